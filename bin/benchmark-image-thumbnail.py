@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""Benchmark thumbnailing large images: full decode and thumbnail() against
+the draft()/reduce() fast path of the PIL image transcoder.
+
+Every run happens in a fresh process, so the reported peak memory is that
+of the run alone.
+"""
+import os
+import sys
+import time
+import shutil
+import resource
+import tempfile
+import argparse
+import multiprocessing
+
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from damn_at.transcoders.image.pil.transcoderimage import open_image, _RESAMPLE
+
+SIZES = {20: (5472, 3648), 35: (7360, 4912), 50: (8688, 5792)}
+"""Megapixels and the dimensions of the generated test images"""
+
+
+def create_image(path, size):
+    """A noisy gradient, so the encoder can't compress it away"""
+    gradient = Image.linear_gradient('L').resize(size)
+    noise = Image.effect_noise(size, 64)
+    Image.merge('RGB', (gradient, noise, gradient.transpose(Image.FLIP_LEFT_RIGHT))).save(path, quality=90)
+
+
+def full_decode(path, box):
+    image = Image.open(path)
+    image.load()
+    image.thumbnail(box, _RESAMPLE)
+    return image
+
+
+def fast_path(path, box):
+    image = open_image(path, [box])
+    image.thumbnail(box, _RESAMPLE)
+    return image
+
+
+def measure(func, path, box, results):
+    start = time.time()
+    func(path, box)
+    elapsed = time.time() - start
+    # ru_maxrss is in kilobytes on Linux, bytes on Mac OS.
+    scale = 1 if sys.platform == 'darwin' else 1024
+    results.put((elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale))
+
+
+def run(func, path, box):
+    results = multiprocessing.Queue()
+    process = multiprocessing.Process(target=measure, args=(func, path, box, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--box', type=int, default=256, help='The thumbnail size [default: 256]')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement, the best counts [default: 3]')
+    parser.add_argument('images', nargs='*', help='JPEG files to use instead of generated ones')
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix='damn_at-benchmark-')
+    try:
+        images = args.images
+        if not images:
+            for megapixels, size in sorted(SIZES.items()):
+                path = os.path.join(tmp, '%dmp.jpg' % megapixels)
+                create_image(path, size)
+                images.append(path)
+
+        box = (args.box, args.box)
+        print('%-20s %-12s %10s %10s' % ('image', 'method', 'seconds', 'peak MB'))
+        for path in images:
+            timings = {}
+            for name, func in (('full decode', full_decode), ('fast path', fast_path)):
+                elapsed, peak = min(run(func, path, box) for _ in range(args.repeat))
+                timings[name] = elapsed
+                print('%-20s %-12s %10.3f %10.1f' % (os.path.basename(path), name, elapsed, peak / 2.0 ** 20))
+            print('%-20s %-12s %9.1fx' % ('', 'speedup', timings['full decode'] / timings['fast path']))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
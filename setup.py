@@ -23,7 +23,8 @@ def version():
             return "0.0.0-development"
 
 INSTALL_REQUIRES = ['Yapsy', 'Image', 'gitpython', 'ffvideo', 'filemagic',
-                    'logilab-common', 'setuptools', 'thrift', 'argcomplete']
+                    'logilab-common', 'setuptools', 'thrift', 'argcomplete',
+                    'numpy']
 TESTS_REQUIRE = ['pylint', 'nose', 'coverage', 'mock']
 
 setup(
@@ -42,7 +43,7 @@ setup(
     scripts=[],
     entry_points={
         'console_scripts': ['pt = damn_at.cli:main',
-                            'damn_at-server = damn_at.thrift.server:main',
+                            'damn_at-server = damn_at.serialization.server:main',
                             'damn_at-analyze = damn_at.analyzer:main',
                             'damn_at-transcode = damn_at.transcoder:main',
                             'damn_fs = damn_at.damnfs.damnfs:main']
@@ -1,6 +1,5 @@
 '''Analyzer for audio files using sox'''
 import os
-import subprocess
 import re
 import mimetypes
 
@@ -8,6 +7,7 @@ from damn_at import logger
 from damn_at import AssetId, FileId, FileDescription, AssetDescription
 from damn_at import MetaDataValue, MetaDataType
 from damn_at.pluginmanager import IAnalyzer
+from damn_at.utilities import run_process
 from damn_at.analyzers.audio import metadata
 
 
@@ -15,12 +15,10 @@ def get_sox_types():
     '''Extract all possible formats for the audio file and store their mime
     types'''
     try:
-        pro = subprocess.Popen(['sox', '-h'], stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE)
-        out, err = pro.communicate()
-        if pro.returncode != 0:
+        out, err, returncode = run_process(['sox', '-h'])
+        if returncode != 0:
             logger.debug(
-                "GetSoxTypes failed with error code %d! " % (pro.returncode),
+                "GetSoxTypes failed with error code %d! " % (returncode),
                 out,
                 err
             )
@@ -64,15 +62,10 @@ class SoundAnalyzer(IAnalyzer):
             mimetype=mimetypes.guess_type(anURI, False)[0], file=fileid))
 
         try:
-            pro = subprocess.Popen(
-                ['sox', '--i', anURI],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            out, err = pro.communicate()
-            if pro.returncode != 0:
+            out, err, returncode = run_process(['sox', '--i', anURI])
+            if returncode != 0:
                 print("E: SoundAnalyzer failed %s with error code %d! "%(anURI,
-                    pro.returncode), out, err)
+                    returncode), out, err)
                 return False
         except OSError:
             print("E: SoundAnalyzer failed %s!"%(anURI), out, err)
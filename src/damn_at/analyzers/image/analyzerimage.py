@@ -5,10 +5,9 @@ import os
 
 from damn_at import mimetypes
 
-import subprocess
-
 from damn_at import MetaDataType, MetaDataValue
 from damn_at import FileId, FileDescription, AssetDescription, AssetId
+from damn_at.utilities import run_process
 
 from damn_at.pluginmanager import IAnalyzer
 
@@ -34,13 +33,11 @@ class GenericImageAnalyzer(IAnalyzer):
         asset_descr = AssetDescription(asset = AssetId(subname = 'main layer', mimetype = image_mimetype, file = fileid))
 
         try:
-            pro = subprocess.Popen(['exiftool',an_uri], stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE)
-            out, err = pro.communicate()
-            if pro.returncode != 0:
+            out, err, returncode = run_process(['exiftool', an_uri])
+            if returncode != 0:
                 print("E: ImageAnalyzer failed %s with error code %d! "
-                        %(an_uri, pro.returncode), out, err)
-                raise AnalyzerException("ImageAnalyzer failed %s with error code %d! "%(an_uri, pro.returncode))
+                        %(an_uri, returncode), out, err)
+                raise AnalyzerException("ImageAnalyzer failed %s with error code %d! "%(an_uri, returncode))
         except OSError as e:
             print("E: ImageAnalyzer failed %s (%s)" %(an_uri, e))
             raise e
@@ -1,8 +1,6 @@
 """
 Blender file format analyzer.
 """
-import binascii
-
 from thrift.protocol import TBinaryProtocol
 
 from damn_at import logger
@@ -11,7 +9,7 @@ from damn_at import FileDescription
 from damn_at.serialization import DeserializeThriftMsg
 
 from damn_at.pluginmanager import IAnalyzer
-from damn_at.utilities import script_path, run_blender
+from damn_at.utilities import script_path, run_blender_with_result
 
 class BlendAnalyzer(IAnalyzer):
     """Blender file format analyzer."""
@@ -24,7 +22,7 @@ class BlendAnalyzer(IAnalyzer):
         pass
 
     def analyze(self, an_uri):
-        stdoutdata, stderrdata, returncode = run_blender(an_uri, script_path(__file__))
+        data, stdoutdata, stderrdata, returncode = run_blender_with_result(an_uri, script_path(__file__))
         
         if returncode != 0: 
             raise AnalyzerException('BlendAnalyzer failed with %s'%(returncode))
@@ -32,8 +30,8 @@ class BlendAnalyzer(IAnalyzer):
         logger.debug(stdoutdata)
         logger.debug(stderrdata)
         
-        data = str(stdoutdata).split('-**-')[1].replace('\n', '').replace('\r', '').replace("b'", '').replace("'", '')
-        data = binascii.unhexlify(data)
+        if not data:
+            raise AnalyzerException('BlendAnalyzer did not write a result')
         
         file_descr = DeserializeThriftMsg(FileDescription(), data, TBinaryProtocol.TBinaryProtocol)
         
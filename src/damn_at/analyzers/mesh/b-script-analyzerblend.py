@@ -2,7 +2,8 @@
 Script to be run with blender -P this
 """
 import bpy # pylint: disable=F0401
-import binascii
+import sys
+import argparse
 import mimetypes
 
 import metadata
@@ -18,6 +19,14 @@ def relpath(path, start=None):
 
 def main(): # pylint: disable=R0914,R0912,R0915
     """The main method"""
+    # Drop everything before '--'
+    args = sys.argv[sys.argv.index('--')+1:]
+
+    parser = argparse.ArgumentParser(description='Analyze.')
+    parser.add_argument('result_path', help='The file to write the serialized FileDescription to')
+
+    args = parser.parse_args(args)
+
     images = {}
     materials = {}
     meshes = {}
@@ -170,9 +179,8 @@ def main(): # pylint: disable=R0914,R0912,R0915
         texts[text.name] = asset_descr
 
     data = SerializeThriftMsg(file_descr)
-    print('-**-')
-    print(binascii.hexlify(data))
-    print('-**-')
+    with open(args.result_path, 'wb') as result:
+        result.write(data)
 
 if __name__ == '__main__':
     main()
@@ -1,10 +1,10 @@
 """Analyzer for Videos """
 import os
-import subprocess
 import mimetypes
 
 from damn_at import MetaDataType, MetaDataValue
 from damn_at import FileId, FileDescription, AssetDescription, AssetId
+from damn_at.utilities import run_process
 
 from damn_at.pluginmanager import  IAnalyzer
 from damn_at.analyzers.video import metadata
@@ -29,12 +29,10 @@ class GenericVideoAnalyzer(IAnalyzer):
             mimetype=video_mimetype, file=fileid))
 
         try:
-            pro = subprocess.Popen(['exiftool', an_uri], stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE)
-            out, err = pro.communicate()
-            if pro.returncode != 0:
+            out, err, returncode = run_process(['exiftool', an_uri])
+            if returncode != 0:
                 print("VideoAnalyzer failed %s with error code %d" 
-                        %(an_uri, pro.returncode), out, err)
+                        %(an_uri, returncode), out, err)
                 return False
         except OSError:
             print("VideoAnalyzer failed %s" %(an_uri), out, err)
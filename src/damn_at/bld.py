@@ -5,6 +5,7 @@ import os
 import subprocess
 import glob
 import hashlib
+import tempfile
 
 from .utilities import calculate_hash_for_file
 
@@ -117,6 +118,35 @@ def blocks_to_file(an_uri, block_hashes, destination):
                 filehandle.write(block.read())
 
 
+def write_block(an_uri, block_hash, data):
+    """
+    Store a block under its hash, verifying that it matches the content.
+    :param an_uri: the directory containing the blocks
+    :param block_hash: the sha1 hexdigest of the block
+    :param data: the content of the block
+    :rtype: bool False if the hash does not match the data
+    """
+    blockhash = hashlib.sha1()
+    blockhash.update(data)
+    if blockhash.hexdigest() != block_hash:
+        return False
+    path = os.path.join(an_uri, hash_to_dir(block_hash))
+    if os.path.exists(path):
+        return True
+    if not os.path.exists(os.path.dirname(path)):
+        try:
+            os.makedirs(os.path.dirname(path))
+        except OSError:
+            if not os.path.isdir(os.path.dirname(path)):
+                raise
+    # Write and rename, so a concurrent reader never sees a partial block.
+    handle, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    with os.fdopen(handle, 'wb') as block:
+        block.write(data)
+    os.rename(tmp_path, path)
+    return True
+
+
 def filter_existing_block_hashes(an_uri, block_hashes):
     """
     Check the given uri if it contains the given blocks and filter out the existing.
@@ -125,7 +155,7 @@ def filter_existing_block_hashes(an_uri, block_hashes):
     :rtype: list<string> a list of block hashes that do not exist
     """
     new_block_hashes = set([])
-    dirs = os.listdir(an_uri)
+    dirs = os.listdir(an_uri) if os.path.isdir(an_uri) else []
     cache = {}
     for bloc_hash in block_hashes:
         prefix = bloc_hash[:2]
@@ -134,8 +164,6 @@ def filter_existing_block_hashes(an_uri, block_hashes):
         else:
             if prefix not in cache:
                 cache[prefix] = os.listdir(os.path.join(an_uri, prefix))
-            else:
-                print('from cache', bloc_hash)
             if bloc_hash[2:] not in cache[prefix]:
                 new_block_hashes.add(bloc_hash)
     return new_block_hashes
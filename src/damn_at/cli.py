@@ -230,6 +230,47 @@ def create_argparse_inspect(parser, subparsers):
                 inspect(args),
             )
 
+def create_argparse_store(parser, subparsers):
+    subparse = subparsers.add_parser(
+            "store",
+            help="Operations on a metadata store",
+            )
+    store_subparsers = subparse.add_subparsers(
+            title='store subcommands',
+            description='valid store subcommands',
+            )
+
+    snapshot_parse = store_subparsers.add_parser(
+            "snapshot",
+            help="Materialize the store into a columnar snapshot",
+            )
+    snapshot_parse.add_argument(
+            dest="store", type=str,
+            help="The path to the metadata store",
+            ).completer = FilesCompleter(['ignore'])
+    snapshot_parse.add_argument(
+            dest="snapshot", type=str,
+            help="The directory of the snapshot to create or update",
+            ).completer = FilesCompleter(['ignore'])
+    snapshot_parse.add_argument(
+            "--rebuild", dest="rebuild", action="store_true",
+            help="Discard the existing snapshot and start over",
+            )
+
+    def snapshot(args):
+        from .metadatastore import MetaDataStore
+        from .snapshot import Snapshot
+        store = MetaDataStore(args.store)
+        snap = Snapshot(args.snapshot)
+        added = snap.update(store, rebuild=args.rebuild)
+        print('Added %d files, snapshot holds %d files and %d assets' % (added, snap.rows('files'), snap.rows('assets')))
+
+    snapshot_parse.set_defaults(
+            func=lambda args:
+                snapshot(args),
+            )
+
+
 def create_argparse():
     usage_text = (
         "Platinumial\n" +
@@ -268,6 +309,7 @@ def create_argparse():
 
     create_argparse_analyze(subparsers)
     create_argparse_inspect(parser, subparsers)
+    create_argparse_store(parser, subparsers)
 
     group = 'peragro.commandline.hooks'
     for entrypoint in pkg_resources.iter_entry_points(group=group):
@@ -0,0 +1,302 @@
+"""
+Role
+====
+
+Compact, read-only in-memory representation of FileDescriptions.
+
+The Thrift generated types keep a ``__dict__`` per object and a full
+:py:class:`damn_at.MetaDataValue` per metadata entry, which adds up quickly
+when whole stores are loaded. The classes here use ``__slots__``, intern
+all keys, mimetypes and paths and keep metadata values in typed arrays.
+
+Use a single :py:class:`CompactPool` when loading many FileDescriptions so
+that identical strings, FileIds, AssetIds and metadata key sets are shared.
+"""
+import sys
+from array import array
+from bisect import bisect_left
+
+from damn_at import (
+    MetaDataType,
+    MetaDataValue,
+    FileId,
+    FileDescription,
+    AssetId,
+    AssetDescription
+)
+from damn_at.utilities import get_metadatavalue_fieldname
+
+try:
+    _intern = sys.intern
+except AttributeError:
+    _intern = intern  # noqa pylint: disable=E0602
+
+try:
+    array('q')
+    _INT_TYPECODE = 'q'
+except ValueError:
+    # Python 2 has no 'long long' arrays.
+    _INT_TYPECODE = 'l'
+
+_NO_VALUE = -1
+
+
+class CompactPool(object):
+    """
+    Interning pool shared between compact objects.
+    """
+    def __init__(self):
+        self._strings = {}
+        self._file_ids = {}
+        self._asset_ids = {}
+        self._keys = {}
+
+    def string(self, value):
+        """Return the shared instance of the given string"""
+        if value is None:
+            return None
+        try:
+            return self._strings[value]
+        except KeyError:
+            if isinstance(value, str):
+                value = _intern(value)
+            self._strings[value] = value
+            return value
+
+    def keys(self, keys):
+        """Return the shared instance of the given tuple of metadata keys"""
+        keys = tuple(self.string(key) for key in keys)
+        return self._keys.setdefault(keys, keys)
+
+    def file_id(self, file_id):
+        """Return the shared :py:class:`CompactFileId` for a FileId"""
+        if file_id is None:
+            return None
+        key = (file_id.filename, file_id.hash)
+        try:
+            return self._file_ids[key]
+        except KeyError:
+            compact = CompactFileId(self.string(file_id.filename),
+                                    self.string(file_id.hash))
+            self._file_ids[key] = compact
+            return compact
+
+    def asset_id(self, asset_id):
+        """Return the shared :py:class:`CompactAssetId` for an AssetId"""
+        if asset_id is None:
+            return None
+        file_id = self.file_id(asset_id.file)
+        key = (asset_id.subname, asset_id.mimetype, file_id)
+        try:
+            return self._asset_ids[key]
+        except KeyError:
+            compact = CompactAssetId(self.string(asset_id.subname),
+                                     self.string(asset_id.mimetype),
+                                     file_id)
+            self._asset_ids[key] = compact
+            return compact
+
+
+class CompactFileId(object):
+    """Compact :py:class:`damn_at.FileId`"""
+    __slots__ = ('filename', 'hash')
+
+    def __init__(self, filename, hash):  # pylint: disable=W0622
+        self.filename = filename
+        self.hash = hash
+
+    def to_thrift(self):
+        """:rtype: :py:class:`damn_at.FileId`"""
+        return FileId(filename=self.filename, hash=self.hash)
+
+    def __repr__(self):
+        return 'CompactFileId(filename=%r, hash=%r)' % (self.filename, self.hash)
+
+
+class CompactAssetId(object):
+    """Compact :py:class:`damn_at.AssetId`"""
+    __slots__ = ('subname', 'mimetype', 'file')
+
+    def __init__(self, subname, mimetype, file):  # pylint: disable=W0622
+        self.subname = subname
+        self.mimetype = mimetype
+        self.file = file
+
+    def to_thrift(self):
+        """:rtype: :py:class:`damn_at.AssetId`"""
+        return AssetId(subname=self.subname, mimetype=self.mimetype,
+                       file=self.file.to_thrift() if self.file else None)
+
+    def __repr__(self):
+        return 'CompactAssetId(subname=%r, mimetype=%r, file=%r)' % (self.subname, self.mimetype, self.file)
+
+
+class CompactMetaData(object):
+    """
+    Read-only mapping of metadata keys to values.
+
+    Values are stored per type in typed arrays: BOOL and INT values in
+    an array of 64bit integers, DOUBLE values in an array of doubles and
+    STRING values in a tuple of interned strings.
+    """
+    __slots__ = ('keys_', 'types', 'index', 'ints', 'doubles', 'strings')
+
+    def __init__(self, metadata, pool):
+        keys = sorted(metadata.keys()) if metadata else []
+        self.keys_ = pool.keys(keys)
+        self.types = array('B')
+        self.index = array('i')
+        self.ints = array(_INT_TYPECODE)
+        self.doubles = array('d')
+        strings = []
+        for key in keys:
+            value = metadata[key]
+            self.types.append(value.type)
+            if value.type == MetaDataType.BOOL:
+                self._append(self.ints, value.bool_value)
+            elif value.type == MetaDataType.INT:
+                self._append(self.ints, value.int_value)
+            elif value.type == MetaDataType.DOUBLE:
+                self._append(self.doubles, value.double_value)
+            else:
+                self._append(strings, pool.string(value.string_value))
+        self.strings = tuple(strings)
+
+    def _append(self, values, value):
+        if value is None:
+            self.index.append(_NO_VALUE)
+        else:
+            self.index.append(len(values))
+            values.append(value)
+
+    def _value(self, i):
+        position = self.index[i]
+        if position == _NO_VALUE:
+            return None
+        value_type = self.types[i]
+        if value_type == MetaDataType.BOOL:
+            return bool(self.ints[position])
+        elif value_type == MetaDataType.INT:
+            return self.ints[position]
+        elif value_type == MetaDataType.DOUBLE:
+            return self.doubles[position]
+        return self.strings[position]
+
+    def _position(self, key):
+        # keys_ is sorted, so look the key up by bisection
+        try:
+            i = bisect_left(self.keys_, key)
+        except TypeError:
+            raise KeyError(key)
+        if i == len(self.keys_) or self.keys_[i] != key:
+            raise KeyError(key)
+        return i
+
+    def __len__(self):
+        return len(self.keys_)
+
+    def __iter__(self):
+        return iter(self.keys_)
+
+    def __contains__(self, key):
+        try:
+            self._position(key)
+        except KeyError:
+            return False
+        return True
+
+    def __getitem__(self, key):
+        return self._value(self._position(key))
+
+    def get(self, key, default=None):
+        """Return the value for key or default"""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        """The metadata keys, sorted"""
+        return list(self.keys_)
+
+    def items(self):
+        """List of (key, value) tuples"""
+        return [(key, self._value(i)) for i, key in enumerate(self.keys_)]
+
+    def type_of(self, key):
+        """Return the :py:class:`damn_at.MetaDataType` of the given key"""
+        return self.types[self._position(key)]
+
+    def to_thrift(self):
+        """:rtype: map<string, :py:class:`damn_at.MetaDataValue`>"""
+        metadata = {}
+        for i, key in enumerate(self.keys_):
+            value_type = self.types[i]
+            field = get_metadatavalue_fieldname(MetaDataType._VALUES_TO_NAMES[value_type])
+            metadata[key] = MetaDataValue(**{'type': value_type, field: self._value(i)})
+        return metadata
+
+
+def _compact_metadata(metadata, pool):
+    if metadata is None:
+        return None
+    return CompactMetaData(metadata, pool)
+
+
+class CompactAssetDescription(object):
+    """Compact :py:class:`damn_at.AssetDescription`"""
+    __slots__ = ('asset', 'metadata', 'dependencies')
+
+    def __init__(self, asset_descr, pool):
+        self.asset = pool.asset_id(asset_descr.asset)
+        self.metadata = _compact_metadata(asset_descr.metadata, pool)
+        if asset_descr.dependencies is None:
+            self.dependencies = None
+        else:
+            self.dependencies = tuple(pool.asset_id(dep) for dep in asset_descr.dependencies)
+
+    def to_thrift(self):
+        """:rtype: :py:class:`damn_at.AssetDescription`"""
+        asset_descr = AssetDescription(asset=self.asset.to_thrift() if self.asset else None)
+        if self.metadata is not None:
+            asset_descr.metadata = self.metadata.to_thrift()
+        if self.dependencies is not None:
+            asset_descr.dependencies = [dep.to_thrift() for dep in self.dependencies]
+        return asset_descr
+
+
+class CompactFileDescription(object):
+    """Compact :py:class:`damn_at.FileDescription`"""
+    __slots__ = ('file', 'mimetype', 'metadata', 'assets')
+
+    def __init__(self, file_descr, pool=None):
+        if pool is None:
+            pool = CompactPool()
+        self.file = pool.file_id(file_descr.file)
+        self.mimetype = pool.string(file_descr.mimetype)
+        self.metadata = _compact_metadata(file_descr.metadata, pool)
+        if file_descr.assets is None:
+            self.assets = None
+        else:
+            self.assets = tuple(CompactAssetDescription(asset_descr, pool)
+                                for asset_descr in file_descr.assets)
+
+    def to_thrift(self):
+        """:rtype: :py:class:`damn_at.FileDescription`"""
+        file_descr = FileDescription(file=self.file.to_thrift() if self.file else None,
+                                     mimetype=self.mimetype)
+        if self.metadata is not None:
+            file_descr.metadata = self.metadata.to_thrift()
+        if self.assets is not None:
+            file_descr.assets = [asset.to_thrift() for asset in self.assets]
+        return file_descr
+
+
+def compact_file_description(file_descr, pool=None):
+    """Convert a FileDescription into its compact representation
+
+    :param file_descr: :py:class:`damn_at.FileDescription`
+    :param pool: :py:class:`CompactPool` to share strings and ids with
+    :rtype: :py:class:`CompactFileDescription`
+    """
+    return CompactFileDescription(file_descr, pool)
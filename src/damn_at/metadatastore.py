@@ -2,6 +2,7 @@
 The MetaDataStore handler.
 """
 import os
+import tempfile
 from .utilities import is_existing_file, pretty_print_file_description
 from .bld import hash_to_dir
 
@@ -51,6 +52,15 @@ class MetaDataStore(object):
         except IOError as ioe:
             raise MetaDataStoreFileException('Failed to open FileDescription with hash %s' % an_hash, ioe)
 
+    def get_compact_metadata(self, store_id, an_hash, pool=None):
+        """
+        Get the FileDescription for the given hash in its compact form,
+        pass the same :py:class:`damn_at.compact.CompactPool` when loading
+        many to share keys, mimetypes and paths between them.
+        """
+        from damn_at.compact import compact_file_description
+        return compact_file_description(self.get_metadata(store_id, an_hash), pool)
+
     def write_metadata(self, store_id, an_hash, a_file_descr):
         """
         Write the FileDescription to this store.
@@ -59,6 +69,16 @@ class MetaDataStore(object):
         path = os.path.join(self.store_path, hash_to_dir(an_hash))
         if not os.path.exists(os.path.dirname(path)):
             os.makedirs(os.path.dirname(path))
-        with open(path, 'wb') as metadata:
-            metadata.write(data)
+        # Write and rename, so concurrent readers never see a partial file.
+        # Every writer gets its own temporary file, as two of them may
+        # store the same hash at once.
+        handle, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.')
+        try:
+            with os.fdopen(handle, 'wb') as metadata:
+                metadata.write(data)
+            os.chmod(tmp_path, 0o644)
+            os.rename(tmp_path, path)
+        except:
+            os.remove(tmp_path)
+            raise
         return a_file_descr
@@ -30,6 +30,7 @@ sys_mimetypes.add_type("image/x-dds", ".dds")
 # (extension->mimetype) so they're never returned for extension lookups!
 sys_mimetypes._db.types_map_inv[True]["image/jpg-reel"] = [".jpg"]
 sys_mimetypes._db.types_map_inv[True]["image/png-reel"] = [".png"]
+sys_mimetypes._db.types_map_inv[True]["application/x-waveform-peaks"] = [".dat"]
 
 
 try:
@@ -61,6 +61,42 @@ class ITranscoder(IPlugin):
         """ blah """
         raise NotImplementedError("'transcode' must be reimplemented by %s" % self)
 
+    def transcode_many(self, dest_path, file_descr, asset_id, targets):
+        """Transcode the asset to several targets at once, reimplement to
+        share work between them, like decoding the source.
+
+        :param targets: list<(:py:class:`damn_at.TargetMimetype`, dict)> the
+                        target mimetypes and their parsed options
+        :rtype: list<list<string>> the file paths of every target
+        """
+        return [self.transcode(dest_path, file_descr, asset_id, target_mimetype, **options)
+                for target_mimetype, options in targets]
+
+    def transcode_assets(self, dest_path, file_descr, jobs):
+        """Transcode several assets of the file at once, reimplement to
+        share work between them, like loading the file.
+
+        :param jobs: list<(:py:class:`damn_at.AssetId`,
+                     :py:class:`damn_at.TargetMimetype`, dict)> the assets,
+                     target mimetypes and their parsed options
+        :rtype: list<list<string>> the file paths of every job
+        """
+        results = [None] * len(jobs)
+        assets = []
+        for i, (asset_id, target_mimetype, options) in enumerate(jobs):
+            for asset, indexes, targets in assets:
+                if asset is asset_id:
+                    break
+            else:
+                asset, indexes, targets = asset_id, [], []
+                assets.append((asset, indexes, targets))
+            indexes.append(i)
+            targets.append((target_mimetype, options))
+        for asset_id, indexes, targets in assets:
+            for i, file_paths in zip(indexes, self.transcode_many(dest_path, file_descr, asset_id, targets)):
+                results[i] = file_paths
+        return results
+
 
 class IMetaDataStore(IPlugin):
     """Interface class for a MetaDataStore"""
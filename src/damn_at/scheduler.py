@@ -0,0 +1,145 @@
+"""
+Role
+====
+
+Concurrency limits for the external tools and transcoder plugins.
+
+Transcodes run in several worker processes, maybe of several pre-forked
+servers, each of which may start Blender, ffmpeg, sox or ImageMagick. The
+:py:class:`Scheduler` keeps that from oversubscribing the machine: every
+tool and plugin has a number of slots, and all tools together share a
+budget of CPUs. Blender takes as many CPUs of the budget as the render
+threads it is told to use, the other tools one each.
+
+Slots are lock files in a directory shared by the processes, a slot is
+free again as soon as its holder exits, however it exits. Waiters queue
+on a turnstile, so a job that needs many CPUs is not starved by ones that
+need few.
+"""
+import os
+import time
+import multiprocessing
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from damn_at.stats import STATS
+
+DEFAULT_LIMITS = {
+    'blender': 2,
+    'ffmpeg': 2,
+    'sox': 4,
+    'convert': 4,
+}
+"""Concurrent processes of the external tools, tools that are not listed
+are only bounded by the CPU budget"""
+
+POLL_INTERVAL = 0.05
+
+
+def parse_limits(values):
+    """Parse 'name=count' strings, like the ones of the command line
+
+    :rtype: dict<string, int>
+    """
+    limits = {}
+    for value in values or []:
+        name, _, count = value.partition('=')
+        limits[name.strip()] = int(count)
+    return limits
+
+
+class Scheduler(object):
+    """
+    Slots of tools and plugins and a global CPU budget, shared between the
+    processes that use the same lock directory.
+
+    :param lock_path: the directory of the slot files, None to not limit
+                      anything
+    :param cpus: the CPU budget, all CPUs of the machine by default
+    :param limits: dict<string, int> slots per tool or plugin name, on top
+                   of :py:data:`DEFAULT_LIMITS`
+    """
+    def __init__(self, lock_path=None, cpus=None, limits=None):
+        self.configure(lock_path, cpus, limits)
+
+    def configure(self, lock_path, cpus=None, limits=None):
+        """Change the lock directory, budget and limits, every process
+        that runs tools is configured alike so they share the slots"""
+        self.lock_path = lock_path
+        self.cpus = cpus or multiprocessing.cpu_count()
+        self.limits = dict(DEFAULT_LIMITS)
+        self.limits.update(limits or {})
+
+    def blender_threads(self):
+        """The render threads of one Blender, so the Blender slots together
+        use the CPU budget and no more, 0 for all CPUs when nothing is
+        limited"""
+        if self.lock_path is None:
+            return 0
+        return max(1, self.cpus // max(1, self.limits.get('blender', 1)))
+
+    @contextmanager
+    def slot(self, name, cpus=1):
+        """Hold a slot of the tool or plugin `name` and `cpus` CPUs of the
+        budget, waiting for them if needed. The wait is recorded in the
+        'scheduler.<name>' statistic.
+        """
+        if self.lock_path is None or fcntl is None:
+            yield
+            return
+        start = time.time()
+        with self._acquire(name, self.limits.get(name), 1):
+            with self._acquire('cpu', self.cpus, min(cpus, self.cpus)):
+                STATS.record('scheduler.' + name, time.time() - start)
+                yield
+
+    @contextmanager
+    def _acquire(self, name, count, needed):
+        """Lock `needed` of the `count` slot files of `name`"""
+        if not count or not needed:
+            yield
+            return
+        if not os.path.exists(self.lock_path):
+            try:
+                os.makedirs(self.lock_path)
+            except OSError:
+                if not os.path.isdir(self.lock_path):
+                    raise
+        held = []
+        try:
+            with self._lock_file('%s.turnstile' % name):
+                while True:
+                    for i in range(count):
+                        if len(held) == needed:
+                            break
+                        lock_file = open(os.path.join(self.lock_path, '%s.%d.lock' % (name, i)), 'a')
+                        try:
+                            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        except IOError:
+                            lock_file.close()
+                            continue
+                        held.append(lock_file)
+                    if len(held) == needed:
+                        break
+                    time.sleep(POLL_INTERVAL)
+            yield
+        finally:
+            for lock_file in held:
+                lock_file.close()
+
+    @contextmanager
+    def _lock_file(self, file_name):
+        with open(os.path.join(self.lock_path, file_name), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+SCHEDULER = Scheduler()
+"""The scheduler of this process, it limits nothing until configured"""
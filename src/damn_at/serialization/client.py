@@ -1,65 +1,324 @@
 #!/usr/bin/env python
-"""DAMN Service client"""
- 
+"""
+DAMN Service client
+
+:py:class:`DamnServiceClient` keeps a pool of open connections, so callers
+don't pay for TCP setup on every call and concurrent callers never wait for
+each other's calls on a shared socket. Calls go round-robin over the
+configured endpoints, each on an idle connection to its endpoint if there
+is one, idle connections are closed after a while and
+calls are retried on a fresh connection when the one they got turned out
+to be broken: read-only calls always, other calls only when the request
+could not be sent, so the server never runs them twice.
+"""
+import os
 import sys
-sys.path.append('generated')
+directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'generated')
+sys.path.append(directory)
 
+import time
+import select
 import socket
+import threading
+import functools
+from collections import deque
 
 from thrift import Thrift
 from thrift.transport import TSocket
 from thrift.transport import TTransport
 from thrift.protocol import TBinaryProtocol
 
-from damn_at.thrift.generated.damn import DamnService
+from damn_at.serialization.generated.damn import DamnService
+from damn_at.serialization.generated.damn.ttypes import UnknownFileException, MissingBlocksException
+from damn_at.serialization.generated.damn_types.ttypes import File
+
+from damn_at import logger
+from damn_at.utilities import calculate_hash_for_file
+from damn_at.bld import BLOCK_SIZE, block_hashes_for_file
+
+
+CHUNK_SIZE = 4 * 1024 * 1024
+"""Files larger than this are uploaded in chunks of this size"""
+
+
+class DamnServiceClientException(Exception):
+    """Base DamnServiceClient Exception"""
+    def __init__(self, msg):
+        Exception.__init__(self)
+        self.msg = msg
+
+    def __str__(self):
+        return repr(self.msg)
+
+
+def parse_endpoint(endpoint):
+    """Parse 'host:port', 'host' or (host, port) into a (host, port) tuple"""
+    if isinstance(endpoint, tuple):
+        return endpoint
+    host, _, port = endpoint.rpartition(':')
+    if not host:
+        return port, 9090
+    return host, int(port)
+
+
+class _Connection(object):
+    """An open connection to one endpoint"""
+    __slots__ = ('endpoint', 'socket', 'transport', 'client', 'last_used')
+
+    def __init__(self, endpoint, timeout):
+        self.endpoint = endpoint
+        self.socket = TSocket.TSocket(*endpoint)
+        if timeout:
+            self.socket.setTimeout(timeout * 1000)
+        # Buffering is critical. Raw sockets are very slow
+        self.transport = TTransport.TBufferedTransport(self.socket)
+        self.client = DamnService.Client(TBinaryProtocol.TBinaryProtocol(self.transport))
+        self.transport.open()
+        self.last_used = time.time()
+
+    def is_alive(self):
+        """An idle connection never has anything to read, unless the server
+        closed it."""
+        handle = self.socket.handle
+        if handle is None:
+            return False
+        try:
+            readable, _, _ = select.select([handle], [], [], 0)
+        except (select.error, ValueError):
+            return False
+        return not readable
+
+    def close(self):
+        try:
+            self.transport.close()
+        except Exception:  # pylint: disable=W0703
+            pass
 
 
 class DamnServiceClient(object):
-    """DamnServiceClient"""
-    def __init__(self):
-        self.host = 'localhost'
-        self.port = 9090
-        self._socket = None
-        self._client = None
-        self._transport = None
-        self.connected = False
-    
+    """
+    Thread-safe, pooled DamnService client.
+
+    Call the service's methods directly on the client, every call borrows a
+    connection from the pool for its duration.
+
+    :param endpoints: list of 'host:port' strings or (host, port) tuples
+    :param size: the maximum number of open connections
+    :param idle_timeout: seconds after which an unused connection is closed
+    :param timeout: socket timeout in seconds, None to wait forever
+    :param retries: how often a call is retried on a new connection after
+                    a transport error, see :py:data:`READ_ONLY_CALLS`
+    """
+    READ_ONLY_CALLS = frozenset(['ping', 'get_stats', 'get_supported_mimetypes', 'get_target_mimetypes',
+                                 'analyze_hash', 'missing_blocks', 'job_status', 'job_result', 'list_jobs'])
+    """Calls without side effects, they are retried even when the server
+    may have received them. Other calls are only retried when sending
+    them failed."""
+
+    def __init__(self, endpoints=None, size=8, idle_timeout=60.0, timeout=None, retries=2):
+        self.endpoints = [parse_endpoint(endpoint) for endpoint in endpoints or ['localhost:9090']]
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.retries = retries
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._next_endpoint = 0
+
+    def _idle_connection(self, endpoint):
+        """Take the most recently used live idle connection to endpoint"""
+        while True:
+            connection = None
+            with self._lock:
+                for i in range(len(self._idle) - 1, -1, -1):
+                    if self._idle[i].endpoint == endpoint:
+                        connection = self._idle[i]
+                        del self._idle[i]
+                        break
+            if connection is None or connection.is_alive():
+                return connection
+            connection.close()
+
     def _connect(self):
-        # Make socket
-        self._socket = TSocket.TSocket(self.host, self.port)
+        """A connection to the next endpoint that accepts one, idle or new"""
+        with self._lock:
+            start = self._next_endpoint
+            self._next_endpoint = (start + 1) % len(self.endpoints)
+        errors = []
+        for i in range(len(self.endpoints)):
+            endpoint = self.endpoints[(start + i) % len(self.endpoints)]
+            connection = self._idle_connection(endpoint)
+            if connection is not None:
+                return connection
+            try:
+                return _Connection(endpoint, self.timeout)
+            except (TTransport.TTransportException, socket.error) as ex:
+                logger.debug("Failed to connect to %s:%d: %s", endpoint[0], endpoint[1], ex)
+                errors.append('%s:%d' % endpoint)
+        raise DamnServiceClientException('Failed to connect to %s' % ', '.join(errors))
 
-        # Buffering is critical. Raw sockets are very slow
-        self._transport = TTransport.TBufferedTransport(self._socket)
+    def _evict(self):
+        """Close idle connections that timed out, oldest first"""
+        deadline = time.time() - self.idle_timeout
+        expired = []
+        with self._lock:
+            while self._idle and self._idle[0].last_used < deadline:
+                expired.append(self._idle.popleft())
+        for connection in expired:
+            connection.close()
+
+    def _acquire(self):
+        self._slots.acquire()
+        try:
+            self._evict()
+            return self._connect()
+        except:
+            self._slots.release()
+            raise
 
-        # Wrap in a protocol
-        protocol = TBinaryProtocol.TBinaryProtocol(self._transport)
+    def _release(self, connection, healthy):
+        surplus = None
+        if healthy:
+            connection.last_used = time.time()
+            with self._lock:
+                self._idle.append(connection)
+                if len(self._idle) > self.size:
+                    surplus = self._idle.popleft()
+        else:
+            surplus = connection
+        if surplus is not None:
+            surplus.close()
+        self._slots.release()
 
-        # Create a client to use the protocol encoder
-        self._client = DamnService.Client(protocol)
+    def call(self, name, *args, **kwargs):
+        """Call the named service method on a pooled connection"""
+        attempts = 1 + self.retries
+        for attempt in range(attempts):
+            connection = self._acquire()
+            healthy = False
+            sent = False
+            try:
+                getattr(connection.client, 'send_' + name)(*args, **kwargs)
+                sent = True
+                result = getattr(connection.client, 'recv_' + name)()
+                healthy = True
+                return result
+            except (TTransport.TTransportException, socket.error) as ex:
+                if attempt + 1 == attempts or (sent and name not in self.READ_ONLY_CALLS):
+                    raise
+                logger.debug("Retrying %s after %s", name, ex)
+            except Thrift.TException:
+                # Declared exceptions leave the connection usable.
+                healthy = True
+                raise
+            finally:
+                self._release(connection, healthy)
+
+    def analyze_file(self, path, timeout_ms=0, chunk_size=CHUNK_SIZE):
+        """Analyze a local file, it's only uploaded when the server doesn't
+        know its content yet. Files larger than chunk_size are uploaded in
+        chunks, so neither side holds them in memory.
+
+        :rtype: :py:class:`damn_at.FileDescription`
+        """
+        file_hash = calculate_hash_for_file(path)
+        size = os.path.getsize(path)
+        try:
+            return self.call('analyze_hash', file_hash, size)
+        except UnknownFileException:
+            pass
+        if size > chunk_size:
+            return self.analyze_file_chunked(path, file_hash, timeout_ms, chunk_size)
+        with open(path, 'rb') as a_file:
+            data = a_file.read()
+        return self.call('analyze', File(filename=os.path.basename(path), data=data), timeout_ms)
+
+    def analyze_file_chunked(self, path, file_hash='', timeout_ms=0, chunk_size=CHUNK_SIZE):
+        """Upload a local file in chunks and analyze it
+
+        :rtype: :py:class:`damn_at.FileDescription`
+        """
+        upload_id = self.call('open_upload', os.path.basename(path))
+        try:
+            offset = 0
+            with open(path, 'rb') as a_file:
+                while True:
+                    data = a_file.read(chunk_size)
+                    if not data:
+                        break
+                    offset = self.call('append_upload', upload_id, offset, data)
+        except Exception:
+            self._abort_upload(upload_id)
+            raise
+        return self.call('commit_upload', upload_id, file_hash, timeout_ms)
+
+    def _abort_upload(self, upload_id):
+        """Abort an upload, never raises so the error that made the
+        upload fail is the one reported"""
+        try:
+            self.call('abort_upload', upload_id)
+        except Exception as ex:  # pylint: disable=W0703
+            logger.warning("Failed to abort upload %s: %s", upload_id, ex)
+
+    def upload_blocks(self, path, block_hashes, batch_size=1024):
+        """Upload the blocks of a local file the server is missing
+
+        :param block_hashes: the block hashes of the file
+        :param batch_size: the number of blocks sent per call
+        """
+        missing = set(self.call('missing_blocks', sorted(set(block_hashes))))
+        batch = {}
+        with open(path, 'rb') as a_file:
+            for block_hash in block_hashes:
+                data = a_file.read(BLOCK_SIZE)
+                if block_hash in missing:
+                    missing.discard(block_hash)
+                    batch[block_hash] = data
+                    if len(batch) == batch_size:
+                        self.call('upload_blocks', batch)
+                        batch = {}
+        if batch:
+            self.call('upload_blocks', batch)
+
+    def analyze_file_blocks(self, path, timeout_ms=0):
+        """Analyze a local file, only uploading the blocks of it the server
+        doesn't have yet, see :py:mod:`damn_at.bld`.
+
+        :rtype: :py:class:`damn_at.FileDescription`
+        """
+        file_hash, block_hashes = block_hashes_for_file(path)
+        try:
+            return self.call('analyze_hash', file_hash, os.path.getsize(path))
+        except UnknownFileException:
+            pass
+        self.upload_blocks(path, block_hashes)
+        try:
+            return self.call('analyze_blocks', os.path.basename(path), file_hash, block_hashes, timeout_ms)
+        except MissingBlocksException:
+            # Blocks can't disappear, unless the server's block store is
+            # cleaned up, try once more.
+            self.upload_blocks(path, block_hashes)
+            return self.call('analyze_blocks', os.path.basename(path), file_hash, block_hashes, timeout_ms)
+
+    def close(self):
+        """Close all idle connections"""
+        with self._lock:
+            idle, self._idle = self._idle, deque()
+        for connection in idle:
+            connection.close()
 
-        # Connect!
-        self._transport.open()
-        
-        self.connected = True
-            
     def __del__(self):
-        self._transport.close()
-        
+        self.close()
+
     def __getattr__(self, name):
-        try:
-            if not self.connected:
-                self._connect()
-            return getattr(self._client, name)
-        except TTransport.TTransportException as tte:
-            self.connected = False
-            raise tte
-        except socket.error as serr:
-            self.connected = False
-            raise serr
-        
+        if name.startswith('_') or not hasattr(DamnService.Iface, name):
+            raise AttributeError(name)
+        return functools.partial(self.call, name)
+
 
 if __name__ == '__main__':
-    client = DamnServiceClient()
+    client = DamnServiceClient(sys.argv[1:])
     while True:
         try:
             #client.ping()
@@ -68,11 +327,7 @@ if __name__ == '__main__':
         except Thrift.TApplicationException as tae:
             print('while TApplicationException', tae)
         except TTransport.TTransportException as wtte:
-            import traceback
-            #traceback.print_exc()
             print('while TTransport', wtte)
-        except socket.error as wserr:
-            import traceback
-            #traceback.print_exc()
-            print('while socket', wserr)
-            client = DamnServiceClient()
+        except DamnServiceClientException as dsce:
+            print('while connecting', dsce)
+            time.sleep(1)
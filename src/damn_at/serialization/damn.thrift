@@ -11,14 +11,192 @@ exception TranscoderException {
   1: string msg
 }
 
+/**
+ * The server is saturated, the call was not started and can be retried.
+ */
+exception ServerBusyException {
+  1: string msg,
+  2: i32 retry_after_ms
+}
+
+/**
+ * The call did not finish before its deadline.
+ */
+exception DeadlineExceededException {
+  1: string msg
+}
+
+/**
+ * The server has no FileDescription for the file, it has to be uploaded.
+ */
+exception UnknownFileException {
+  1: string msg
+}
+
+/**
+ * Blocks the server needs to rebuild a file.
+ */
+exception MissingBlocksException {
+  1: string msg,
+  2: list<string> block_hashes
+}
+
+exception UploadException {
+  1: string msg
+}
+
+/**
+ * The outcome of one item of a batch call, either the result or an error.
+ * retryable: the item failed because the server was busy or out of time.
+ */
+struct AnalyzeResult {
+  1: optional damn_types.FileDescription file_description,
+  2: optional string error,
+  3: optional bool retryable
+}
+
+struct TranscodeRequest {
+  1: list<damn_types.File> files,
+  2: damn_types.AssetId asset,
+  3: Mimetype mimetype,
+  4: map<string, string> options
+}
+
+struct TranscodeResult {
+  1: optional list<damn_types.File> files,
+  2: optional string error,
+  3: optional bool retryable
+}
+
+enum JobState {
+  QUEUED = 1,
+  RUNNING = 2,
+  DONE = 3,
+  FAILED = 4,
+  CANCELLED = 5
+}
+
+/**
+ * Times are seconds since the epoch.
+ */
+struct JobStatus {
+  1: string job_id,
+  2: JobState state,
+  3: i32 priority,
+  4: i32 attempts,
+  5: double created,
+  6: optional double started,
+  7: optional double finished,
+  8: optional string error
+}
+
+exception UnknownJobException {
+  1: string msg
+}
+
+/**
+ * The job has no result (yet), see state.
+ */
+exception JobException {
+  1: string msg,
+  2: JobState state
+}
+
 service DamnService {
     void ping(),
     
+    /**
+     * The statistics of the serving process as JSON: call counts and latency
+     * percentiles per method, pool utilization and queue depth, cache hit
+     * rates and time spent in subprocesses, see damn_at.stats.
+     */
+    string get_stats(),
+    
     list<Mimetype> get_supported_mimetypes(),
     
     map<Mimetype, list<damn_types.TargetMimetype>> get_target_mimetypes(),
     
-    damn_types.FileDescription analyze(1:damn_types.File file) throws (1:AnalyzerException ae),
+    /**
+     * Return the stored FileDescription of the file with the given sha1 hash
+     * and size without uploading it. Call analyze() on UnknownFileException.
+     */
+    damn_types.FileDescription analyze_hash(1:string hash, 2:i64 size) throws (1:UnknownFileException ufe),
+    
+    /**
+     * timeout_ms: the deadline of the call, 0 for the server's default.
+     */
+    damn_types.FileDescription analyze(1:damn_types.File file, 2:i32 timeout_ms) throws (1:AnalyzerException ae, 2:ServerBusyException sbe, 3:DeadlineExceededException dee),
+    
+    /**
+     * Block deduplicated upload, see damn_at.bld: return which of the given
+     * block hashes the server doesn't have.
+     */
+    list<string> missing_blocks(1:list<string> block_hashes),
+    
+    /**
+     * Store blocks, keyed by the sha1 hexdigest of their content.
+     */
+    void upload_blocks(1:map<string, binary> blocks) throws (1:UploadException ue),
+    
+    /**
+     * Rebuild a file from its blocks and analyze it.
+     * hash: the sha1 hexdigest of the whole file.
+     * block_hashes: the hashes of the file's blocks in order.
+     */
+    damn_types.FileDescription analyze_blocks(1:string filename, 2:string hash, 3:list<string> block_hashes, 4:i32 timeout_ms) throws (1:AnalyzerException ae, 2:ServerBusyException sbe, 3:DeadlineExceededException dee, 4:MissingBlocksException mbe),
+    
+    /**
+     * Batch variants of analyze and transcode, the items are spread over the
+     * worker pool and the results returned in the order of the items.
+     */
+    list<AnalyzeResult> analyze_many(1:list<damn_types.File> files, 2:i32 timeout_ms),
+    
+    list<TranscodeResult> transcode_many(1:list<TranscodeRequest> requests, 2:i32 timeout_ms),
+    
+    /**
+     * Queue a transcode as a job, returns the job id. Jobs with a higher
+     * priority run first, jobs survive a restart of the server.
+     */
+    string submit_transcode(1:TranscodeRequest request, 2:i32 priority),
+    
+    JobStatus job_status(1:string job_id) throws (1:UnknownJobException uje),
+    
+    list<damn_types.File> job_result(1:string job_id) throws (1:UnknownJobException uje, 2:JobException je),
+    
+    /**
+     * Returns false if the job had already finished. A running job is not
+     * interrupted, it runs to completion and its result is discarded.
+     */
+    bool cancel_job(1:string job_id) throws (1:UnknownJobException uje),
+    
+    /**
+     * The most recent jobs, in the given state, or all when state is unset.
+     */
+    list<JobStatus> list_jobs(1:JobState state, 2:i32 limit),
+    
+    /**
+     * Chunked upload: spool a large file to disk on the server.
+     * Returns the id of the upload.
+     */
+    string open_upload(1:string filename),
+    
+    /**
+     * Append data at offset, returns the size of the upload so far.
+     * Appending a chunk again (after a retry) is harmless.
+     */
+    i64 append_upload(1:string upload_id, 2:i64 offset, 3:binary data) throws (1:UploadException ue),
+    
+    /**
+     * Finish the upload and analyze the spooled file.
+     * hash: the sha1 hexdigest of the file to verify it, or empty.
+     */
+    damn_types.FileDescription commit_upload(1:string upload_id, 2:string hash, 3:i32 timeout_ms) throws (1:AnalyzerException ae, 2:ServerBusyException sbe, 3:DeadlineExceededException dee, 4:UploadException ue),
+    
+    void abort_upload(1:string upload_id),
     
-    list<damn_types.File> transcode(1:list<damn_types.File> files, 2:damn_types.AssetId asset, 3:Mimetype mimetype, 4:map<string, string> options) throws (1:TranscoderException te)
+    /**
+     * files: the file containing the asset first, followed by the files it references.
+     * timeout_ms: the deadline of the call, 0 for the server's default.
+     */
+    list<damn_types.File> transcode(1:list<damn_types.File> files, 2:damn_types.AssetId asset, 3:Mimetype mimetype, 4:map<string, string> options, 5:i32 timeout_ms) throws (1:TranscoderException te, 2:ServerBusyException sbe, 3:DeadlineExceededException dee)
 }
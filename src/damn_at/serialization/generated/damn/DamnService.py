@@ -21,26 +21,148 @@ class Iface:
   def ping(self, ):
     pass
 
+  def get_stats(self, ):
+    pass
+
   def get_supported_mimetypes(self, ):
     pass
 
   def get_target_mimetypes(self, ):
     pass
 
-  def analyze(self, file):
+  def analyze_hash(self, hash, size):
+    """
+    Parameters:
+     - hash
+     - size
+    """
+    pass
+
+  def analyze(self, file, timeout_ms):
     """
     Parameters:
      - file
+     - timeout_ms
+    """
+    pass
+
+  def missing_blocks(self, block_hashes):
+    """
+    Parameters:
+     - block_hashes
+    """
+    pass
+
+  def upload_blocks(self, blocks):
+    """
+    Parameters:
+     - blocks
+    """
+    pass
+
+  def analyze_blocks(self, filename, hash, block_hashes, timeout_ms):
+    """
+    Parameters:
+     - filename
+     - hash
+     - block_hashes
+     - timeout_ms
+    """
+    pass
+
+  def analyze_many(self, files, timeout_ms):
+    """
+    Parameters:
+     - files
+     - timeout_ms
+    """
+    pass
+
+  def transcode_many(self, requests, timeout_ms):
+    """
+    Parameters:
+     - requests
+     - timeout_ms
+    """
+    pass
+
+  def submit_transcode(self, request, priority):
+    """
+    Parameters:
+     - request
+     - priority
+    """
+    pass
+
+  def job_status(self, job_id):
+    """
+    Parameters:
+     - job_id
+    """
+    pass
+
+  def job_result(self, job_id):
+    """
+    Parameters:
+     - job_id
+    """
+    pass
+
+  def cancel_job(self, job_id):
+    """
+    Parameters:
+     - job_id
+    """
+    pass
+
+  def list_jobs(self, state, limit):
+    """
+    Parameters:
+     - state
+     - limit
+    """
+    pass
+
+  def open_upload(self, filename):
+    """
+    Parameters:
+     - filename
+    """
+    pass
+
+  def append_upload(self, upload_id, offset, data):
+    """
+    Parameters:
+     - upload_id
+     - offset
+     - data
+    """
+    pass
+
+  def commit_upload(self, upload_id, hash, timeout_ms):
+    """
+    Parameters:
+     - upload_id
+     - hash
+     - timeout_ms
+    """
+    pass
+
+  def abort_upload(self, upload_id):
+    """
+    Parameters:
+     - upload_id
     """
     pass
 
-  def transcode(self, files, asset, mimetype, options):
+  def transcode(self, files, asset, mimetype, options, timeout_ms):
     """
     Parameters:
      - files
      - asset
      - mimetype
      - options
+     - timeout_ms
     """
     pass
 
@@ -75,6 +197,31 @@ class Client(Iface):
     self._iprot.readMessageEnd()
     return
 
+  def get_stats(self, ):
+    self.send_get_stats()
+    return self.recv_get_stats()
+
+  def send_get_stats(self, ):
+    self._oprot.writeMessageBegin('get_stats', TMessageType.CALL, self._seqid)
+    args = get_stats_args()
+    args.write(self._oprot)
+    self._oprot.writeMessageEnd()
+    self._oprot.trans.flush()
+
+  def recv_get_stats(self, ):
+    (fname, mtype, rseqid) = self._iprot.readMessageBegin()
+    if mtype == TMessageType.EXCEPTION:
+      x = TApplicationException()
+      x.read(self._iprot)
+      self._iprot.readMessageEnd()
+      raise x
+    result = get_stats_result()
+    result.read(self._iprot)
+    self._iprot.readMessageEnd()
+    if result.success is not None:
+      return result.success
+    raise TApplicationException(TApplicationException.MISSING_RESULT, "get_stats failed: unknown result");
+
   def get_supported_mimetypes(self, ):
     self.send_get_supported_mimetypes()
     return self.recv_get_supported_mimetypes()
@@ -125,18 +272,54 @@ class Client(Iface):
       return result.success
     raise TApplicationException(TApplicationException.MISSING_RESULT, "get_target_mimetypes failed: unknown result");
 
-  def analyze(self, file):
+  def analyze_hash(self, hash, size):
+    """
+    Parameters:
+     - hash
+     - size
+    """
+    self.send_analyze_hash(hash, size)
+    return self.recv_analyze_hash()
+
+  def send_analyze_hash(self, hash, size):
+    self._oprot.writeMessageBegin('analyze_hash', TMessageType.CALL, self._seqid)
+    args = analyze_hash_args()
+    args.hash = hash
+    args.size = size
+    args.write(self._oprot)
+    self._oprot.writeMessageEnd()
+    self._oprot.trans.flush()
+
+  def recv_analyze_hash(self, ):
+    (fname, mtype, rseqid) = self._iprot.readMessageBegin()
+    if mtype == TMessageType.EXCEPTION:
+      x = TApplicationException()
+      x.read(self._iprot)
+      self._iprot.readMessageEnd()
+      raise x
+    result = analyze_hash_result()
+    result.read(self._iprot)
+    self._iprot.readMessageEnd()
+    if result.success is not None:
+      return result.success
+    if result.ufe is not None:
+      raise result.ufe
+    raise TApplicationException(TApplicationException.MISSING_RESULT, "analyze_hash failed: unknown result");
+
+  def analyze(self, file, timeout_ms):
     """
     Parameters:
      - file
+     - timeout_ms
     """
-    self.send_analyze(file)
+    self.send_analyze(file, timeout_ms)
     return self.recv_analyze()
 
-  def send_analyze(self, file):
+  def send_analyze(self, file, timeout_ms):
     self._oprot.writeMessageBegin('analyze', TMessageType.CALL, self._seqid)
     args = analyze_args()
     args.file = file
+    args.timeout_ms = timeout_ms
     args.write(self._oprot)
     self._oprot.writeMessageEnd()
     self._oprot.trans.flush()
@@ -155,141 +338,2929 @@ class Client(Iface):
       return result.success
     if result.ae is not None:
       raise result.ae
+    if result.sbe is not None:
+      raise result.sbe
+    if result.dee is not None:
+      raise result.dee
     raise TApplicationException(TApplicationException.MISSING_RESULT, "analyze failed: unknown result");
 
-  def transcode(self, files, asset, mimetype, options):
+  def missing_blocks(self, block_hashes):
     """
     Parameters:
-     - files
-     - asset
-     - mimetype
-     - options
+     - block_hashes
     """
-    self.send_transcode(files, asset, mimetype, options)
-    return self.recv_transcode()
+    self.send_missing_blocks(block_hashes)
+    return self.recv_missing_blocks()
 
-  def send_transcode(self, files, asset, mimetype, options):
-    self._oprot.writeMessageBegin('transcode', TMessageType.CALL, self._seqid)
-    args = transcode_args()
-    args.files = files
-    args.asset = asset
-    args.mimetype = mimetype
-    args.options = options
+  def send_missing_blocks(self, block_hashes):
+    self._oprot.writeMessageBegin('missing_blocks', TMessageType.CALL, self._seqid)
+    args = missing_blocks_args()
+    args.block_hashes = block_hashes
     args.write(self._oprot)
     self._oprot.writeMessageEnd()
     self._oprot.trans.flush()
 
-  def recv_transcode(self, ):
+  def recv_missing_blocks(self, ):
     (fname, mtype, rseqid) = self._iprot.readMessageBegin()
     if mtype == TMessageType.EXCEPTION:
       x = TApplicationException()
       x.read(self._iprot)
       self._iprot.readMessageEnd()
       raise x
-    result = transcode_result()
+    result = missing_blocks_result()
     result.read(self._iprot)
     self._iprot.readMessageEnd()
     if result.success is not None:
       return result.success
-    if result.te is not None:
-      raise result.te
-    raise TApplicationException(TApplicationException.MISSING_RESULT, "transcode failed: unknown result");
+    raise TApplicationException(TApplicationException.MISSING_RESULT, "missing_blocks failed: unknown result");
 
+  def upload_blocks(self, blocks):
+    """
+    Parameters:
+     - blocks
+    """
+    self.send_upload_blocks(blocks)
+    self.recv_upload_blocks()
 
-class Processor(Iface, TProcessor):
-  def __init__(self, handler):
-    self._handler = handler
-    self._processMap = {}
-    self._processMap["ping"] = Processor.process_ping
-    self._processMap["get_supported_mimetypes"] = Processor.process_get_supported_mimetypes
-    self._processMap["get_target_mimetypes"] = Processor.process_get_target_mimetypes
-    self._processMap["analyze"] = Processor.process_analyze
-    self._processMap["transcode"] = Processor.process_transcode
+  def send_upload_blocks(self, blocks):
+    self._oprot.writeMessageBegin('upload_blocks', TMessageType.CALL, self._seqid)
+    args = upload_blocks_args()
+    args.blocks = blocks
+    args.write(self._oprot)
+    self._oprot.writeMessageEnd()
+    self._oprot.trans.flush()
 
-  def process(self, iprot, oprot):
-    (name, type, seqid) = iprot.readMessageBegin()
-    if name not in self._processMap:
-      iprot.skip(TType.STRUCT)
-      iprot.readMessageEnd()
-      x = TApplicationException(TApplicationException.UNKNOWN_METHOD, 'Unknown function %s' % (name))
-      oprot.writeMessageBegin(name, TMessageType.EXCEPTION, seqid)
-      x.write(oprot)
-      oprot.writeMessageEnd()
-      oprot.trans.flush()
-      return
-    else:
-      self._processMap[name](self, seqid, iprot, oprot)
-    return True
+  def recv_upload_blocks(self, ):
+    (fname, mtype, rseqid) = self._iprot.readMessageBegin()
+    if mtype == TMessageType.EXCEPTION:
+      x = TApplicationException()
+      x.read(self._iprot)
+      self._iprot.readMessageEnd()
+      raise x
+    result = upload_blocks_result()
+    result.read(self._iprot)
+    self._iprot.readMessageEnd()
+    if result.ue is not None:
+      raise result.ue
+    return
 
-  def process_ping(self, seqid, iprot, oprot):
-    args = ping_args()
-    args.read(iprot)
-    iprot.readMessageEnd()
-    result = ping_result()
-    self._handler.ping()
-    oprot.writeMessageBegin("ping", TMessageType.REPLY, seqid)
-    result.write(oprot)
-    oprot.writeMessageEnd()
-    oprot.trans.flush()
+  def analyze_blocks(self, filename, hash, block_hashes, timeout_ms):
+    """
+    Parameters:
+     - filename
+     - hash
+     - block_hashes
+     - timeout_ms
+    """
+    self.send_analyze_blocks(filename, hash, block_hashes, timeout_ms)
+    return self.recv_analyze_blocks()
+
+  def send_analyze_blocks(self, filename, hash, block_hashes, timeout_ms):
+    self._oprot.writeMessageBegin('analyze_blocks', TMessageType.CALL, self._seqid)
+    args = analyze_blocks_args()
+    args.filename = filename
+    args.hash = hash
+    args.block_hashes = block_hashes
+    args.timeout_ms = timeout_ms
+    args.write(self._oprot)
+    self._oprot.writeMessageEnd()
+    self._oprot.trans.flush()
 
-  def process_get_supported_mimetypes(self, seqid, iprot, oprot):
-    args = get_supported_mimetypes_args()
-    args.read(iprot)
-    iprot.readMessageEnd()
-    result = get_supported_mimetypes_result()
-    result.success = self._handler.get_supported_mimetypes()
-    oprot.writeMessageBegin("get_supported_mimetypes", TMessageType.REPLY, seqid)
-    result.write(oprot)
-    oprot.writeMessageEnd()
-    oprot.trans.flush()
+  def recv_analyze_blocks(self, ):
+    (fname, mtype, rseqid) = self._iprot.readMessageBegin()
+    if mtype == TMessageType.EXCEPTION:
+      x = TApplicationException()
+      x.read(self._iprot)
+      self._iprot.readMessageEnd()
+      raise x
+    result = analyze_blocks_result()
+    result.read(self._iprot)
+    self._iprot.readMessageEnd()
+    if result.success is not None:
+      return result.success
+    if result.ae is not None:
+      raise result.ae
+    if result.sbe is not None:
+      raise result.sbe
+    if result.dee is not None:
+      raise result.dee
+    if result.mbe is not None:
+      raise result.mbe
+    raise TApplicationException(TApplicationException.MISSING_RESULT, "analyze_blocks failed: unknown result");
+
+  def analyze_many(self, files, timeout_ms):
+    """
+    Parameters:
+     - files
+     - timeout_ms
+    """
+    self.send_analyze_many(files, timeout_ms)
+    return self.recv_analyze_many()
 
-  def process_get_target_mimetypes(self, seqid, iprot, oprot):
-    args = get_target_mimetypes_args()
-    args.read(iprot)
-    iprot.readMessageEnd()
-    result = get_target_mimetypes_result()
-    result.success = self._handler.get_target_mimetypes()
-    oprot.writeMessageBegin("get_target_mimetypes", TMessageType.REPLY, seqid)
-    result.write(oprot)
-    oprot.writeMessageEnd()
-    oprot.trans.flush()
+  def send_analyze_many(self, files, timeout_ms):
+    self._oprot.writeMessageBegin('analyze_many', TMessageType.CALL, self._seqid)
+    args = analyze_many_args()
+    args.files = files
+    args.timeout_ms = timeout_ms
+    args.write(self._oprot)
+    self._oprot.writeMessageEnd()
+    self._oprot.trans.flush()
 
-  def process_analyze(self, seqid, iprot, oprot):
-    args = analyze_args()
-    args.read(iprot)
-    iprot.readMessageEnd()
-    result = analyze_result()
-    try:
-      result.success = self._handler.analyze(args.file)
-    except AnalyzerException as ae:
-      result.ae = ae
-    oprot.writeMessageBegin("analyze", TMessageType.REPLY, seqid)
-    result.write(oprot)
-    oprot.writeMessageEnd()
-    oprot.trans.flush()
+  def recv_analyze_many(self, ):
+    (fname, mtype, rseqid) = self._iprot.readMessageBegin()
+    if mtype == TMessageType.EXCEPTION:
+      x = TApplicationException()
+      x.read(self._iprot)
+      self._iprot.readMessageEnd()
+      raise x
+    result = analyze_many_result()
+    result.read(self._iprot)
+    self._iprot.readMessageEnd()
+    if result.success is not None:
+      return result.success
+    raise TApplicationException(TApplicationException.MISSING_RESULT, "analyze_many failed: unknown result");
 
-  def process_transcode(self, seqid, iprot, oprot):
-    args = transcode_args()
-    args.read(iprot)
-    iprot.readMessageEnd()
-    result = transcode_result()
-    try:
-      result.success = self._handler.transcode(args.files, args.asset, args.mimetype, args.options)
-    except TranscoderException as te:
-      result.te = te
-    oprot.writeMessageBegin("transcode", TMessageType.REPLY, seqid)
-    result.write(oprot)
-    oprot.writeMessageEnd()
-    oprot.trans.flush()
+  def transcode_many(self, requests, timeout_ms):
+    """
+    Parameters:
+     - requests
+     - timeout_ms
+    """
+    self.send_transcode_many(requests, timeout_ms)
+    return self.recv_transcode_many()
+
+  def send_transcode_many(self, requests, timeout_ms):
+    self._oprot.writeMessageBegin('transcode_many', TMessageType.CALL, self._seqid)
+    args = transcode_many_args()
+    args.requests = requests
+    args.timeout_ms = timeout_ms
+    args.write(self._oprot)
+    self._oprot.writeMessageEnd()
+    self._oprot.trans.flush()
+
+  def recv_transcode_many(self, ):
+    (fname, mtype, rseqid) = self._iprot.readMessageBegin()
+    if mtype == TMessageType.EXCEPTION:
+      x = TApplicationException()
+      x.read(self._iprot)
+      self._iprot.readMessageEnd()
+      raise x
+    result = transcode_many_result()
+    result.read(self._iprot)
+    self._iprot.readMessageEnd()
+    if result.success is not None:
+      return result.success
+    raise TApplicationException(TApplicationException.MISSING_RESULT, "transcode_many failed: unknown result");
+
+  def submit_transcode(self, request, priority):
+    """
+    Parameters:
+     - request
+     - priority
+    """
+    self.send_submit_transcode(request, priority)
+    return self.recv_submit_transcode()
+
+  def send_submit_transcode(self, request, priority):
+    self._oprot.writeMessageBegin('submit_transcode', TMessageType.CALL, self._seqid)
+    args = submit_transcode_args()
+    args.request = request
+    args.priority = priority
+    args.write(self._oprot)
+    self._oprot.writeMessageEnd()
+    self._oprot.trans.flush()
+
+  def recv_submit_transcode(self, ):
+    (fname, mtype, rseqid) = self._iprot.readMessageBegin()
+    if mtype == TMessageType.EXCEPTION:
+      x = TApplicationException()
+      x.read(self._iprot)
+      self._iprot.readMessageEnd()
+      raise x
+    result = submit_transcode_result()
+    result.read(self._iprot)
+    self._iprot.readMessageEnd()
+    if result.success is not None:
+      return result.success
+    raise TApplicationException(TApplicationException.MISSING_RESULT, "submit_transcode failed: unknown result");
+
+  def job_status(self, job_id):
+    """
+    Parameters:
+     - job_id
+    """
+    self.send_job_status(job_id)
+    return self.recv_job_status()
+
+  def send_job_status(self, job_id):
+    self._oprot.writeMessageBegin('job_status', TMessageType.CALL, self._seqid)
+    args = job_status_args()
+    args.job_id = job_id
+    args.write(self._oprot)
+    self._oprot.writeMessageEnd()
+    self._oprot.trans.flush()
+
+  def recv_job_status(self, ):
+    (fname, mtype, rseqid) = self._iprot.readMessageBegin()
+    if mtype == TMessageType.EXCEPTION:
+      x = TApplicationException()
+      x.read(self._iprot)
+      self._iprot.readMessageEnd()
+      raise x
+    result = job_status_result()
+    result.read(self._iprot)
+    self._iprot.readMessageEnd()
+    if result.success is not None:
+      return result.success
+    if result.uje is not None:
+      raise result.uje
+    raise TApplicationException(TApplicationException.MISSING_RESULT, "job_status failed: unknown result");
+
+  def job_result(self, job_id):
+    """
+    Parameters:
+     - job_id
+    """
+    self.send_job_result(job_id)
+    return self.recv_job_result()
+
+  def send_job_result(self, job_id):
+    self._oprot.writeMessageBegin('job_result', TMessageType.CALL, self._seqid)
+    args = job_result_args()
+    args.job_id = job_id
+    args.write(self._oprot)
+    self._oprot.writeMessageEnd()
+    self._oprot.trans.flush()
+
+  def recv_job_result(self, ):
+    (fname, mtype, rseqid) = self._iprot.readMessageBegin()
+    if mtype == TMessageType.EXCEPTION:
+      x = TApplicationException()
+      x.read(self._iprot)
+      self._iprot.readMessageEnd()
+      raise x
+    result = job_result_result()
+    result.read(self._iprot)
+    self._iprot.readMessageEnd()
+    if result.success is not None:
+      return result.success
+    if result.uje is not None:
+      raise result.uje
+    if result.je is not None:
+      raise result.je
+    raise TApplicationException(TApplicationException.MISSING_RESULT, "job_result failed: unknown result");
+
+  def cancel_job(self, job_id):
+    """
+    Parameters:
+     - job_id
+    """
+    self.send_cancel_job(job_id)
+    return self.recv_cancel_job()
+
+  def send_cancel_job(self, job_id):
+    self._oprot.writeMessageBegin('cancel_job', TMessageType.CALL, self._seqid)
+    args = cancel_job_args()
+    args.job_id = job_id
+    args.write(self._oprot)
+    self._oprot.writeMessageEnd()
+    self._oprot.trans.flush()
+
+  def recv_cancel_job(self, ):
+    (fname, mtype, rseqid) = self._iprot.readMessageBegin()
+    if mtype == TMessageType.EXCEPTION:
+      x = TApplicationException()
+      x.read(self._iprot)
+      self._iprot.readMessageEnd()
+      raise x
+    result = cancel_job_result()
+    result.read(self._iprot)
+    self._iprot.readMessageEnd()
+    if result.success is not None:
+      return result.success
+    if result.uje is not None:
+      raise result.uje
+    raise TApplicationException(TApplicationException.MISSING_RESULT, "cancel_job failed: unknown result");
+
+  def list_jobs(self, state, limit):
+    """
+    Parameters:
+     - state
+     - limit
+    """
+    self.send_list_jobs(state, limit)
+    return self.recv_list_jobs()
+
+  def send_list_jobs(self, state, limit):
+    self._oprot.writeMessageBegin('list_jobs', TMessageType.CALL, self._seqid)
+    args = list_jobs_args()
+    args.state = state
+    args.limit = limit
+    args.write(self._oprot)
+    self._oprot.writeMessageEnd()
+    self._oprot.trans.flush()
+
+  def recv_list_jobs(self, ):
+    (fname, mtype, rseqid) = self._iprot.readMessageBegin()
+    if mtype == TMessageType.EXCEPTION:
+      x = TApplicationException()
+      x.read(self._iprot)
+      self._iprot.readMessageEnd()
+      raise x
+    result = list_jobs_result()
+    result.read(self._iprot)
+    self._iprot.readMessageEnd()
+    if result.success is not None:
+      return result.success
+    raise TApplicationException(TApplicationException.MISSING_RESULT, "list_jobs failed: unknown result");
+
+  def open_upload(self, filename):
+    """
+    Parameters:
+     - filename
+    """
+    self.send_open_upload(filename)
+    return self.recv_open_upload()
+
+  def send_open_upload(self, filename):
+    self._oprot.writeMessageBegin('open_upload', TMessageType.CALL, self._seqid)
+    args = open_upload_args()
+    args.filename = filename
+    args.write(self._oprot)
+    self._oprot.writeMessageEnd()
+    self._oprot.trans.flush()
+
+  def recv_open_upload(self, ):
+    (fname, mtype, rseqid) = self._iprot.readMessageBegin()
+    if mtype == TMessageType.EXCEPTION:
+      x = TApplicationException()
+      x.read(self._iprot)
+      self._iprot.readMessageEnd()
+      raise x
+    result = open_upload_result()
+    result.read(self._iprot)
+    self._iprot.readMessageEnd()
+    if result.success is not None:
+      return result.success
+    raise TApplicationException(TApplicationException.MISSING_RESULT, "open_upload failed: unknown result");
+
+  def append_upload(self, upload_id, offset, data):
+    """
+    Parameters:
+     - upload_id
+     - offset
+     - data
+    """
+    self.send_append_upload(upload_id, offset, data)
+    return self.recv_append_upload()
+
+  def send_append_upload(self, upload_id, offset, data):
+    self._oprot.writeMessageBegin('append_upload', TMessageType.CALL, self._seqid)
+    args = append_upload_args()
+    args.upload_id = upload_id
+    args.offset = offset
+    args.data = data
+    args.write(self._oprot)
+    self._oprot.writeMessageEnd()
+    self._oprot.trans.flush()
+
+  def recv_append_upload(self, ):
+    (fname, mtype, rseqid) = self._iprot.readMessageBegin()
+    if mtype == TMessageType.EXCEPTION:
+      x = TApplicationException()
+      x.read(self._iprot)
+      self._iprot.readMessageEnd()
+      raise x
+    result = append_upload_result()
+    result.read(self._iprot)
+    self._iprot.readMessageEnd()
+    if result.success is not None:
+      return result.success
+    if result.ue is not None:
+      raise result.ue
+    raise TApplicationException(TApplicationException.MISSING_RESULT, "append_upload failed: unknown result");
+
+  def commit_upload(self, upload_id, hash, timeout_ms):
+    """
+    Parameters:
+     - upload_id
+     - hash
+     - timeout_ms
+    """
+    self.send_commit_upload(upload_id, hash, timeout_ms)
+    return self.recv_commit_upload()
+
+  def send_commit_upload(self, upload_id, hash, timeout_ms):
+    self._oprot.writeMessageBegin('commit_upload', TMessageType.CALL, self._seqid)
+    args = commit_upload_args()
+    args.upload_id = upload_id
+    args.hash = hash
+    args.timeout_ms = timeout_ms
+    args.write(self._oprot)
+    self._oprot.writeMessageEnd()
+    self._oprot.trans.flush()
+
+  def recv_commit_upload(self, ):
+    (fname, mtype, rseqid) = self._iprot.readMessageBegin()
+    if mtype == TMessageType.EXCEPTION:
+      x = TApplicationException()
+      x.read(self._iprot)
+      self._iprot.readMessageEnd()
+      raise x
+    result = commit_upload_result()
+    result.read(self._iprot)
+    self._iprot.readMessageEnd()
+    if result.success is not None:
+      return result.success
+    if result.ae is not None:
+      raise result.ae
+    if result.sbe is not None:
+      raise result.sbe
+    if result.dee is not None:
+      raise result.dee
+    if result.ue is not None:
+      raise result.ue
+    raise TApplicationException(TApplicationException.MISSING_RESULT, "commit_upload failed: unknown result");
+
+  def abort_upload(self, upload_id):
+    """
+    Parameters:
+     - upload_id
+    """
+    self.send_abort_upload(upload_id)
+    self.recv_abort_upload()
+
+  def send_abort_upload(self, upload_id):
+    self._oprot.writeMessageBegin('abort_upload', TMessageType.CALL, self._seqid)
+    args = abort_upload_args()
+    args.upload_id = upload_id
+    args.write(self._oprot)
+    self._oprot.writeMessageEnd()
+    self._oprot.trans.flush()
+
+  def recv_abort_upload(self, ):
+    (fname, mtype, rseqid) = self._iprot.readMessageBegin()
+    if mtype == TMessageType.EXCEPTION:
+      x = TApplicationException()
+      x.read(self._iprot)
+      self._iprot.readMessageEnd()
+      raise x
+    result = abort_upload_result()
+    result.read(self._iprot)
+    self._iprot.readMessageEnd()
+    return
+
+  def transcode(self, files, asset, mimetype, options, timeout_ms):
+    """
+    Parameters:
+     - files
+     - asset
+     - mimetype
+     - options
+     - timeout_ms
+    """
+    self.send_transcode(files, asset, mimetype, options, timeout_ms)
+    return self.recv_transcode()
+
+  def send_transcode(self, files, asset, mimetype, options, timeout_ms):
+    self._oprot.writeMessageBegin('transcode', TMessageType.CALL, self._seqid)
+    args = transcode_args()
+    args.files = files
+    args.asset = asset
+    args.mimetype = mimetype
+    args.options = options
+    args.timeout_ms = timeout_ms
+    args.write(self._oprot)
+    self._oprot.writeMessageEnd()
+    self._oprot.trans.flush()
+
+  def recv_transcode(self, ):
+    (fname, mtype, rseqid) = self._iprot.readMessageBegin()
+    if mtype == TMessageType.EXCEPTION:
+      x = TApplicationException()
+      x.read(self._iprot)
+      self._iprot.readMessageEnd()
+      raise x
+    result = transcode_result()
+    result.read(self._iprot)
+    self._iprot.readMessageEnd()
+    if result.success is not None:
+      return result.success
+    if result.te is not None:
+      raise result.te
+    if result.sbe is not None:
+      raise result.sbe
+    if result.dee is not None:
+      raise result.dee
+    raise TApplicationException(TApplicationException.MISSING_RESULT, "transcode failed: unknown result");
+
+
+class Processor(Iface, TProcessor):
+  def __init__(self, handler):
+    self._handler = handler
+    self._processMap = {}
+    self._processMap["ping"] = Processor.process_ping
+    self._processMap["get_stats"] = Processor.process_get_stats
+    self._processMap["get_supported_mimetypes"] = Processor.process_get_supported_mimetypes
+    self._processMap["get_target_mimetypes"] = Processor.process_get_target_mimetypes
+    self._processMap["analyze_hash"] = Processor.process_analyze_hash
+    self._processMap["analyze"] = Processor.process_analyze
+    self._processMap["missing_blocks"] = Processor.process_missing_blocks
+    self._processMap["upload_blocks"] = Processor.process_upload_blocks
+    self._processMap["analyze_blocks"] = Processor.process_analyze_blocks
+    self._processMap["analyze_many"] = Processor.process_analyze_many
+    self._processMap["transcode_many"] = Processor.process_transcode_many
+    self._processMap["submit_transcode"] = Processor.process_submit_transcode
+    self._processMap["job_status"] = Processor.process_job_status
+    self._processMap["job_result"] = Processor.process_job_result
+    self._processMap["cancel_job"] = Processor.process_cancel_job
+    self._processMap["list_jobs"] = Processor.process_list_jobs
+    self._processMap["open_upload"] = Processor.process_open_upload
+    self._processMap["append_upload"] = Processor.process_append_upload
+    self._processMap["commit_upload"] = Processor.process_commit_upload
+    self._processMap["abort_upload"] = Processor.process_abort_upload
+    self._processMap["transcode"] = Processor.process_transcode
+
+  def process(self, iprot, oprot):
+    (name, type, seqid) = iprot.readMessageBegin()
+    if name not in self._processMap:
+      iprot.skip(TType.STRUCT)
+      iprot.readMessageEnd()
+      x = TApplicationException(TApplicationException.UNKNOWN_METHOD, 'Unknown function %s' % (name))
+      oprot.writeMessageBegin(name, TMessageType.EXCEPTION, seqid)
+      x.write(oprot)
+      oprot.writeMessageEnd()
+      oprot.trans.flush()
+      return
+    else:
+      self._processMap[name](self, seqid, iprot, oprot)
+    return True
+
+  def process_ping(self, seqid, iprot, oprot):
+    args = ping_args()
+    args.read(iprot)
+    iprot.readMessageEnd()
+    result = ping_result()
+    self._handler.ping()
+    oprot.writeMessageBegin("ping", TMessageType.REPLY, seqid)
+    result.write(oprot)
+    oprot.writeMessageEnd()
+    oprot.trans.flush()
+
+  def process_get_stats(self, seqid, iprot, oprot):
+    args = get_stats_args()
+    args.read(iprot)
+    iprot.readMessageEnd()
+    result = get_stats_result()
+    result.success = self._handler.get_stats()
+    oprot.writeMessageBegin("get_stats", TMessageType.REPLY, seqid)
+    result.write(oprot)
+    oprot.writeMessageEnd()
+    oprot.trans.flush()
+
+  def process_get_supported_mimetypes(self, seqid, iprot, oprot):
+    args = get_supported_mimetypes_args()
+    args.read(iprot)
+    iprot.readMessageEnd()
+    result = get_supported_mimetypes_result()
+    result.success = self._handler.get_supported_mimetypes()
+    oprot.writeMessageBegin("get_supported_mimetypes", TMessageType.REPLY, seqid)
+    result.write(oprot)
+    oprot.writeMessageEnd()
+    oprot.trans.flush()
+
+  def process_get_target_mimetypes(self, seqid, iprot, oprot):
+    args = get_target_mimetypes_args()
+    args.read(iprot)
+    iprot.readMessageEnd()
+    result = get_target_mimetypes_result()
+    result.success = self._handler.get_target_mimetypes()
+    oprot.writeMessageBegin("get_target_mimetypes", TMessageType.REPLY, seqid)
+    result.write(oprot)
+    oprot.writeMessageEnd()
+    oprot.trans.flush()
+
+  def process_analyze_hash(self, seqid, iprot, oprot):
+    args = analyze_hash_args()
+    args.read(iprot)
+    iprot.readMessageEnd()
+    result = analyze_hash_result()
+    try:
+      result.success = self._handler.analyze_hash(args.hash, args.size)
+    except UnknownFileException as ufe:
+      result.ufe = ufe
+    oprot.writeMessageBegin("analyze_hash", TMessageType.REPLY, seqid)
+    result.write(oprot)
+    oprot.writeMessageEnd()
+    oprot.trans.flush()
+
+  def process_analyze(self, seqid, iprot, oprot):
+    args = analyze_args()
+    args.read(iprot)
+    iprot.readMessageEnd()
+    result = analyze_result()
+    try:
+      result.success = self._handler.analyze(args.file, args.timeout_ms)
+    except AnalyzerException as ae:
+      result.ae = ae
+    except ServerBusyException as sbe:
+      result.sbe = sbe
+    except DeadlineExceededException as dee:
+      result.dee = dee
+    oprot.writeMessageBegin("analyze", TMessageType.REPLY, seqid)
+    result.write(oprot)
+    oprot.writeMessageEnd()
+    oprot.trans.flush()
+
+  def process_missing_blocks(self, seqid, iprot, oprot):
+    args = missing_blocks_args()
+    args.read(iprot)
+    iprot.readMessageEnd()
+    result = missing_blocks_result()
+    result.success = self._handler.missing_blocks(args.block_hashes)
+    oprot.writeMessageBegin("missing_blocks", TMessageType.REPLY, seqid)
+    result.write(oprot)
+    oprot.writeMessageEnd()
+    oprot.trans.flush()
+
+  def process_upload_blocks(self, seqid, iprot, oprot):
+    args = upload_blocks_args()
+    args.read(iprot)
+    iprot.readMessageEnd()
+    result = upload_blocks_result()
+    try:
+      self._handler.upload_blocks(args.blocks)
+    except UploadException as ue:
+      result.ue = ue
+    oprot.writeMessageBegin("upload_blocks", TMessageType.REPLY, seqid)
+    result.write(oprot)
+    oprot.writeMessageEnd()
+    oprot.trans.flush()
+
+  def process_analyze_blocks(self, seqid, iprot, oprot):
+    args = analyze_blocks_args()
+    args.read(iprot)
+    iprot.readMessageEnd()
+    result = analyze_blocks_result()
+    try:
+      result.success = self._handler.analyze_blocks(args.filename, args.hash, args.block_hashes, args.timeout_ms)
+    except AnalyzerException as ae:
+      result.ae = ae
+    except ServerBusyException as sbe:
+      result.sbe = sbe
+    except DeadlineExceededException as dee:
+      result.dee = dee
+    except MissingBlocksException as mbe:
+      result.mbe = mbe
+    oprot.writeMessageBegin("analyze_blocks", TMessageType.REPLY, seqid)
+    result.write(oprot)
+    oprot.writeMessageEnd()
+    oprot.trans.flush()
+
+  def process_analyze_many(self, seqid, iprot, oprot):
+    args = analyze_many_args()
+    args.read(iprot)
+    iprot.readMessageEnd()
+    result = analyze_many_result()
+    result.success = self._handler.analyze_many(args.files, args.timeout_ms)
+    oprot.writeMessageBegin("analyze_many", TMessageType.REPLY, seqid)
+    result.write(oprot)
+    oprot.writeMessageEnd()
+    oprot.trans.flush()
+
+  def process_transcode_many(self, seqid, iprot, oprot):
+    args = transcode_many_args()
+    args.read(iprot)
+    iprot.readMessageEnd()
+    result = transcode_many_result()
+    result.success = self._handler.transcode_many(args.requests, args.timeout_ms)
+    oprot.writeMessageBegin("transcode_many", TMessageType.REPLY, seqid)
+    result.write(oprot)
+    oprot.writeMessageEnd()
+    oprot.trans.flush()
+
+  def process_submit_transcode(self, seqid, iprot, oprot):
+    args = submit_transcode_args()
+    args.read(iprot)
+    iprot.readMessageEnd()
+    result = submit_transcode_result()
+    result.success = self._handler.submit_transcode(args.request, args.priority)
+    oprot.writeMessageBegin("submit_transcode", TMessageType.REPLY, seqid)
+    result.write(oprot)
+    oprot.writeMessageEnd()
+    oprot.trans.flush()
+
+  def process_job_status(self, seqid, iprot, oprot):
+    args = job_status_args()
+    args.read(iprot)
+    iprot.readMessageEnd()
+    result = job_status_result()
+    try:
+      result.success = self._handler.job_status(args.job_id)
+    except UnknownJobException as uje:
+      result.uje = uje
+    oprot.writeMessageBegin("job_status", TMessageType.REPLY, seqid)
+    result.write(oprot)
+    oprot.writeMessageEnd()
+    oprot.trans.flush()
+
+  def process_job_result(self, seqid, iprot, oprot):
+    args = job_result_args()
+    args.read(iprot)
+    iprot.readMessageEnd()
+    result = job_result_result()
+    try:
+      result.success = self._handler.job_result(args.job_id)
+    except UnknownJobException as uje:
+      result.uje = uje
+    except JobException as je:
+      result.je = je
+    oprot.writeMessageBegin("job_result", TMessageType.REPLY, seqid)
+    result.write(oprot)
+    oprot.writeMessageEnd()
+    oprot.trans.flush()
+
+  def process_cancel_job(self, seqid, iprot, oprot):
+    args = cancel_job_args()
+    args.read(iprot)
+    iprot.readMessageEnd()
+    result = cancel_job_result()
+    try:
+      result.success = self._handler.cancel_job(args.job_id)
+    except UnknownJobException as uje:
+      result.uje = uje
+    oprot.writeMessageBegin("cancel_job", TMessageType.REPLY, seqid)
+    result.write(oprot)
+    oprot.writeMessageEnd()
+    oprot.trans.flush()
+
+  def process_list_jobs(self, seqid, iprot, oprot):
+    args = list_jobs_args()
+    args.read(iprot)
+    iprot.readMessageEnd()
+    result = list_jobs_result()
+    result.success = self._handler.list_jobs(args.state, args.limit)
+    oprot.writeMessageBegin("list_jobs", TMessageType.REPLY, seqid)
+    result.write(oprot)
+    oprot.writeMessageEnd()
+    oprot.trans.flush()
+
+  def process_open_upload(self, seqid, iprot, oprot):
+    args = open_upload_args()
+    args.read(iprot)
+    iprot.readMessageEnd()
+    result = open_upload_result()
+    result.success = self._handler.open_upload(args.filename)
+    oprot.writeMessageBegin("open_upload", TMessageType.REPLY, seqid)
+    result.write(oprot)
+    oprot.writeMessageEnd()
+    oprot.trans.flush()
+
+  def process_append_upload(self, seqid, iprot, oprot):
+    args = append_upload_args()
+    args.read(iprot)
+    iprot.readMessageEnd()
+    result = append_upload_result()
+    try:
+      result.success = self._handler.append_upload(args.upload_id, args.offset, args.data)
+    except UploadException as ue:
+      result.ue = ue
+    oprot.writeMessageBegin("append_upload", TMessageType.REPLY, seqid)
+    result.write(oprot)
+    oprot.writeMessageEnd()
+    oprot.trans.flush()
+
+  def process_commit_upload(self, seqid, iprot, oprot):
+    args = commit_upload_args()
+    args.read(iprot)
+    iprot.readMessageEnd()
+    result = commit_upload_result()
+    try:
+      result.success = self._handler.commit_upload(args.upload_id, args.hash, args.timeout_ms)
+    except AnalyzerException as ae:
+      result.ae = ae
+    except ServerBusyException as sbe:
+      result.sbe = sbe
+    except DeadlineExceededException as dee:
+      result.dee = dee
+    except UploadException as ue:
+      result.ue = ue
+    oprot.writeMessageBegin("commit_upload", TMessageType.REPLY, seqid)
+    result.write(oprot)
+    oprot.writeMessageEnd()
+    oprot.trans.flush()
+
+  def process_abort_upload(self, seqid, iprot, oprot):
+    args = abort_upload_args()
+    args.read(iprot)
+    iprot.readMessageEnd()
+    result = abort_upload_result()
+    self._handler.abort_upload(args.upload_id)
+    oprot.writeMessageBegin("abort_upload", TMessageType.REPLY, seqid)
+    result.write(oprot)
+    oprot.writeMessageEnd()
+    oprot.trans.flush()
+
+  def process_transcode(self, seqid, iprot, oprot):
+    args = transcode_args()
+    args.read(iprot)
+    iprot.readMessageEnd()
+    result = transcode_result()
+    try:
+      result.success = self._handler.transcode(args.files, args.asset, args.mimetype, args.options, args.timeout_ms)
+    except TranscoderException as te:
+      result.te = te
+    except ServerBusyException as sbe:
+      result.sbe = sbe
+    except DeadlineExceededException as dee:
+      result.dee = dee
+    oprot.writeMessageBegin("transcode", TMessageType.REPLY, seqid)
+    result.write(oprot)
+    oprot.writeMessageEnd()
+    oprot.trans.flush()
+
+
+# HELPER FUNCTIONS AND STRUCTURES
+
+class ping_args:
+
+  thrift_spec = (
+  )
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('ping_args')
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class ping_result:
+
+  thrift_spec = (
+  )
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('ping_result')
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class get_stats_args:
+
+  thrift_spec = (
+  )
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('get_stats_args')
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class get_stats_result:
+  """
+  Attributes:
+   - success
+  """
+
+  thrift_spec = (
+    (0, TType.STRING, 'success', None, None, ), # 0
+  )
+
+  def __init__(self, success=None,):
+    self.success = success
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 0:
+        if ftype == TType.STRING:
+          self.success = iprot.readString();
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('get_stats_result')
+    if self.success is not None:
+      oprot.writeFieldBegin('success', TType.STRING, 0)
+      oprot.writeString(self.success)
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class get_supported_mimetypes_args:
+
+  thrift_spec = (
+  )
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('get_supported_mimetypes_args')
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class get_supported_mimetypes_result:
+  """
+  Attributes:
+   - success
+  """
+
+  thrift_spec = (
+    (0, TType.LIST, 'success', (TType.STRING,None), None, ), # 0
+  )
+
+  def __init__(self, success=None,):
+    self.success = success
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 0:
+        if ftype == TType.LIST:
+          self.success = []
+          (_etype33, _size30) = iprot.readListBegin()
+          for _i34 in xrange(_size30):
+            _elem35 = iprot.readString();
+            self.success.append(_elem35)
+          iprot.readListEnd()
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('get_supported_mimetypes_result')
+    if self.success is not None:
+      oprot.writeFieldBegin('success', TType.LIST, 0)
+      oprot.writeListBegin(TType.STRING, len(self.success))
+      for iter36 in self.success:
+        oprot.writeString(iter36)
+      oprot.writeListEnd()
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class get_target_mimetypes_args:
+
+  thrift_spec = (
+  )
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('get_target_mimetypes_args')
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class get_target_mimetypes_result:
+  """
+  Attributes:
+   - success
+  """
+
+  thrift_spec = (
+    (0, TType.MAP, 'success', (TType.STRING,None,TType.LIST,(TType.STRUCT,(damn_types.ttypes.TargetMimetype, damn_types.ttypes.TargetMimetype.thrift_spec))), None, ), # 0
+  )
+
+  def __init__(self, success=None,):
+    self.success = success
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 0:
+        if ftype == TType.MAP:
+          self.success = {}
+          (_ktype38, _vtype39, _size37 ) = iprot.readMapBegin() 
+          for _i41 in xrange(_size37):
+            _key42 = iprot.readString();
+            _val43 = []
+            (_etype47, _size44) = iprot.readListBegin()
+            for _i48 in xrange(_size44):
+              _elem49 = damn_types.ttypes.TargetMimetype()
+              _elem49.read(iprot)
+              _val43.append(_elem49)
+            iprot.readListEnd()
+            self.success[_key42] = _val43
+          iprot.readMapEnd()
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('get_target_mimetypes_result')
+    if self.success is not None:
+      oprot.writeFieldBegin('success', TType.MAP, 0)
+      oprot.writeMapBegin(TType.STRING, TType.LIST, len(self.success))
+      for kiter50,viter51 in self.success.items():
+        oprot.writeString(kiter50)
+        oprot.writeListBegin(TType.STRUCT, len(viter51))
+        for iter52 in viter51:
+          iter52.write(oprot)
+        oprot.writeListEnd()
+      oprot.writeMapEnd()
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class analyze_hash_args:
+  """
+  Attributes:
+   - hash
+   - size
+  """
+
+  thrift_spec = (
+    None, # 0
+    (1, TType.STRING, 'hash', None, None, ), # 1
+    (2, TType.I64, 'size', None, None, ), # 2
+  )
+
+  def __init__(self, hash=None, size=None,):
+    self.hash = hash
+    self.size = size
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 1:
+        if ftype == TType.STRING:
+          self.hash = iprot.readString();
+        else:
+          iprot.skip(ftype)
+      elif fid == 2:
+        if ftype == TType.I64:
+          self.size = iprot.readI64();
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('analyze_hash_args')
+    if self.hash is not None:
+      oprot.writeFieldBegin('hash', TType.STRING, 1)
+      oprot.writeString(self.hash)
+      oprot.writeFieldEnd()
+    if self.size is not None:
+      oprot.writeFieldBegin('size', TType.I64, 2)
+      oprot.writeI64(self.size)
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class analyze_hash_result:
+  """
+  Attributes:
+   - success
+   - ufe
+  """
+
+  thrift_spec = (
+    (0, TType.STRUCT, 'success', (damn_types.ttypes.FileDescription, damn_types.ttypes.FileDescription.thrift_spec), None, ), # 0
+    (1, TType.STRUCT, 'ufe', (UnknownFileException, UnknownFileException.thrift_spec), None, ), # 1
+  )
+
+  def __init__(self, success=None, ufe=None,):
+    self.success = success
+    self.ufe = ufe
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 0:
+        if ftype == TType.STRUCT:
+          self.success = damn_types.ttypes.FileDescription()
+          self.success.read(iprot)
+        else:
+          iprot.skip(ftype)
+      elif fid == 1:
+        if ftype == TType.STRUCT:
+          self.ufe = UnknownFileException()
+          self.ufe.read(iprot)
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('analyze_hash_result')
+    if self.success is not None:
+      oprot.writeFieldBegin('success', TType.STRUCT, 0)
+      self.success.write(oprot)
+      oprot.writeFieldEnd()
+    if self.ufe is not None:
+      oprot.writeFieldBegin('ufe', TType.STRUCT, 1)
+      self.ufe.write(oprot)
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class analyze_args:
+  """
+  Attributes:
+   - file
+   - timeout_ms
+  """
+
+  thrift_spec = (
+    None, # 0
+    (1, TType.STRUCT, 'file', (damn_types.ttypes.File, damn_types.ttypes.File.thrift_spec), None, ), # 1
+    (2, TType.I32, 'timeout_ms', None, None, ), # 2
+  )
+
+  def __init__(self, file=None, timeout_ms=None,):
+    self.file = file
+    self.timeout_ms = timeout_ms
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 1:
+        if ftype == TType.STRUCT:
+          self.file = damn_types.ttypes.File()
+          self.file.read(iprot)
+        else:
+          iprot.skip(ftype)
+      elif fid == 2:
+        if ftype == TType.I32:
+          self.timeout_ms = iprot.readI32();
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('analyze_args')
+    if self.file is not None:
+      oprot.writeFieldBegin('file', TType.STRUCT, 1)
+      self.file.write(oprot)
+      oprot.writeFieldEnd()
+    if self.timeout_ms is not None:
+      oprot.writeFieldBegin('timeout_ms', TType.I32, 2)
+      oprot.writeI32(self.timeout_ms)
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class analyze_result:
+  """
+  Attributes:
+   - success
+   - ae
+   - sbe
+   - dee
+  """
+
+  thrift_spec = (
+    (0, TType.STRUCT, 'success', (damn_types.ttypes.FileDescription, damn_types.ttypes.FileDescription.thrift_spec), None, ), # 0
+    (1, TType.STRUCT, 'ae', (AnalyzerException, AnalyzerException.thrift_spec), None, ), # 1
+    (2, TType.STRUCT, 'sbe', (ServerBusyException, ServerBusyException.thrift_spec), None, ), # 2
+    (3, TType.STRUCT, 'dee', (DeadlineExceededException, DeadlineExceededException.thrift_spec), None, ), # 3
+  )
+
+  def __init__(self, success=None, ae=None, sbe=None, dee=None,):
+    self.success = success
+    self.ae = ae
+    self.sbe = sbe
+    self.dee = dee
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 0:
+        if ftype == TType.STRUCT:
+          self.success = damn_types.ttypes.FileDescription()
+          self.success.read(iprot)
+        else:
+          iprot.skip(ftype)
+      elif fid == 1:
+        if ftype == TType.STRUCT:
+          self.ae = AnalyzerException()
+          self.ae.read(iprot)
+        else:
+          iprot.skip(ftype)
+      elif fid == 2:
+        if ftype == TType.STRUCT:
+          self.sbe = ServerBusyException()
+          self.sbe.read(iprot)
+        else:
+          iprot.skip(ftype)
+      elif fid == 3:
+        if ftype == TType.STRUCT:
+          self.dee = DeadlineExceededException()
+          self.dee.read(iprot)
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('analyze_result')
+    if self.success is not None:
+      oprot.writeFieldBegin('success', TType.STRUCT, 0)
+      self.success.write(oprot)
+      oprot.writeFieldEnd()
+    if self.ae is not None:
+      oprot.writeFieldBegin('ae', TType.STRUCT, 1)
+      self.ae.write(oprot)
+      oprot.writeFieldEnd()
+    if self.sbe is not None:
+      oprot.writeFieldBegin('sbe', TType.STRUCT, 2)
+      self.sbe.write(oprot)
+      oprot.writeFieldEnd()
+    if self.dee is not None:
+      oprot.writeFieldBegin('dee', TType.STRUCT, 3)
+      self.dee.write(oprot)
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class missing_blocks_args:
+  """
+  Attributes:
+   - block_hashes
+  """
+
+  thrift_spec = (
+    None, # 0
+    (1, TType.LIST, 'block_hashes', (TType.STRING,None), None, ), # 1
+  )
+
+  def __init__(self, block_hashes=None,):
+    self.block_hashes = block_hashes
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 1:
+        if ftype == TType.LIST:
+          self.block_hashes = []
+          (_etype56, _size53) = iprot.readListBegin()
+          for _i57 in xrange(_size53):
+            _elem58 = iprot.readString();
+            self.block_hashes.append(_elem58)
+          iprot.readListEnd()
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('missing_blocks_args')
+    if self.block_hashes is not None:
+      oprot.writeFieldBegin('block_hashes', TType.LIST, 1)
+      oprot.writeListBegin(TType.STRING, len(self.block_hashes))
+      for iter59 in self.block_hashes:
+        oprot.writeString(iter59)
+      oprot.writeListEnd()
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class missing_blocks_result:
+  """
+  Attributes:
+   - success
+  """
+
+  thrift_spec = (
+    (0, TType.LIST, 'success', (TType.STRING,None), None, ), # 0
+  )
+
+  def __init__(self, success=None,):
+    self.success = success
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 0:
+        if ftype == TType.LIST:
+          self.success = []
+          (_etype63, _size60) = iprot.readListBegin()
+          for _i64 in xrange(_size60):
+            _elem65 = iprot.readString();
+            self.success.append(_elem65)
+          iprot.readListEnd()
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('missing_blocks_result')
+    if self.success is not None:
+      oprot.writeFieldBegin('success', TType.LIST, 0)
+      oprot.writeListBegin(TType.STRING, len(self.success))
+      for iter66 in self.success:
+        oprot.writeString(iter66)
+      oprot.writeListEnd()
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class upload_blocks_args:
+  """
+  Attributes:
+   - blocks
+  """
+
+  thrift_spec = (
+    None, # 0
+    (1, TType.MAP, 'blocks', (TType.STRING,None,TType.STRING,None), None, ), # 1
+  )
+
+  def __init__(self, blocks=None,):
+    self.blocks = blocks
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 1:
+        if ftype == TType.MAP:
+          self.blocks = {}
+          (_ktype68, _vtype69, _size67 ) = iprot.readMapBegin() 
+          for _i71 in xrange(_size67):
+            _key72 = iprot.readString();
+            _val73 = iprot.readString();
+            self.blocks[_key72] = _val73
+          iprot.readMapEnd()
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('upload_blocks_args')
+    if self.blocks is not None:
+      oprot.writeFieldBegin('blocks', TType.MAP, 1)
+      oprot.writeMapBegin(TType.STRING, TType.STRING, len(self.blocks))
+      for kiter74,viter75 in self.blocks.items():
+        oprot.writeString(kiter74)
+        oprot.writeString(viter75)
+      oprot.writeMapEnd()
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class upload_blocks_result:
+  """
+  Attributes:
+   - ue
+  """
+
+  thrift_spec = (
+    None, # 0
+    (1, TType.STRUCT, 'ue', (UploadException, UploadException.thrift_spec), None, ), # 1
+  )
+
+  def __init__(self, ue=None,):
+    self.ue = ue
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 1:
+        if ftype == TType.STRUCT:
+          self.ue = UploadException()
+          self.ue.read(iprot)
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('upload_blocks_result')
+    if self.ue is not None:
+      oprot.writeFieldBegin('ue', TType.STRUCT, 1)
+      self.ue.write(oprot)
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class analyze_blocks_args:
+  """
+  Attributes:
+   - filename
+   - hash
+   - block_hashes
+   - timeout_ms
+  """
+
+  thrift_spec = (
+    None, # 0
+    (1, TType.STRING, 'filename', None, None, ), # 1
+    (2, TType.STRING, 'hash', None, None, ), # 2
+    (3, TType.LIST, 'block_hashes', (TType.STRING,None), None, ), # 3
+    (4, TType.I32, 'timeout_ms', None, None, ), # 4
+  )
+
+  def __init__(self, filename=None, hash=None, block_hashes=None, timeout_ms=None,):
+    self.filename = filename
+    self.hash = hash
+    self.block_hashes = block_hashes
+    self.timeout_ms = timeout_ms
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 1:
+        if ftype == TType.STRING:
+          self.filename = iprot.readString();
+        else:
+          iprot.skip(ftype)
+      elif fid == 2:
+        if ftype == TType.STRING:
+          self.hash = iprot.readString();
+        else:
+          iprot.skip(ftype)
+      elif fid == 3:
+        if ftype == TType.LIST:
+          self.block_hashes = []
+          (_etype79, _size76) = iprot.readListBegin()
+          for _i80 in xrange(_size76):
+            _elem81 = iprot.readString();
+            self.block_hashes.append(_elem81)
+          iprot.readListEnd()
+        else:
+          iprot.skip(ftype)
+      elif fid == 4:
+        if ftype == TType.I32:
+          self.timeout_ms = iprot.readI32();
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('analyze_blocks_args')
+    if self.filename is not None:
+      oprot.writeFieldBegin('filename', TType.STRING, 1)
+      oprot.writeString(self.filename)
+      oprot.writeFieldEnd()
+    if self.hash is not None:
+      oprot.writeFieldBegin('hash', TType.STRING, 2)
+      oprot.writeString(self.hash)
+      oprot.writeFieldEnd()
+    if self.block_hashes is not None:
+      oprot.writeFieldBegin('block_hashes', TType.LIST, 3)
+      oprot.writeListBegin(TType.STRING, len(self.block_hashes))
+      for iter82 in self.block_hashes:
+        oprot.writeString(iter82)
+      oprot.writeListEnd()
+      oprot.writeFieldEnd()
+    if self.timeout_ms is not None:
+      oprot.writeFieldBegin('timeout_ms', TType.I32, 4)
+      oprot.writeI32(self.timeout_ms)
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class analyze_blocks_result:
+  """
+  Attributes:
+   - success
+   - ae
+   - sbe
+   - dee
+   - mbe
+  """
+
+  thrift_spec = (
+    (0, TType.STRUCT, 'success', (damn_types.ttypes.FileDescription, damn_types.ttypes.FileDescription.thrift_spec), None, ), # 0
+    (1, TType.STRUCT, 'ae', (AnalyzerException, AnalyzerException.thrift_spec), None, ), # 1
+    (2, TType.STRUCT, 'sbe', (ServerBusyException, ServerBusyException.thrift_spec), None, ), # 2
+    (3, TType.STRUCT, 'dee', (DeadlineExceededException, DeadlineExceededException.thrift_spec), None, ), # 3
+    (4, TType.STRUCT, 'mbe', (MissingBlocksException, MissingBlocksException.thrift_spec), None, ), # 4
+  )
+
+  def __init__(self, success=None, ae=None, sbe=None, dee=None, mbe=None,):
+    self.success = success
+    self.ae = ae
+    self.sbe = sbe
+    self.dee = dee
+    self.mbe = mbe
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 0:
+        if ftype == TType.STRUCT:
+          self.success = damn_types.ttypes.FileDescription()
+          self.success.read(iprot)
+        else:
+          iprot.skip(ftype)
+      elif fid == 1:
+        if ftype == TType.STRUCT:
+          self.ae = AnalyzerException()
+          self.ae.read(iprot)
+        else:
+          iprot.skip(ftype)
+      elif fid == 2:
+        if ftype == TType.STRUCT:
+          self.sbe = ServerBusyException()
+          self.sbe.read(iprot)
+        else:
+          iprot.skip(ftype)
+      elif fid == 3:
+        if ftype == TType.STRUCT:
+          self.dee = DeadlineExceededException()
+          self.dee.read(iprot)
+        else:
+          iprot.skip(ftype)
+      elif fid == 4:
+        if ftype == TType.STRUCT:
+          self.mbe = MissingBlocksException()
+          self.mbe.read(iprot)
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('analyze_blocks_result')
+    if self.success is not None:
+      oprot.writeFieldBegin('success', TType.STRUCT, 0)
+      self.success.write(oprot)
+      oprot.writeFieldEnd()
+    if self.ae is not None:
+      oprot.writeFieldBegin('ae', TType.STRUCT, 1)
+      self.ae.write(oprot)
+      oprot.writeFieldEnd()
+    if self.sbe is not None:
+      oprot.writeFieldBegin('sbe', TType.STRUCT, 2)
+      self.sbe.write(oprot)
+      oprot.writeFieldEnd()
+    if self.dee is not None:
+      oprot.writeFieldBegin('dee', TType.STRUCT, 3)
+      self.dee.write(oprot)
+      oprot.writeFieldEnd()
+    if self.mbe is not None:
+      oprot.writeFieldBegin('mbe', TType.STRUCT, 4)
+      self.mbe.write(oprot)
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class analyze_many_args:
+  """
+  Attributes:
+   - files
+   - timeout_ms
+  """
+
+  thrift_spec = (
+    None, # 0
+    (1, TType.LIST, 'files', (TType.STRUCT,(damn_types.ttypes.File, damn_types.ttypes.File.thrift_spec)), None, ), # 1
+    (2, TType.I32, 'timeout_ms', None, None, ), # 2
+  )
+
+  def __init__(self, files=None, timeout_ms=None,):
+    self.files = files
+    self.timeout_ms = timeout_ms
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 1:
+        if ftype == TType.LIST:
+          self.files = []
+          (_etype86, _size83) = iprot.readListBegin()
+          for _i87 in xrange(_size83):
+            _elem88 = damn_types.ttypes.File()
+            _elem88.read(iprot)
+            self.files.append(_elem88)
+          iprot.readListEnd()
+        else:
+          iprot.skip(ftype)
+      elif fid == 2:
+        if ftype == TType.I32:
+          self.timeout_ms = iprot.readI32();
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('analyze_many_args')
+    if self.files is not None:
+      oprot.writeFieldBegin('files', TType.LIST, 1)
+      oprot.writeListBegin(TType.STRUCT, len(self.files))
+      for iter89 in self.files:
+        iter89.write(oprot)
+      oprot.writeListEnd()
+      oprot.writeFieldEnd()
+    if self.timeout_ms is not None:
+      oprot.writeFieldBegin('timeout_ms', TType.I32, 2)
+      oprot.writeI32(self.timeout_ms)
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class analyze_many_result:
+  """
+  Attributes:
+   - success
+  """
+
+  thrift_spec = (
+    (0, TType.LIST, 'success', (TType.STRUCT,(AnalyzeResult, AnalyzeResult.thrift_spec)), None, ), # 0
+  )
+
+  def __init__(self, success=None,):
+    self.success = success
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 0:
+        if ftype == TType.LIST:
+          self.success = []
+          (_etype93, _size90) = iprot.readListBegin()
+          for _i94 in xrange(_size90):
+            _elem95 = AnalyzeResult()
+            _elem95.read(iprot)
+            self.success.append(_elem95)
+          iprot.readListEnd()
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('analyze_many_result')
+    if self.success is not None:
+      oprot.writeFieldBegin('success', TType.LIST, 0)
+      oprot.writeListBegin(TType.STRUCT, len(self.success))
+      for iter96 in self.success:
+        iter96.write(oprot)
+      oprot.writeListEnd()
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class transcode_many_args:
+  """
+  Attributes:
+   - requests
+   - timeout_ms
+  """
+
+  thrift_spec = (
+    None, # 0
+    (1, TType.LIST, 'requests', (TType.STRUCT,(TranscodeRequest, TranscodeRequest.thrift_spec)), None, ), # 1
+    (2, TType.I32, 'timeout_ms', None, None, ), # 2
+  )
+
+  def __init__(self, requests=None, timeout_ms=None,):
+    self.requests = requests
+    self.timeout_ms = timeout_ms
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 1:
+        if ftype == TType.LIST:
+          self.requests = []
+          (_etype100, _size97) = iprot.readListBegin()
+          for _i101 in xrange(_size97):
+            _elem102 = TranscodeRequest()
+            _elem102.read(iprot)
+            self.requests.append(_elem102)
+          iprot.readListEnd()
+        else:
+          iprot.skip(ftype)
+      elif fid == 2:
+        if ftype == TType.I32:
+          self.timeout_ms = iprot.readI32();
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('transcode_many_args')
+    if self.requests is not None:
+      oprot.writeFieldBegin('requests', TType.LIST, 1)
+      oprot.writeListBegin(TType.STRUCT, len(self.requests))
+      for iter103 in self.requests:
+        iter103.write(oprot)
+      oprot.writeListEnd()
+      oprot.writeFieldEnd()
+    if self.timeout_ms is not None:
+      oprot.writeFieldBegin('timeout_ms', TType.I32, 2)
+      oprot.writeI32(self.timeout_ms)
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class transcode_many_result:
+  """
+  Attributes:
+   - success
+  """
+
+  thrift_spec = (
+    (0, TType.LIST, 'success', (TType.STRUCT,(TranscodeResult, TranscodeResult.thrift_spec)), None, ), # 0
+  )
+
+  def __init__(self, success=None,):
+    self.success = success
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 0:
+        if ftype == TType.LIST:
+          self.success = []
+          (_etype107, _size104) = iprot.readListBegin()
+          for _i108 in xrange(_size104):
+            _elem109 = TranscodeResult()
+            _elem109.read(iprot)
+            self.success.append(_elem109)
+          iprot.readListEnd()
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('transcode_many_result')
+    if self.success is not None:
+      oprot.writeFieldBegin('success', TType.LIST, 0)
+      oprot.writeListBegin(TType.STRUCT, len(self.success))
+      for iter110 in self.success:
+        iter110.write(oprot)
+      oprot.writeListEnd()
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class submit_transcode_args:
+  """
+  Attributes:
+   - request
+   - priority
+  """
+
+  thrift_spec = (
+    None, # 0
+    (1, TType.STRUCT, 'request', (TranscodeRequest, TranscodeRequest.thrift_spec), None, ), # 1
+    (2, TType.I32, 'priority', None, None, ), # 2
+  )
+
+  def __init__(self, request=None, priority=None,):
+    self.request = request
+    self.priority = priority
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 1:
+        if ftype == TType.STRUCT:
+          self.request = TranscodeRequest()
+          self.request.read(iprot)
+        else:
+          iprot.skip(ftype)
+      elif fid == 2:
+        if ftype == TType.I32:
+          self.priority = iprot.readI32();
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('submit_transcode_args')
+    if self.request is not None:
+      oprot.writeFieldBegin('request', TType.STRUCT, 1)
+      self.request.write(oprot)
+      oprot.writeFieldEnd()
+    if self.priority is not None:
+      oprot.writeFieldBegin('priority', TType.I32, 2)
+      oprot.writeI32(self.priority)
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class submit_transcode_result:
+  """
+  Attributes:
+   - success
+  """
+
+  thrift_spec = (
+    (0, TType.STRING, 'success', None, None, ), # 0
+  )
+
+  def __init__(self, success=None,):
+    self.success = success
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 0:
+        if ftype == TType.STRING:
+          self.success = iprot.readString();
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('submit_transcode_result')
+    if self.success is not None:
+      oprot.writeFieldBegin('success', TType.STRING, 0)
+      oprot.writeString(self.success)
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class job_status_args:
+  """
+  Attributes:
+   - job_id
+  """
+
+  thrift_spec = (
+    None, # 0
+    (1, TType.STRING, 'job_id', None, None, ), # 1
+  )
+
+  def __init__(self, job_id=None,):
+    self.job_id = job_id
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 1:
+        if ftype == TType.STRING:
+          self.job_id = iprot.readString();
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('job_status_args')
+    if self.job_id is not None:
+      oprot.writeFieldBegin('job_id', TType.STRING, 1)
+      oprot.writeString(self.job_id)
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class job_status_result:
+  """
+  Attributes:
+   - success
+   - uje
+  """
+
+  thrift_spec = (
+    (0, TType.STRUCT, 'success', (JobStatus, JobStatus.thrift_spec), None, ), # 0
+    (1, TType.STRUCT, 'uje', (UnknownJobException, UnknownJobException.thrift_spec), None, ), # 1
+  )
+
+  def __init__(self, success=None, uje=None,):
+    self.success = success
+    self.uje = uje
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 0:
+        if ftype == TType.STRUCT:
+          self.success = JobStatus()
+          self.success.read(iprot)
+        else:
+          iprot.skip(ftype)
+      elif fid == 1:
+        if ftype == TType.STRUCT:
+          self.uje = UnknownJobException()
+          self.uje.read(iprot)
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('job_status_result')
+    if self.success is not None:
+      oprot.writeFieldBegin('success', TType.STRUCT, 0)
+      self.success.write(oprot)
+      oprot.writeFieldEnd()
+    if self.uje is not None:
+      oprot.writeFieldBegin('uje', TType.STRUCT, 1)
+      self.uje.write(oprot)
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class job_result_args:
+  """
+  Attributes:
+   - job_id
+  """
+
+  thrift_spec = (
+    None, # 0
+    (1, TType.STRING, 'job_id', None, None, ), # 1
+  )
+
+  def __init__(self, job_id=None,):
+    self.job_id = job_id
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 1:
+        if ftype == TType.STRING:
+          self.job_id = iprot.readString();
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('job_result_args')
+    if self.job_id is not None:
+      oprot.writeFieldBegin('job_id', TType.STRING, 1)
+      oprot.writeString(self.job_id)
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class job_result_result:
+  """
+  Attributes:
+   - success
+   - uje
+   - je
+  """
+
+  thrift_spec = (
+    (0, TType.LIST, 'success', (TType.STRUCT,(damn_types.ttypes.File, damn_types.ttypes.File.thrift_spec)), None, ), # 0
+    (1, TType.STRUCT, 'uje', (UnknownJobException, UnknownJobException.thrift_spec), None, ), # 1
+    (2, TType.STRUCT, 'je', (JobException, JobException.thrift_spec), None, ), # 2
+  )
+
+  def __init__(self, success=None, uje=None, je=None,):
+    self.success = success
+    self.uje = uje
+    self.je = je
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 0:
+        if ftype == TType.LIST:
+          self.success = []
+          (_etype114, _size111) = iprot.readListBegin()
+          for _i115 in xrange(_size111):
+            _elem116 = damn_types.ttypes.File()
+            _elem116.read(iprot)
+            self.success.append(_elem116)
+          iprot.readListEnd()
+        else:
+          iprot.skip(ftype)
+      elif fid == 1:
+        if ftype == TType.STRUCT:
+          self.uje = UnknownJobException()
+          self.uje.read(iprot)
+        else:
+          iprot.skip(ftype)
+      elif fid == 2:
+        if ftype == TType.STRUCT:
+          self.je = JobException()
+          self.je.read(iprot)
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('job_result_result')
+    if self.success is not None:
+      oprot.writeFieldBegin('success', TType.LIST, 0)
+      oprot.writeListBegin(TType.STRUCT, len(self.success))
+      for iter117 in self.success:
+        iter117.write(oprot)
+      oprot.writeListEnd()
+      oprot.writeFieldEnd()
+    if self.uje is not None:
+      oprot.writeFieldBegin('uje', TType.STRUCT, 1)
+      self.uje.write(oprot)
+      oprot.writeFieldEnd()
+    if self.je is not None:
+      oprot.writeFieldBegin('je', TType.STRUCT, 2)
+      self.je.write(oprot)
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class cancel_job_args:
+  """
+  Attributes:
+   - job_id
+  """
+
+  thrift_spec = (
+    None, # 0
+    (1, TType.STRING, 'job_id', None, None, ), # 1
+  )
+
+  def __init__(self, job_id=None,):
+    self.job_id = job_id
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 1:
+        if ftype == TType.STRING:
+          self.job_id = iprot.readString();
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('cancel_job_args')
+    if self.job_id is not None:
+      oprot.writeFieldBegin('job_id', TType.STRING, 1)
+      oprot.writeString(self.job_id)
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class cancel_job_result:
+  """
+  Attributes:
+   - success
+   - uje
+  """
+
+  thrift_spec = (
+    (0, TType.BOOL, 'success', None, None, ), # 0
+    (1, TType.STRUCT, 'uje', (UnknownJobException, UnknownJobException.thrift_spec), None, ), # 1
+  )
+
+  def __init__(self, success=None, uje=None,):
+    self.success = success
+    self.uje = uje
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 0:
+        if ftype == TType.BOOL:
+          self.success = iprot.readBool();
+        else:
+          iprot.skip(ftype)
+      elif fid == 1:
+        if ftype == TType.STRUCT:
+          self.uje = UnknownJobException()
+          self.uje.read(iprot)
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('cancel_job_result')
+    if self.success is not None:
+      oprot.writeFieldBegin('success', TType.BOOL, 0)
+      oprot.writeBool(self.success)
+      oprot.writeFieldEnd()
+    if self.uje is not None:
+      oprot.writeFieldBegin('uje', TType.STRUCT, 1)
+      self.uje.write(oprot)
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
 
 
-# HELPER FUNCTIONS AND STRUCTURES
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
 
-class ping_args:
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class list_jobs_args:
+  """
+  Attributes:
+   - state
+   - limit
+  """
 
   thrift_spec = (
+    None, # 0
+    (1, TType.I32, 'state', None, None, ), # 1
+    (2, TType.I32, 'limit', None, None, ), # 2
   )
 
+  def __init__(self, state=None, limit=None,):
+    self.state = state
+    self.limit = limit
+
   def read(self, iprot):
     if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
       fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
@@ -299,6 +3270,16 @@ class ping_args:
       (fname, ftype, fid) = iprot.readFieldBegin()
       if ftype == TType.STOP:
         break
+      if fid == 1:
+        if ftype == TType.I32:
+          self.state = iprot.readI32();
+        else:
+          iprot.skip(ftype)
+      elif fid == 2:
+        if ftype == TType.I32:
+          self.limit = iprot.readI32();
+        else:
+          iprot.skip(ftype)
       else:
         iprot.skip(ftype)
       iprot.readFieldEnd()
@@ -308,7 +3289,15 @@ class ping_args:
     if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
       oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
       return
-    oprot.writeStructBegin('ping_args')
+    oprot.writeStructBegin('list_jobs_args')
+    if self.state is not None:
+      oprot.writeFieldBegin('state', TType.I32, 1)
+      oprot.writeI32(self.state)
+      oprot.writeFieldEnd()
+    if self.limit is not None:
+      oprot.writeFieldBegin('limit', TType.I32, 2)
+      oprot.writeI32(self.limit)
+      oprot.writeFieldEnd()
     oprot.writeFieldStop()
     oprot.writeStructEnd()
 
@@ -327,11 +3316,19 @@ class ping_args:
   def __ne__(self, other):
     return not (self == other)
 
-class ping_result:
+class list_jobs_result:
+  """
+  Attributes:
+   - success
+  """
 
   thrift_spec = (
+    (0, TType.LIST, 'success', (TType.STRUCT,(JobStatus, JobStatus.thrift_spec)), None, ), # 0
   )
 
+  def __init__(self, success=None,):
+    self.success = success
+
   def read(self, iprot):
     if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
       fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
@@ -341,6 +3338,17 @@ class ping_result:
       (fname, ftype, fid) = iprot.readFieldBegin()
       if ftype == TType.STOP:
         break
+      if fid == 0:
+        if ftype == TType.LIST:
+          self.success = []
+          (_etype121, _size118) = iprot.readListBegin()
+          for _i122 in xrange(_size118):
+            _elem123 = JobStatus()
+            _elem123.read(iprot)
+            self.success.append(_elem123)
+          iprot.readListEnd()
+        else:
+          iprot.skip(ftype)
       else:
         iprot.skip(ftype)
       iprot.readFieldEnd()
@@ -350,7 +3358,14 @@ class ping_result:
     if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
       oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
       return
-    oprot.writeStructBegin('ping_result')
+    oprot.writeStructBegin('list_jobs_result')
+    if self.success is not None:
+      oprot.writeFieldBegin('success', TType.LIST, 0)
+      oprot.writeListBegin(TType.STRUCT, len(self.success))
+      for iter124 in self.success:
+        iter124.write(oprot)
+      oprot.writeListEnd()
+      oprot.writeFieldEnd()
     oprot.writeFieldStop()
     oprot.writeStructEnd()
 
@@ -369,11 +3384,20 @@ class ping_result:
   def __ne__(self, other):
     return not (self == other)
 
-class get_supported_mimetypes_args:
+class open_upload_args:
+  """
+  Attributes:
+   - filename
+  """
 
   thrift_spec = (
+    None, # 0
+    (1, TType.STRING, 'filename', None, None, ), # 1
   )
 
+  def __init__(self, filename=None,):
+    self.filename = filename
+
   def read(self, iprot):
     if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
       fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
@@ -383,6 +3407,11 @@ class get_supported_mimetypes_args:
       (fname, ftype, fid) = iprot.readFieldBegin()
       if ftype == TType.STOP:
         break
+      if fid == 1:
+        if ftype == TType.STRING:
+          self.filename = iprot.readString();
+        else:
+          iprot.skip(ftype)
       else:
         iprot.skip(ftype)
       iprot.readFieldEnd()
@@ -392,7 +3421,11 @@ class get_supported_mimetypes_args:
     if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
       oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
       return
-    oprot.writeStructBegin('get_supported_mimetypes_args')
+    oprot.writeStructBegin('open_upload_args')
+    if self.filename is not None:
+      oprot.writeFieldBegin('filename', TType.STRING, 1)
+      oprot.writeString(self.filename)
+      oprot.writeFieldEnd()
     oprot.writeFieldStop()
     oprot.writeStructEnd()
 
@@ -411,14 +3444,14 @@ class get_supported_mimetypes_args:
   def __ne__(self, other):
     return not (self == other)
 
-class get_supported_mimetypes_result:
+class open_upload_result:
   """
   Attributes:
    - success
   """
 
   thrift_spec = (
-    (0, TType.LIST, 'success', (TType.STRING,None), None, ), # 0
+    (0, TType.STRING, 'success', None, None, ), # 0
   )
 
   def __init__(self, success=None,):
@@ -434,13 +3467,8 @@ class get_supported_mimetypes_result:
       if ftype == TType.STOP:
         break
       if fid == 0:
-        if ftype == TType.LIST:
-          self.success = []
-          (_etype3, _size0) = iprot.readListBegin()
-          for _i4 in xrange(_size0):
-            _elem5 = iprot.readString();
-            self.success.append(_elem5)
-          iprot.readListEnd()
+        if ftype == TType.STRING:
+          self.success = iprot.readString();
         else:
           iprot.skip(ftype)
       else:
@@ -452,13 +3480,10 @@ class get_supported_mimetypes_result:
     if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
       oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
       return
-    oprot.writeStructBegin('get_supported_mimetypes_result')
+    oprot.writeStructBegin('open_upload_result')
     if self.success is not None:
-      oprot.writeFieldBegin('success', TType.LIST, 0)
-      oprot.writeListBegin(TType.STRING, len(self.success))
-      for iter6 in self.success:
-        oprot.writeString(iter6)
-      oprot.writeListEnd()
+      oprot.writeFieldBegin('success', TType.STRING, 0)
+      oprot.writeString(self.success)
       oprot.writeFieldEnd()
     oprot.writeFieldStop()
     oprot.writeStructEnd()
@@ -478,11 +3503,26 @@ class get_supported_mimetypes_result:
   def __ne__(self, other):
     return not (self == other)
 
-class get_target_mimetypes_args:
+class append_upload_args:
+  """
+  Attributes:
+   - upload_id
+   - offset
+   - data
+  """
 
   thrift_spec = (
+    None, # 0
+    (1, TType.STRING, 'upload_id', None, None, ), # 1
+    (2, TType.I64, 'offset', None, None, ), # 2
+    (3, TType.STRING, 'data', None, None, ), # 3
   )
 
+  def __init__(self, upload_id=None, offset=None, data=None,):
+    self.upload_id = upload_id
+    self.offset = offset
+    self.data = data
+
   def read(self, iprot):
     if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
       fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
@@ -492,6 +3532,21 @@ class get_target_mimetypes_args:
       (fname, ftype, fid) = iprot.readFieldBegin()
       if ftype == TType.STOP:
         break
+      if fid == 1:
+        if ftype == TType.STRING:
+          self.upload_id = iprot.readString();
+        else:
+          iprot.skip(ftype)
+      elif fid == 2:
+        if ftype == TType.I64:
+          self.offset = iprot.readI64();
+        else:
+          iprot.skip(ftype)
+      elif fid == 3:
+        if ftype == TType.STRING:
+          self.data = iprot.readString();
+        else:
+          iprot.skip(ftype)
       else:
         iprot.skip(ftype)
       iprot.readFieldEnd()
@@ -501,7 +3556,19 @@ class get_target_mimetypes_args:
     if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
       oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
       return
-    oprot.writeStructBegin('get_target_mimetypes_args')
+    oprot.writeStructBegin('append_upload_args')
+    if self.upload_id is not None:
+      oprot.writeFieldBegin('upload_id', TType.STRING, 1)
+      oprot.writeString(self.upload_id)
+      oprot.writeFieldEnd()
+    if self.offset is not None:
+      oprot.writeFieldBegin('offset', TType.I64, 2)
+      oprot.writeI64(self.offset)
+      oprot.writeFieldEnd()
+    if self.data is not None:
+      oprot.writeFieldBegin('data', TType.STRING, 3)
+      oprot.writeString(self.data)
+      oprot.writeFieldEnd()
     oprot.writeFieldStop()
     oprot.writeStructEnd()
 
@@ -520,18 +3587,21 @@ class get_target_mimetypes_args:
   def __ne__(self, other):
     return not (self == other)
 
-class get_target_mimetypes_result:
+class append_upload_result:
   """
   Attributes:
    - success
+   - ue
   """
 
   thrift_spec = (
-    (0, TType.MAP, 'success', (TType.STRING,None,TType.LIST,(TType.STRUCT,(damn_types.ttypes.TargetMimetype, damn_types.ttypes.TargetMimetype.thrift_spec))), None, ), # 0
+    (0, TType.I64, 'success', None, None, ), # 0
+    (1, TType.STRUCT, 'ue', (UploadException, UploadException.thrift_spec), None, ), # 1
   )
 
-  def __init__(self, success=None,):
+  def __init__(self, success=None, ue=None,):
     self.success = success
+    self.ue = ue
 
   def read(self, iprot):
     if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
@@ -543,20 +3613,14 @@ class get_target_mimetypes_result:
       if ftype == TType.STOP:
         break
       if fid == 0:
-        if ftype == TType.MAP:
-          self.success = {}
-          (_ktype8, _vtype9, _size7 ) = iprot.readMapBegin() 
-          for _i11 in xrange(_size7):
-            _key12 = iprot.readString();
-            _val13 = []
-            (_etype17, _size14) = iprot.readListBegin()
-            for _i18 in xrange(_size14):
-              _elem19 = damn_types.ttypes.TargetMimetype()
-              _elem19.read(iprot)
-              _val13.append(_elem19)
-            iprot.readListEnd()
-            self.success[_key12] = _val13
-          iprot.readMapEnd()
+        if ftype == TType.I64:
+          self.success = iprot.readI64();
+        else:
+          iprot.skip(ftype)
+      elif fid == 1:
+        if ftype == TType.STRUCT:
+          self.ue = UploadException()
+          self.ue.read(iprot)
         else:
           iprot.skip(ftype)
       else:
@@ -568,17 +3632,14 @@ class get_target_mimetypes_result:
     if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
       oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
       return
-    oprot.writeStructBegin('get_target_mimetypes_result')
+    oprot.writeStructBegin('append_upload_result')
     if self.success is not None:
-      oprot.writeFieldBegin('success', TType.MAP, 0)
-      oprot.writeMapBegin(TType.STRING, TType.LIST, len(self.success))
-      for kiter20,viter21 in self.success.items():
-        oprot.writeString(kiter20)
-        oprot.writeListBegin(TType.STRUCT, len(viter21))
-        for iter22 in viter21:
-          iter22.write(oprot)
-        oprot.writeListEnd()
-      oprot.writeMapEnd()
+      oprot.writeFieldBegin('success', TType.I64, 0)
+      oprot.writeI64(self.success)
+      oprot.writeFieldEnd()
+    if self.ue is not None:
+      oprot.writeFieldBegin('ue', TType.STRUCT, 1)
+      self.ue.write(oprot)
       oprot.writeFieldEnd()
     oprot.writeFieldStop()
     oprot.writeStructEnd()
@@ -598,19 +3659,25 @@ class get_target_mimetypes_result:
   def __ne__(self, other):
     return not (self == other)
 
-class analyze_args:
+class commit_upload_args:
   """
   Attributes:
-   - file
+   - upload_id
+   - hash
+   - timeout_ms
   """
 
   thrift_spec = (
     None, # 0
-    (1, TType.STRUCT, 'file', (damn_types.ttypes.File, damn_types.ttypes.File.thrift_spec), None, ), # 1
+    (1, TType.STRING, 'upload_id', None, None, ), # 1
+    (2, TType.STRING, 'hash', None, None, ), # 2
+    (3, TType.I32, 'timeout_ms', None, None, ), # 3
   )
 
-  def __init__(self, file=None,):
-    self.file = file
+  def __init__(self, upload_id=None, hash=None, timeout_ms=None,):
+    self.upload_id = upload_id
+    self.hash = hash
+    self.timeout_ms = timeout_ms
 
   def read(self, iprot):
     if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
@@ -622,9 +3689,18 @@ class analyze_args:
       if ftype == TType.STOP:
         break
       if fid == 1:
-        if ftype == TType.STRUCT:
-          self.file = damn_types.ttypes.File()
-          self.file.read(iprot)
+        if ftype == TType.STRING:
+          self.upload_id = iprot.readString();
+        else:
+          iprot.skip(ftype)
+      elif fid == 2:
+        if ftype == TType.STRING:
+          self.hash = iprot.readString();
+        else:
+          iprot.skip(ftype)
+      elif fid == 3:
+        if ftype == TType.I32:
+          self.timeout_ms = iprot.readI32();
         else:
           iprot.skip(ftype)
       else:
@@ -636,10 +3712,18 @@ class analyze_args:
     if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
       oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
       return
-    oprot.writeStructBegin('analyze_args')
-    if self.file is not None:
-      oprot.writeFieldBegin('file', TType.STRUCT, 1)
-      self.file.write(oprot)
+    oprot.writeStructBegin('commit_upload_args')
+    if self.upload_id is not None:
+      oprot.writeFieldBegin('upload_id', TType.STRING, 1)
+      oprot.writeString(self.upload_id)
+      oprot.writeFieldEnd()
+    if self.hash is not None:
+      oprot.writeFieldBegin('hash', TType.STRING, 2)
+      oprot.writeString(self.hash)
+      oprot.writeFieldEnd()
+    if self.timeout_ms is not None:
+      oprot.writeFieldBegin('timeout_ms', TType.I32, 3)
+      oprot.writeI32(self.timeout_ms)
       oprot.writeFieldEnd()
     oprot.writeFieldStop()
     oprot.writeStructEnd()
@@ -659,21 +3743,30 @@ class analyze_args:
   def __ne__(self, other):
     return not (self == other)
 
-class analyze_result:
+class commit_upload_result:
   """
   Attributes:
    - success
    - ae
+   - sbe
+   - dee
+   - ue
   """
 
   thrift_spec = (
     (0, TType.STRUCT, 'success', (damn_types.ttypes.FileDescription, damn_types.ttypes.FileDescription.thrift_spec), None, ), # 0
     (1, TType.STRUCT, 'ae', (AnalyzerException, AnalyzerException.thrift_spec), None, ), # 1
+    (2, TType.STRUCT, 'sbe', (ServerBusyException, ServerBusyException.thrift_spec), None, ), # 2
+    (3, TType.STRUCT, 'dee', (DeadlineExceededException, DeadlineExceededException.thrift_spec), None, ), # 3
+    (4, TType.STRUCT, 'ue', (UploadException, UploadException.thrift_spec), None, ), # 4
   )
 
-  def __init__(self, success=None, ae=None,):
+  def __init__(self, success=None, ae=None, sbe=None, dee=None, ue=None,):
     self.success = success
     self.ae = ae
+    self.sbe = sbe
+    self.dee = dee
+    self.ue = ue
 
   def read(self, iprot):
     if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
@@ -696,6 +3789,24 @@ class analyze_result:
           self.ae.read(iprot)
         else:
           iprot.skip(ftype)
+      elif fid == 2:
+        if ftype == TType.STRUCT:
+          self.sbe = ServerBusyException()
+          self.sbe.read(iprot)
+        else:
+          iprot.skip(ftype)
+      elif fid == 3:
+        if ftype == TType.STRUCT:
+          self.dee = DeadlineExceededException()
+          self.dee.read(iprot)
+        else:
+          iprot.skip(ftype)
+      elif fid == 4:
+        if ftype == TType.STRUCT:
+          self.ue = UploadException()
+          self.ue.read(iprot)
+        else:
+          iprot.skip(ftype)
       else:
         iprot.skip(ftype)
       iprot.readFieldEnd()
@@ -705,7 +3816,7 @@ class analyze_result:
     if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
       oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
       return
-    oprot.writeStructBegin('analyze_result')
+    oprot.writeStructBegin('commit_upload_result')
     if self.success is not None:
       oprot.writeFieldBegin('success', TType.STRUCT, 0)
       self.success.write(oprot)
@@ -714,6 +3825,120 @@ class analyze_result:
       oprot.writeFieldBegin('ae', TType.STRUCT, 1)
       self.ae.write(oprot)
       oprot.writeFieldEnd()
+    if self.sbe is not None:
+      oprot.writeFieldBegin('sbe', TType.STRUCT, 2)
+      self.sbe.write(oprot)
+      oprot.writeFieldEnd()
+    if self.dee is not None:
+      oprot.writeFieldBegin('dee', TType.STRUCT, 3)
+      self.dee.write(oprot)
+      oprot.writeFieldEnd()
+    if self.ue is not None:
+      oprot.writeFieldBegin('ue', TType.STRUCT, 4)
+      self.ue.write(oprot)
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class abort_upload_args:
+  """
+  Attributes:
+   - upload_id
+  """
+
+  thrift_spec = (
+    None, # 0
+    (1, TType.STRING, 'upload_id', None, None, ), # 1
+  )
+
+  def __init__(self, upload_id=None,):
+    self.upload_id = upload_id
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 1:
+        if ftype == TType.STRING:
+          self.upload_id = iprot.readString();
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('abort_upload_args')
+    if self.upload_id is not None:
+      oprot.writeFieldBegin('upload_id', TType.STRING, 1)
+      oprot.writeString(self.upload_id)
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class abort_upload_result:
+
+  thrift_spec = (
+  )
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('abort_upload_result')
     oprot.writeFieldStop()
     oprot.writeStructEnd()
 
@@ -739,6 +3964,7 @@ class transcode_args:
    - asset
    - mimetype
    - options
+   - timeout_ms
   """
 
   thrift_spec = (
@@ -747,13 +3973,15 @@ class transcode_args:
     (2, TType.STRUCT, 'asset', (damn_types.ttypes.AssetId, damn_types.ttypes.AssetId.thrift_spec), None, ), # 2
     (3, TType.STRING, 'mimetype', None, None, ), # 3
     (4, TType.MAP, 'options', (TType.STRING,None,TType.STRING,None), None, ), # 4
+    (5, TType.I32, 'timeout_ms', None, None, ), # 5
   )
 
-  def __init__(self, files=None, asset=None, mimetype=None, options=None,):
+  def __init__(self, files=None, asset=None, mimetype=None, options=None, timeout_ms=None,):
     self.files = files
     self.asset = asset
     self.mimetype = mimetype
     self.options = options
+    self.timeout_ms = timeout_ms
 
   def read(self, iprot):
     if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
@@ -767,11 +3995,11 @@ class transcode_args:
       if fid == 1:
         if ftype == TType.LIST:
           self.files = []
-          (_etype26, _size23) = iprot.readListBegin()
-          for _i27 in xrange(_size23):
-            _elem28 = damn_types.ttypes.File()
-            _elem28.read(iprot)
-            self.files.append(_elem28)
+          (_etype128, _size125) = iprot.readListBegin()
+          for _i129 in xrange(_size125):
+            _elem130 = damn_types.ttypes.File()
+            _elem130.read(iprot)
+            self.files.append(_elem130)
           iprot.readListEnd()
         else:
           iprot.skip(ftype)
@@ -789,14 +4017,19 @@ class transcode_args:
       elif fid == 4:
         if ftype == TType.MAP:
           self.options = {}
-          (_ktype30, _vtype31, _size29 ) = iprot.readMapBegin() 
-          for _i33 in xrange(_size29):
-            _key34 = iprot.readString();
-            _val35 = iprot.readString();
-            self.options[_key34] = _val35
+          (_ktype132, _vtype133, _size131 ) = iprot.readMapBegin() 
+          for _i135 in xrange(_size131):
+            _key136 = iprot.readString();
+            _val137 = iprot.readString();
+            self.options[_key136] = _val137
           iprot.readMapEnd()
         else:
           iprot.skip(ftype)
+      elif fid == 5:
+        if ftype == TType.I32:
+          self.timeout_ms = iprot.readI32();
+        else:
+          iprot.skip(ftype)
       else:
         iprot.skip(ftype)
       iprot.readFieldEnd()
@@ -810,8 +4043,8 @@ class transcode_args:
     if self.files is not None:
       oprot.writeFieldBegin('files', TType.LIST, 1)
       oprot.writeListBegin(TType.STRUCT, len(self.files))
-      for iter36 in self.files:
-        iter36.write(oprot)
+      for iter138 in self.files:
+        iter138.write(oprot)
       oprot.writeListEnd()
       oprot.writeFieldEnd()
     if self.asset is not None:
@@ -825,11 +4058,15 @@ class transcode_args:
     if self.options is not None:
       oprot.writeFieldBegin('options', TType.MAP, 4)
       oprot.writeMapBegin(TType.STRING, TType.STRING, len(self.options))
-      for kiter37,viter38 in self.options.items():
-        oprot.writeString(kiter37)
-        oprot.writeString(viter38)
+      for kiter139,viter140 in self.options.items():
+        oprot.writeString(kiter139)
+        oprot.writeString(viter140)
       oprot.writeMapEnd()
       oprot.writeFieldEnd()
+    if self.timeout_ms is not None:
+      oprot.writeFieldBegin('timeout_ms', TType.I32, 5)
+      oprot.writeI32(self.timeout_ms)
+      oprot.writeFieldEnd()
     oprot.writeFieldStop()
     oprot.writeStructEnd()
 
@@ -853,16 +4090,22 @@ class transcode_result:
   Attributes:
    - success
    - te
+   - sbe
+   - dee
   """
 
   thrift_spec = (
     (0, TType.LIST, 'success', (TType.STRUCT,(damn_types.ttypes.File, damn_types.ttypes.File.thrift_spec)), None, ), # 0
     (1, TType.STRUCT, 'te', (TranscoderException, TranscoderException.thrift_spec), None, ), # 1
+    (2, TType.STRUCT, 'sbe', (ServerBusyException, ServerBusyException.thrift_spec), None, ), # 2
+    (3, TType.STRUCT, 'dee', (DeadlineExceededException, DeadlineExceededException.thrift_spec), None, ), # 3
   )
 
-  def __init__(self, success=None, te=None,):
+  def __init__(self, success=None, te=None, sbe=None, dee=None,):
     self.success = success
     self.te = te
+    self.sbe = sbe
+    self.dee = dee
 
   def read(self, iprot):
     if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
@@ -876,11 +4119,11 @@ class transcode_result:
       if fid == 0:
         if ftype == TType.LIST:
           self.success = []
-          (_etype42, _size39) = iprot.readListBegin()
-          for _i43 in xrange(_size39):
-            _elem44 = damn_types.ttypes.File()
-            _elem44.read(iprot)
-            self.success.append(_elem44)
+          (_etype144, _size141) = iprot.readListBegin()
+          for _i145 in xrange(_size141):
+            _elem146 = damn_types.ttypes.File()
+            _elem146.read(iprot)
+            self.success.append(_elem146)
           iprot.readListEnd()
         else:
           iprot.skip(ftype)
@@ -890,6 +4133,18 @@ class transcode_result:
           self.te.read(iprot)
         else:
           iprot.skip(ftype)
+      elif fid == 2:
+        if ftype == TType.STRUCT:
+          self.sbe = ServerBusyException()
+          self.sbe.read(iprot)
+        else:
+          iprot.skip(ftype)
+      elif fid == 3:
+        if ftype == TType.STRUCT:
+          self.dee = DeadlineExceededException()
+          self.dee.read(iprot)
+        else:
+          iprot.skip(ftype)
       else:
         iprot.skip(ftype)
       iprot.readFieldEnd()
@@ -903,14 +4158,22 @@ class transcode_result:
     if self.success is not None:
       oprot.writeFieldBegin('success', TType.LIST, 0)
       oprot.writeListBegin(TType.STRUCT, len(self.success))
-      for iter45 in self.success:
-        iter45.write(oprot)
+      for iter147 in self.success:
+        iter147.write(oprot)
       oprot.writeListEnd()
       oprot.writeFieldEnd()
     if self.te is not None:
       oprot.writeFieldBegin('te', TType.STRUCT, 1)
       self.te.write(oprot)
       oprot.writeFieldEnd()
+    if self.sbe is not None:
+      oprot.writeFieldBegin('sbe', TType.STRUCT, 2)
+      self.sbe.write(oprot)
+      oprot.writeFieldEnd()
+    if self.dee is not None:
+      oprot.writeFieldBegin('dee', TType.STRUCT, 3)
+      self.dee.write(oprot)
+      oprot.writeFieldEnd()
     oprot.writeFieldStop()
     oprot.writeStructEnd()
 
@@ -0,0 +1,334 @@
+"""
+Persistent job queue for long running DamnService calls.
+
+Jobs are kept in a local SQLite database, so they survive a restart of
+the server. Workers lease the job with the highest priority: a leased job
+belongs to that worker until the lease expires, a worker that dies simply
+stops renewing its lease and the job is handed out again, up to
+:py:data:`MAX_ATTEMPTS` times.
+
+Cancelling a running job doesn't stop it: it runs to completion and its
+result is discarded.
+"""
+import os
+import time
+import uuid
+import socket
+import sqlite3
+import threading
+
+from damn_at import logger
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+MAX_ATTEMPTS = 3
+"""How often a job is leased before it's considered failed"""
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    request BLOB,
+    result BLOB,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    created REAL NOT NULL,
+    started REAL,
+    finished REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (state, priority DESC, created);
+'''
+
+_COLUMNS = ('id', 'kind', 'priority', 'state', 'error', 'attempts', 'created', 'started', 'finished')
+
+
+class JobQueueException(Exception):
+    """Base JobQueue Exception"""
+    def __init__(self, msg):
+        Exception.__init__(self)
+        self.msg = msg
+
+    def __str__(self):
+        return repr(self.msg)
+
+
+class UnknownJobException(JobQueueException):
+    """No job with that id"""
+    pass
+
+
+class JobRetryException(JobQueueException):
+    """The job can't run right now, put it back in the queue"""
+    pass
+
+
+class JobQueue(object):
+    """
+    A SQLite backed job queue, safe to use from several threads and
+    processes at once.
+
+    :param path: the SQLite database file
+    """
+    def __init__(self, path):
+        self.path = path
+        if not os.path.exists(os.path.dirname(os.path.abspath(path))):
+            os.makedirs(os.path.dirname(os.path.abspath(path)))
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.executescript(_SCHEMA)
+
+    def _connection(self):
+        """The connection of the calling thread, connections are not
+        shared with forked processes."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def submit(self, kind, request, priority=0):
+        """Queue a job
+
+        :param kind: the kind of job, workers only lease the kinds they handle
+        :param request: the serialized request
+        :param priority: higher priorities are leased first
+        :rtype: string the job id
+        """
+        job_id = uuid.uuid4().hex
+        with self._connection() as connection:
+            connection.execute('INSERT INTO jobs (id, kind, priority, state, request, created) '
+                               'VALUES (?, ?, ?, ?, ?, ?)',
+                               (job_id, kind, priority, QUEUED, sqlite3.Binary(request), time.time()))
+        return job_id
+
+    def lease(self, kind, owner, duration):
+        """Lease the next job of the given kind
+
+        :param owner: identifies the worker
+        :param duration: seconds until the lease expires unless renewed
+        :rtype: (job id, request) or None
+        """
+        now = time.time()
+        connection = self._connection()
+        # BEGIN IMMEDIATE makes the select and update atomic between processes.
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            # Jobs of dead workers are leased again, or failed after too many tries.
+            connection.execute('UPDATE jobs SET state = ?, error = ?, finished = ?, lease_owner = NULL '
+                               'WHERE state = ? AND lease_expires < ? AND attempts >= ?',
+                               (FAILED, 'Worker lost %d times' % MAX_ATTEMPTS, now, RUNNING, now, MAX_ATTEMPTS))
+            row = connection.execute('SELECT id, request FROM jobs WHERE kind = ? AND '
+                                     '(state = ? OR (state = ? AND lease_expires < ?)) '
+                                     'ORDER BY priority DESC, created LIMIT 1',
+                                     (kind, QUEUED, RUNNING, now)).fetchone()
+            if row is not None:
+                connection.execute('UPDATE jobs SET state = ?, lease_owner = ?, lease_expires = ?, '
+                                   'attempts = attempts + 1, started = ? WHERE id = ?',
+                                   (RUNNING, owner, now + duration, now, row[0]))
+            connection.commit()
+        except:
+            connection.rollback()
+            raise
+        if row is None:
+            return None
+        return row[0], bytes(row[1])
+
+    def renew(self, job_id, owner, duration):
+        """Extend a lease
+
+        :rtype: bool False if the job is no longer leased by owner
+        """
+        with self._connection() as connection:
+            cursor = connection.execute('UPDATE jobs SET lease_expires = ? '
+                                        'WHERE id = ? AND state = ? AND lease_owner = ?',
+                                        (time.time() + duration, job_id, RUNNING, owner))
+            return cursor.rowcount == 1
+
+    def release(self, job_id, owner):
+        """Give a leased job back to the queue without counting the attempt"""
+        with self._connection() as connection:
+            connection.execute('UPDATE jobs SET state = ?, lease_owner = NULL, attempts = attempts - 1 '
+                               'WHERE id = ? AND state = ? AND lease_owner = ?',
+                               (QUEUED, job_id, RUNNING, owner))
+
+    def _finish(self, job_id, owner, state, result, error):
+        with self._connection() as connection:
+            cursor = connection.execute('UPDATE jobs SET state = ?, result = ?, error = ?, finished = ?, '
+                                        'lease_owner = NULL WHERE id = ? AND state = ? AND lease_owner = ?',
+                                        (state, result, error, time.time(), job_id, RUNNING, owner))
+            return cursor.rowcount == 1
+
+    def complete(self, job_id, owner, result):
+        """Store the serialized result of a leased job
+
+        :rtype: bool False if the lease was lost or the job cancelled
+        """
+        return self._finish(job_id, owner, DONE, sqlite3.Binary(result), None)
+
+    def fail(self, job_id, owner, error):
+        """Mark a leased job as failed
+
+        :rtype: bool False if the lease was lost or the job cancelled
+        """
+        return self._finish(job_id, owner, FAILED, None, error)
+
+    def cancel(self, job_id):
+        """Cancel a job that isn't finished yet, a running job is not
+        interrupted but runs to completion and its result is discarded.
+
+        :rtype: bool whether the job was cancelled
+        """
+        with self._connection() as connection:
+            cursor = connection.execute('UPDATE jobs SET state = ?, finished = ?, lease_owner = NULL '
+                                        'WHERE id = ? AND state IN (?, ?)',
+                                        (CANCELLED, time.time(), job_id, QUEUED, RUNNING))
+            if cursor.rowcount == 1:
+                return True
+        self.status(job_id)
+        return False
+
+    def status(self, job_id):
+        """
+        :rtype: dict with the columns id, kind, priority, state, error,
+                attempts, created, started and finished
+        :raises: UnknownJobException
+        """
+        row = self._connection().execute('SELECT %s FROM jobs WHERE id = ?' % ', '.join(_COLUMNS),
+                                          (job_id,)).fetchone()
+        if row is None:
+            raise UnknownJobException('No job %s' % job_id)
+        return dict(zip(_COLUMNS, row))
+
+    def result(self, job_id):
+        """
+        :rtype: (state, serialized result or None, error or None)
+        :raises: UnknownJobException
+        """
+        row = self._connection().execute('SELECT state, result, error FROM jobs WHERE id = ?',
+                                          (job_id,)).fetchone()
+        if row is None:
+            raise UnknownJobException('No job %s' % job_id)
+        return row[0], bytes(row[1]) if row[1] is not None else None, row[2]
+
+    def counts(self):
+        """:rtype: dict the number of jobs per state"""
+        rows = self._connection().execute('SELECT state, COUNT(*) FROM jobs GROUP BY state').fetchall()
+        return dict(rows)
+
+    def list(self, state=None, limit=100):
+        """The most recent jobs, optionally only those in the given state
+
+        :rtype: list<dict> see :py:meth:`status`
+        """
+        query = 'SELECT %s FROM jobs' % ', '.join(_COLUMNS)
+        args = ()
+        if state:
+            query += ' WHERE state = ?'
+            args = (state,)
+        query += ' ORDER BY created DESC LIMIT ?'
+        rows = self._connection().execute(query, args + (limit,)).fetchall()
+        return [dict(zip(_COLUMNS, row)) for row in rows]
+
+
+class JobRunner(object):
+    """
+    Threads that lease jobs of one kind and run them.
+
+    Leases are renewed while a job runs, up to the job's deadline: the lease
+    of a job that overruns it lapses and the job is handed out again.
+    Errors of the queue itself, like a locked database, are logged and the
+    threads carry on.
+
+    :param handle: called with the serialized request and the job's
+                   deadline, returns the serialized result, raises
+                   :py:class:`JobRetryException` to put the job back in
+                   the queue
+    :param timeout: seconds a job may run, counted from its lease
+    """
+    def __init__(self, queue, kind, handle, threads=2, lease_duration=60.0, poll_interval=1.0, timeout=3600.0):
+        self.queue = queue
+        self.kind = kind
+        self.handle = handle
+        self.threads = threads
+        self.lease_duration = lease_duration
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.owner = '%s:%d:%s' % (socket.gethostname(), os.getpid(), uuid.uuid4().hex[:8])
+        self._stopping = threading.Event()
+        # Running jobs and their deadlines.
+        self._active = {}
+        self._lock = threading.Lock()
+        self._workers = []
+
+    def start(self):
+        """Start the worker threads and the lease renewal thread"""
+        self._stopping.clear()
+        for _ in range(self.threads):
+            self._start_thread(self._work)
+        self._start_thread(self._renew)
+
+    def _start_thread(self, target):
+        thread = threading.Thread(target=target)
+        thread.daemon = True
+        thread.start()
+        self._workers.append(thread)
+
+    def stop(self):
+        """Stop leasing and wait for the running jobs"""
+        self._stopping.set()
+        for thread in self._workers:
+            thread.join()
+        self._workers = []
+
+    def _update(self, method, job_id, *args):
+        """Call a JobQueue method for a leased job, logging failures"""
+        try:
+            return method(job_id, self.owner, *args)
+        except Exception as ex:  # pylint: disable=W0703
+            logger.warning("Failed to %s job %s: %s", method.__name__, job_id, ex)
+            return False
+
+    def _renew(self):
+        while not self._stopping.wait(self.lease_duration / 3):
+            now = time.time()
+            with self._lock:
+                active = [job_id for job_id, deadline in self._active.items() if deadline > now]
+            for job_id in active:
+                self._update(self.queue.renew, job_id, self.lease_duration)
+
+    def _work(self):
+        while not self._stopping.is_set():
+            try:
+                job = self.queue.lease(self.kind, self.owner, self.lease_duration)
+            except Exception as ex:  # pylint: disable=W0703
+                logger.warning("Failed to lease a %s job: %s", self.kind, ex)
+                job = None
+            if job is None:
+                self._stopping.wait(self.poll_interval)
+                continue
+            job_id, request = job
+            deadline = time.time() + self.timeout
+            with self._lock:
+                self._active[job_id] = deadline
+            try:
+                result = self.handle(request, deadline)
+            except JobRetryException:
+                self._update(self.queue.release, job_id)
+                self._stopping.wait(self.poll_interval)
+            except Exception as ex:  # pylint: disable=W0703
+                self._update(self.queue.fail, job_id, getattr(ex, 'msg', None) or str(ex))
+            else:
+                self._update(self.queue.complete, job_id, result)
+            finally:
+                with self._lock:
+                    self._active.pop(job_id, None)
@@ -0,0 +1,353 @@
+"""
+Bounded process pool for the heavy DamnService calls.
+
+Analyzing and transcoding run Blender, ffmpeg and friends, so they don't
+run on the server's threads but are handed to a :py:class:`WorkerPool`.
+The pool admits a fixed number of jobs (running plus queued), beyond that
+:py:meth:`WorkerPool.run` fails immediately with
+:py:class:`PoolBusyException` instead of letting callers pile up, which
+keeps server threads free for the cheap calls.
+
+Every job carries a deadline. A job that is still queued when its deadline
+passes is skipped by the worker, a caller stops waiting at the deadline.
+A job that is still running at its deadline is interrupted in the worker,
+taking the programs it started down with it, see
+:py:func:`damn_at.utilities.run_process`. A job that does not give up
+within the pool's grace period has its worker process killed, and its slot
+is given up after twice that, so hung jobs can't starve the pool.
+
+Jobs hand the statistics they gathered in the worker, like subprocess
+times, back to the :py:data:`damn_at.stats.STATS` of the calling process.
+
+Where the platform offers it, worker processes are started by a fork
+server, or spawned, rather than forked from the server: workers replacing
+killed ones are started while the server's threads run, and a forked copy
+would inherit the locks those threads held. Jobs and initializers must be
+picklable, module level functions either way.
+"""
+import os
+import time
+import signal
+import itertools
+import threading
+import multiprocessing
+from contextlib import contextmanager
+
+from damn_at.stats import STATS
+
+_DONE = 0
+_FAILED = 1
+_EXPIRED = 2
+_OVERRUN = 3
+
+GRACE = 15.0
+"""Seconds a job may run past its deadline before its worker is killed"""
+
+
+class PoolException(Exception):
+    """Base WorkerPool Exception"""
+    def __init__(self, msg):
+        Exception.__init__(self)
+        self.msg = msg
+
+    def __str__(self):
+        return repr(self.msg)
+
+
+class PoolBusyException(PoolException):
+    """The pool is saturated, the job was not started"""
+    def __init__(self, msg, retry_after):
+        PoolException.__init__(self, msg)
+        self.retry_after = retry_after
+
+
+class PoolDeadlineException(PoolException):
+    """The job did not finish before its deadline"""
+    pass
+
+
+class PoolJobException(PoolException):
+    """The job raised an exception"""
+    pass
+
+
+def _context():
+    """The multiprocessing context to start worker processes with, Python 2
+    only forks"""
+    get_context = getattr(multiprocessing, 'get_context', None)
+    if get_context is None:
+        return multiprocessing
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return get_context('forkserver')
+    return get_context('spawn')
+
+
+def _init_process(initializer, initargs):
+    """Runs when a worker process starts, the statistics it inherited
+    belong to the parent."""
+    STATS.drain()
+    if initializer is not None:
+        initializer(*initargs)
+
+
+class _DeadlineInterrupt(BaseException):
+    """Raised in a job that runs past its deadline, not an Exception so
+    the job's own error handling doesn't swallow it"""
+    pass
+
+
+@contextmanager
+def _watchdog(deadline, grace):
+    """Interrupt the job at its deadline, and exit the worker process if it
+    is still running grace seconds later. Pool workers run their jobs on
+    the main thread, so the alarm signal reaches them."""
+    if deadline is None or not hasattr(signal, 'setitimer'):
+        yield
+        return
+    fired = []
+
+    def alarm(signum, frame):  # pylint: disable=W0613
+        if fired:
+            # The pool replaces the worker process.
+            os._exit(1)
+        fired.append(True)
+        raise _DeadlineInterrupt()
+    previous = signal.signal(signal.SIGALRM, alarm)
+    signal.setitimer(signal.ITIMER_REAL, max(0.001, deadline - time.time()), grace)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _run_job(func, deadline, grace, args):
+    """Runs in the worker process, never raises so the pool always reports
+    back and exceptions don't need to be picklable."""
+    start = time.time()
+    if deadline is not None and start > deadline:
+        return _EXPIRED, None, 0.0, None
+    try:
+        with _watchdog(deadline, grace):
+            try:
+                value = func(*args)
+            except Exception as ex:  # pylint: disable=W0703
+                return _FAILED, getattr(ex, 'msg', None) or str(ex), time.time() - start, STATS.drain()
+    except _DeadlineInterrupt:
+        return _OVERRUN, None, time.time() - start, STATS.drain()
+    return _DONE, value, time.time() - start, STATS.drain()
+
+
+class WorkerPool(object):
+    """
+    A multiprocessing pool that admits at most `max_pending` jobs.
+
+    :param processes: the number of worker processes
+    :param max_pending: the number of jobs running or queued at any time
+    :param initializer: called in every worker process when it starts
+    :param name: the pool's statistics are kept as 'pool.<name>'
+    :param grace: seconds a job may run past its deadline before its
+                  worker process is killed
+    """
+    def __init__(self, processes, max_pending, initializer=None, initargs=(), name='pool', grace=GRACE):
+        self.processes = processes
+        self.name = name
+        self.max_pending = max(max_pending, processes)
+        self.grace = grace
+        self._initializer = initializer
+        self._initargs = initargs
+        self._pool = None
+        # Admitted jobs, and the time their slot is given up on, if any.
+        self._jobs = {}
+        self._job_ids = itertools.count()
+        self._lost = 0
+        self._duration = 1.0
+        self._busy = 0.0
+        self._started = time.time()
+        self._lock = threading.Lock()
+        STATS.gauge('pool.%s' % name, self.stats)
+
+    def start(self):
+        """Start the worker processes, call before starting any threads"""
+        with self._lock:
+            if self._pool is None:
+                self._pool = _context().Pool(self.processes, _init_process,
+                                             (self._initializer, self._initargs))
+                self._started = time.time()
+
+    def close(self):
+        """Let the submitted jobs finish and stop the worker processes"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+            if self._lost:
+                # The jobs of killed workers never finish, so joining would
+                # wait forever, wait for the others and terminate.
+                while self.pending:
+                    time.sleep(0.1)
+                pool.terminate()
+            pool.join()
+
+    @property
+    def pending(self):
+        """The number of jobs running or queued"""
+        with self._lock:
+            self._sweep()
+            return len(self._jobs)
+
+    def stats(self):
+        """
+        :rtype: dict processes, pending jobs, queued jobs, lost jobs whose
+                worker was killed and utilization, the share of time the
+                worker processes were busy
+        """
+        with self._lock:
+            self._sweep()
+            elapsed = time.time() - self._started
+            pending = len(self._jobs)
+            return {
+                'processes': self.processes,
+                'max_pending': self.max_pending,
+                'pending': pending,
+                'queued': max(0, pending - self.processes),
+                'lost': self._lost,
+                'utilization': self._busy / (elapsed * self.processes) if elapsed else 0.0,
+            }
+
+    def retry_after(self):
+        """Estimated seconds until a slot frees up"""
+        with self._lock:
+            return self._duration * max(1, len(self._jobs) - self.processes + 1) / self.processes
+
+    def _sweep(self):
+        """Give up the slots of jobs that never reported back, their worker
+        was killed, call with the lock held"""
+        now = time.time()
+        for job_id, limit in list(self._jobs.items()):
+            if limit is not None and limit < now:
+                del self._jobs[job_id]
+                self._lost += 1
+
+    def _admit(self, deadline):
+        """Admit a job, None if the pool is saturated
+
+        :rtype: int the job's id
+        """
+        with self._lock:
+            self._sweep()
+            if len(self._jobs) >= self.max_pending:
+                return None
+            job_id = next(self._job_ids)
+            self._jobs[job_id] = None if deadline is None else deadline + 2 * self.grace
+            return job_id
+
+    def _release(self, job_id, result):
+        with self._lock:
+            self._jobs.pop(job_id, None)
+            status, _, duration, stats = result
+            if status != _EXPIRED:
+                # Exponentially weighted average of the job durations.
+                self._duration = 0.8 * self._duration + 0.2 * duration
+                self._busy += duration
+        if stats:
+            STATS.merge(stats)
+        if status == _EXPIRED:
+            STATS.incr('pool.%s.expired' % self.name)
+        else:
+            STATS.record('pool.%s.job' % self.name, duration)
+        if status == _OVERRUN:
+            STATS.incr('pool.%s.overrun' % self.name)
+
+    def _submit(self, func, args, deadline, callback=None):
+        """Admit and queue a job
+
+        :param callback: called without arguments once the job is done
+        :rtype: multiprocessing.pool.AsyncResult
+        """
+        if self._pool is None:
+            self.start()
+        if deadline is not None and time.time() > deadline:
+            raise PoolDeadlineException('Deadline exceeded before the job was submitted')
+        job_id = self._admit(deadline)
+        if job_id is None:
+            STATS.incr('pool.%s.busy' % self.name)
+            raise PoolBusyException('%d jobs pending' % self.max_pending, self.retry_after())
+
+        def done(result):
+            self._release(job_id, result)
+            if callback:
+                callback()
+        try:
+            return self._pool.apply_async(_run_job, (func, deadline, self.grace, args), callback=done)
+        except Exception:
+            self._release(job_id, (_EXPIRED, None, 0.0, None))
+            raise
+
+    @staticmethod
+    def _result(async_result, deadline):
+        """Wait for a job's result until the deadline"""
+        timeout = None if deadline is None else max(0.0, deadline - time.time())
+        try:
+            status, value, _, _ = async_result.get(timeout)
+        except multiprocessing.TimeoutError:
+            raise PoolDeadlineException('Deadline exceeded')
+        if status == _EXPIRED:
+            raise PoolDeadlineException('Deadline exceeded before the job started')
+        if status == _OVERRUN:
+            raise PoolDeadlineException('Deadline exceeded')
+        if status == _FAILED:
+            raise PoolJobException(value)
+        return value
+
+    def run(self, func, args, deadline=None):
+        """Run func(*args) in a worker process and wait for its result
+
+        :param func: a picklable, module level function
+        :param deadline: :py:func:`time.time` by which the job must be done
+        :raises: PoolBusyException, PoolDeadlineException, PoolJobException
+        """
+        return self._result(self._submit(func, args, deadline), deadline)
+
+    def run_many(self, func, args_list, deadline=None):
+        """Run func(*args) for all args in args_list and wait for the results
+
+        A batch keeps at most one job per worker process in the pool, it
+        waits for its own jobs to finish rather than failing when they fill
+        the pool, leaving the rest of the queue to single calls.
+
+        :rtype: list<(value, :py:class:`PoolException`)> in the order of
+                args_list, one of both is None
+        """
+        window = threading.Condition()
+        running = [0]
+
+        def done():
+            with window:
+                running[0] -= 1
+                window.notify()
+
+        submitted = []
+        for args in args_list:
+            with window:
+                while running[0] >= self.processes:
+                    if deadline is not None and time.time() >= deadline:
+                        break
+                    window.wait(None if deadline is None else deadline - time.time())
+                running[0] += 1
+            try:
+                submitted.append(self._submit(func, args, deadline, done))
+            except PoolException as ex:
+                done()
+                submitted.append(ex)
+
+        results = []
+        for item in submitted:
+            if isinstance(item, PoolException):
+                results.append((None, item))
+                continue
+            try:
+                results.append((self._result(item, deadline), None))
+            except PoolException as ex:
+                results.append((None, ex))
+        return results
@@ -1,73 +1,1062 @@
 #!/usr/bin/env python
-"""DAMN Service server"""
- 
+"""
+DAMN Service server
+
+The server hands connections to a fixed pool of worker threads and can
+optionally pre-fork worker processes that share the listening socket, each
+with its own pool of threads. Every worker process owns one warm
+:py:class:`damn_at.Analyzer` and :py:class:`damn_at.Transcoder`, the
+responses that only depend on the loaded plugins are computed once.
+
+The analyze and transcode calls run on bounded process pools, see
+:py:mod:`damn_at.serialization.pool`, a saturated pool fails the call with
+the retryable ServerBusyException and every call has a deadline.
+Identical transcodes that arrive while one is running wait for it and
+share its result, transcodes done before are served from the
+:py:class:`damn_at.transcodecache.TranscodeCache`.
+
+Every call is timed, :py:meth:`DamnServiceHandler.get_stats` and the
+optional stats file report the statistics of the serving process, see
+:py:mod:`damn_at.stats`.
+
+SIGTERM and SIGINT stop the server gracefully: no new connections are
+accepted, calls that are being processed run to completion and idle
+connections are closed.
+"""
 import os
+import re
 import sys
+import time
+import shutil
+import uuid
+import hashlib
+import errno
+import select
+import signal
+import socket
+import tempfile
+import threading
 directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'generated')
 sys.path.append(directory)
- 
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
 from thrift.transport import TSocket
 from thrift.transport import TTransport
 from thrift.protocol import TBinaryProtocol
 from thrift.server import TServer
 
-from damn_at.thrift.generated.damn import DamnService
+from damn_at.serialization.generated.damn import DamnService
+from damn_at.serialization.generated.damn.ttypes import (
+    AnalyzerException,
+    TranscoderException,
+    ServerBusyException,
+    DeadlineExceededException,
+    UnknownFileException,
+    MissingBlocksException,
+    UploadException,
+    AnalyzeResult,
+    TranscodeRequest,
+    TranscodeResult,
+    JobState,
+    JobStatus,
+    JobException,
+    UnknownJobException
+)
+from damn_at.serialization.generated.damn_types.ttypes import File
 
+from damn_at import logger, FileDescription
+from damn_at.stats import STATS, StatsWriter, TimedProxy
+from damn_at.singleflight import SingleFlight, SingleFlightDeadlineException
+from damn_at.scheduler import SCHEDULER, parse_limits
 from damn_at.analyzer import Analyzer
+from damn_at.transcoder import Transcoder
+from damn_at.transcodecache import TranscodeCache, DEFAULT_MAX_SIZE
+from damn_at.metadatastore import MetaDataStore, MetaDataStoreException
+from damn_at.bld import blocks_to_file, filter_existing_block_hashes, write_block
+from damn_at.serialization import SerializeThriftMsg, DeserializeThriftMsg
+from damn_at.serialization import jobqueue
+from damn_at.serialization.pool import (
+    WorkerPool,
+    PoolBusyException,
+    PoolDeadlineException,
+    PoolJobException
+)
+from damn_at.utilities import (
+    calculate_hash_for_file,
+    get_referenced_file_ids,
+    find_asset_id_in_file_descr,
+    is_existing_file
+)
+
+DEFAULT_TIMEOUT = 300.0
+"""Deadline in seconds of calls that don't specify one"""
+
+DEFAULT_JOB_TIMEOUT = 3600.0
+"""Deadline in seconds of queued jobs, counted from when they start"""
+
+STATS_INTERVAL = 10.0
+"""Seconds between writes of the stats file"""
+
+UPLOAD_EXPIRY = 24 * 3600
+"""Seconds after which an unfinished upload is removed"""
+
+_JOB_STATES = {
+    jobqueue.QUEUED: JobState.QUEUED,
+    jobqueue.RUNNING: JobState.RUNNING,
+    jobqueue.DONE: JobState.DONE,
+    jobqueue.FAILED: JobState.FAILED,
+    jobqueue.CANCELLED: JobState.CANCELLED,
+}
+
+_HASH = re.compile('^[0-9a-f]{40}$')
+_UPLOAD_ID = re.compile('^[0-9a-f]{32}$')
+
+_WORKER = {}
+
+
+def _init_worker(transcode_path, cache_path, cache_size, store_path, scheduler_args):
+    """Build the warm Analyzer and Transcoder of a pool process"""
+    # Shutdown is driven by the server process.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    SCHEDULER.configure(*scheduler_args)
+    metadatastore = MetaDataStore(store_path)
+
+    def resolve(an_hash):
+        """The stored FileDescription of a dependency"""
+        if not _HASH.match(an_hash) or not metadatastore.is_in_store('', an_hash):
+            return None
+        try:
+            return metadatastore.get_metadata('', an_hash)
+        except MetaDataStoreException:
+            return None
+    _WORKER['analyzer'] = Analyzer()
+    _WORKER['transcoder'] = Transcoder(transcode_path, TranscodeCache(cache_path, cache_size), resolve)
+
+
+def _write_files(directory, files):
+    """Write (filename, data) tuples below directory, keeping relative
+    paths but never writing outside of it.
+
+    :rtype: list<string> the written paths
+    """
+    paths = []
+    for filename, data in files:
+        relpath = os.path.normpath(filename).lstrip('/')
+        if relpath.startswith('..'):
+            relpath = os.path.basename(relpath)
+        path = os.path.join(directory, relpath)
+        if not os.path.exists(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, 'wb') as a_file:
+            a_file.write(data or b'')
+        paths.append(path)
+    return paths
+
+
+def _hash_file_descr(file_descr):
+    """Calculate the hashes of all FileIds in the FileDescription"""
+    hashes = {}
+    for file_id in get_referenced_file_ids(file_descr):
+        if file_id.filename not in hashes and is_existing_file(file_id.filename):
+            hashes[file_id.filename] = calculate_hash_for_file(file_id.filename)
+        file_id.hash = hashes.get(file_id.filename, file_id.hash)
+
+
+def _analyze_file_job(path):
+    """Analyze a file in a temporary directory, runs in a pool process
+
+    :rtype: string the serialized FileDescription
+    """
+    file_descr = _WORKER['analyzer'].analyze_file(path)
+    _hash_file_descr(file_descr)
+    # Report the paths as the client knows them.
+    directory = os.path.dirname(path)
+    for file_id in get_referenced_file_ids(file_descr):
+        if file_id.filename and file_id.filename.startswith(directory + os.sep):
+            file_id.filename = os.path.relpath(file_id.filename, directory)
+    return SerializeThriftMsg(file_descr)
+
+
+def _analyze_job(filename, data):
+    """Analyze an uploaded file, runs in a pool process
+
+    :rtype: string the serialized FileDescription
+    """
+    directory = tempfile.mkdtemp(prefix='damn_at-analyze-')
+    try:
+        return _analyze_file_job(_write_files(directory, [(filename, data)])[0])
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def _asset_key(files, subname, asset_mimetype):
+    """Identifies an asset by the content of its files, not by where they
+    were uploaded to."""
+    digest = hashlib.sha1()
+    for filename, data in files:
+        # Filenames are byte strings on Python 2, they may be non-ASCII.
+        if not isinstance(filename, bytes):
+            filename = filename.encode('utf-8')
+        digest.update(filename + b':' + hashlib.sha1(data or b'').hexdigest().encode('ascii') + b'\n')
+    return '%s:%s:%s' % (digest.hexdigest(), subname, asset_mimetype)
+
+
+def _transcode_key(files, subname, asset_mimetype, mimetype, options):
+    """Identifies the outcome of a transcode call"""
+    return '%s:%s:%r' % (_asset_key(files, subname, asset_mimetype), mimetype, sorted(options.items()))
+
+
+def _transcode_assets_job(files, assets):
+    """Transcode several assets of uploaded files to several targets each,
+    runs in a pool process. The file is analyzed once, and loaded once for
+    all assets where the plugin supports it, see
+    :py:meth:`damn_at.Transcoder.transcode_assets`.
+
+    A target that fails doesn't fail the others, when the batch fails its
+    targets are transcoded one by one to find the failing ones. The outputs
+    are written to a directory of the job's own, so concurrent jobs never
+    read or remove each other's.
+
+    :param assets: list<(string, string, list<(string, dict)>)> the subname,
+                   mimetype, and target mimetypes and unparsed options
+    :rtype: list<list<(list<(string, string)>, string)>> the relative paths
+            and data of the results, or the error, of every target of
+            every asset
+    """
+    transcoder = _WORKER['transcoder']
+    directory = tempfile.mkdtemp(prefix='damn_at-transcode-')
+    output_path = tempfile.mkdtemp(prefix='damn_at-transcoded-')
+    try:
+        paths = _write_files(directory, files)
+        file_descr = _WORKER['analyzer'].analyze_file(paths[0])
+        _hash_file_descr(file_descr)
+        results = [[None] * len(targets) for _, _, targets in assets]
+        requests = []
+        for i, (subname, asset_mimetype, targets) in enumerate(assets):
+            asset_id = find_asset_id_in_file_descr(file_descr, subname, asset_mimetype)
+            for j, (mimetype, options) in enumerate(targets):
+                try:
+                    if asset_id is None:
+                        raise TranscoderException(msg='No asset %s(%s) in %s' % (subname, asset_mimetype, files[0][0]))
+                    route = transcoder.plan(asset_id.mimetype, mimetype)
+                    if route is None:
+                        raise TranscoderException(msg='Can not transcode %s to %s' % (asset_id.mimetype, mimetype))
+                    requests.append(((i, j), (asset_id, mimetype, transcoder.parse_route_options(route, **options),
+                                              route)))
+                except Exception as ex:  # pylint: disable=W0703
+                    results[i][j] = (None, _error_message(ex))
+        try:
+            outputs = transcoder.transcode_assets(file_descr, [request for _, request in requests], output_path)
+            outputs = [(file_paths, None) for file_paths in outputs]
+        except Exception:  # pylint: disable=W0703
+            outputs = []
+            for _, request in requests:
+                try:
+                    outputs.append((transcoder.transcode_assets(file_descr, [request], output_path)[0], None))
+                except Exception as ex:  # pylint: disable=W0703
+                    outputs.append((None, _error_message(ex)))
+        for ((i, j), request), (file_paths, error) in zip(requests, outputs):
+            if file_paths is False and error is None:
+                # The plugins report the targets that failed in a batch as False.
+                error = 'Transcoding %s(%s) to %s failed' % (request[0].subname, request[0].mimetype, request[1])
+            result = []
+            for file_path in file_paths or []:
+                with open(os.path.join(output_path, file_path), 'rb') as output:
+                    result.append((file_path, output.read()))
+            results[i][j] = (result if error is None else None, error)
+        return results
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+        shutil.rmtree(output_path, ignore_errors=True)
+
+
+def _error_message(ex):
+    return getattr(ex, 'msg', None) or str(ex)
+
+
+def _transcode_job(files, subname, asset_mimetype, mimetype, options):
+    """Transcode an asset of uploaded files, runs in a pool process, see
+    :py:func:`_transcode_assets_job`.
+
+    :rtype: list<(string, string)> the relative paths and data of the results
+    """
+    result, error = _transcode_assets_job(files, [(subname, asset_mimetype, [(mimetype, options)])])[0][0]
+    if error is not None:
+        raise TranscoderException(msg=error)
+    return result
+
 
-from damn_at.thrift.generated.damn_types.ttypes import TargetMimetype, TargetMimetypeOption
- 
-class DamnServiceHandler:
+class DamnServiceHandler(object):
     """DAMN Service Implementation"""
-    def __init__(self):
-        self.log = {}
+    def __init__(self, transcode_path=None, analyze_processes=2, transcode_processes=2,
+                 max_pending=None, default_timeout=DEFAULT_TIMEOUT, store_path=None, block_path=None,
+                 spool_path=None, job_path=None, stats_path=None, stats_interval=STATS_INTERVAL,
+                 cache_path=None, cache_size=DEFAULT_MAX_SIZE, cpus=None, limits=None,
+                 job_timeout=DEFAULT_JOB_TIMEOUT):
+        self.transcode_path = transcode_path or os.path.join(tempfile.gettempdir(), 'transcoded')
+        self.cache_path = cache_path or os.path.join(tempfile.gettempdir(), 'damn-transcode-cache')
+        self.metadatastore = MetaDataStore(store_path or os.path.join(tempfile.gettempdir(), 'damn'))
+        self.block_path = block_path or os.path.join(tempfile.gettempdir(), 'damn-blocks')
+        self.spool_path = spool_path or os.path.join(tempfile.gettempdir(), 'damn-spool')
+        self.jobs = jobqueue.JobQueue(job_path or os.path.join(tempfile.gettempdir(), 'damn-jobs.sqlite'))
+        self.job_runner = jobqueue.JobRunner(self.jobs, 'transcode', self._run_transcode_job,
+                                             threads=transcode_processes, timeout=job_timeout)
+        self.default_timeout = default_timeout
+        # All processes of the server share the tool slots and CPU budget.
+        scheduler_args = (os.path.join(self.transcode_path, '.locks', 'scheduler'), cpus, limits)
+        SCHEDULER.configure(*scheduler_args)
+        # Separate pools, so slow transcodes can't hold up analyzing.
+        worker_args = (self.transcode_path, self.cache_path, cache_size, self.metadatastore.store_path,
+                       scheduler_args)
+        self.analyze_pool = WorkerPool(analyze_processes, max_pending or 2 * analyze_processes,
+                                       _init_worker, worker_args, name='analyze')
+        self.transcode_pool = WorkerPool(transcode_processes, max_pending or 2 * transcode_processes,
+                                         _init_worker, worker_args, name='transcode')
+        STATS.gauge('jobs', self.jobs.counts)
+        self._transcodes = SingleFlight('rpc.transcode')
+        self.stats_path = stats_path
+        self.stats_interval = stats_interval
+        self._stats_writer = None
+        self._analyzer = None
+        self._transcoder = None
+        self._supported_mimetypes = None
+        self._target_mimetypes = None
+
+    @property
+    def analyzer(self):
+        """The :py:class:`damn_at.Analyzer` of this worker"""
+        if self._analyzer is None:
+            self._analyzer = Analyzer()
+        return self._analyzer
+
+    @property
+    def transcoder(self):
+        """The :py:class:`damn_at.Transcoder` of this worker"""
+        if self._transcoder is None:
+            self._transcoder = Transcoder(self.transcode_path)
+        return self._transcoder
+
+    def warm_up(self):
+        """Load the plugins and build the static responses up front, so
+        the first client doesn't pay for it and worker threads never race
+        on the lazy initialization."""
+        self.get_supported_mimetypes()
+        self.get_target_mimetypes()
+
+    @property
+    def max_pending(self):
+        """The number of heavy calls that can be in progress at once"""
+        return self.analyze_pool.max_pending + self.transcode_pool.max_pending
+
+    def start(self):
+        """Start the worker pools, call in the process that serves and
+        before the server starts its threads."""
+        self.analyze_pool.start()
+        self.transcode_pool.start()
+        self.job_runner.start()
+        if self.stats_path:
+            # '{pid}' keeps the files of pre-forked processes apart.
+            self._stats_writer = StatsWriter(self.stats_path.replace('{pid}', str(os.getpid())),
+                                             self.stats_interval)
+            self._stats_writer.start()
+
+    def close(self):
+        """Let the running jobs finish and stop the worker pools"""
+        self.job_runner.stop()
+        self.analyze_pool.close()
+        self.transcode_pool.close()
+        if self._stats_writer is not None:
+            self._stats_writer.stop()
+            self._stats_writer = None
+
+    def _timeout(self, timeout_ms):
+        return timeout_ms / 1000.0 if timeout_ms and timeout_ms > 0 else self.default_timeout
+
+    def _run(self, pool, exception, func, args, timeout_ms, key=None):
+        """Run a job on the pool, translating the pool's exceptions
+
+        :param key: coalesce the job with the identical transcodes in
+                    flight, see :py:func:`_transcode_key`
+        """
+        timeout = self._timeout(timeout_ms)
+        deadline = time.time() + timeout
+        try:
+            if key is None:
+                return pool.run(func, args, deadline)
+            return self._transcodes.do(key, lambda: pool.run(func, args, deadline), deadline)
+        except PoolBusyException as pbe:
+            raise ServerBusyException(msg='Server busy: %s' % pbe.msg,
+                                      retry_after_ms=int(pbe.retry_after * 1000))
+        except (PoolDeadlineException, SingleFlightDeadlineException) as ex:
+            raise DeadlineExceededException(msg='%s (%.1fs)' % (ex.msg, timeout))
+        except PoolJobException as pje:
+            raise exception(msg=pje.msg)
+
+    def _run_many(self, pool, func, args_list, timeout_ms):
+        """Run jobs on the pool
+
+        :rtype: list<(value, error message, retryable)>
+        """
+        results = []
+        for value, ex in pool.run_many(func, args_list, time.time() + self._timeout(timeout_ms)):
+            if ex is None:
+                results.append((value, None, None))
+            else:
+                results.append((None, ex.msg, not isinstance(ex, PoolJobException)))
+        return results
 
     def ping(self, ):
         """Implementation"""
-        print "ping()"
+        logger.debug("ping()")
+
+    def get_stats(self, ):
+        """Implementation"""
+        return STATS.to_json()
 
     def get_supported_mimetypes(self, ):
         """Implementation"""
-        return Analyzer().get_supported_mimetypes()
-    
+        if self._supported_mimetypes is None:
+            self._supported_mimetypes = sorted(self.analyzer.get_supported_mimetypes())
+        return self._supported_mimetypes
+
     def get_target_mimetypes(self, ):
         """Implementation"""
-        mimetypes = {}
-        
-        for source in Analyzer().get_supported_mimetypes():
-            option = TargetMimetypeOption(name='', description='', type='', constraint='', default_value='')
-            target = TargetMimetype(mimetype='target//'+source, description='', template='/x/x/')
-            target.options = [option]
-            mimetypes[source] = target
-        
-        return mimetypes
-        
-    def analyze(self, a_file):
+        if self._target_mimetypes is None:
+            self._target_mimetypes = self.transcoder.get_target_mimetypes()
+        return self._target_mimetypes
+
+    def _stored_file_descr(self, an_hash, size):
+        """Return the stored FileDescription for the hash if its size
+        matches, None otherwise."""
+        if not _HASH.match(an_hash or '') or not self.metadatastore.is_in_store('', an_hash):
+            STATS.incr('store.miss')
+            return None
+        try:
+            file_descr = self.metadatastore.get_metadata('', an_hash)
+        except MetaDataStoreException:
+            STATS.incr('store.miss')
+            return None
+        st_size = (file_descr.metadata or {}).get('st_size')
+        if size is not None and st_size is not None and st_size.int_value != size:
+            STATS.incr('store.miss')
+            return None
+        STATS.incr('store.hit')
+        return file_descr
+
+    def analyze_hash(self, an_hash, size):
+        """
+        Parameters:
+         - hash
+         - size
+        """
+        file_descr = self._stored_file_descr(an_hash, size)
+        if file_descr is None:
+            raise UnknownFileException(msg='No FileDescription for %s' % an_hash)
+        return file_descr
+
+    def analyze(self, a_file, timeout_ms=None):
         """
         Parameters:
          - file
+         - timeout_ms
+        """
+        data = a_file.data or b''
+        file_hash = hashlib.sha1(data).hexdigest()
+        file_descr = self._stored_file_descr(file_hash, len(data))
+        if file_descr is not None:
+            return file_descr
+        data = self._run(self.analyze_pool, AnalyzerException,
+                         _analyze_job, (a_file.filename, data), timeout_ms)
+        file_descr = DeserializeThriftMsg(FileDescription(), data)
+        self.metadatastore.write_metadata('', file_hash, file_descr)
+        return file_descr
+
+    def missing_blocks(self, block_hashes):
+        """
+        Parameters:
+         - block_hashes
         """
-        pass
+        block_hashes = [block_hash for block_hash in block_hashes if _HASH.match(block_hash)]
+        missing = filter_existing_block_hashes(self.block_path, block_hashes)
+        return sorted(missing)
 
+    def upload_blocks(self, blocks):
+        """
+        Parameters:
+         - blocks
+        """
+        for block_hash, data in blocks.items():
+            if not _HASH.match(block_hash) or not write_block(self.block_path, block_hash, data):
+                raise UploadException(msg='Block does not match its hash %s' % block_hash)
 
-def main(): 
-    """Start the server"""
-    handler = DamnServiceHandler()
-    processor = DamnService.Processor(handler)
-    transport = TSocket.TServerSocket(port=9090)
+    def analyze_blocks(self, filename, file_hash, block_hashes, timeout_ms=None):
+        """
+        Parameters:
+         - filename
+         - hash
+         - block_hashes
+         - timeout_ms
+        """
+        file_descr = self._stored_file_descr(file_hash, None)
+        if file_descr is not None:
+            return file_descr
+        if not all(_HASH.match(block_hash) for block_hash in block_hashes):
+            raise AnalyzerException(msg='Invalid block hashes for %s' % filename)
+        missing = self.missing_blocks(block_hashes)
+        if missing:
+            raise MissingBlocksException(msg='%d blocks missing' % len(missing), block_hashes=missing)
+
+        directory = tempfile.mkdtemp(prefix='damn_at-blocks-')
+        try:
+            path = os.path.join(directory, os.path.basename(filename) or 'file')
+            blocks_to_file(self.block_path, block_hashes, path)
+            if calculate_hash_for_file(path) != file_hash:
+                raise AnalyzerException(msg='The blocks of %s do not add up to %s' % (filename, file_hash))
+            data = self._run(self.analyze_pool, AnalyzerException,
+                             _analyze_file_job, (path,), timeout_ms)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+        file_descr = DeserializeThriftMsg(FileDescription(), data)
+        self.metadatastore.write_metadata('', file_hash, file_descr)
+        return file_descr
+
+    def analyze_many(self, files, timeout_ms=None):
+        """
+        Parameters:
+         - files
+         - timeout_ms
+        """
+        results = [None] * len(files)
+        jobs = []
+        for i, a_file in enumerate(files):
+            data = a_file.data or b''
+            file_hash = hashlib.sha1(data).hexdigest()
+            file_descr = self._stored_file_descr(file_hash, len(data))
+            if file_descr is not None:
+                results[i] = AnalyzeResult(file_description=file_descr)
+            else:
+                jobs.append((i, file_hash, (a_file.filename, data)))
+
+        outcomes = self._run_many(self.analyze_pool, _analyze_job, [args for _, _, args in jobs], timeout_ms)
+        for (i, file_hash, _), (data, error, retryable) in zip(jobs, outcomes):
+            if error is not None:
+                results[i] = AnalyzeResult(error=error, retryable=retryable)
+                continue
+            file_descr = DeserializeThriftMsg(FileDescription(), data)
+            self.metadatastore.write_metadata('', file_hash, file_descr)
+            results[i] = AnalyzeResult(file_description=file_descr)
+        return results
+
+    def transcode_many(self, requests, timeout_ms=None):
+        """
+        Parameters:
+         - requests
+         - timeout_ms
+        """
+        # Requests that are identical, here or to transcode calls and jobs in
+        # flight, are transcoded once.
+        deadline = time.time() + self._timeout(timeout_ms)
+        keys = []
+        args = {}
+        for request in requests:
+            request_args = ([(a_file.filename, a_file.data) for a_file in request.files or []],
+                            request.asset.subname, request.asset.mimetype, request.mimetype,
+                            dict(request.options or {}))
+            key = _transcode_key(*request_args)
+            keys.append(key)
+            args.setdefault(key, request_args)
+
+        results = []
+        for files, ex in self._transcodes.do_many(keys, lambda led: self._transcode_files(led, args, deadline),
+                                                  deadline):
+            if ex is not None:
+                # Targets fail one by one, and not for reasons a retry fixes.
+                results.append(TranscodeResult(error=_error_message(ex),
+                                               retryable=not isinstance(ex, PoolJobException)))
+            else:
+                results.append(TranscodeResult(files=[File(filename=filename, data=data)
+                                                      for filename, data in files]))
+        return results
+
+    def _transcode_files(self, keys, args, deadline):
+        """Transcode the requests of keys with one job per file, that loads
+        it once for all its assets
+
+        :param args: the arguments of :py:func:`_transcode_job` per key
+        :rtype: list<(list<(string, string)>, :py:class:`PoolException`)>
+                the relative paths and data of the results, or the error,
+                for every key
+        """
+        jobs = []
+        job_indexes = {}
+        positions = []
+        for key in keys:
+            files, subname, asset_mimetype, mimetype, options = args[key]
+            # Transcode keys start with the digest of the files.
+            file_key = key.partition(':')[0]
+            if file_key not in job_indexes:
+                job_indexes[file_key] = (len(jobs), {})
+                jobs.append((files, []))
+            job, asset_indexes = job_indexes[file_key]
+            assets = jobs[job][1]
+            if (subname, asset_mimetype) not in asset_indexes:
+                asset_indexes[subname, asset_mimetype] = len(assets)
+                assets.append((subname, asset_mimetype, []))
+            asset = asset_indexes[subname, asset_mimetype]
+            targets = assets[asset][2]
+            positions.append((job, asset, len(targets)))
+            targets.append((mimetype, options))
+
+        outcomes = self.transcode_pool.run_many(_transcode_assets_job, jobs, deadline)
+        results = []
+        for job, asset, target in positions:
+            value, ex = outcomes[job]
+            if ex is not None:
+                results.append((None, ex))
+                continue
+            files, error = value[asset][target]
+            results.append((files, None) if error is None else (None, PoolJobException(error)))
+        return results
+
+    def _run_transcode_job(self, data, deadline):
+        """Run a queued transcode job, see :py:class:`jobqueue.JobRunner`"""
+        request = DeserializeThriftMsg(TranscodeRequest(), data)
+        args = ([(a_file.filename, a_file.data) for a_file in request.files or []],
+                request.asset.subname, request.asset.mimetype, request.mimetype, dict(request.options or {}))
+        try:
+            results = self._transcodes.do(_transcode_key(*args),
+                                          lambda: self.transcode_pool.run(_transcode_job, args, deadline),
+                                          deadline)
+        except PoolBusyException as pbe:
+            raise jobqueue.JobRetryException(pbe.msg)
+        except PoolDeadlineException as pde:
+            if time.time() < deadline:
+                # An identical call with a shorter deadline gave up on it.
+                raise jobqueue.JobRetryException(pde.msg)
+            raise
+        return SerializeThriftMsg(TranscodeResult(files=[File(filename=filename, data=data)
+                                                         for filename, data in results]))
+
+    @staticmethod
+    def _job_status(status):
+        return JobStatus(job_id=status['id'], state=_JOB_STATES[status['state']], priority=status['priority'],
+                         attempts=status['attempts'], created=status['created'], started=status['started'],
+                         finished=status['finished'], error=status['error'])
+
+    def submit_transcode(self, request, priority=None):
+        """
+        Parameters:
+         - request
+         - priority
+        """
+        return self.jobs.submit('transcode', SerializeThriftMsg(request), priority or 0)
+
+    def job_status(self, job_id):
+        """
+        Parameters:
+         - job_id
+        """
+        try:
+            return self._job_status(self.jobs.status(job_id))
+        except jobqueue.UnknownJobException as uje:
+            raise UnknownJobException(msg=uje.msg)
+
+    def job_result(self, job_id):
+        """
+        Parameters:
+         - job_id
+        """
+        try:
+            state, data, error = self.jobs.result(job_id)
+        except jobqueue.UnknownJobException as uje:
+            raise UnknownJobException(msg=uje.msg)
+        if state != jobqueue.DONE:
+            raise JobException(msg=error or 'Job %s is %s' % (job_id, state), state=_JOB_STATES[state])
+        return DeserializeThriftMsg(TranscodeResult(), data).files
+
+    def cancel_job(self, job_id):
+        """
+        Parameters:
+         - job_id
+        """
+        try:
+            return self.jobs.cancel(job_id)
+        except jobqueue.UnknownJobException as uje:
+            raise UnknownJobException(msg=uje.msg)
+
+    def list_jobs(self, state=None, limit=None):
+        """
+        Parameters:
+         - state
+         - limit
+        """
+        states = dict((value, key) for key, value in _JOB_STATES.items())
+        return [self._job_status(status)
+                for status in self.jobs.list(states.get(state), limit or 100)]
+
+    def _upload_path(self, upload_id):
+        """The spooled file of an upload, the directory of an upload holds
+        exactly one file, so the analyzers see the original name."""
+        if _UPLOAD_ID.match(upload_id or ''):
+            directory = os.path.join(self.spool_path, upload_id)
+            if os.path.isdir(directory):
+                names = os.listdir(directory)
+                if len(names) == 1:
+                    return os.path.join(directory, names[0])
+        raise UploadException(msg='No such upload %s' % upload_id)
+
+    def _expire_uploads(self):
+        deadline = time.time() - UPLOAD_EXPIRY
+        for upload_id in os.listdir(self.spool_path):
+            directory = os.path.join(self.spool_path, upload_id)
+            try:
+                if os.path.getmtime(directory) < deadline:
+                    shutil.rmtree(directory, ignore_errors=True)
+            except OSError:
+                pass
+
+    def open_upload(self, filename):
+        """
+        Parameters:
+         - filename
+        """
+        if not os.path.exists(self.spool_path):
+            os.makedirs(self.spool_path)
+        self._expire_uploads()
+        upload_id = uuid.uuid4().hex
+        directory = os.path.join(self.spool_path, upload_id)
+        os.mkdir(directory)
+        open(os.path.join(directory, os.path.basename(filename or '') or 'file'), 'wb').close()
+        return upload_id
+
+    def append_upload(self, upload_id, offset, data):
+        """
+        Parameters:
+         - upload_id
+         - offset
+         - data
+        """
+        path = self._upload_path(upload_id)
+        size = os.path.getsize(path)
+        if offset + len(data) <= size:
+            # A retried chunk that was already written.
+            return size
+        if offset != size:
+            raise UploadException(msg='Upload %s is at %d, not at %d' % (upload_id, size, offset))
+        with open(path, 'ab') as spool:
+            spool.write(data)
+        os.utime(os.path.dirname(path), None)
+        return size + len(data)
+
+    def commit_upload(self, upload_id, file_hash, timeout_ms=None):
+        """
+        Parameters:
+         - upload_id
+         - hash
+         - timeout_ms
+        """
+        path = self._upload_path(upload_id)
+        done = True
+        try:
+            actual_hash = calculate_hash_for_file(path)
+            if file_hash and file_hash != actual_hash:
+                raise UploadException(msg='Upload %s does not match %s' % (upload_id, file_hash))
+            file_descr = self._stored_file_descr(actual_hash, os.path.getsize(path))
+            if file_descr is not None:
+                return file_descr
+            # The pool analyzes the spooled file in place.
+            data = self._run(self.analyze_pool, AnalyzerException,
+                             _analyze_file_job, (path,), timeout_ms)
+            file_descr = DeserializeThriftMsg(FileDescription(), data)
+            self.metadatastore.write_metadata('', actual_hash, file_descr)
+            return file_descr
+        except (ServerBusyException, DeadlineExceededException):
+            # Keep the upload, the client can commit it again.
+            done = False
+            raise
+        finally:
+            if done:
+                shutil.rmtree(os.path.dirname(path), ignore_errors=True)
+
+    def abort_upload(self, upload_id):
+        """
+        Parameters:
+         - upload_id
+        """
+        if _UPLOAD_ID.match(upload_id or ''):
+            shutil.rmtree(os.path.join(self.spool_path, upload_id), ignore_errors=True)
+
+    def transcode(self, files, asset, mimetype, options, timeout_ms=None):
+        """
+        Parameters:
+         - files
+         - asset
+         - mimetype
+         - options
+         - timeout_ms
+        """
+        if not files:
+            raise TranscoderException(msg='No files to transcode')
+        args = ([(a_file.filename, a_file.data) for a_file in files],
+                asset.subname, asset.mimetype, mimetype, dict(options or {}))
+        results = self._run(self.transcode_pool, TranscoderException, _transcode_job, args, timeout_ms,
+                            _transcode_key(*args))
+        return [File(filename=filename, data=data) for filename, data in results]
+
+
+class DamnServer(TServer.TServer):
+    """
+    Thread pool server that stops gracefully.
+
+    A connection is served by one worker thread until the client
+    disconnects. Between calls the worker polls the connection so it
+    notices :py:meth:`stop` without waiting for the client.
+    """
+    def __init__(self, processor, server_transport, transport_factory, protocol_factory,
+                 threads=10, poll_interval=0.5):
+        TServer.TServer.__init__(self, processor, server_transport, transport_factory, protocol_factory)
+        self.threads = threads
+        self.poll_interval = poll_interval
+        self.clients = queue.Queue()
+        self._stopping = threading.Event()
+        self._workers = []
+
+    def listen(self):
+        """Bind and listen, call before forking to share the socket"""
+        self.serverTransport.listen()
+
+    def serve(self, listen=True):
+        """Serve until :py:meth:`stop` is called, then wait for the
+        calls in progress.
+
+        :param listen: False when the server transport already listens
+        """
+        for _ in range(self.threads):
+            thread = threading.Thread(target=self._serve_thread)
+            thread.daemon = True
+            thread.start()
+            self._workers.append(thread)
+
+        if listen:
+            self.listen()
+        # Closing the socket does not wake a thread blocked in accept() on
+        # Linux, so accept with a timeout and check for stop in between.
+        self.serverTransport.handle.settimeout(self.poll_interval)
+        while not self._stopping.is_set():
+            try:
+                client = self.serverTransport.accept()
+            except socket.timeout:
+                continue
+            except Exception as ex:  # pylint: disable=W0703
+                if self._stopping.is_set():
+                    break
+                if getattr(ex, 'errno', None) != errno.EINTR:
+                    logger.exception(ex)
+                continue
+            if client is not None:
+                self.clients.put(client)
+
+        for _ in self._workers:
+            self.clients.put(None)
+        for thread in self._workers:
+            thread.join()
+        self._workers = []
+
+    def stop(self):
+        """Stop accepting connections, safe to call from a signal handler"""
+        self._stopping.set()
+        try:
+            self.serverTransport.close()
+        except Exception:  # pylint: disable=W0703
+            pass
+
+    def _serve_thread(self):
+        while True:
+            client = self.clients.get()
+            if client is None:
+                return
+            try:
+                self._serve_client(client)
+            except Exception as ex:  # pylint: disable=W0703
+                logger.exception(ex)
+
+    def _wait_for_call(self, client):
+        """Block until a call arrives on the connection or the server stops"""
+        while not self._stopping.is_set():
+            try:
+                readable, _, _ = select.select([client.handle], [], [], self.poll_interval)
+            except (select.error, ValueError):
+                return False
+            if readable:
+                return True
+        return False
+
+    def _serve_client(self, client):
+        itrans = self.inputTransportFactory.getTransport(client)
+        otrans = self.outputTransportFactory.getTransport(client)
+        iprot = self.inputProtocolFactory.getProtocol(itrans)
+        oprot = self.outputProtocolFactory.getProtocol(otrans)
+        try:
+            while self._wait_for_call(client):
+                self.processor.process(iprot, oprot)
+        except TTransport.TTransportException:
+            pass
+        finally:
+            itrans.close()
+            otrans.close()
+
+
+def _install_signal_handlers(handler):
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, handler)
+
+
+def serve_forked(server, processes, post_fork=None, pre_exit=None):
+    """Pre-fork `processes` workers that each run `server` on the shared
+    listening socket. The parent restarts workers that die and forwards
+    SIGTERM/SIGINT to them for a graceful shutdown.
+
+    :param post_fork: called in a worker before it starts serving
+    :param pre_exit: called in a worker after it stopped serving
+    """
+    server.listen()
+    children = set()
+    stopping = []
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            try:
+                if post_fork:
+                    post_fork()
+                _install_signal_handlers(lambda signum, frame: server.stop())
+                server.serve(listen=False)
+                if pre_exit:
+                    pre_exit()
+            finally:
+                os._exit(0)  # pylint: disable=W0212
+        children.add(pid)
+
+    def stop(signum, frame):
+        stopping.append(signum)
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                pass
+
+    for _ in range(processes):
+        spawn()
+    _install_signal_handlers(stop)
+
+    while children:
+        try:
+            pid, _ = os.waitpid(-1, 0)
+        except OSError as ose:
+            if ose.errno == errno.EINTR:
+                continue
+            break
+        children.discard(pid)
+        if not stopping:
+            logger.warn("Worker %d died, restarting it", pid)
+            time.sleep(0.1)
+            spawn()
+    server.serverTransport.close()
+
+
+def create_server(handler, host=None, port=9090, threads=10):
+    """Create a :py:class:`DamnServer` for the given handler, its calls
+    are recorded as 'rpc.<method>' in :py:data:`damn_at.stats.STATS`"""
+    processor = DamnService.Processor(TimedProxy(handler, 'rpc'))
+    transport = TSocket.TServerSocket(host=host, port=port)
     tfactory = TTransport.TBufferedTransportFactory()
     pfactory = TBinaryProtocol.TBinaryProtocolFactory()
+    return DamnServer(processor, transport, tfactory, pfactory, threads=threads)
+
+
+def main():
+    """Start the server"""
+    import argparse
+    import logging
+
+    parser = argparse.ArgumentParser(description='DAMN Service server')
+    parser.add_argument('--host', default=None, help='The address to listen on [default: all]')
+    parser.add_argument('--port', type=int, default=9090, help='The port to listen on [default: 9090]')
+    parser.add_argument('--threads', type=int, default=10, help='Worker threads per process [default: 10]')
+    parser.add_argument('--processes', type=int, default=0,
+                        help='Pre-forked worker processes, 0 serves from this process [default: 0]')
+    parser.add_argument('--transcode-path', dest='transcode_path', default=None,
+                        help='Where transcoded files are written')
+    parser.add_argument('--transcode-cache', dest='cache_path', default=None,
+                        help='Where transcoded files are cached')
+    parser.add_argument('--transcode-cache-size', dest='cache_size', type=int, default=DEFAULT_MAX_SIZE // 2 ** 20,
+                        help='Megabytes of transcoded files cached [default: %d]' % (DEFAULT_MAX_SIZE // 2 ** 20))
+    parser.add_argument('--store', dest='store_path', default=None,
+                        help='The metadata store that remembers analyzed files')
+    parser.add_argument('--blocks', dest='block_path', default=None,
+                        help='Where uploaded blocks are stored')
+    parser.add_argument('--spool', dest='spool_path', default=None,
+                        help='Where chunked uploads are spooled')
+    parser.add_argument('--jobs', dest='job_path', default=None,
+                        help='The SQLite database of the job queue')
+    parser.add_argument('--analyze-processes', dest='analyze_processes', type=int, default=2,
+                        help='Analyzer processes per server process [default: 2]')
+    parser.add_argument('--transcode-processes', dest='transcode_processes', type=int, default=2,
+                        help='Transcoder processes per server process [default: 2]')
+    parser.add_argument('--max-pending', dest='max_pending', type=int, default=None,
+                        help='Analyze or transcode calls running or queued per pool before '
+                             'calls are refused [default: twice the processes]')
+    parser.add_argument('--cpus', type=int, default=None,
+                        help='CPUs the external tools may use together [default: all]')
+    parser.add_argument('--limit', dest='limits', action='append', default=[], metavar='NAME=COUNT',
+                        help='Concurrent processes of a tool or transcodes of a plugin, '
+                             'like blender=2 or "Image Transcoder=4", may be repeated')
+    parser.add_argument('--stats-file', dest='stats_path', default=None,
+                        help='Write the statistics to this file periodically, '
+                             '{pid} is replaced by the process id')
+    parser.add_argument('--stats-interval', dest='stats_interval', type=float, default=STATS_INTERVAL,
+                        help='Seconds between writes of the stats file [default: %d]' % STATS_INTERVAL)
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help='Deadline in seconds of calls that specify none [default: %d]' % DEFAULT_TIMEOUT)
+    parser.add_argument('--job-timeout', dest='job_timeout', type=float, default=DEFAULT_JOB_TIMEOUT,
+                        help='Deadline in seconds of queued jobs once they start [default: %d]'
+                             % DEFAULT_JOB_TIMEOUT)
+    args = parser.parse_args()
+
+    logging.basicConfig(format='%(levelname)s:%(message)s', level=logging.INFO)
 
-    server = TServer.TSimpleServer(processor, transport, tfactory, pfactory)
+    # Warm up before forking, every worker process gets its own copy.
+    handler = DamnServiceHandler(args.transcode_path, args.analyze_processes, args.transcode_processes,
+                                 args.max_pending, args.timeout, args.store_path, args.block_path,
+                                 args.spool_path, args.job_path, args.stats_path, args.stats_interval,
+                                 args.cache_path, args.cache_size * 2 ** 20, args.cpus,
+                                 parse_limits(args.limits), args.job_timeout)
+    handler.warm_up()
+    if args.processes > 0 and args.stats_path and '{pid}' not in args.stats_path:
+        handler.stats_path += '.{pid}'
 
-    # You could do one of these for a multithreaded server
-    #server = TServer.TThreadedServer(processor, transport, tfactory, pfactory)
-    #server = TServer.TThreadPoolServer(processor, transport, tfactory, pfactory)
+    threads = args.threads
+    if threads <= handler.max_pending:
+        # Threads blocked on heavy calls must leave room for the cheap ones.
+        threads = handler.max_pending + args.threads
+        logger.warn("Raising the number of threads to %d", threads)
+    server = create_server(handler, args.host, args.port, threads)
 
-    print 'Starting the server...'
-    server.serve()
-    print 'done.'
+    print('Starting the server...')
+    if args.processes > 0:
+        serve_forked(server, args.processes, handler.start, handler.close)
+    else:
+        handler.start()
+        _install_signal_handlers(lambda signum, frame: server.stop())
+        server.serve()
+        handler.close()
+    print('done.')
 
 
-if __name__ == '__main__': 
+if __name__ == '__main__':
     main()
@@ -0,0 +1,186 @@
+"""
+Role
+====
+
+Coalescing of identical concurrent calls.
+
+While a call with some key is in flight, other calls with the same key
+don't start their own but wait for it and share its result or exception.
+A batch of keys is done by one call for the keys that aren't in flight,
+it shares their outcomes with single calls and other batches alike.
+With a lock directory, processes that share it also take turns on a key,
+so they never work on the same output files at once.
+"""
+import os
+import time
+import hashlib
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from damn_at.stats import STATS
+
+
+class SingleFlightDeadlineException(Exception):
+    """The call in flight did not finish before the waiting caller's
+    deadline"""
+    def __init__(self, msg):
+        Exception.__init__(self)
+        self.msg = msg
+
+    def __str__(self):
+        return repr(self.msg)
+
+
+class _Call(object):
+    """A call in flight"""
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """
+    Runs one call per key at a time and shares its outcome with the
+    callers that asked for the same key in the meantime.
+
+    :param name: coalesced calls are counted as '<name>.coalesced'
+    :param lock_path: the directory of the lock files shared between
+                      processes, None to only coalesce within this process
+    """
+    def __init__(self, name, lock_path=None):
+        self.name = name
+        self.lock_path = lock_path
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func, deadline=None):
+        """Call func() unless a call for key is in flight, in which case
+        wait for that one.
+
+        :param key: a string identifying the outcome of the call
+        :param deadline: :py:func:`time.time` until which to wait for a call
+                         in flight
+        :raises: SingleFlightDeadlineException
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            STATS.incr(self.name + '.coalesced')
+            self._wait(call, deadline)
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            with self._process_lock(key):
+                call.result = func()
+            return call.result
+        except Exception as ex:
+            call.error = ex
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def do_many(self, keys, func, deadline=None):
+        """Call func(keys) for the keys no call is in flight for, and wait
+        for the calls in flight for the others.
+
+        :param func: returns a list<(result, exception)> in the order of
+                     the keys it was called with, one of both None
+        :param deadline: see :py:meth:`do`
+        :rtype: list<(result, exception)> in the order of keys
+        """
+        calls = {}
+        led = []
+        with self._lock:
+            for key in keys:
+                if key in calls:
+                    continue
+                call = self._calls.get(key)
+                if call is None:
+                    call = self._calls[key] = _Call()
+                    led.append(key)
+                else:
+                    STATS.incr(self.name + '.coalesced')
+                calls[key] = call
+
+        if led:
+            try:
+                try:
+                    with self._process_locks(sorted(led)):
+                        outcomes = func(led)
+                except Exception as ex:  # pylint: disable=W0703
+                    outcomes = [(None, ex)] * len(led)
+                for key, (result, error) in zip(led, outcomes):
+                    calls[key].result, calls[key].error = result, error
+            finally:
+                with self._lock:
+                    for key in led:
+                        del self._calls[key]
+                for key in led:
+                    calls[key].done.set()
+
+        results = []
+        for key in keys:
+            call = calls[key]
+            try:
+                self._wait(call, deadline)
+            except SingleFlightDeadlineException as ex:
+                results.append((None, ex))
+            else:
+                results.append((call.result, call.error))
+        return results
+
+    @staticmethod
+    def _wait(call, deadline):
+        """Wait for a call in flight until the deadline"""
+        timeout = None if deadline is None else max(0.0, deadline - time.time())
+        if not call.done.wait(timeout):
+            raise SingleFlightDeadlineException('Deadline exceeded waiting for an identical call')
+
+    @contextmanager
+    def _process_locks(self, keys):
+        """Hold the lock files of all keys, take them in a fixed order so
+        batches don't deadlock each other"""
+        if not keys:
+            yield
+            return
+        with self._process_lock(keys[0]):
+            with self._process_locks(keys[1:]):
+                yield
+
+    @contextmanager
+    def _process_lock(self, key):
+        """Hold the lock file of the key"""
+        if self.lock_path is None or fcntl is None:
+            yield
+            return
+        if not os.path.exists(self.lock_path):
+            try:
+                os.makedirs(self.lock_path)
+            except OSError:
+                if not os.path.isdir(self.lock_path):
+                    raise
+        # Keys are byte strings on Python 2, they may hold non-ASCII filenames.
+        if not isinstance(key, bytes):
+            key = key.encode('utf-8')
+        path = os.path.join(self.lock_path, hashlib.sha1(key).hexdigest() + '.lock')
+        with open(path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -0,0 +1,340 @@
+"""
+Role
+====
+
+Columnar analytics snapshot of a :py:class:`damn_at.MetaDataStore`.
+
+Aggregate questions (vertices per project, image resolutions, size by
+mimetype) would otherwise need every FileDescription in the store to be
+deserialized one at a time. A snapshot materializes the store once into
+NumPy ``.npy`` columns which can be memory-mapped and scanned vectorized.
+
+Layout::
+
+    snapshot/
+        manifest.json       format version and the list of segments
+        dictionary.json     all strings, columns hold int32 codes into it
+        00000/
+            segment.json    row counts and columns of this segment
+            files.hash.npy  files.filename.npy  files.mimetype.npy
+            assets.file.npy assets.subname.npy  assets.mimetype.npy
+            <table>.meta.<n>.npy  one per metadata key and type
+
+Every :py:meth:`Snapshot.update` only deserializes the FileDescriptions
+that are not in the snapshot yet and writes them as a new segment, the
+existing segments are never rewritten.
+
+Missing values are marked with :py:data:`MISSING`, a per-type sentinel.
+"""
+import os
+import re
+import json
+import shutil
+
+import numpy
+
+from damn_at import MetaDataType
+from damn_at.utilities import get_metadatavalue_fieldname
+
+FORMAT_VERSION = 1
+
+_HEX = re.compile(r'^[0-9a-f]+$')
+
+MISSING = {
+    MetaDataType.BOOL: -1,
+    MetaDataType.INT: numpy.iinfo(numpy.int64).min,
+    MetaDataType.DOUBLE: numpy.nan,
+    MetaDataType.STRING: -1,
+}
+"""The value marking a missing metadata value in a column, per type"""
+
+_DTYPES = {
+    MetaDataType.BOOL: numpy.int8,
+    MetaDataType.INT: numpy.int64,
+    MetaDataType.DOUBLE: numpy.float64,
+    MetaDataType.STRING: numpy.int32,
+}
+
+_COLUMNS = {
+    'files': ('hash', 'filename', 'mimetype'),
+    'assets': ('file', 'subname', 'mimetype'),
+}
+"""The structural columns of the tables"""
+
+
+def _column_dtype(column):
+    return 'S40' if column == 'hash' else numpy.int64 if column == 'file' else numpy.int32
+
+
+class SnapshotException(Exception):
+    """Base Snapshot Exception"""
+    def __init__(self, msg):
+        Exception.__init__(self)
+        self.msg = msg
+
+    def __str__(self):
+        return repr(self.msg)
+
+
+def store_hashes(store_path):
+    """Yield the hashes of all FileDescriptions in the given store directory
+
+    :param store_path: the path of the :py:class:`damn_at.MetaDataStore`
+    :rtype: generator<string>
+    """
+    for prefix in sorted(os.listdir(store_path)):
+        path = os.path.join(store_path, prefix)
+        if not _HEX.match(prefix) or not os.path.isdir(path):
+            continue
+        for name in sorted(os.listdir(path)):
+            # Skip temporary files of writers in progress.
+            if _HEX.match(name):
+                yield prefix + name
+
+
+class _Dictionary(object):
+    """String to int32 code mapping, shared by all segments"""
+    def __init__(self, strings):
+        self.strings = strings
+        self.codes = dict((string, code) for code, string in enumerate(strings))
+
+    def code(self, string):
+        if string is None:
+            return -1
+        try:
+            return self.codes[string]
+        except KeyError:
+            code = len(self.strings)
+            self.strings.append(string)
+            self.codes[string] = code
+            return code
+
+
+class _TableBuilder(object):
+    """Collects the rows of the files or assets table of a new segment"""
+    def __init__(self, name, dictionary):
+        self.name = name
+        self.dictionary = dictionary
+        self.columns = {}
+        self.metadata = {}
+        self.rows = 0
+
+    def add_row(self, values, metadata):
+        for column, value in values.items():
+            self.columns.setdefault(column, []).append(value)
+        if metadata:
+            for key, metadata_value in metadata.items():
+                value_type = metadata_value.type
+                field = get_metadatavalue_fieldname(MetaDataType._VALUES_TO_NAMES[value_type])
+                value = getattr(metadata_value, field, None)
+                if value is None:
+                    continue
+                if value_type == MetaDataType.STRING:
+                    value = self.dictionary.code(value)
+                column = self.metadata.setdefault((key, value_type), {})
+                column[self.rows] = value
+        self.rows += 1
+
+    def write(self, path):
+        """Write the table's columns and return their descriptions"""
+        columns = []
+        for column, values in sorted(self.columns.items()):
+            file_name = '%s.%s.npy' % (self.name, column)
+            numpy.save(os.path.join(path, file_name), numpy.array(values, dtype=_column_dtype(column)))
+            columns.append({'table': self.name, 'column': column, 'file': file_name})
+        for i, ((key, value_type), values) in enumerate(sorted(self.metadata.items())):
+            file_name = '%s.meta.%d.npy' % (self.name, i)
+            array = numpy.empty(self.rows, dtype=_DTYPES[value_type])
+            array.fill(MISSING[value_type])
+            for row, value in values.items():
+                array[row] = value
+            numpy.save(os.path.join(path, file_name), array)
+            columns.append({'table': self.name, 'key': key,
+                            'type': MetaDataType._VALUES_TO_NAMES[value_type],
+                            'file': file_name})
+        return columns
+
+
+class Snapshot(object):
+    """
+    A columnar snapshot on disk.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._manifest = None
+        self._dictionary = None
+        self._segments = None
+
+    @property
+    def manifest(self):
+        """The snapshot's manifest"""
+        if self._manifest is None:
+            manifest_path = os.path.join(self.path, 'manifest.json')
+            if os.path.exists(manifest_path):
+                with open(manifest_path, 'r') as manifest:
+                    self._manifest = json.load(manifest)
+                if self._manifest.get('version') != FORMAT_VERSION:
+                    raise SnapshotException('Unsupported snapshot version %s in %s' % (self._manifest.get('version'), self.path))
+            else:
+                self._manifest = {'version': FORMAT_VERSION, 'segments': []}
+        return self._manifest
+
+    @property
+    def dictionary(self):
+        """List of all strings, string columns index into it"""
+        if self._dictionary is None:
+            dictionary_path = os.path.join(self.path, 'dictionary.json')
+            if os.path.exists(dictionary_path):
+                with open(dictionary_path, 'r') as dictionary:
+                    self._dictionary = json.load(dictionary)
+            else:
+                self._dictionary = []
+        return self._dictionary
+
+    def _segment_descriptions(self):
+        if self._segments is None:
+            self._segments = []
+            for segment in self.manifest['segments']:
+                with open(os.path.join(self.path, segment, 'segment.json'), 'r') as description:
+                    self._segments.append((segment, json.load(description)))
+        return self._segments
+
+    def _load(self, segment, file_name):
+        return numpy.load(os.path.join(self.path, segment, file_name), mmap_mode='r')
+
+    def rows(self, table):
+        """Number of rows in the 'files' or 'assets' table"""
+        return sum(description['rows'][table] for _, description in self._segment_descriptions())
+
+    def column(self, table, column):
+        """Return a structural column ('hash', 'filename', 'mimetype',
+        'file', 'subname') of the 'files' or 'assets' table.
+
+        'assets.file' holds row numbers into the files table, string
+        columns hold codes into :py:attr:`dictionary`.
+
+        :rtype: numpy.ndarray
+        """
+        if column not in _COLUMNS.get(table, ()):
+            raise SnapshotException('No column %s in table %s' % (column, table))
+        dtype = _column_dtype(column)
+        arrays = []
+        for segment, description in self._segment_descriptions():
+            for entry in description['columns']:
+                if entry['table'] == table and entry.get('column') == column:
+                    arrays.append(self._load(segment, entry['file']))
+                    break
+            else:
+                # A segment without rows in the table, like one of files
+                # without assets, has no columns for it.
+                if description['rows'][table]:
+                    raise SnapshotException('No column %s in table %s of segment %s' % (column, table, segment))
+                arrays.append(numpy.empty(0, dtype=dtype))
+        return self._concatenate(arrays, dtype)
+
+    def metadata(self, table, key, value_type):
+        """Return the column of a metadata key of the 'files' or 'assets'
+        table, rows without the key hold :py:data:`MISSING` [value_type].
+
+        :param value_type: :py:class:`damn_at.MetaDataType`
+        :rtype: numpy.ndarray
+        """
+        type_name = MetaDataType._VALUES_TO_NAMES[value_type]
+        arrays = []
+        for segment, description in self._segment_descriptions():
+            for entry in description['columns']:
+                if entry['table'] == table and entry.get('key') == key and entry.get('type') == type_name:
+                    arrays.append(self._load(segment, entry['file']))
+                    break
+            else:
+                missing = numpy.empty(description['rows'][table], dtype=_DTYPES[value_type])
+                missing.fill(MISSING[value_type])
+                arrays.append(missing)
+        return self._concatenate(arrays, _DTYPES[value_type])
+
+    def metadata_keys(self, table):
+        """Return the set of (key, type name) metadata columns of a table"""
+        keys = set()
+        for _, description in self._segment_descriptions():
+            for entry in description['columns']:
+                if entry['table'] == table and 'key' in entry:
+                    keys.add((entry['key'], entry['type']))
+        return keys
+
+    def strings(self, codes):
+        """Decode a column of dictionary codes into strings"""
+        return [self.dictionary[code] if code >= 0 else None for code in codes]
+
+    @staticmethod
+    def _concatenate(arrays, dtype):
+        if len(arrays) == 1:
+            return arrays[0]
+        if not arrays:
+            return numpy.empty(0, dtype=dtype)
+        return numpy.concatenate(arrays)
+
+    def update(self, metadatastore, rebuild=False):
+        """Add all FileDescriptions of the store that are not in this
+        snapshot yet as a new segment.
+
+        :param metadatastore: :py:class:`damn_at.MetaDataStore`
+        :param rebuild: discard the existing segments first
+        :rtype: int the number of FileDescriptions added
+        """
+        if rebuild:
+            for segment in self.manifest['segments']:
+                shutil.rmtree(os.path.join(self.path, segment), ignore_errors=True)
+            self._manifest = {'version': FORMAT_VERSION, 'segments': []}
+            self._dictionary = []
+            self._segments = None
+
+        known = set()
+        file_rows = self.rows('files')
+        if file_rows:
+            known = set(file_hash.decode('ascii') if isinstance(file_hash, bytes) else file_hash
+                        for file_hash in self.column('files', 'hash'))
+
+        dictionary = _Dictionary(list(self.dictionary))
+        files = _TableBuilder('files', dictionary)
+        assets = _TableBuilder('assets', dictionary)
+
+        for an_hash in store_hashes(metadatastore.store_path):
+            if an_hash in known:
+                continue
+            file_descr = metadatastore.get_metadata('', an_hash)
+            file_row = file_rows + files.rows
+            files.add_row({'hash': an_hash,
+                           'filename': dictionary.code(file_descr.file.filename if file_descr.file else None),
+                           'mimetype': dictionary.code(file_descr.mimetype)},
+                          file_descr.metadata)
+            for asset_descr in file_descr.assets or []:
+                assets.add_row({'file': file_row,
+                                'subname': dictionary.code(asset_descr.asset.subname),
+                                'mimetype': dictionary.code(asset_descr.asset.mimetype)},
+                               asset_descr.metadata)
+
+        if not files.rows:
+            return 0
+
+        segment = '%05d' % len(self.manifest['segments'])
+        segment_path = os.path.join(self.path, segment)
+        if not os.path.exists(segment_path):
+            os.makedirs(segment_path)
+        description = {'rows': {'files': files.rows, 'assets': assets.rows},
+                       'columns': files.write(segment_path) + assets.write(segment_path)}
+        with open(os.path.join(segment_path, 'segment.json'), 'w') as segment_file:
+            json.dump(description, segment_file)
+
+        # Write the dictionary before the manifest that makes the segment visible.
+        self._dictionary = dictionary.strings
+        self._write_json('dictionary.json', self._dictionary)
+        self.manifest['segments'].append(segment)
+        self._write_json('manifest.json', self.manifest)
+        self._segments = None
+        return files.rows
+
+    def _write_json(self, name, data):
+        path = os.path.join(self.path, name)
+        with open(path + '.tmp', 'w') as json_file:
+            json.dump(data, json_file)
+        os.rename(path + '.tmp', path)
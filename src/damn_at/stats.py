@@ -0,0 +1,269 @@
+"""
+Role
+====
+
+Runtime statistics: call counts, latency histograms, counters and gauges.
+
+Latencies go into :py:class:`Histogram`, a log-linear histogram in the
+spirit of HdrHistogram: constant memory, about 3% relative error and
+histograms of different processes can be merged. Every process has one
+:py:data:`STATS` registry, worker processes hand theirs to the parent with
+:py:meth:`Stats.drain` and :py:meth:`Stats.merge`.
+
+Caches count their lookups as '<name>.hit' and '<name>.miss', the snapshot
+reports the hit rate of every cache.
+"""
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+_SUB_BUCKET_BITS = 5
+_SUB_BUCKETS = 1 << (_SUB_BUCKET_BITS + 1)
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def _bucket(value):
+    """The bucket of a non negative integer value"""
+    shift = max(0, value.bit_length() - _SUB_BUCKET_BITS - 1)
+    return shift * _SUB_BUCKETS + (value >> shift)
+
+
+def _bucket_value(bucket):
+    """The highest value that falls in the bucket"""
+    shift, mantissa = divmod(bucket, _SUB_BUCKETS)
+    return ((mantissa + 1) << shift) - 1
+
+
+class Histogram(object):
+    """
+    Log-linear histogram of durations, recorded in microseconds.
+    """
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, seconds):
+        """Record a duration in seconds"""
+        value = max(0, int(seconds * 1000000))
+        bucket = _bucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        """Add the recordings of another histogram"""
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percentile):
+        """The duration in seconds below which percentile % of the
+        recordings fall"""
+        if not self.count:
+            return 0.0
+        rank = percentile / 100.0 * self.count
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min(_bucket_value(bucket), self.max) / 1000000.0
+        return self.max / 1000000.0
+
+    def summary(self):
+        """:rtype: dict count, total, mean, max and percentiles in seconds"""
+        summary = {
+            'count': self.count,
+            'total': self.total / 1000000.0,
+            'mean': self.total / 1000000.0 / self.count if self.count else 0.0,
+            'max': self.max / 1000000.0,
+        }
+        for percentile in PERCENTILES:
+            summary['p%s' % ('%g' % percentile).replace('.', '')] = self.percentile(percentile)
+        return summary
+
+    def to_dict(self):
+        return {'counts': list(self.counts.items()), 'count': self.count,
+                'total': self.total, 'max': self.max}
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls()
+        histogram.counts = dict((int(bucket), count) for bucket, count in data['counts'])
+        histogram.count = data['count']
+        histogram.total = data['total']
+        histogram.max = data['max']
+        return histogram
+
+
+class Stats(object):
+    """
+    Thread-safe registry of histograms, counters and gauges.
+    """
+    def __init__(self):
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+        self._gauges = {}
+
+    def record(self, name, seconds):
+        """Record a duration in the histogram with the given name"""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.record(seconds)
+
+    def incr(self, name, amount=1):
+        """Add to the counter with the given name"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def gauge(self, name, func):
+        """Register a callable that returns the current value of a gauge"""
+        with self._lock:
+            self._gauges[name] = func
+
+    @contextmanager
+    def timed(self, name):
+        """Record the duration of the with block, '<name>.errors' counts
+        the blocks that raised."""
+        start = time.time()
+        try:
+            yield
+        except:
+            self.incr(name + '.errors')
+            raise
+        finally:
+            self.record(name, time.time() - start)
+
+    def drain(self):
+        """Return the histograms and counters and reset them, to pass them
+        on to another process.
+
+        :rtype: dict see :py:meth:`merge`
+        """
+        with self._lock:
+            histograms, self._histograms = self._histograms, {}
+            counters, self._counters = self._counters, {}
+        return {'histograms': dict((name, histogram.to_dict()) for name, histogram in histograms.items()),
+                'counters': counters}
+
+    def merge(self, drained):
+        """Add what another process :py:meth:`drain` -ed"""
+        with self._lock:
+            for name, data in drained['histograms'].items():
+                histogram = self._histograms.get(name)
+                if histogram is None:
+                    histogram = self._histograms[name] = Histogram()
+                histogram.merge(Histogram.from_dict(data))
+            for name, amount in drained['counters'].items():
+                self._counters[name] = self._counters.get(name, 0) + amount
+
+    def snapshot(self):
+        """:rtype: dict a JSON serializable view of all statistics"""
+        with self._lock:
+            histograms = dict((name, histogram.summary()) for name, histogram in self._histograms.items())
+            counters = dict(self._counters)
+            gauges = list(self._gauges.items())
+        snapshot = {
+            'pid': os.getpid(),
+            'time': time.time(),
+            'uptime': time.time() - self.started,
+            'histograms': histograms,
+            'counters': counters,
+            'hit_rates': {},
+            'gauges': {},
+        }
+        for name, hits in counters.items():
+            if name.endswith('.hit'):
+                lookups = hits + counters.get(name[:-4] + '.miss', 0)
+                snapshot['hit_rates'][name[:-4]] = float(hits) / lookups
+        for name, func in gauges:
+            try:
+                snapshot['gauges'][name] = func()
+            except Exception as ex:  # pylint: disable=W0703
+                snapshot['gauges'][name] = str(ex)
+        return snapshot
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), sort_keys=True)
+
+
+STATS = Stats()
+"""The statistics of this process"""
+
+
+class TimedProxy(object):
+    """
+    Wraps an object so that calls of its methods are timed in
+    '<prefix>.<method>' and counted as in flight while they run.
+    """
+    def __init__(self, target, prefix, stats=STATS):
+        self._target = target
+        self._prefix = prefix
+        self._stats = stats
+        self._inflight = {}
+        self._lock = threading.Lock()
+        stats.gauge(prefix + '.inflight', lambda: dict(self._inflight))
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        def timed(*args, **kwargs):
+            with self._lock:
+                self._inflight[name] = self._inflight.get(name, 0) + 1
+            try:
+                with self._stats.timed('%s.%s' % (self._prefix, name)):
+                    return attr(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._inflight[name] -= 1
+        return timed
+
+
+class StatsWriter(object):
+    """
+    Periodically writes the statistics as JSON to a file.
+    """
+    def __init__(self, path, interval=10.0, stats=STATS):
+        self.path = path
+        self.interval = interval
+        self.stats = stats
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stop and write the statistics one last time"""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def write(self):
+        if not os.path.exists(os.path.dirname(os.path.abspath(self.path))):
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)))
+        with open(self.path + '.tmp', 'w') as stats_file:
+            stats_file.write(self.stats.to_json())
+        os.rename(self.path + '.tmp', self.path)
+
+    def _run(self):
+        while not self._stopping.wait(self.interval):
+            self.write()
+        self.write()
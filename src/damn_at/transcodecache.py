@@ -0,0 +1,213 @@
+"""
+Role
+====
+
+Content addressed cache of transcoded files.
+
+A transcode is identified by the hash of the asset's file, the hashes of
+all files it transitively depends on (textures, linked libraries), the
+target mimetype, the options and the plugin's version, see
+:py:func:`cache_key`. The outputs are kept below the cache directory and
+listed in a SQLite manifest, which is shared by all processes using the
+same directory. When the outputs exceed the size limit the least recently
+used are removed.
+"""
+import os
+import time
+import json
+import uuid
+import shutil
+import hashlib
+import sqlite3
+import threading
+
+from damn_at.stats import STATS
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS outputs (
+    key TEXT PRIMARY KEY,
+    files TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outputs_lru ON outputs (last_used);
+'''
+
+DEFAULT_MAX_SIZE = 1024 * 1024 * 1024
+"""Bytes of outputs kept before the least recently used are removed"""
+
+
+def _find_asset_descr(file_descr, asset_id):
+    for asset_descr in file_descr.assets or []:
+        if asset_descr.asset.subname == asset_id.subname and asset_descr.asset.mimetype == asset_id.mimetype:
+            return asset_descr
+
+
+def dependency_hashes(file_descr, asset_id, resolve=None):
+    """The file hashes of everything the asset transitively depends on
+
+    :param resolve: returns the FileDescription of a file hash or None,
+                    to follow dependencies into other files
+    :rtype: list<string> sorted hashes, None if a dependency has no hash
+    """
+    hashes = set()
+    file_descrs = {file_descr.file.hash: file_descr} if file_descr.file else {}
+    todo = [asset_id]
+    seen = set()
+    while todo:
+        current = todo.pop()
+        file_hash = current.file.hash if current.file else None
+        if not file_hash:
+            return None
+        if (file_hash, current.subname, current.mimetype) in seen:
+            continue
+        seen.add((file_hash, current.subname, current.mimetype))
+        hashes.add(file_hash)
+        if file_hash not in file_descrs:
+            file_descrs[file_hash] = resolve(file_hash) if resolve else None
+        if file_descrs[file_hash] is None:
+            continue
+        asset_descr = _find_asset_descr(file_descrs[file_hash], current)
+        if asset_descr is not None:
+            todo.extend(asset_descr.dependencies or [])
+    hashes.discard(asset_id.file.hash)
+    return sorted(hashes)
+
+
+def _normalize(value):
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def cache_key(file_descr, asset_id, mimetype, options, version, resolve=None):
+    """
+    :param options: the parsed options, see :py:func:`damn_at.options.parse_options`
+    :param version: identifies the plugin and its version
+    :rtype: string the key, None when the asset can't be cached because
+            not all files involved have a hash
+    """
+    dependencies = dependency_hashes(file_descr, asset_id, resolve)
+    if not asset_id.file.hash or dependencies is None:
+        return None
+    key = json.dumps([asset_id.file.hash, asset_id.subname, asset_id.mimetype, dependencies, mimetype,
+                      sorted((name, _normalize(value)) for name, value in options.items()), version])
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def _copy(src, dst):
+    """Copy src to dst. Not a hard link: plugins rewrite their outputs in
+    place, which would change the cached copy too."""
+    if not os.path.exists(os.path.dirname(dst)):
+        os.makedirs(os.path.dirname(dst))
+    if os.path.exists(dst):
+        # It may still be a link to a cached file.
+        os.remove(dst)
+    shutil.copyfile(src, dst)
+
+
+class TranscodeCache(object):
+    """
+    Size bounded cache of transcoded files, safe to use from several
+    threads and processes at once.
+
+    :param path: the cache directory
+    :param max_size: bytes of outputs kept
+    """
+    def __init__(self, path, max_size=DEFAULT_MAX_SIZE):
+        self.path = path
+        self.max_size = max_size
+        if not os.path.exists(path):
+            os.makedirs(path)
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.executescript(_SCHEMA)
+
+    def _connection(self):
+        """The connection of the calling thread, connections are not
+        shared with forked processes."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(os.path.join(self.path, 'manifest.sqlite'), timeout=30)
+            connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _output_dir(self, key):
+        return os.path.join(self.path, key[:2], key)
+
+    def get(self, key, dest_path):
+        """Put the cached outputs of key below dest_path
+
+        :rtype: list<string> the outputs' paths relative to dest_path,
+                None when they're not cached
+        """
+        with self._connection() as connection:
+            row = connection.execute('SELECT files FROM outputs WHERE key = ?', (key,)).fetchone()
+            if row is not None:
+                connection.execute('UPDATE outputs SET last_used = ? WHERE key = ?', (time.time(), key))
+        if row is None:
+            STATS.incr('transcode_cache.miss')
+            return None
+        file_paths = json.loads(row[0])
+        try:
+            for file_path in file_paths:
+                _copy(os.path.join(self._output_dir(key), file_path), os.path.join(dest_path, file_path))
+        except (OSError, IOError):
+            # Evicted in the meantime.
+            STATS.incr('transcode_cache.miss')
+            return None
+        STATS.incr('transcode_cache.hit')
+        return file_paths
+
+    def put(self, key, dest_path, file_paths):
+        """Cache the outputs below dest_path and evict the least recently
+        used outputs beyond the size limit"""
+        tmp_dir = os.path.join(self.path, 'tmp-' + uuid.uuid4().hex)
+        size = 0
+        try:
+            for file_path in file_paths:
+                _copy(os.path.join(dest_path, file_path), os.path.join(tmp_dir, file_path))
+                size += os.path.getsize(os.path.join(tmp_dir, file_path))
+            output_dir = self._output_dir(key)
+            if not os.path.exists(os.path.dirname(output_dir)):
+                os.makedirs(os.path.dirname(output_dir))
+            try:
+                os.rename(tmp_dir, output_dir)
+            except OSError:
+                # Another process cached the same outputs.
+                if not os.path.isdir(output_dir):
+                    raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        with self._connection() as connection:
+            connection.execute('INSERT OR REPLACE INTO outputs (key, files, size, last_used) VALUES (?, ?, ?, ?)',
+                               (key, json.dumps(list(file_paths)), size, time.time()))
+        self.evict()
+
+    def size(self):
+        """:rtype: int the bytes of all outputs"""
+        return self._connection().execute('SELECT COALESCE(SUM(size), 0) FROM outputs').fetchone()[0]
+
+    def evict(self):
+        """Remove the least recently used outputs until they fit"""
+        evicted = []
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            total = connection.execute('SELECT COALESCE(SUM(size), 0) FROM outputs').fetchone()[0]
+            if total > self.max_size:
+                for key, size in connection.execute('SELECT key, size FROM outputs ORDER BY last_used').fetchall():
+                    if total <= self.max_size:
+                        break
+                    evicted.append(key)
+                    total -= size
+                connection.executemany('DELETE FROM outputs WHERE key = ?', [(key,) for key in evicted])
+            connection.commit()
+        except:
+            connection.rollback()
+            raise
+        for key in evicted:
+            shutil.rmtree(self._output_dir(key), ignore_errors=True)
+        STATS.incr('transcode_cache.evicted', len(evicted))
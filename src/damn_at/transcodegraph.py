@@ -0,0 +1,102 @@
+"""
+Role
+====
+
+The graph of all mimetype conversions the transcoder plugins offer.
+
+Every entry of a plugin's convert_map is an edge. The cost of an edge is
+the time it took on average, learned from the transcodes done so far, so
+:py:meth:`TranscodeGraph.plan` finds the cheapest route to a mimetype, be
+it a direct conversion or a few hops through intermediate mimetypes, like
+video to png to a sized jpeg.
+"""
+import heapq
+import threading
+
+DEFAULT_COST = 1.0
+"""Seconds assumed for an edge that wasn't timed yet"""
+
+HOP_COST = 0.1
+"""Seconds added for every hop, for writing and reading the intermediate"""
+
+MAX_HOPS = 3
+
+
+class TranscodeGraph(object):
+    """
+    Conversions between mimetypes with learned costs, thread-safe.
+    """
+    def __init__(self, default_cost=DEFAULT_COST):
+        self.default_cost = default_cost
+        self._edges = {}
+        self._costs = {}
+        self._lock = threading.Lock()
+
+    def add_edge(self, src_mimetype, target_mimetype, plugin):
+        """The plugin converts src_mimetype to the :py:class:`damn_at.TargetMimetype`"""
+        self._edges.setdefault(src_mimetype, []).append((target_mimetype, plugin))
+
+    def edges(self, src_mimetype):
+        """:rtype: list<(TargetMimetype, plugin)> the conversions of src_mimetype"""
+        return self._edges.get(src_mimetype, [])
+
+    def sources(self):
+        """:rtype: list<string> the mimetypes with conversions"""
+        return list(self._edges)
+
+    @staticmethod
+    def _key(src_mimetype, target_mimetype, plugin):
+        return getattr(plugin, 'name', id(plugin)), src_mimetype, target_mimetype.mimetype
+
+    def cost(self, src_mimetype, target_mimetype, plugin):
+        """Estimated seconds of a conversion"""
+        with self._lock:
+            return self._costs.get(self._key(src_mimetype, target_mimetype, plugin), self.default_cost)
+
+    def record(self, src_mimetype, target_mimetype, plugin, seconds):
+        """Learn from the time a conversion took"""
+        key = self._key(src_mimetype, target_mimetype, plugin)
+        with self._lock:
+            if key in self._costs:
+                # Exponentially weighted average, recent timings count most.
+                self._costs[key] = 0.8 * self._costs[key] + 0.2 * seconds
+            else:
+                self._costs[key] = seconds
+
+    def _search(self, src_mimetype, max_hops):
+        """Dijkstra from src_mimetype, yields (mimetype, route) cheapest first"""
+        heap = [(0.0, 0, src_mimetype, [])]
+        counter = 1
+        done = set()
+        while heap:
+            cost, _, mimetype, route = heapq.heappop(heap)
+            if route:
+                if mimetype in done:
+                    continue
+                done.add(mimetype)
+                yield mimetype, route
+            if len(route) == max_hops:
+                continue
+            for target_mimetype, plugin in self.edges(mimetype):
+                if target_mimetype.mimetype in done:
+                    continue
+                hop_cost = self.cost(mimetype, target_mimetype, plugin) + HOP_COST
+                heapq.heappush(heap, (cost + hop_cost, counter, target_mimetype.mimetype,
+                                      route + [(mimetype, target_mimetype, plugin)]))
+                counter += 1
+
+    def plan(self, src_mimetype, mimetype, max_hops=MAX_HOPS):
+        """The cheapest route from src_mimetype to mimetype
+
+        :rtype: list<(string, TargetMimetype, plugin)> the source mimetype,
+                target and plugin of every hop, None if there is no route
+        """
+        for reached, route in self._search(src_mimetype, max_hops):
+            if reached == mimetype:
+                return route
+        return None
+
+    def reachable(self, src_mimetype, max_hops=MAX_HOPS):
+        """:rtype: dict<string, route> the cheapest route to every mimetype
+        src_mimetype can be converted to, see :py:meth:`plan`"""
+        return dict(self._search(src_mimetype, max_hops))
@@ -5,13 +5,22 @@ Transcoder convience class to find the right plugin for a mimetype
 and address it.
 """
 import os
+import time
+import shutil
+import tempfile
 
 from .pluginmanager import DAMNPluginManagerSingleton
+from .singleflight import SingleFlight
+from . import scheduler
+from .transcodecache import cache_key, dependency_hashes
+from .transcodegraph import TranscodeGraph
 
 from damn_at import TargetMimetype, TargetMimetypeOption
+from damn_at import FileId, FileDescription, AssetDescription, AssetId
 from .options import options_to_template, parse_options
 
 from .utilities import (
+    calculate_hash_for_file,
     find_asset_ids_in_file_descr,
     get_asset_names_in_file_descr
 )
@@ -42,12 +51,42 @@ class TranscoderUnknownAssetException(TranscoderException):
     pass
 
 
+def transcode_key(asset_id, mimetype, dependencies, **options):
+    """Identifies the outcome of transcoding the asset with the options
+
+    :param dependencies: the hashes of the files the asset depends on, see
+                         :py:func:`damn_at.transcodecache.dependency_hashes`
+    """
+    return '%s:%s:%s:%r:%s:%r' % (asset_id.file.hash or os.path.abspath(asset_id.file.filename),
+                                  asset_id.subname, asset_id.mimetype, dependencies, mimetype,
+                                  sorted(options.items()))
+
+
 class Transcoder(object):
     """
     Analyze files and tries to find known assets types in it.
+
+    The convert_maps of all plugins form a
+    :py:class:`damn_at.transcodegraph.TranscodeGraph`, a mimetype no plugin
+    converts to directly is reached in several hops, the cheapest route is
+    taken. The intermediate files of a route are written to a private
+    directory below the path, with a cache later requests that share a
+    prefix of the route reuse them.
+
+    Identical transcodes that run at the same time, in this process or in
+    others with the same path, are done once, see
+    :py:class:`damn_at.singleflight.SingleFlight`.
+
+    :param cache: a :py:class:`damn_at.transcodecache.TranscodeCache` that
+                  serves transcodes done before
+    :param resolve: returns the FileDescription of a file hash or None, so
+                    the cache knows the dependencies of linked files
     """
-    def __init__(self, path):
+    def __init__(self, path, cache=None, resolve=None):
         self._path = path
+        self.cache = cache
+        self.resolve = resolve
+        self._in_flight = SingleFlight('transcode', os.path.join(path, '.locks') if path else None)
         self.transcoders = {}
         plugin_mgr = DAMNPluginManagerSingleton.get()
 
@@ -61,6 +100,7 @@ class Transcoder(object):
         self._build_target_mimetypes()
 
     def _build_target_mimetypes(self):
+        self.graph = TranscodeGraph()
         self.target_mimetypes = {}
         self.target_mimetypes_transcoders = {}
         for src_mimetype, transcoders in self.transcoders.items():
@@ -79,15 +119,38 @@ class Transcoder(object):
                         self.target_mimetypes_transcoders[src_mimetype] = []
                     self.target_mimetypes[src_mimetype].append(tmt)
                     self.target_mimetypes_transcoders[src_mimetype].append((tmt, transcoder,))
+                    self.graph.add_edge(src_mimetype, tmt, transcoder)
+
+        # Advertise the mimetypes that are only reached in several hops.
+        for src_mimetype in self.graph.sources():
+            direct = set(tmt.mimetype for tmt in self.target_mimetypes[src_mimetype])
+            for dst_mimetype, route in self.graph.reachable(src_mimetype).items():
+                if dst_mimetype not in direct:
+                    tmt = route[-1][1]
+                    via = ', '.join(target.mimetype for _, target, _ in route[:-1])
+                    self.target_mimetypes[src_mimetype].append(
+                        TargetMimetype(mimetype=tmt.mimetype, description='%s (via %s)' % (tmt.description, via),
+                                       template=tmt.template, options=tmt.options))
 
     def _get_transcoder(self, src_mimetype, target_mimetype):
-        """Returns a transcoder
+        """Returns the transcoder of the last hop to the target
+
+        """
+        return self._hop(src_mimetype, target_mimetype)[1]
+
+    def _hop(self, src_mimetype, target_mimetype):
+        """The source mimetype and transcoder of the last hop to the target
 
+        :rtype: (string, plugin)
         """
-        target_mimetypes = self.target_mimetypes_transcoders[src_mimetype]
-        for target, transcoder in target_mimetypes:
-            if target == target_mimetype:
-                return transcoder
+        route = self.graph.plan(src_mimetype, target_mimetype.mimetype)
+        if route and route[-1][1] == target_mimetype:
+            return route[-1][0], route[-1][2]
+        for hop_src in [src_mimetype] + self.graph.sources():
+            for target, transcoder in self.graph.edges(hop_src):
+                if target == target_mimetype:
+                    return hop_src, transcoder
+        return None, None
 
     def get_target_mimetypes(self):
         """
@@ -97,26 +160,41 @@ class Transcoder(object):
         """
         return self.target_mimetypes
 
+    def plan(self, src_mimetype, mimetype):
+        """The cheapest route to mimetype, by the costs learned so far.
+
+        The costs change with every transcode, so plan a transcode once,
+        parse its options with :py:meth:`parse_route_options` and pass the
+        route on to :py:meth:`transcode_assets`, which then runs the plugins
+        the options were parsed for.
+
+        :rtype: list<(string, TargetMimetype, plugin)> the hops, None when
+                mimetype can't be reached
+        """
+        return self.graph.plan(src_mimetype, mimetype)
+
     def get_target_mimetype(self, src_mimetype, mimetype, **options):
-        """"""
-        # TODO: Need some clever way to select the right transcoder in
-        # the list based on options passed.
-        if src_mimetype in self.target_mimetypes_transcoders:
-            target_mimetypes = self.target_mimetypes_transcoders[src_mimetype]
-            for target, transcoder in target_mimetypes:
-                if target.mimetype == mimetype:
-                    return target
+        """The TargetMimetype of the last hop of the cheapest route, its
+        options are the ones a transcode to mimetype takes."""
+        route = self.plan(src_mimetype, mimetype)
+        if route:
+            return route[-1][1]
 
     def parse_options(self, src_mimetype, target_mimetype, **options):
         """"""
-        transcoder = self._get_transcoder(src_mimetype, target_mimetype)
-        convert_map_entry = transcoder.plugin_object.convert_map[src_mimetype][target_mimetype.mimetype]
+        hop_src, transcoder = self._hop(src_mimetype, target_mimetype)
+        convert_map_entry = transcoder.plugin_object.convert_map[hop_src][target_mimetype.mimetype]
         return parse_options(convert_map_entry, **options)
 
+    def parse_route_options(self, route, **options):
+        """Parse the options for the last hop of a route, see :py:meth:`plan`"""
+        hop_src, target_mimetype, transcoder = route[-1]
+        return parse_options(transcoder.plugin_object.convert_map[hop_src][target_mimetype.mimetype], **options)
+
     def get_paths(self, asset_id, target_mimetype, **options):
         """"""
-        transcoder = self._get_transcoder(asset_id.mimetype, target_mimetype)
-        convert_map_entry = transcoder.plugin_object.convert_map[asset_id.mimetype][target_mimetype.mimetype]
+        hop_src, transcoder = self._hop(asset_id.mimetype, target_mimetype)
+        convert_map_entry = transcoder.plugin_object.convert_map[hop_src][target_mimetype.mimetype]
 
         path_templates = []
         single_options = dict([(option.name, option) for option in convert_map_entry if not option.is_array])
@@ -146,10 +224,156 @@ class Transcoder(object):
 
         :rtype: list<string> file paths
         """
-        target_mimetype = self.get_target_mimetype(asset_id.mimetype, mimetype)
-        transcoder = self._get_transcoder(asset_id.mimetype, target_mimetype)
+        return self.transcode_many(file_descr, asset_id, [(mimetype, options)])[0]
+
+    def _cache_key(self, transcoder, file_descr, asset_id, mimetype, options):
+        if self.cache is None:
+            return None
+        version = '%s %s' % (getattr(transcoder, 'name', ''), getattr(transcoder, 'version', ''))
+        return cache_key(file_descr, asset_id, mimetype, options, version, self.resolve)
+
+    def _run_plugin(self, transcoder, dest_path, file_descr, jobs):
+        """Run the plugin's transcode_assets, in a slot of the plugin, and
+        learn how long it took
+
+        :param jobs: list<(string, AssetId, TargetMimetype, dict)> the source
+                     mimetype of the hop, the asset, target and options
+        """
+        with scheduler.SCHEDULER.slot(transcoder.name, cpus=0):
+            start = time.time()
+            file_paths_list = transcoder.plugin_object.transcode_assets(
+                dest_path, file_descr, [(asset_id, target, options) for _, asset_id, target, options in jobs])
+        seconds = (time.time() - start) / len(jobs)
+        for hop_src, _, target_mimetype, _ in jobs:
+            self.graph.record(hop_src, target_mimetype, transcoder, seconds)
+        return file_paths_list
+
+    def _intermediate(self, directory, file_descr, asset_id, hop):
+        """Transcode the asset along one hop of a route into directory
+
+        :rtype: (FileDescription, AssetId) of the intermediate file
+        """
+        hop_src, target_mimetype, transcoder = hop
+        options = parse_options(transcoder.plugin_object.convert_map[hop_src][target_mimetype.mimetype])
+        key = self._cache_key(transcoder, file_descr, asset_id, target_mimetype.mimetype, options)
+
+        def produce():
+            file_paths = self._run_plugin(transcoder, directory, file_descr,
+                                          [(hop_src, asset_id, target_mimetype, options)])[0]
+            if file_paths:
+                self.cache.put(key, directory, file_paths)
+            produced.append(file_paths)
+            return file_paths
+
+        produced = []
+        if key is None:
+            file_paths = self._run_plugin(transcoder, directory, file_descr,
+                                          [(hop_src, asset_id, target_mimetype, options)])[0]
+        else:
+            file_paths = self.cache.get(key, directory)
+            if file_paths is None:
+                self._in_flight.do('hop:' + key, produce)
+                # Whoever produced it, the intermediate is in the cache now.
+                file_paths = produced[0] if produced else self.cache.get(key, directory)
+        if not file_paths:
+            raise TranscoderException('Transcoding %s to %s failed' % (asset_id.subname, target_mimetype.mimetype))
+
+        path = os.path.join(directory, file_paths[0])
+        file_id = FileId(filename=path, hash=key or calculate_hash_for_file(path))
+        intermediate = AssetId(subname=asset_id.subname, mimetype=target_mimetype.mimetype, file=file_id)
+        return (FileDescription(file=file_id, mimetype=target_mimetype.mimetype,
+                                assets=[AssetDescription(asset=intermediate, dependencies=[])]),
+                intermediate)
+
+    def transcode_many(self, file_descr, asset_id, targets):
+        """
+        Transcode the given AssetId in FileDescription to several mimetypes
+        and options at once, plugins that implement
+        :py:meth:`damn_at.pluginmanager.ITranscoder.transcode_many` decode
+        the source only once for all of them.
+
+        :param targets: list<(string, dict)> mimetypes and parsed options,
+                        optionally with the route they were parsed for
+        :rtype: list<list<string>> file paths of every target
+        """
+        return self.transcode_assets(file_descr, [(asset_id,) + tuple(target) for target in targets])
 
-        return transcoder.plugin_object.transcode(self._path, file_descr, asset_id, target_mimetype, **options)
+    def transcode_assets(self, file_descr, requests, dest_path=None):
+        """
+        Transcode several assets of the FileDescription at once, plugins that
+        implement :py:meth:`damn_at.pluginmanager.ITranscoder.transcode_assets`
+        load the file only once for all of them.
+
+        :param requests: list<(AssetId, string, dict)> the assets, mimetypes
+                         and parsed options, optionally with the route the
+                         options were parsed for, see :py:meth:`plan`
+        :param dest_path: where the outputs are written instead of the path,
+                          callers that remove their outputs pass a directory
+                          of their own
+        :rtype: list<list<string>> file paths of every request, relative to
+                dest_path
+        """
+        if dest_path is None:
+            dest_path = self._path
+
+        def run():
+            # Plan all routes before the intermediates below teach the graph
+            # new costs, a request must take the route its options are for.
+            routes = [request[3] if len(request) > 3 else self.plan(request[0].mimetype, request[1])
+                      for request in requests]
+            results = [None] * len(requests)
+            batches = []
+            intermediates = {}
+            directory = None
+            try:
+                for i, request in enumerate(requests):
+                    asset_id, mimetype, options = request[:3]
+                    route = routes[i]
+                    if route is None:
+                        raise TranscoderUnknownTypeException('Can not transcode %s to %s' % (asset_id.mimetype, mimetype))
+                    src_descr, src_asset = file_descr, asset_id
+                    for n in range(1, len(route)):
+                        # Targets that share a prefix of their routes share its intermediates.
+                        prefix = (id(asset_id),) + tuple((hop_src, id(target)) for hop_src, target, _ in route[:n])
+                        if prefix not in intermediates:
+                            if directory is None:
+                                directory = tempfile.mkdtemp(prefix='intermediate-', dir=self._path or None)
+                            intermediates[prefix] = self._intermediate(directory, src_descr, src_asset, route[n - 1])
+                        src_descr, src_asset = intermediates[prefix]
+
+                    hop_src, target_mimetype, transcoder = route[-1]
+                    key = self._cache_key(transcoder, src_descr, src_asset, mimetype, options)
+                    if key is not None:
+                        results[i] = self.cache.get(key, dest_path)
+                        if results[i] is not None:
+                            continue
+                    # One batch per plugin and source file, whatever its assets.
+                    for batch_transcoder, batch_descr, batch in batches:
+                        if batch_transcoder is transcoder and batch_descr is src_descr:
+                            break
+                    else:
+                        batch = []
+                        batches.append((transcoder, src_descr, batch))
+                    batch.append((i, key, (hop_src, src_asset, target_mimetype, options)))
+
+                for transcoder, src_descr, batch in batches:
+                    file_paths_list = self._run_plugin(transcoder, dest_path, src_descr, [job for _, _, job in batch])
+                    for (i, key, _), file_paths in zip(batch, file_paths_list):
+                        if key is not None and file_paths:
+                            self.cache.put(key, dest_path, file_paths)
+                        results[i] = file_paths
+            finally:
+                if directory is not None:
+                    shutil.rmtree(directory, ignore_errors=True)
+            return results
+
+        key = '|'.join(transcode_key(request[0], request[1],
+                                     dependency_hashes(file_descr, request[0], self.resolve), **request[2])
+                       for request in requests)
+        if dest_path != self._path:
+            # Outputs in another directory are of no use to the others.
+            key = '%s|%s' % (os.path.abspath(dest_path), key)
+        return self._in_flight.do(key, run)
 
 '''
 def main():
@@ -231,7 +455,8 @@ def main():
         mimes = [asset_id.mimetype for asset_id in asset_ids]
         raise TranscoderUnknownAssetException(asset_subname + ' ambigious in file_descr. Please specify "%s(<mimetype>)" with <mimetype> one of %s' % (asset_subname, mimes))
 
-    target_mimetype = t.get_target_mimetype(asset_id.mimetype, args.mimetype)
+    route = t.plan(asset_id.mimetype, args.mimetype)
+    target_mimetype = route[-1][1] if route else None
 
     if not target_mimetype:
         if asset_id.mimetype not in t.get_target_mimetypes():
@@ -253,7 +478,7 @@ def main():
     options = parser.parse_args()
 
     # Parse the options using the convert_map of the transcoder
-    options = t.parse_options(asset_id.mimetype, target_mimetype, **vars(options))
+    options = t.parse_route_options(route, **vars(options))
 
     print(_CMD_DESCRIPTION)
     print('Transcoding "%s"\n' % file_descr.file.filename)
@@ -261,7 +486,7 @@ def main():
     print('with: ')
     for option_name, option_value in options.items():
         print('* %s: %s ' % (option_name, option_value))
-    file_paths = t.transcode(file_descr, asset_id, args.mimetype, **options)
+    file_paths = t.transcode_assets(file_descr, [(asset_id, args.mimetype, options, route)])[0]
     print(file_paths)
 
 
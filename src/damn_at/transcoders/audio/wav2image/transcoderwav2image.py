@@ -1,14 +1,34 @@
-import os, tempfile
-import mimetypes, subprocess
-import matplotlib.pyplot as plt
+import os
 
 from damn_at import logger
 from damn_at.transcoder import TranscoderException
-from damn_at.utilities import WaveData
+from damn_at.utilities import read_audio
+from damn_at.waveform import PeakLevels, render_waveform
 
 from damn_at.pluginmanager import ITranscoder
 from damn_at.options import Sizes, HexColorOption, IntOption, VectorOption, expand_path_template
 
+COLUMN_BUCKETS = 4
+"""Peak buckets per pixel column, so an estimated duration that is off a
+bit still leaves at least one per column"""
+
+
+def expected_frames(file_descr, samplerate):
+    """The number of frames sox will decode at samplerate, estimated from
+    the duration the analyzer found, like '00:03:25.10 = 9041653 samples',
+    None if unknown"""
+    metadata = file_descr.assets[0].metadata or {}
+    if 'duration' not in metadata:
+        return None
+    seconds = 0.0
+    try:
+        for part in metadata['duration'].string_value.split('=')[0].strip().split(':'):
+            seconds = seconds * 60 + float(part)
+    except ValueError:
+        return None
+    return int(seconds * samplerate)
+
+
 class Audio2ImageTranscoder(ITranscoder):
     options = [HexColorOption(name = 'color', description = 'Color of the plot', default = '#0000ff'),
             IntOption(name = 'samplerate', description = 'Sample Rate of the audio', default = 800),
@@ -30,43 +50,31 @@ class Audio2ImageTranscoder(ITranscoder):
         file_path = expand_path_template(target_mimetype.template,
                 target_mimetype.mimetype, asset_id, **options)
         
-        audio_mimetype = mimetypes.guess_type(file_descr.file.filename)[0]
+        # The size is in inches, like the figure sizes of matplotlib.
+        width = max(1, int(options['size'][0] * options['dpi']))
+        height = max(1, int(options['size'][1] * options['dpi']))
+
+        metadata = file_descr.assets[0].metadata or {}
+        nchannels = 2 if 'channels' in metadata and metadata['channels'].int_value >= 2 else 1
+        frames = expected_frames(file_descr, options['samplerate'])
+        bucket = max(1, frames // (width * COLUMN_BUCKETS)) if frames else 1
+        peaks = PeakLevels([bucket], nchannels)
         try:
-            tmp = tempfile.NamedTemporaryFile()
-            pro = subprocess.Popen(["sox", file_descr.file.filename, "-t", "wav", "-r", str(options['samplerate']),  tmp.name], 
-                stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            out, err = pro.communicate()
-            if pro.returncode != 0:
-                print("Sox failed %s with error code %d!" %(file_decrs.file.filename, pro.returncode), 
-                        out, err)
-                return False
-            else:
-                toopen = tmp.name
-        except OSError:
-            print("Sox failed %s!" %(file_descr.file.filename), out, err)
+            for chunk in read_audio(file_descr.file.filename, options['samplerate'], nchannels):
+                peaks.add(chunk)
+        except (OSError, IOError) as ex:
+            print("Sox failed %s!" %(file_descr.file.filename), ex)
             return False
 
-        wavedata = WaveData()
-        wavedata.extractData(toopen, 2)
-        channels = wavedata.getData()
-        gcolor = options['color']
-
-        plt.figure(1, figsize = options['size'])
-        if wavedata.nchannels == 2:
-            plt.subplot(211)
-            plt.plot(channels[0], color = gcolor)
-            plt.axis('off')
-            plt.subplot(212)
-            plt.plot(channels[1], color = gcolor)
-        else:
-            plt.plot(channels[0])
-        
-        plt.axis('off')
+        color = options['color']
+        color = tuple(int(color[i:i + 2], 16) for i in (1, 3, 5))
+        image = render_waveform(peaks.finish()[0], (width, height), color)
         
         full_path = os.path.join(dest_path, file_path)
         if not os.path.exists(os.path.dirname(full_path)):
             os.makedirs(os.path.dirname(full_path))
 
-        plt.savefig(full_path, dpi = options['dpi'])
+        image.save(full_path, 'JPEG' if target_mimetype.mimetype == 'image/jpeg' else 'PNG',
+                   dpi=(options['dpi'], options['dpi']))
 
         return [file_path]
@@ -1,9 +1,13 @@
-import os, tempfile
-import json, mimetypes, subprocess
+import os
+import json
+import shutil
+import tempfile
+
+import numpy
 
 from damn_at import logger
 from damn_at.transcoder import TranscoderException
-from damn_at.utilities import WaveData
+from damn_at.utilities import read_audio
 
 from damn_at.pluginmanager import ITranscoder
 from damn_at.options import IntOption, expand_path_template
@@ -28,44 +32,44 @@ class Audio2JsonTranscoder(ITranscoder):
         file_path = expand_path_template(target_mimetype.template,
                 target_mimetype.mimetype, asset_id, **options)
         
-        audio_mimetype = mimetypes.guess_type(file_descr.file.filename)[0]
-        try:
-            tmp = tempfile.NamedTemporaryFile()
-            pro = subprocess.Popen(["sox", file_descr.file.filename, "-t", "wav", "-r", str(options['samplerate']), tmp.name], 
-                stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            out, err = pro.communicate()
-            if pro.returncode != 0:
-                print("Sox failed %s with error code %d!" %(file_decrs.file.filename, pro.returncode), 
-                        out, err)
-                return False
-            else:
-                toopen = tmp.name
-        except OSError:
-            print("Sox failed %s!" %(file_descr.file.filename), out, err)
-            return False
-
-        wavedata = WaveData()
-        wavedata.extractData(toopen, options['precision'])
-        channels = wavedata.getData()
-
-        if wavedata.nchannels == options['channels']:
-            if options['channels'] == 1:
-                transcoded = json.dumps({"mono": channels[0]})
-            elif options['channels'] ==2:
-                transcoded = json.dumps({"left": channels[0], "right": channels[1]})
-
-        else:
-            if options['channels'] == 1:
-                transcoded = json.dumps({"mono": channels[0]})
-            else :
-                transcoded = json.dumps({"left": channels[0], "right": channels[0]})
-        
+        names = ['mono'] if options['channels'] == 1 else ['left', 'right']
         full_path = os.path.join(dest_path, file_path)
         if not os.path.exists(os.path.dirname(full_path)):
             os.makedirs(os.path.dirname(full_path))
 
-        output_file = open(full_path, 'w')
-        output_file.write(transcoded)
-        output_file.close()
+        # Written next to full_path and renamed over it once complete, a
+        # failing sox leaves no partial JSON behind.
+        handle, tmp_path = tempfile.mkstemp(dir=os.path.dirname(full_path), prefix='.')
+        try:
+            with os.fdopen(handle, 'w') as output_file, tempfile.TemporaryFile('w+') as second:
+                # The first channel is written as it is decoded, the second
+                # one is spooled to a file and appended after it.
+                output_file.write('{"%s": [' % names[0])
+                separator = ''
+                for chunk in read_audio(file_descr.file.filename, options['samplerate'], len(names)):
+                    output_file.write(separator + self.format_samples(chunk[:, 0], options['precision']))
+                    if len(names) == 2:
+                        second.write(separator + self.format_samples(chunk[:, 1], options['precision']))
+                    separator = ', '
+                if len(names) == 2:
+                    output_file.write('], "%s": [' % names[1])
+                    second.seek(0)
+                    shutil.copyfileobj(second, output_file)
+                output_file.write(']}')
+            os.chmod(tmp_path, 0o644)
+            os.rename(tmp_path, full_path)
+        except (OSError, IOError) as ex:
+            os.remove(tmp_path)
+            logger.error("Sox failed %s: %s", file_descr.file.filename, ex)
+            return False
+        except:
+            os.remove(tmp_path)
+            raise
 
         return [file_path]
+
+    @staticmethod
+    def format_samples(samples, precision):
+        """The samples rounded to precision decimals as JSON numbers,
+        without the brackets"""
+        return json.dumps(numpy.round(samples.astype(numpy.float64), precision).tolist())[1:-1]
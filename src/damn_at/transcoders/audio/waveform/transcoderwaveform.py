@@ -0,0 +1,52 @@
+import os
+
+from damn_at import logger
+from damn_at.utilities import read_audio
+from damn_at.waveform import PeakLevels, write_peaks
+
+from damn_at.pluginmanager import ITranscoder
+from damn_at.options import IntOption, EnumOption, expand_path_template
+
+class WaveformTranscoder(ITranscoder):
+    """Min/max peaks of every channel at several zoom levels, in the peak
+    file format of :py:mod:`damn_at.waveform`, from one streaming pass."""
+    options = [IntOption(name = 'samplerate', description = 'Samples per second each channel', default = 22050, min = 200),
+        IntOption(name = 'zoom', description = 'Samples per bucket of the finest level', default = 64, min = 1),
+        IntOption(name = 'levels', description = 'Number of zoom levels', default = 6, min = 1, max = 16),
+        IntOption(name = 'factor', description = 'Zoom factor between levels', default = 4, min = 2, max = 64),
+        EnumOption(name = 'bits', description = 'Bits per peak', choices = ('8', '16'), default = '16')]
+    
+    convert_map = {"audio/x-wav" : {"application/x-waveform-peaks" : options},
+            "audio/mpeg" : {"application/x-waveform-peaks" : options}}
+
+    def __init__(self):
+        ITranscoder.__init__(self)
+
+    def activate(self):
+        pass
+
+    def transcode(self, dest_path, file_descr, asset_id, target_mimetype,
+            **options):
+
+        file_path = expand_path_template(target_mimetype.template,
+                target_mimetype.mimetype, asset_id, **options)
+
+        metadata = file_descr.assets[0].metadata or {}
+        nchannels = 2 if 'channels' in metadata and metadata['channels'].int_value >= 2 else 1
+        samples_per_bucket = [options['zoom'] * options['factor'] ** level for level in range(options['levels'])]
+        peaks = PeakLevels(samples_per_bucket, nchannels)
+        try:
+            for chunk in read_audio(file_descr.file.filename, options['samplerate'], nchannels):
+                peaks.add(chunk)
+        except (OSError, IOError) as ex:
+            logger.error("Sox failed %s: %s", file_descr.file.filename, ex)
+            return False
+
+        full_path = os.path.join(dest_path, file_path)
+        if not os.path.exists(os.path.dirname(full_path)):
+            os.makedirs(os.path.dirname(full_path))
+
+        with open(full_path, 'wb') as output_file:
+            write_peaks(output_file, peaks.finish(), samples_per_bucket, options['samplerate'], int(options['bits']))
+
+        return [file_path]
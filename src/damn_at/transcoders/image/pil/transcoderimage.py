@@ -7,6 +7,54 @@ from damn_at.transcoder import TranscoderException
 from damn_at.pluginmanager import ITranscoder
 from damn_at.options import IntVectorOption, FloatOption, expand_path_template
 
+_RESAMPLE = getattr(Image, 'LANCZOS', None) or Image.ANTIALIAS
+
+_REDUCING_GAP = 2
+"""Images are cheaply reduced to no less than this times the largest
+target before the final resample"""
+
+_CONVERT_MODES = {'1': 'L', 'P': 'RGB', 'PA': 'RGBA'}
+"""Modes that can't be scaled smoothly, and the modes they're scaled in"""
+
+
+def _fit(size, box):
+    """The size of an image of the given size after thumbnail(box)"""
+    if tuple(box) == (-1, -1):
+        return tuple(size)
+    scale = min(float(box[0]) / size[0], float(box[1]) / size[1], 1.0)
+    return max(1, int(size[0] * scale)), max(1, int(size[1] * scale))
+
+
+def _convert_mode(image):
+    """Convert palette, bilevel and 16 bit images to a mode they can be
+    scaled in"""
+    if image.mode.startswith('I;16'):
+        return image.convert('I')
+    if image.mode in _CONVERT_MODES:
+        return image.convert(_CONVERT_MODES[image.mode])
+    return image
+
+
+def open_image(path, boxes):
+    """Open and decode an image only as large as the largest of the
+    thumbnail boxes needs. JPEGs are scaled down by the decoder with
+    draft(), other images with the cheap box filter of reduce()."""
+    image = Image.open(path)
+    if (-1, -1) in boxes:
+        image.load()
+        return _convert_mode(image)
+    sizes = [_fit(image.size, box) for box in boxes]
+    need = max(width for width, _ in sizes), max(height for _, height in sizes)
+    if image.format == 'JPEG':
+        # Scales by 1/2, 1/4 or 1/8 in the DCT domain, never below need.
+        image.draft(image.mode, need)
+    image.load()
+    image = _convert_mode(image)
+    factor = min(image.size[0] // need[0], image.size[1] // need[1]) // _REDUCING_GAP
+    if factor > 1 and hasattr(image, 'reduce'):
+        image = image.reduce(factor)
+    return image
+
 
 class ImageTranscoder(ITranscoder):
     options = [IntVectorOption(name='size', description='The target size of the image', size=2, min=1, max=4096, default=(-1,-1)),
@@ -14,32 +62,55 @@ class ImageTranscoder(ITranscoder):
     convert_map = {"image/jpeg" : {"image/png": options, "image/jpeg": options, "image/x-ms-bmp" : options},
                    "image/png" : {"image/png": options, "image/jpeg": options, "image/x-ms-bmp": options},
                    "image/x-ms-bmp" : {"image/x-ms-bmp": options, "image/png": options, "image/jpeg": options} }
-    
+
     def __init__(self):
         ITranscoder.__init__(self)
-        
+
     def activate(self):
         pass
 
     def transcode(self, dest_path, file_descr, asset_id, target_mimetype, **options):
-        file_path = expand_path_template(target_mimetype.template, target_mimetype.mimetype, asset_id, **options)
-        
-        try:  
-          im = Image.open(file_descr.file.filename)
-        except IOError:
-          print "cannot open", file_descr.file.fileName
-          return False
-
-        if options['size'] != [-1,-1]:
-          im.thumbnail(options['size'])
-        
-        if im.mode == 'P':
-          im = im.convert('RGB')
-          
-        full_path = os.path.join(dest_path, file_path)
-        if not os.path.exists(os.path.dirname(full_path)):
-            os.makedirs(os.path.dirname(full_path))
-          
-        im.save(full_path)
-        
-        return [file_path]
+        return self.transcode_many(dest_path, file_descr, asset_id, [(target_mimetype, options)])[0]
+
+    def transcode_many(self, dest_path, file_descr, asset_id, targets):
+        """Decode the image once and write all targets, largest first. Every
+        size is scaled down from the previous, smaller level when that is
+        still large enough, rather than from the full image."""
+        try:
+            image = open_image(file_descr.file.filename, [tuple(options['size']) for _, options in targets])
+        except (IOError, ValueError) as ex:
+            logger.error("cannot open %s: %s", file_descr.file.filename, ex)
+            return [False] * len(targets)
+
+        sizes = [_fit(image.size, options['size']) for _, options in targets]
+        order = sorted(range(len(targets)), key=lambda i: sizes[i][0] * sizes[i][1], reverse=True)
+
+        levels = {}
+        previous = image
+        results = [None] * len(targets)
+        for i in order:
+            target_mimetype, options = targets[i]
+            size = sizes[i]
+            if size not in levels:
+                if size == image.size:
+                    levels[size] = image
+                else:
+                    source = previous if previous.size[0] >= size[0] and previous.size[1] >= size[1] else image
+                    level = source.copy()
+                    level.thumbnail(tuple(options['size']), _RESAMPLE)
+                    levels[size] = previous = level
+
+            file_path = expand_path_template(target_mimetype.template, target_mimetype.mimetype, asset_id, **options)
+            full_path = os.path.join(dest_path, file_path)
+            if not os.path.exists(os.path.dirname(full_path)):
+                os.makedirs(os.path.dirname(full_path))
+            try:
+                levels[size].save(full_path)
+            except (IOError, ValueError) as ex:
+                # Not every format takes every mode, like 32 bit integers in JPEG.
+                logger.error("cannot write %s: %s", full_path, ex)
+                results[i] = False
+                continue
+            results[i] = [file_path]
+
+        return results
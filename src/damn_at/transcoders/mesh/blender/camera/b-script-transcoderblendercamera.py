@@ -1,7 +1,9 @@
 import bpy
 from mathutils import Vector, Matrix, Euler
 
+import os
 import sys
+import json
 import argparse
 
 
@@ -12,19 +14,8 @@ def render(scene, path):
     img.save_render(path, scene=scene)
 
 
-def main():
-    # Drop everything before '--'
-    args = sys.argv[sys.argv.index('--')+1:]
-
-    parser = argparse.ArgumentParser(description='Render.')
-    parser.add_argument('object')
-    parser.add_argument('path_template')
-    parser.add_argument('--width', type=int, default=256)
-    parser.add_argument('--height', type=int, default=256)
-    parser.add_argument('--format', choices=('PNG', 'Jpeg'), default='PNG')
-
-    args = parser.parse_args(args)
-    
+def render_camera(args):
+    """Render the view of a camera of the file, in the camera's scene"""
     camera = bpy.data.objects[args.object]
     
     scene = camera.users_scene[0]
@@ -48,5 +39,46 @@ def main():
     render(scene, args.path_template)
 
 
+def write_results(path, results):
+    """Record the errors of the jobs done so far, None for those that
+    succeeded, see damn_at.utilities.run_blender_batch"""
+    with open(path + '.tmp', 'w') as result:
+        json.dump(results, result)
+    os.replace(path + '.tmp', path)
+
+
+def main():
+    # Drop everything before '--'
+    args = sys.argv[sys.argv.index('--')+1:]
+
+    parser = argparse.ArgumentParser(description='Render.')
+    parser.add_argument('--batch', help='A JSON file with a list of renders, each with the arguments below')
+    parser.add_argument('--result', help='The file to write the errors of the batch\'s renders to')
+    parser.add_argument('object', nargs='?')
+    parser.add_argument('path_template', nargs='?')
+    parser.add_argument('--width', type=int, default=256)
+    parser.add_argument('--height', type=int, default=256)
+    parser.add_argument('--format', choices=('PNG', 'Jpeg'), default='PNG')
+
+    args = parser.parse_args(args)
+    
+    if not args.batch:
+        render_camera(args)
+        return
+
+    # The file is loaded once for all cameras.
+    results = []
+    with open(args.batch) as jobs:
+        for job in json.load(jobs):
+            try:
+                render_camera(argparse.Namespace(**dict(vars(args), **job)))
+                results.append(None)
+            except Exception as ex:
+                print('Failed to render %s: %s'%(job.get('object'), ex))
+                results.append('Failed to render %s: %s'%(job.get('object'), ex))
+            if args.result:
+                write_results(args.result, results)
+
+
 if __name__ == '__main__':
     main()
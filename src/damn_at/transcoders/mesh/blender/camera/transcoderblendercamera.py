@@ -6,7 +6,7 @@ from damn_at.transcoder import TranscoderException
 
 from damn_at.pluginmanager import ITranscoder
 from damn_at.options import IntVectorOption, EnumOption, expand_path_template
-from damn_at.utilities import script_path, run_blender
+from damn_at.utilities import script_path, run_blender_batch
 
 class BlenderCameraTranscoder(ITranscoder):
     options = [IntVectorOption(name='size', description='The target size of the image', size=2, min=1, max=4096, default=(64,64))]
@@ -20,20 +20,30 @@ class BlenderCameraTranscoder(ITranscoder):
         pass
 
     def transcode(self, dest_path, file_descr, asset_id, target_mimetype, **options):
-        
-        path_template = expand_path_template(target_mimetype.template, target_mimetype.mimetype, asset_id, **options)
-        path_template = os.path.join(dest_path, path_template)
+        return self.transcode_assets(dest_path, file_descr, [(asset_id, target_mimetype, options)])[0]
+
+    def transcode_assets(self, dest_path, file_descr, jobs):
+        """Render all cameras in one Blender session"""
+        renders = []
+        results = []
+        for asset_id, target_mimetype, options in jobs:
+            path_template = expand_path_template(target_mimetype.template, target_mimetype.mimetype, asset_id, **options)
+            abs_file_path = os.path.join(dest_path, path_template)
             
-        arguments = ['--', asset_id.subname, path_template]
-        arguments.append('--format=PNG')#TODO
-        arguments.append('--width='+str(options['size'][0]))
-        arguments.append('--height='+str(options['size'][1]))
+            renders.append({'object': asset_id.subname, 'path_template': abs_file_path,
+                            'format': 'PNG',#TODO
+                            'width': options['size'][0], 'height': options['size'][1]})
+            results.append([path_template])
             
-        stdoutdata, stderrdata, returncode = run_blender(file_descr.file.filename, script_path(__file__), arguments)
+        errors, stdoutdata, stderrdata, returncode = run_blender_batch(file_descr.file.filename, script_path(__file__), renders)
         
         logger.debug(stdoutdata)
         logger.debug(stderrdata)
         logger.debug(returncode)
-        #print(returncode) #Todo: check return code
         
-        return path_template
+        for i, error in enumerate(errors):
+            if error is not None:
+                logger.error('Rendering %s failed: %s', results[i][0], error)
+                results[i] = False
+        
+        return results
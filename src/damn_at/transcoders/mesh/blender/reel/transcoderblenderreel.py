@@ -1,14 +1,12 @@
 import os
-from PIL import Image
-
-from string import Template
+import math
 
 from damn_at import logger
 from damn_at.transcoder import TranscoderException
 
 from damn_at.pluginmanager import ITranscoder
 from damn_at.options import IntVectorOption, IntOption, expand_path_template
-from damn_at.utilities import script_path, run_blender
+from damn_at.utilities import script_path, run_blender_batch
 
 class BlenderTranscoder(ITranscoder):
     options = [IntVectorOption(name='size', description='The target size of the image', size=2, min=1, max=4096, default=(128,128)),
@@ -25,57 +23,46 @@ class BlenderTranscoder(ITranscoder):
         pass
 
     def transcode(self, dest_path, file_descr, asset_id, target_mimetype, **options):
-        path_template = expand_path_template(target_mimetype.template, target_mimetype.mimetype, asset_id, **options)
-        abs_file_path = os.path.join(dest_path, path_template)
-        template = Template(path_template+'__${angles}')
-        
-        angles = [0.0, 0.1, 0.5]
-        
-        width = options['size'][0] * options['footage']
-        height = options['size'][1] * (options['frames']/options['footage'])
-          
-        angles = []
-        file_paths = []
-        for angle in range(0, 628, 628/12):
-            angle = angle/100.0
-            file_path = template.safe_substitute(angles=angle)
-            file_paths.append(file_path)
-            angles.append(angle)
-            
-        if asset_id.mimetype == 'application/x-blender.mesh':
-            datatype = 'mesh' 
-        elif asset_id.mimetype == 'application/x-blender.group':
-            datatype = 'group' 
-        else:
-            datatype = 'object' 
-            
-        arguments = ['--', datatype, asset_id.subname, os.path.join(dest_path, template.safe_substitute())]
-        arguments.extend(map(str, angles))
-        arguments.append('--format=PNG')#TODO
-        arguments.append('--camera_type=PERSPECTIVE')
-        arguments.append('--width='+str(options['size'][0]))
-        arguments.append('--height='+str(options['size'][1]))
+        return self.transcode_assets(dest_path, file_descr, [(asset_id, target_mimetype, options)])[0]
+
+    def transcode_assets(self, dest_path, file_descr, jobs):
+        """Render all reels in one Blender session, the render script
+        assembles every reel's sprite from its frames in memory."""
+        renders = []
+        results = []
+        for asset_id, target_mimetype, options in jobs:
+            path_template = expand_path_template(target_mimetype.template, target_mimetype.mimetype, asset_id, **options)
+            abs_file_path = os.path.join(dest_path, path_template)
+            logger.debug(abs_file_path)
+              
+            # One turn around the asset.
+            angles = [2 * math.pi * frame / options['frames'] for frame in range(options['frames'])]
+                
+            if asset_id.mimetype == 'application/x-blender.mesh':
+                datatype = 'mesh' 
+            elif asset_id.mimetype == 'application/x-blender.group':
+                datatype = 'group' 
+            else:
+                datatype = 'object' 
+                
+            renders.append({'type': datatype, 'object': asset_id.subname, 'path_template': abs_file_path,
+                            'angles': angles, 'footage': options['footage'],
+                            'format': 'JPEG' if target_mimetype.mimetype == 'image/jpg-reel' else 'PNG',
+                            'camera_type': 'PERSPECTIVE',#TODO
+                            'width': options['size'][0], 'height': options['size'][1]})
+            results.append([path_template])
         
         script = os.path.join(os.path.dirname(__file__), '../render/b-script-transcoderblenderrender.py')
-        
-        logger.debug(abs_file_path)
             
-        stdoutdata, stderrdata, returncode = run_blender(file_descr.file.filename, script, arguments)
+        errors, stdoutdata, stderrdata, returncode = run_blender_batch(file_descr.file.filename, script, renders)
         
         logger.debug(stdoutdata)
         logger.debug(stderrdata)
         logger.debug(returncode)
-        #print(returncode) #Todo: check return code
-        
-        sprite = Image.new('RGB', (width, height))
-        for i, file_path in enumerate(file_paths):
-            path = os.path.join(dest_path, file_path)
-            tile = Image.open(path)
-            x = (i%options['footage'])*options['size'][0]
-            y = (i/options['footage'])*options['size'][1]
-            sprite.paste(tile, (x,y))
         
-        #sprite.show()    
-        sprite.save(abs_file_path)
+        for i, error in enumerate(errors):
+            if error is not None:
+                logger.error('Rendering %s failed: %s', results[i][0], error)
+                results[i] = False
         
-        return [path_template]
+        return results
@@ -1,7 +1,9 @@
 import bpy
 from mathutils import Vector, Matrix, Euler
 
+import os
 import sys
+import json
 import argparse
 from string import Template
 
@@ -12,11 +14,8 @@ def create_scene(args):
     bpy.context.screen.scene = scene
 
     scene.world = None
-    scene.render.image_settings.file_format = args.format
-    scene.render.image_settings.color_mode = "RGBA"
+    set_output(scene, args)
     #scene.render.image_settings.quality = 90
-    scene.render.resolution_x = args.width
-    scene.render.resolution_y = args.height
     scene.render.resolution_percentage = 100
     
     # Remove sky to make the render transparant
@@ -29,6 +28,14 @@ def create_scene(args):
     return scene
 
 
+def set_output(scene, args):
+    """Set the format and size of the renders"""
+    scene.render.image_settings.file_format = args.format
+    scene.render.image_settings.color_mode = "RGB" if args.format == 'JPEG' else "RGBA"
+    scene.render.resolution_x = args.width
+    scene.render.resolution_y = args.height
+
+
 def create_camera(scene):
     """Create a camera"""
     camdata = bpy.data.cameras.new('persp')
@@ -167,7 +174,7 @@ def bounding_box_for_empty(empty):
     
     return bbox
 
-def render(obj, scene, path, angle=None):
+def rotate(obj, scene, angle=None):
     if angle:
         rot = Matrix.Rotation(angle, 4, 'Z')
         mw = obj.matrix_world.copy()
@@ -175,6 +182,10 @@ def render(obj, scene, path, angle=None):
         #obj.matrix_world = mw*rot
         obj.matrix_world = rot*mw
         scene.update()
+
+
+def render(obj, scene, path, angle=None):
+    rotate(obj, scene, angle)
     
     bpy.ops.render.render()
     #bpy.ops.render.opengl()
@@ -182,26 +193,57 @@ def render(obj, scene, path, angle=None):
     img.save_render(path, scene=scene)
 
 
-def main():
-    # Drop everything before '--'
-    args = sys.argv[sys.argv.index('--')+1:]
-
-    parser = argparse.ArgumentParser(description='Render.')
-    parser.add_argument('type')
-    parser.add_argument('object')
-    parser.add_argument('path_template')
-    parser.add_argument('angles', metavar='N', type=float, nargs='+',
-                     help='an integer for the accumulator')
-    parser.add_argument('--camera_type', choices=('ORTHO', 'PERSPECTIVE'), default='PERSPECTIVE')
-    parser.add_argument('--width', type=int, default=256)
-    parser.add_argument('--height', type=int, default=256)
-    parser.add_argument('--format', choices=('PNG', 'Jpeg'), default='PNG')
+def create_viewer(scene):
+    """Route renders to a Viewer node, its image has the pixels of the
+    last render, unlike 'Render Result'"""
+    scene.use_nodes = True
+    tree = scene.node_tree
+    for node in list(tree.nodes):
+        tree.nodes.remove(node)
+    layers = tree.nodes.new('CompositorNodeRLayers')
+    composite = tree.nodes.new('CompositorNodeComposite')
+    viewer = tree.nodes.new('CompositorNodeViewer')
+    viewer.use_alpha = True
+    for node in (composite, viewer):
+        tree.links.new(layers.outputs['Image'], node.inputs['Image'])
+        tree.links.new(layers.outputs['Alpha'], node.inputs['Alpha'])
+
+
+def render_reel(obj, scene, path, angles, footage):
+    """Render the angles into the tiles of one sprite, footage tiles per
+    row, and save only the sprite. The tiles never touch the disk."""
+    if not scene.use_nodes:
+        create_viewer(scene)
+    width = scene.render.resolution_x
+    height = scene.render.resolution_y
+    columns = min(footage, len(angles))
+    rows = (len(angles) + footage - 1) // footage
+    row_size = width * 4
+    stride = columns * row_size
+    pixels = [0.0] * (stride * height * rows)
 
-    args = parser.parse_args(args)
-    
-    template = Template(args.path_template)
-    
-    
+    previous_angle = 0.0
+    for i, angle in enumerate(angles):
+        rotate(obj, scene, previous_angle - angle)
+        previous_angle = angle
+        print('Render %s angle into tile %d of %s'%(str(angle), i, path))
+        bpy.ops.render.render()
+        tile = bpy.data.images['Viewer Node'].pixels[:]
+        # Pixel rows go bottom to top, the first tile is the top left one.
+        x = (i % footage) * row_size
+        y = (rows - 1 - i // footage) * height
+        for row in range(height):
+            start = (y + row) * stride + x
+            pixels[start:start + row_size] = tile[row * row_size:(row + 1) * row_size]
+
+    sprite = bpy.data.images.new('Preview_Reel', columns * width, rows * height, alpha=True)
+    sprite.pixels = pixels
+    sprite.save_render(path, scene=scene)
+    bpy.data.images.remove(sprite)
+
+
+def load_object(args):
+    """The object to render, a new one for meshes and groups"""
     if args.type == 'mesh':
         mesh = bpy.data.meshes[args.object]
         obj = bpy.data.objects.new(args.object, mesh)
@@ -213,39 +255,113 @@ def main():
         obj.dupli_type = 'GROUP'
     else:
         raise Exception('Unsupported type %s!'%args.type)
+    return obj
+
+
+def render_object(args, scene, cameraob, camdata, light):
+    """Render the object of args from all its angles, the scene, camera and
+    light are reused between objects"""
+    template = Template(args.path_template)
+
+    obj = load_object(args)
+    matrix = obj.matrix_world.copy()
+    set_output(scene, args)
 
-    scene = create_scene(args)
-    
     scene.objects.link(obj)
+    try:
+        scene.objects.active = obj
 
-    scene.objects.active = obj
-    
-    reset_materials()
-    
-    # Reset Object's location
-    obj.location = (0,0,0)
-    scene.update()
+        # Reset Object's location
+        obj.location = (0,0,0)
+        scene.update()
 
-    if args.type == 'group':
-        bbox = bounding_box_for_empty(obj)
+        if args.type == 'group':
+            bbox = bounding_box_for_empty(obj)
+        else:
+            bbox = obj.bound_box
+            bbox =  [x for x in map(lambda v: obj.matrix_world*Vector(v), bbox)]
+
+        scale_camera (cameraob, camdata, bbox, args.width, args.height)
+
+        light.location = cameraob.location.copy()
+
+        if getattr(args, 'footage', None):
+            render_reel(obj, scene, args.path_template, args.angles, args.footage)
+            return
+
+        previous_angle = 0.0
+        for angle in args.angles:
+            new_angle = previous_angle - angle
+            previous_angle = angle
+            path = template.safe_substitute(angles=angle)
+            print('Render %s angle to %s'%(str(angle), path))   
+            render(obj, scene, path, new_angle)
+    finally:
+        # Leave the scene as it was for the next object.
+        scene.objects.unlink(obj)
+        obj.matrix_world = matrix
+        scene.update()
+
+
+def write_results(path, results):
+    """Record the errors of the jobs done so far, None for those that
+    succeeded, see damn_at.utilities.run_blender_batch"""
+    with open(path + '.tmp', 'w') as result:
+        json.dump(results, result)
+    os.replace(path + '.tmp', path)
+
+
+def main():
+    # Drop everything before '--'
+    args = sys.argv[sys.argv.index('--')+1:]
+
+    parser = argparse.ArgumentParser(description='Render.')
+    parser.add_argument('--batch', help='A JSON file with a list of renders, each with the arguments below')
+    parser.add_argument('--result', help='The file to write the errors of the batch\'s renders to')
+    parser.add_argument('type', nargs='?')
+    parser.add_argument('object', nargs='?')
+    parser.add_argument('path_template', nargs='?')
+    parser.add_argument('angles', metavar='N', type=float, nargs='*',
+                     help='an integer for the accumulator')
+    parser.add_argument('--camera_type', choices=('ORTHO', 'PERSPECTIVE'), default='PERSPECTIVE')
+    parser.add_argument('--width', type=int, default=256)
+    parser.add_argument('--height', type=int, default=256)
+    parser.add_argument('--format', choices=('PNG', 'JPEG'), default='PNG')
+    parser.add_argument('--footage', type=int, default=None,
+                        help='Render the angles into one sprite with this many frames per row')
+
+    args = parser.parse_args(args)
+
+    if args.batch:
+        with open(args.batch) as jobs:
+            renders = [argparse.Namespace(**dict(vars(args), **job)) for job in json.load(jobs)]
     else:
-        bbox = obj.bound_box
-        bbox =  [x for x in map(lambda v: obj.matrix_world*Vector(v), bbox)]
+        renders = [args]
+    if not renders:
+        return
 
+    # The file is loaded once, and the scene set up once, for all renders.
+    scene = create_scene(renders[0])
 
-    cameraob, camdata  = create_camera(scene)
+    reset_materials()
 
-    scale_camera (cameraob, camdata, bbox, args.width, args.height)
+    cameraob, camdata  = create_camera(scene)
 
     light = create_light(scene, cameraob)
 
-    previous_angle = 0.0
-    for angle in args.angles:
-        new_angle = previous_angle - angle
-        previous_angle = angle
-        path = template.safe_substitute(angles=angle)
-        print('Render %s angle to %s'%(str(angle), path))   
-        render(obj, scene, path, new_angle)
+    results = []
+    for render_args in renders:
+        try:
+            render_object(render_args, scene, cameraob, camdata, light)
+            results.append(None)
+        except Exception as ex:
+            # One missing object must not cost the others their renders.
+            print('Failed to render %s: %s'%(render_args.object, ex))
+            if not args.batch:
+                raise
+            results.append('Failed to render %s: %s'%(render_args.object, ex))
+        if args.result:
+            write_results(args.result, results)
 
     
 
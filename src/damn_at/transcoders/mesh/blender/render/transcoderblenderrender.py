@@ -6,7 +6,40 @@ from damn_at.transcoder import TranscoderException
 
 from damn_at.pluginmanager import ITranscoder
 from damn_at.options import IntVectorOption, FloatArrayOption, EnumOption, expand_path_template
-from damn_at.utilities import script_path, run_blender
+from damn_at.utilities import script_path, run_blender_batch
+
+
+def render_job(dest_path, asset_id, target_mimetype, options):
+    """The arguments of b-script-transcoderblenderrender.py for rendering an
+    asset, see :py:func:`damn_at.utilities.run_blender_batch`
+
+    :rtype: tuple<dict, list<string>> the render and the file paths it writes
+    """
+    options = dict(options)
+    angles = options.pop('angles')
+    
+    path_template = expand_path_template(target_mimetype.template, target_mimetype.mimetype, asset_id, **options)
+    path_template = os.path.join(dest_path, path_template)
+    
+    file_paths = []
+    for angle in angles:
+        opts = dict(options)
+        opts['angles'] = angle
+        file_path = expand_path_template(target_mimetype.template, target_mimetype.mimetype, asset_id, **opts)
+        file_paths.append(file_path)
+        
+    if asset_id.mimetype == 'application/x-blender.mesh':
+        datatype = 'mesh' 
+    elif asset_id.mimetype == 'application/x-blender.group':
+        datatype = 'group' 
+    else:
+        datatype = 'object' 
+        
+    render = {'type': datatype, 'object': asset_id.subname, 'path_template': path_template,
+              'angles': list(angles), 'format': 'PNG', 'camera_type': 'PERSPECTIVE',#TODO
+              'width': options['size'][0], 'height': options['size'][1]}
+    return render, file_paths
+
 
 class BlenderTranscoder(ITranscoder):
     options = [IntVectorOption(name='size', description='The target size of the image', size=2, min=1, max=4096, default=(64,64)),
@@ -23,40 +56,27 @@ class BlenderTranscoder(ITranscoder):
         pass
 
     def transcode(self, dest_path, file_descr, asset_id, target_mimetype, **options):
-        angles = options['angles']
-        del options['angles']
-        
-        path_template = expand_path_template(target_mimetype.template, target_mimetype.mimetype, asset_id, **options)
-        path_template = os.path.join(dest_path, path_template)
-        
-        file_paths = []
-        for angle in angles:
-            opts = dict(options)
-            opts['angles'] = angle
-            file_path = expand_path_template(target_mimetype.template, target_mimetype.mimetype, asset_id, **opts)
-            file_paths.append(file_path)
-            
-        if asset_id.mimetype == 'application/x-blender.mesh':
-            datatype = 'mesh' 
-        elif asset_id.mimetype == 'application/x-blender.group':
-            datatype = 'group' 
-        else:
-            datatype = 'object' 
-            
-        arguments = ['--', datatype, asset_id.subname, path_template]
-        arguments.extend(map(str, angles))
-        arguments.append('--format=PNG')#TODO
-        arguments.append('--camera_type=PERSPECTIVE')
-        arguments.append('--width='+str(options['size'][0]))
-        arguments.append('--height='+str(options['size'][1]))
-        
-        
-            
-        stdoutdata, stderrdata, returncode = run_blender(file_descr.file.filename, script_path(__file__), arguments)
+        return self.transcode_assets(dest_path, file_descr, [(asset_id, target_mimetype, options)])[0]
+
+    def transcode_assets(self, dest_path, file_descr, jobs):
+        """Render all assets in one Blender session, the file is loaded and
+        the preview scene set up only once."""
+        renders = []
+        results = []
+        for asset_id, target_mimetype, options in jobs:
+            render, file_paths = render_job(dest_path, asset_id, target_mimetype, options)
+            renders.append(render)
+            results.append(file_paths)
+
+        errors, stdoutdata, stderrdata, returncode = run_blender_batch(file_descr.file.filename, script_path(__file__), renders)
         
         logger.debug(stdoutdata)
         logger.debug(stderrdata)
         logger.debug(returncode)
-        #print(returncode) #Todo: check return code
         
-        return file_paths
+        for i, error in enumerate(errors):
+            if error is not None:
+                logger.error('Rendering %s failed: %s', results[i][0], error)
+                results[i] = False
+        
+        return results
@@ -1,21 +1,13 @@
 import bpy
 
 import os, sys
+import json
 import argparse
 from string import Template
 
 
-def main():
-    # Drop everything before '--'
-    args = sys.argv[sys.argv.index('--')+1:]
-
-    parser = argparse.ArgumentParser(description='Render.')
-    parser.add_argument('mimetype')
-    parser.add_argument('subname')
-    parser.add_argument('destination')
-
-    args = parser.parse_args(args)
-    
+def extract_text(args):
+    """Write the text of the file to the destination"""
     text = bpy.data.texts[args.subname]
     
     if not os.path.exists(os.path.dirname(args.destination)):
@@ -31,6 +23,45 @@ def main():
     with open(args.destination, 'wb') as file:
         file.write(bytes(data, 'UTF-8'))
         file.flush()
+
+
+def write_results(path, results):
+    """Record the errors of the jobs done so far, None for those that
+    succeeded, see damn_at.utilities.run_blender_batch"""
+    with open(path + '.tmp', 'w') as result:
+        json.dump(results, result)
+    os.replace(path + '.tmp', path)
+
+
+def main():
+    # Drop everything before '--'
+    args = sys.argv[sys.argv.index('--')+1:]
+
+    parser = argparse.ArgumentParser(description='Render.')
+    parser.add_argument('--batch', help='A JSON file with a list of texts, each with the arguments below')
+    parser.add_argument('--result', help='The file to write the errors of the batch\'s texts to')
+    parser.add_argument('mimetype', nargs='?')
+    parser.add_argument('subname', nargs='?')
+    parser.add_argument('destination', nargs='?')
+
+    args = parser.parse_args(args)
+    
+    if not args.batch:
+        extract_text(args)
+        return
+
+    # The file is loaded once for all texts.
+    results = []
+    with open(args.batch) as jobs:
+        for job in json.load(jobs):
+            try:
+                extract_text(argparse.Namespace(**dict(vars(args), **job)))
+                results.append(None)
+            except Exception as ex:
+                print('Failed to extract %s: %s'%(job.get('subname'), ex))
+                results.append('Failed to extract %s: %s'%(job.get('subname'), ex))
+            if args.result:
+                write_results(args.result, results)
         
     
 if __name__ == '__main__':
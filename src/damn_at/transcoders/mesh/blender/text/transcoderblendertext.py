@@ -1,5 +1,4 @@
 import os
-import subprocess
 
 from string import Template
 
@@ -8,7 +7,7 @@ from damn_at.transcoder import TranscoderException
 
 from damn_at.pluginmanager import ITranscoder
 from damn_at.options import IntVectorOption, IntOption, expand_path_template
-from damn_at.utilities import script_path, run_blender
+from damn_at.utilities import script_path, run_blender_batch, run_process
 
 class BlenderTranscoder(ITranscoder):
     options = [IntVectorOption(name='size', description='The target size of the image', size=2, min=1, max=4096, default=(128,128)),
@@ -22,29 +21,44 @@ class BlenderTranscoder(ITranscoder):
         pass
 
     def transcode(self, dest_path, file_descr, asset_id, target_mimetype, **options):
-        path_template = expand_path_template(target_mimetype.template, target_mimetype.mimetype, asset_id, **options)
-        abs_file_path = os.path.join(dest_path, path_template)
-        abs_file_path_txt = abs_file_path+'.txt'
-                    
-        arguments = ['--', asset_id.mimetype, asset_id.subname, abs_file_path_txt]
-        
-        
-        logger.debug(abs_file_path)
+        return self.transcode_assets(dest_path, file_descr, [(asset_id, target_mimetype, options)])[0]
+
+    def transcode_assets(self, dest_path, file_descr, jobs):
+        """Extract all texts in one Blender session, then render each"""
+        texts = []
+        paths = []
+        for asset_id, target_mimetype, options in jobs:
+            path_template = expand_path_template(target_mimetype.template, target_mimetype.mimetype, asset_id, **options)
+            abs_file_path = os.path.join(dest_path, path_template)
+            abs_file_path_txt = abs_file_path+'.txt'
+            
+            logger.debug(abs_file_path)
             
-        stdoutdata, stderrdata, returncode = run_blender(file_descr.file.filename, script_path(__file__), arguments)
+            texts.append({'mimetype': asset_id.mimetype, 'subname': asset_id.subname, 'destination': abs_file_path_txt})
+            paths.append((path_template, abs_file_path, abs_file_path_txt, options))
+            
+        errors, stdoutdata, stderrdata, returncode = run_blender_batch(file_descr.file.filename, script_path(__file__), texts)
         
         logger.debug(stdoutdata)
         logger.debug(stderrdata)
         logger.debug(returncode)
-        #print(returncode) #Todo: check return code
-        
-        arguments = ['convert', '-pointsize', '26', '-resize', str(options['size'][0]), abs_file_path_txt+'[0]', abs_file_path]
-        print arguments
-        pro = subprocess.Popen(arguments, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        stdoutdata, stderrdata = pro.communicate()
-        logger.debug(stdoutdata)
-        logger.debug(stderrdata)
-        logger.debug(pro.returncode)
         
+        results = []
+        for (path_template, abs_file_path, abs_file_path_txt, options), error in zip(paths, errors):
+            if error is not None:
+                logger.error('Extracting %s failed: %s', path_template, error)
+                results.append(False)
+                continue
+            arguments = ['convert', '-pointsize', '26', '-resize', str(options['size'][0]), abs_file_path_txt+'[0]', abs_file_path]
+            logger.debug(arguments)
+            stdoutdata, stderrdata, returncode = run_process(arguments)
+            logger.debug(stdoutdata)
+            logger.debug(stderrdata)
+            logger.debug(returncode)
+            if returncode != 0:
+                logger.error('convert failed %s with error code %d: %s', path_template, returncode, stderrdata)
+                results.append(False)
+                continue
+            results.append([path_template])
         
-        return [path_template]
+        return results
@@ -1,22 +1,129 @@
 """Video to Image Transcoder """
-import os 
-import tempfile 
-import subprocess
+import os
 from PIL import Image
+from damn_at import logger
 from damn_at.pluginmanager import ITranscoder
-from damn_at.options import IntOption, IntVectorOption, expand_path_template
+from damn_at.options import IntOption, IntVectorOption, EnumOption, expand_path_template
+from damn_at.utilities import run_process
+
+
+def parse_duration(value):
+    """Seconds of a duration as exiftool reports it, like '0:01:23',
+    '12.34 s' or '0:00:05 (approx)', None if it isn't one."""
+    value = value.replace('(approx)', '').strip()
+    try:
+        if value.endswith('s'):
+            return float(value[:-1])
+        seconds = 0.0
+        for part in value.split(':'):
+            seconds = seconds * 60 + float(part)
+        return seconds
+    except ValueError:
+        return None
+
+
+def video_size(asset_descr):
+    """The size of the video's frames the analyzer found, None if unknown"""
+    metadata = asset_descr.metadata or {}
+    if 'width' not in metadata or 'height' not in metadata:
+        return None
+    width, height = metadata['width'].int_value, metadata['height'].int_value
+    if not width or not height:
+        return None
+    return width, height
+
+
+def probe_video(path):
+    """The size and duration of the video as ffprobe finds them, for files
+    the analyzer told nothing about
+
+    :rtype: dict with 'size' and 'duration' where known
+    """
+    out, _, returncode = run_process(['ffprobe', '-v', 'error', '-select_streams', 'v:0',
+                                      '-show_entries', 'stream=width,height:format=duration',
+                                      '-of', 'default=noprint_wrappers=1', path])
+    if returncode != 0:
+        return {}
+    values = {}
+    for line in out.decode('utf-8', 'replace').splitlines():
+        key, _, value = line.partition('=')
+        values[key.strip()] = value.strip()
+    probed = {}
+    try:
+        size = int(values.get('width', 0)), int(values.get('height', 0))
+        if size[0] and size[1]:
+            probed['size'] = size
+    except ValueError:
+        pass
+    duration = parse_duration(values.get('duration', ''))
+    if duration:
+        probed['duration'] = duration
+    return probed
+
+
+def frame_size(size, box):
+    """The size of frames of the given size scaled down to fit in the box"""
+    width, height = size
+    if tuple(box) == (-1, -1):
+        return width, height
+    scale = min(float(box[0]) / width, float(box[1]) / height, 1.0)
+    return max(1, int(width * scale)), max(1, int(height * scale))
+
+
+def read_frames(path, size, count, start=0.0, fps=None, keyframes=False):
+    """Decode frames of the video with one ffmpeg, straight to PIL images.
+
+    ffmpeg seeks to start in the input, scales and writes raw RGB frames to
+    its stdout, no frame is ever written to disk.
+
+    :param size: the size of the frames, see :py:func:`frame_size`
+    :param fps: frames per second to pick, evenly spaced, or None for the
+                consecutive frames from start
+    :param keyframes: only decode the keyframes, much cheaper but the
+                      frames are the keyframes nearest to their times
+    :rtype: list<PIL.Image.Image> at most count frames
+    """
+    args = ['ffmpeg', '-v', 'error']
+    if keyframes:
+        args.extend(['-skip_frame', 'nokey'])
+    if start:
+        args.extend(['-ss', '%.3f' % start])
+    filters = ['scale=%d:%d' % tuple(size)]
+    if fps:
+        filters.insert(0, 'fps=%r' % fps)
+    args.extend(['-i', path, '-vf', ','.join(filters), '-frames:v', str(count),
+                 '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-'])
+    out, err, returncode = run_process(args)
+    if returncode != 0:
+        logger.error('ffmpeg failed %s with error code %d: %s', path, returncode, err)
+        return []
+    frame_bytes = size[0] * size[1] * 3
+    return [Image.frombytes('RGB', tuple(size), out[i:i + frame_bytes])
+            for i in range(0, len(out) - frame_bytes + 1, frame_bytes)]
+
 
 class Video2ImageTranscoder(ITranscoder):
-    """Generic Transcoder class for video2image"""
+    """Generic Transcoder class for video2image
+
+    Besides single frames it makes storyboards: reels of evenly spaced
+    frames, in a grid of 'footage' frames per row, from one decode pass.
+    """
     options = [IntOption(name='second', description='The second from which frame is to be extracted', default=-1, min=-1),
         IntVectorOption(name='size', description='The size of output image in pixels', size=2, min=1, max=4096, default=(-1, -1))]
+    reel_options = [IntVectorOption(name='size', description='The size of a frame in pixels', size=2, min=1, max=4096, default=(160, 160)),
+        IntOption(name='frames', description='Total number of frames.', min=1, max=4096, default=12),
+        IntOption(name='footage', description='Number of frames per line', min=1, max=4096, default=4),
+        EnumOption(name='spacing', description='Frames evenly spaced in time, or the nearest keyframes which is '
+                   'much faster to decode', choices=('even', 'keyframes'), default='even')]
 
-    convert_map = {"video/mp4" : {"image/png":options, "image/jpeg":options},
-            "video/x-msvideo" : {"image/png":options, "image/jpeg":options},
-            "video/x-flv" : {"image/png":options, "image/jpeg":options},
-            "video/quicktime" : {"image/png":options, "image/jpeg":options},
-            "video/x-matroska" : {"image/png":options, "image/jpeg":options},
-            "video/mpeg" : {"image/png":options, "image/jpeg":options},
+    targets = {"image/png": options, "image/jpeg": options,
+               "image/png-reel": reel_options, "image/jpg-reel": reel_options}
+    convert_map = {"video/mp4" : targets,
+            "video/x-msvideo" : targets,
+            "video/x-flv" : targets,
+            "video/quicktime" : targets,
+            "video/x-matroska" : targets,
+            "video/mpeg" : targets,
             }
 
     def __init__(self):
@@ -31,37 +138,54 @@ class Video2ImageTranscoder(ITranscoder):
         file_path = expand_path_template(target_mimetype.template,
                 target_mimetype.mimetype, asset_id, **options)
 
-        time = file_descr.assets[0].metadata['duration'].string_value.split(':')
-        time = eval(time[0])*3600 + eval(time[1])*60 + eval(time[2])
-        if time < options['second']:
-            print "Not in range of video", file_descr.file.filename
+        asset_descr = file_descr.assets[0]
+        duration = asset_descr.metadata.get('duration') if asset_descr.metadata else None
+        duration = parse_duration(duration.string_value) if duration else None
+        size = video_size(asset_descr)
+        if not duration or size is None:
+            probed = probe_video(file_descr.file.filename)
+            duration = duration or probed.get('duration')
+            size = size or probed.get('size')
+        if not duration or size is None:
+            logger.error("Unknown duration or size of %s", file_descr.file.filename)
             return False
+        size = frame_size(size, options['size'])
 
-        if options['second']==-1:
-            second = time/2
+        if target_mimetype.mimetype.endswith('-reel'):
+            image = self.storyboard(file_descr.file.filename, duration, size, options)
         else:
-            second = options['second']
-        try:
-            tmp = tempfile.NamedTemporaryFile(suffix = '.jpeg')
-            pro = subprocess.Popen(['ffmpeg', '-ss', str(second), '-i',
-                file_descr.file.filename, '-t', '1', '-r', '1', tmp.name, '-y' ])
-            out, err = pro.communicate()
-            if pro.returncode != 0:
-                print('ffmpeg failed %s with error code %d' 
-                        %(file_descr.file.filename, pro.returncode), err)
-                return False
-        except OSError:
-            print "Cannot open video", file_descr.file.filename
+            image = self.frame(file_descr.file.filename, duration, size, options)
+        if image is None:
             return False
 
-        image = Image.open(tmp.name)
-        
         full_path = os.path.join(dest_path, file_path)
         if not os.path.exists(os.path.dirname(full_path)):
             os.makedirs(os.path.dirname(full_path))
-
-        if options['size'] != [-1, -1]:
-            image.thumbnail(options['size'])
-        image.save(full_path)
+        image.save(full_path, 'JPEG' if 'jp' in target_mimetype.mimetype else 'PNG')
 
         return [file_path]
+
+    def frame(self, path, duration, size, options):
+        """The frame at the second of the options, the middle one by default"""
+        if duration < options['second']:
+            logger.error("Not in range of video %s", path)
+            return None
+        second = duration / 2 if options['second'] == -1 else options['second']
+        frames = read_frames(path, size, 1, start=second)
+        return frames[0] if frames else None
+
+    def storyboard(self, path, duration, size, options):
+        """A grid of frames spread evenly over the whole video, each in the
+        middle of its share of the duration"""
+        count = options['frames']
+        footage = min(options['footage'], count)
+        interval = duration / count
+        frames = read_frames(path, size, count, start=interval / 2, fps=1.0 / interval,
+                             keyframes=options['spacing'] == 'keyframes')
+        if not frames:
+            return None
+        rows = (count + footage - 1) // footage
+        sprite = Image.new('RGB', (size[0] * footage, size[1] * rows))
+        for i, frame in enumerate(frames):
+            sprite.paste(frame, ((i % footage) * size[0], (i // footage) * size[1]))
+        return sprite
@@ -4,9 +4,16 @@ General utilities.
 
 import os
 import subprocess
+import tempfile
 import glob
 import hashlib
-import wave, struct
+import json
+import wave
+
+import numpy
+
+from damn_at.stats import STATS
+from damn_at import scheduler
 
 def calculate_hash_for_file(an_uri):
     """Returns a sha1 hexdigest for the given file.
@@ -47,6 +54,33 @@ def script_path(filename):
     return os.path.join(dirname, 'b-script-' + fnoext + '.py')
 
 
+def run_process(args, cpus=1, **kwargs):
+    """Runs a program to completion, its time is recorded in the
+    'subprocess.<program>' statistic.
+
+    The program waits for a slot of the scheduler, see
+    :py:class:`damn_at.scheduler.Scheduler`. It is killed when waiting for
+    it is interrupted, like by the deadline of a pool job.
+
+    :param cpus: the CPUs of the budget the program uses
+    :param kwargs: passed on to :py:class:`subprocess.Popen`
+    :rtype: tuple<string, string, int> stdout, stderr and returncode
+    """
+    kwargs.setdefault('stdout', subprocess.PIPE)
+    kwargs.setdefault('stderr', subprocess.PIPE)
+    program = os.path.basename(args[0])
+    with scheduler.SCHEDULER.slot(program, cpus):
+        with STATS.timed('subprocess.' + program):
+            process = subprocess.Popen(args, **kwargs)
+            try:
+                stdout, stderr = process.communicate()
+            except BaseException:
+                process.kill()
+                process.wait()
+                raise
+    return stdout, stderr, process.returncode
+
+
 def run_blender(an_uri, script_uri, arguments=[]):
     """Runs blender with the given file and script"""
     paths = collect_python3_paths()
@@ -58,20 +92,77 @@ def run_blender(an_uri, script_uri, arguments=[]):
 
     env = dict(os.environ)
     env['PYTHONPATH'] = os.pathsep.join(paths)
-    args = ['blender', "-b", an_uri, '-P', script_uri]
+    # As many render threads as the scheduler accounts for, 0 is all CPUs.
+    threads = scheduler.SCHEDULER.blender_threads()
+    args = ['blender', "-b", an_uri, '-t', str(threads), '-P', script_uri]
     args.extend(arguments)
 
-    process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env)
-    stdout, stderr = process.communicate()
-    return stdout, stderr, process.returncode
+    return run_process(args, cpus=threads or scheduler.SCHEDULER.cpus, env=env)
+
+
+def run_blender_with_result(an_uri, script_uri, arguments=[]):
+    """Runs blender with the given file and script and collect the
+    script's binary result.
+
+    The script gets a file path as its first argument after '--' to
+    write its result to, so it never has to go through blender's stdout.
+
+    :rtype: tuple<bytes, string, string, int> the result, stdout, stderr and returncode
+    """
+    handle, result_path = tempfile.mkstemp(prefix='damn_at-', suffix='.result')
+    os.close(handle)
+    try:
+        args = ['--', result_path]
+        args.extend(arguments)
+        stdout, stderr, returncode = run_blender(an_uri, script_uri, args)
+        with open(result_path, 'rb') as result:
+            data = result.read()
+    finally:
+        os.remove(result_path)
+    return data, stdout, stderr, returncode
+
+
+def run_blender_batch(an_uri, script_uri, jobs):
+    """Runs blender once with the given file for several jobs of the
+    script, rather than loading the file once per job.
+
+    The script gets '--batch' and the path of a JSON file with the list of
+    jobs as its arguments after '--', and '--result' and the path of a file
+    to write the JSON list of the errors of the jobs done so far to, None
+    for those that succeeded. Writing it after every job, by renaming
+    '<path>.tmp' over it, keeps the outcomes when blender dies on a later
+    one, which then fail.
+
+    :param jobs: list<dict> the arguments of every job
+    :rtype: tuple<list<string>, string, string, int> the error of every job
+            or None, stdout, stderr and returncode
+    """
+    handle, jobs_path = tempfile.mkstemp(prefix='damn_at-', suffix='.json')
+    result_handle, result_path = tempfile.mkstemp(prefix='damn_at-', suffix='.result')
+    os.close(result_handle)
+    try:
+        with os.fdopen(handle, 'w') as jobs_file:
+            json.dump(jobs, jobs_file)
+        stdout, stderr, returncode = run_blender(an_uri, script_uri,
+                                                 ['--', '--batch', jobs_path, '--result', result_path])
+        try:
+            with open(result_path) as result:
+                errors = json.load(result)[:len(jobs)]
+        except ValueError:
+            errors = []
+    finally:
+        for path in (jobs_path, result_path, result_path + '.tmp'):
+            if os.path.exists(path):
+                os.remove(path)
+    errors.extend(['Blender exited with %s before the job was done' % returncode] * (len(jobs) - len(errors)))
+    return errors, stdout, stderr, returncode
 
 
 def collect_python3_paths():
     """Collect python3's 'dist-packages' paths to create PYTHONPATH with"""
     paths = []
     args = ['python3', "-c", 'import site; [print(x) for x in site.getsitepackages()]']
-    process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    stdout, _ = process.communicate()
+    stdout, _, _ = run_process(args)
     for path in stdout.split('\n'):
         paths.append(path)
         for include in glob.glob(path + '/*.egg'):
@@ -258,6 +349,82 @@ def unique_asset_id_reference_from_fields(file_id_hash, subname, mimetype):
     return name.replace('/', '__')
 
 
+_SAMPLE_SCALES = {1: 128.0, 2: 32768.0, 3: 8388608.0, 4: 2147483648.0}
+"""Full scale of the PCM sample widths"""
+
+
+def decode_samples(raw_data, sample_width, nchannels):
+    """Decode little endian PCM frames to floats in [-1.0, 1.0)
+
+    :param sample_width: bytes per sample, 1 (unsigned) to 4
+    :rtype: numpy.ndarray float32 of shape (frames, nchannels)
+    """
+    if sample_width not in _SAMPLE_SCALES:
+        raise ValueError("Only supports 8, 16, 24 and 32 bit audio formats.")
+    if sample_width == 3:
+        # Widen to 32 bit, the shift back keeps the sign.
+        packed = numpy.frombuffer(raw_data, dtype=numpy.uint8).reshape(-1, 3)
+        widened = numpy.zeros((len(packed), 4), dtype=numpy.uint8)
+        widened[:, 1:] = packed
+        integers = widened.view('<i4').ravel() >> 8
+    else:
+        integers = numpy.frombuffer(raw_data, dtype={1: numpy.uint8, 2: '<i2', 4: '<i4'}[sample_width])
+    samples = integers.astype(numpy.float32)
+    if sample_width == 1:
+        #As the values are from 0 to 255 for 8 bit files.
+        samples -= 128.0
+    samples *= 1.0 / _SAMPLE_SCALES[sample_width]
+    return samples.reshape(-1, nchannels)
+
+
+CHUNK_FRAMES = 65536
+"""Frames per chunk of :py:func:`read_audio`"""
+
+
+def read_audio(path, samplerate, nchannels, chunk_frames=CHUNK_FRAMES):
+    """Decode an audio file with sox, streaming.
+
+    sox resamples to 16 bit samples at samplerate and writes them raw to
+    its stdout, they are read in chunks, so memory stays bounded however
+    long the recording is and nothing is written to disk.
+
+    :param nchannels: the channels sox mixes or copies the audio to
+    :rtype: generator of numpy.ndarray float32 of shape (frames, nchannels)
+            in [-1.0, 1.0)
+    :raises IOError: when sox fails
+    """
+    args = ['sox', path, '-t', 'raw', '-e', 'signed-integer', '-b', '16', '-L',
+            '-r', str(samplerate), '-c', str(nchannels), '-']
+    frame_size = 2 * nchannels
+    with scheduler.SCHEDULER.slot('sox'):
+        with STATS.timed('subprocess.sox'):
+            # stderr goes to a file, a full pipe would block sox.
+            with tempfile.TemporaryFile() as stderr:
+                process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=stderr)
+                finished = False
+                try:
+                    remainder = b''
+                    while True:
+                        data = process.stdout.read(chunk_frames * frame_size)
+                        if not data:
+                            break
+                        data = remainder + data
+                        usable = len(data) - len(data) % frame_size
+                        remainder = data[usable:]
+                        if usable:
+                            yield decode_samples(data[:usable], 2, nchannels)
+                    finished = True
+                finally:
+                    process.stdout.close()
+                    # Stopped early by the caller, sox must not linger.
+                    if not finished and process.poll() is None:
+                        process.kill()
+                    returncode = process.wait()
+                if returncode != 0:
+                    stderr.seek(0)
+                    raise IOError('sox failed %s with error code %d: %s' % (path, returncode, stderr.read()))
+
+
 class WaveData():
 
     def __init__(self):
@@ -265,6 +432,8 @@ class WaveData():
         self.nchannels = None
 
     def extractData(self, path, precision):
+        """Read the samples of a wave file, rounded to precision decimals,
+        into self.channels, an array of shape (nchannels, frames)"""
         stream = wave.open(path, 'rb')
         self.nchannels = stream.getnchannels()
         sample_width = stream.getsampwidth()
@@ -273,29 +442,10 @@ class WaveData():
         raw_data = stream.readframes(num_frames)
         stream.close()
 
-        total_samples = self.nchannels*num_frames
-
-        if sample_width == 1:
-            fmt = "%iB" % total_samples # read unsigned chars
-            round_with = 128.0
-        elif sample_width == 2:
-            fmt = "%ih" % total_samples # read signed 2 byte shorts
-            round_with = 32768.0
-        else:
-            raise ValueError("Only supports 8 and 16 bit audio formats.")
-
-        integer_data = struct.unpack(fmt, raw_data)
+        samples = decode_samples(raw_data, sample_width, self.nchannels)
         del raw_data # Keep Memory Tidy
-
-        self.channels = [ [] for time in range(self.nchannels) ]
-
-        #As the values are from 0 to 255 for 8 bit files.
-        if sample_width ==1:
-            integer_data = [ val - 128 for val in integer_data ]
-
-        for index, value in enumerate(integer_data):
-            bucket = index % self.nchannels
-            self.channels[bucket].append(round(value/round_with, precision))
+        numpy.round(samples, precision, out=samples)
+        self.channels = samples.T
 
     def getData(self):
         return self.channels
@@ -0,0 +1,208 @@
+"""
+Role
+====
+
+Waveform peaks: the minimum and maximum sample of every bucket of a fixed
+number of samples, at several zoom levels.
+
+:py:class:`PeakLevels` computes all levels in one pass over the chunks of
+:py:func:`damn_at.utilities.read_audio`, every level is derived from the
+next finer one, so the audio is only looked at once.
+
+The peak file format, all numbers little endian, is modelled after the
+.dat files of audiowaveform::
+
+    header  magic 'DAMNPEAK', version uint32, sample rate uint32,
+            channels uint32, bits uint32 (8 or 16), levels uint32
+    index   per level: samples per bucket uint32, buckets uint32,
+            offset uint64 of the level's data from the start of the file
+    data    per level: per bucket: per channel: min and max, int8 or int16
+
+A client reads the header and index, then only the bytes of the level
+and range of buckets it displays, see :py:func:`read_peaks`.
+
+:py:func:`render_waveform` draws peaks as an image, one pixel column per
+bucket of :py:func:`column_peaks`.
+"""
+import struct
+
+import numpy
+from PIL import Image
+
+MAGIC = b'DAMNPEAK'
+VERSION = 1
+
+_HEADER = struct.Struct('<8sIIIII')
+_INDEX = struct.Struct('<IIQ')
+_DTYPES = {8: '<i1', 16: '<i2'}
+
+
+class PeakLevels(object):
+    """
+    Min/max peaks of audio at several zoom levels, fed chunk by chunk.
+
+    :param samples_per_bucket: list<int> the bucket sizes of the levels,
+                               finest first, each a multiple of the previous
+    :param nchannels: the channels of the audio
+    """
+    def __init__(self, samples_per_bucket, nchannels):
+        for finer, coarser in zip(samples_per_bucket, samples_per_bucket[1:]):
+            if coarser % finer:
+                raise ValueError('%d samples per bucket is not a multiple of %d' % (coarser, finer))
+        self.samples_per_bucket = list(samples_per_bucket)
+        self.nchannels = nchannels
+        self._peaks = [[] for _ in samples_per_bucket]
+        # Input not yet making up a whole bucket, samples or finer peaks.
+        self._pending = [numpy.zeros((0, nchannels, 2), numpy.float32) for _ in samples_per_bucket]
+        self._samples = numpy.zeros((0, nchannels), numpy.float32)
+
+    def add(self, samples):
+        """Add a chunk of samples
+
+        :param samples: numpy.ndarray of shape (frames, nchannels)
+        """
+        samples = numpy.concatenate((self._samples, samples)) if len(self._samples) else samples
+        size = self.samples_per_bucket[0]
+        whole = len(samples) - len(samples) % size
+        self._samples = samples[whole:].copy()
+        if whole:
+            buckets = samples[:whole].reshape(-1, size, self.nchannels)
+            self._add_peaks(0, numpy.stack((buckets.min(axis=1), buckets.max(axis=1)), axis=-1))
+
+    def _add_peaks(self, level, peaks):
+        """Add whole buckets to the level, and what they add up to to the
+        coarser levels"""
+        self._peaks[level].append(peaks)
+        if level + 1 == len(self.samples_per_bucket):
+            return
+        factor = self.samples_per_bucket[level + 1] // self.samples_per_bucket[level]
+        peaks = numpy.concatenate((self._pending[level + 1], peaks))
+        whole = len(peaks) - len(peaks) % factor
+        self._pending[level + 1] = peaks[whole:]
+        if whole:
+            self._add_peaks(level + 1, _merge(peaks[:whole].reshape(-1, factor, self.nchannels, 2)))
+
+    def finish(self):
+        """The peaks of every level, the last bucket of a level may be a
+        partial one
+
+        :rtype: list<numpy.ndarray> float32 of shape (buckets, nchannels, 2)
+        """
+        partial = None
+        if len(self._samples):
+            partial = numpy.stack((self._samples.min(axis=0), self._samples.max(axis=0)), axis=-1)[None]
+        for level in range(len(self.samples_per_bucket)):
+            if level:
+                # The finer level's leftovers, its partial bucket included.
+                pending = self._pending[level]
+                if partial is not None:
+                    pending = numpy.concatenate((pending, partial))
+                partial = _merge(pending[None]) if len(pending) else None
+                self._pending[level] = pending[:0]
+            if partial is not None:
+                self._peaks[level].append(partial)
+        self._samples = self._samples[:0]
+        return [numpy.concatenate(peaks) if peaks else numpy.zeros((0, self.nchannels, 2), numpy.float32)
+                for peaks in self._peaks]
+
+
+def _merge(groups):
+    """Merge groups of peaks of shape (groups, size, nchannels, 2)"""
+    return numpy.stack((groups[..., 0].min(axis=1), groups[..., 1].max(axis=1)), axis=-1)
+
+
+def write_peaks(output, levels, samples_per_bucket, samplerate, bits=16):
+    """Write peak levels in the peak file format
+
+    :param output: a binary file
+    :param levels: list<numpy.ndarray> see :py:meth:`PeakLevels.finish`
+    """
+    if bits not in _DTYPES:
+        raise ValueError('Only supports 8 and 16 bit peaks.')
+    nchannels = levels[0].shape[1] if levels else 0
+    scale = 2 ** (bits - 1) - 1
+    output.write(_HEADER.pack(MAGIC, VERSION, samplerate, nchannels, bits, len(levels)))
+    offset = _HEADER.size + _INDEX.size * len(levels)
+    for size, peaks in zip(samples_per_bucket, levels):
+        output.write(_INDEX.pack(size, len(peaks), offset))
+        offset += peaks.size * bits // 8
+    for peaks in levels:
+        output.write(numpy.clip(numpy.round(peaks * scale), -scale, scale).astype(_DTYPES[bits]).tobytes())
+
+
+def read_index(input_file):
+    """Read the header and index of a peak file
+
+    :rtype: dict samplerate, channels, bits and levels, a list of
+            (samples per bucket, buckets, offset)
+    """
+    magic, version, samplerate, nchannels, bits, count = _HEADER.unpack(input_file.read(_HEADER.size))
+    if magic != MAGIC or version != VERSION or bits not in _DTYPES:
+        raise ValueError('Not a peak file')
+    levels = [_INDEX.unpack(input_file.read(_INDEX.size)) for _ in range(count)]
+    return {'samplerate': samplerate, 'channels': nchannels, 'bits': bits, 'levels': levels}
+
+
+def read_peaks(input_file, level, start=0, stop=None):
+    """Read a range of buckets of a level of a peak file, the level with
+    the given number of samples per bucket
+
+    :rtype: numpy.ndarray float of shape (buckets, nchannels, 2)
+    """
+    input_file.seek(0)
+    index = read_index(input_file)
+    for size, buckets, offset in index['levels']:
+        if size == level:
+            break
+    else:
+        raise ValueError('No level of %d samples per bucket' % level)
+    stop = buckets if stop is None else min(stop, buckets)
+    start = min(start, stop)
+    bucket_bytes = index['channels'] * 2 * index['bits'] // 8
+    input_file.seek(offset + start * bucket_bytes)
+    data = numpy.frombuffer(input_file.read((stop - start) * bucket_bytes), dtype=_DTYPES[index['bits']])
+    return data.reshape(-1, index['channels'], 2) / float(2 ** (index['bits'] - 1) - 1)
+
+
+def column_peaks(peaks, width):
+    """Merge or stretch peaks to exactly width buckets
+
+    :param peaks: numpy.ndarray of shape (buckets, nchannels, 2)
+    :rtype: numpy.ndarray of shape (width, nchannels, 2)
+    """
+    count = len(peaks)
+    if not count:
+        return numpy.zeros((width, peaks.shape[1], 2), numpy.float32)
+    if count < width:
+        return peaks[numpy.arange(width) * count // width]
+    starts = numpy.arange(width) * count // width
+    return numpy.stack((numpy.minimum.reduceat(peaks[..., 0], starts, axis=0),
+                        numpy.maximum.reduceat(peaks[..., 1], starts, axis=0)), axis=-1)
+
+
+def render_waveform(peaks, size, color, background=(255, 255, 255)):
+    """Draw the waveform of peaks, the channels in bands below each other.
+
+    Every pixel column is filled from its bucket's minimum to its maximum,
+    no state is shared, so it is safe to call from several threads.
+
+    :param peaks: numpy.ndarray of shape (buckets, nchannels, 2)
+    :param size: (width, height) of the image in pixels
+    :param color: the waveform's color as an (r, g, b) tuple
+    :rtype: PIL.Image.Image in RGB
+    """
+    width, height = size
+    columns = column_peaks(peaks, width)
+    pixels = numpy.empty((height, width, 3), numpy.uint8)
+    pixels[...] = background
+    nchannels = columns.shape[1]
+    band = height // nchannels if nchannels else 0
+    rows = numpy.arange(band)[:, None]
+    for channel in range(nchannels):
+        # Row 0 is the top, +1.0 lands on the first row of the band.
+        half = (band - 1) / 2.0
+        top = numpy.round(half - numpy.clip(columns[:, channel, 1], -1.0, 1.0) * half)
+        bottom = numpy.round(half - numpy.clip(columns[:, channel, 0], -1.0, 1.0) * half)
+        mask = (rows >= top) & (rows <= bottom)
+        pixels[channel * band:(channel + 1) * band][mask] = color
+    return Image.fromarray(pixels, 'RGB')
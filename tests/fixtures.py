@@ -0,0 +1,28 @@
+"""FileDescriptions shared by the tests"""
+from damn_at import (
+    MetaDataType,
+    MetaDataValue,
+    FileId,
+    FileDescription,
+    AssetId,
+    AssetDescription
+)
+
+
+def create_file_description(filename, file_hash, vertices=24, subnames=('Cube',)):
+    """Create a FileDescription with a mesh asset with some metadata per
+    subname, each depending on a material"""
+    fileid = FileId(filename=filename, hash=file_hash)
+    assets = []
+    for subname in subnames:
+        metadata = {
+            'nr_of_vertices': MetaDataValue(type=MetaDataType.INT, int_value=vertices),
+            'smooth': MetaDataValue(type=MetaDataType.BOOL, bool_value=True),
+            'scale': MetaDataValue(type=MetaDataType.DOUBLE, double_value=0.5),
+            'type': MetaDataValue(type=MetaDataType.STRING, string_value='MESH'),
+        }
+        asset = AssetDescription(asset=AssetId(subname=subname, mimetype='application/x-blender.mesh', file=fileid),
+                                 metadata=metadata)
+        asset.dependencies = [AssetId(subname='Material', mimetype='application/x-blender.material', file=fileid)]
+        assets.append(asset)
+    return FileDescription(file=fileid, mimetype='application/x-blender', metadata={}, assets=assets)
@@ -29,3 +29,17 @@ class TestCase(unittest.TestCase):
 
     def test_walk(self):
         pass
+
+    def test_write_block(self):
+        import shutil
+        import hashlib
+        import tempfile
+        destination = tempfile.mkdtemp()
+        try:
+            data = b'block data'
+            block_hash = hashlib.sha1(data).hexdigest()
+            assert not bld.write_block(destination, 'b' * 40, data)
+            assert bld.write_block(destination, block_hash, data)
+            assert bld.filter_existing_block_hashes(destination, [block_hash, 'b' * 40]) == set(['b' * 40])
+        finally:
+            shutil.rmtree(destination)
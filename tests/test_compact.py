@@ -0,0 +1,73 @@
+"""Test the compact FileDescription representation"""
+import sys
+import unittest
+
+from damn_at import MetaDataType, FileDescription
+from damn_at.compact import CompactPool, compact_file_description
+from damn_at.serialization import SerializeThriftMsg, DeserializeThriftMsg
+
+from tests.fixtures import create_file_description
+
+
+def _footprint(obj, seen=None):
+    """Approximate memory used by obj and everything it references,
+    counting shared objects once"""
+    if seen is None:
+        seen = set()
+    if obj is None or isinstance(obj, (bool, type)) or id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_footprint(key, seen) + _footprint(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(_footprint(item, seen) for item in obj)
+    elif hasattr(obj, '__dict__'):
+        size += _footprint(vars(obj), seen)
+    for cls in type(obj).__mro__:
+        for slot in getattr(cls, '__slots__', ()):
+            size += _footprint(getattr(obj, slot, None), seen)
+    return size
+
+
+class CompactTest(unittest.TestCase):
+    """Test compact_file_description"""
+    def test_round_trip(self):
+        file_descr = create_file_description('cube1.blend', '52c676b4')
+        compact = compact_file_description(file_descr)
+        self.assertEqual(file_descr, compact.to_thrift())
+
+    def test_metadata(self):
+        compact = compact_file_description(create_file_description('cube1.blend', '52c676b4'))
+        metadata = compact.assets[0].metadata
+        self.assertEqual(24, metadata['nr_of_vertices'])
+        self.assertEqual(True, metadata['smooth'])
+        self.assertEqual(0.5, metadata['scale'])
+        self.assertEqual('MESH', metadata['type'])
+        self.assertEqual(MetaDataType.DOUBLE, metadata.type_of('scale'))
+        self.assertRaises(KeyError, lambda: metadata['unknown'])
+        self.assertRaises(KeyError, metadata.type_of, 'unknown')
+        self.assertTrue('scale' in metadata)
+        self.assertFalse('unknown' in metadata)
+        self.assertFalse(1 in metadata)
+
+    def test_pool_sharing(self):
+        pool = CompactPool()
+        first = compact_file_description(create_file_description('cube1.blend', '52c676b4'), pool)
+        second = compact_file_description(create_file_description('cube2.blend', '8c8065ae'), pool)
+        self.assertTrue(first.assets[0].metadata.keys_ is second.assets[0].metadata.keys_)
+        self.assertTrue(first.assets[0].asset.mimetype is second.assets[0].asset.mimetype)
+        self.assertTrue(first.assets[0].asset.file is first.assets[0].dependencies[0].file)
+
+    def test_memory(self):
+        # Deserialize like a store does, so the Thrift objects don't
+        # share strings the way the fixture's literals do.
+        file_descrs = []
+        for i in range(50):
+            file_descr = create_file_description('cube%d.blend' % i, '%08x' % i,
+                                                 subnames=['Cube%d' % j for j in range(5)])
+            file_descrs.append(DeserializeThriftMsg(FileDescription(), SerializeThriftMsg(file_descr)))
+        pool = CompactPool()
+        compacts = [compact_file_description(file_descr, pool) for file_descr in file_descrs]
+        self.assertEqual(file_descrs, [compact.to_thrift() for compact in compacts])
+        self.assertTrue(_footprint(file_descrs) > 3 * _footprint(compacts))
@@ -1,19 +1,370 @@
 """Test DAMN services"""
+import os
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+import threading
 import unittest
 
-from thrift.protocol import TJSONProtocol, TBinaryProtocol
+import mock
 
-from damn_at.serialization import SerializeThriftMsg, DeserializeThriftMsg
+from thrift.transport import TSocket, TTransport
+from thrift.protocol import TBinaryProtocol
+
+from damn_at.serialization.server import DamnServiceHandler, create_server, _asset_key, _transcode_assets_job
+from damn_at.serialization.client import DamnServiceClient
+from damn_at.serialization.pool import (
+    WorkerPool,
+    PoolBusyException,
+    PoolDeadlineException,
+    PoolJobException
+)
+from damn_at.serialization.generated.damn import DamnService
+from damn_at.serialization.generated.damn.ttypes import UnknownFileException, UploadException, TranscodeRequest
+from damn_at.serialization.generated.damn_types.ttypes import File
+from damn_at import MetaDataType, MetaDataValue, FileId, FileDescription, AssetId, AssetDescription
 
-from damn_at import FileId, AssetId, AssetDescription
 
 class DAMNServiceTest(unittest.TestCase):
-    """DAMNServiceTest"""   
+    """DAMNServiceTest"""
+    def setUp(self):
+        patcher = mock.patch('damn_at.serialization.server.Analyzer')
+        self.analyzer = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.analyzer.return_value.get_supported_mimetypes.return_value = ['image/png', 'application/x-blender']
 
     def test_something(self): # pylint: disable=C0103
         """test_something"""
         self.assertEqual(True, True)
 
+    def test_static_responses_cached(self):
+        """The Analyzer is created once and its response cached"""
+        handler = DamnServiceHandler()
+        self.assertEqual(['application/x-blender', 'image/png'], handler.get_supported_mimetypes())
+        handler.get_supported_mimetypes()
+        self.assertEqual(1, self.analyzer.call_count)
+        self.assertEqual(1, self.analyzer.return_value.get_supported_mimetypes.call_count)
+
+    def test_analyze_hash(self):
+        """Stored FileDescriptions are found by hash and size"""
+        store_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, store_path)
+        handler = DamnServiceHandler(store_path=store_path)
+        file_hash = 'a' * 40
+        file_descr = FileDescription(file=FileId(filename='cube.blend', hash=file_hash), mimetype='application/x-blender',
+                                     metadata={'st_size': MetaDataValue(type=MetaDataType.INT, int_value=42)})
+        handler.metadatastore.write_metadata('', file_hash, file_descr)
+
+        self.assertEqual(file_descr, handler.analyze_hash(file_hash, 42))
+        self.assertRaises(UnknownFileException, handler.analyze_hash, file_hash, 43)
+        self.assertRaises(UnknownFileException, handler.analyze_hash, 'b' * 40, 42)
+        self.assertRaises(UnknownFileException, handler.analyze_hash, '../../etc/passwd', 42)
+
+    def test_transcode_assets_job(self):
+        """A failing target doesn't fail the other targets of its file"""
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        fileid = FileId(filename='cube.blend')
+        asset_id = AssetId(subname='Cube', mimetype='application/x-blender.mesh', file=fileid)
+        analyzer = mock.Mock()
+        analyzer.analyze_file.return_value = FileDescription(file=fileid, assets=[AssetDescription(asset=asset_id)])
+        transcoder = mock.Mock(_path=path)
+        transcoder.plan.side_effect = lambda src, dst: None if dst == 'unknown/mime' else [(src, dst, None)]
+        transcoder.parse_route_options.return_value = {}
+
+        dest_paths = set()
+
+        def transcode_assets(file_descr, requests, dest_path):  # pylint: disable=W0613
+            dest_paths.add(dest_path)
+            if len(requests) > 1 or requests[0][1] == 'image/jpeg':
+                raise Exception('Broken')
+            if requests[0][1] == 'image/gif':
+                return [False]
+            with open(os.path.join(dest_path, 'cube.png'), 'wb') as output:
+                output.write(b'png')
+            return [['cube.png']]
+        transcoder.transcode_assets.side_effect = transcode_assets
+
+        with mock.patch.dict('damn_at.serialization.server._WORKER', analyzer=analyzer, transcoder=transcoder):
+            results = _transcode_assets_job([('cube.blend', b'blend')], [
+                ('Cube', 'application/x-blender.mesh', [('image/png', {}), ('image/jpeg', {}), ('unknown/mime', {}),
+                                                      ('image/gif', {})]),
+                ('Sphere', 'application/x-blender.mesh', [('image/png', {})])])
+        self.assertEqual(([('cube.png', b'png')], None), results[0][0])
+        self.assertEqual((None, 'Broken'), results[0][1])
+        self.assertEqual((None, 'Can not transcode application/x-blender.mesh to unknown/mime'), results[0][2])
+        self.assertEqual((None, 'Transcoding Cube(application/x-blender.mesh) to image/gif failed'), results[0][3])
+        self.assertEqual((None, 'No asset Sphere(application/x-blender.mesh) in cube.blend'), results[1][0])
+        # The job's outputs are its own.
+        self.assertEqual(1, len(dest_paths))
+        dest_path = dest_paths.pop()
+        self.assertNotEqual(path, dest_path)
+        self.assertFalse(os.path.exists(dest_path))
+
+    def test_transcode_coalescing(self):
+        """transcode_many shares identical transcodes with transcode calls"""
+        handler = DamnServiceHandler()
+        started = threading.Event()
+        release = threading.Event()
+
+        def run(func, args, deadline):  # pylint: disable=W0613
+            started.set()
+            release.wait(5)
+            return [('cube.png', b'png')]
+
+        def run_many(func, args_list, deadline):  # pylint: disable=W0613
+            return [([[([('cube.%s' % mimetype.split('/')[1], b'data')], None) for mimetype, _ in targets]
+                      for _, _, targets in assets], None) for _, assets in args_list]
+
+        files = [File(filename='cube.blend', data=b'blend')]
+        asset = AssetId(subname='Cube', mimetype='application/x-blender.mesh')
+        outcomes = []
+        with mock.patch.object(handler, 'transcode_pool') as pool:
+            pool.run.side_effect = run
+            pool.run_many.side_effect = run_many
+            call = threading.Thread(target=lambda: outcomes.append(handler.transcode(files, asset, 'image/png', {})))
+            call.start()
+            self.assertTrue(started.wait(5))
+            batch = threading.Thread(target=lambda: outcomes.append(handler.transcode_many([
+                TranscodeRequest(files=files, asset=asset, mimetype='image/png', options={}),
+                TranscodeRequest(files=files, asset=asset, mimetype='image/jpeg', options={}),
+                TranscodeRequest(files=files, asset=asset, mimetype='image/jpeg', options={})])))
+            batch.start()
+            time.sleep(0.2)
+            release.set()
+            call.join(5)
+            batch.join(5)
+
+        self.assertEqual(1, pool.run.call_count)
+        self.assertEqual(1, pool.run_many.call_count)
+        self.assertEqual([[('image/jpeg', {})]], [targets for _, _, targets in pool.run_many.call_args[0][1][0][1]])
+        self.assertEqual([File(filename='cube.png', data=b'png')], outcomes[0])
+        self.assertEqual([[File(filename='cube.png', data=b'png')], [File(filename='cube.jpeg', data=b'data')],
+                          [File(filename='cube.jpeg', data=b'data')]], [result.files for result in outcomes[1]])
+
+    def test_asset_key(self):
+        """Uploads are identified by content, whatever their filenames"""
+        key = _asset_key([(b'caf\xc3\xa9.blend', b'blend')], 'Cube', 'application/x-blender.mesh')
+        self.assertEqual(key, _asset_key([(u'caf\xe9.blend', b'blend')], 'Cube', 'application/x-blender.mesh'))
+        self.assertNotEqual(key, _asset_key([(u'caf\xe9.blend', b'other')], 'Cube', 'application/x-blender.mesh'))
+
+    def test_upload_blocks(self):
+        """Uploaded blocks are no longer missing, corrupt ones are refused"""
+        block_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, block_path)
+        handler = DamnServiceHandler(block_path=block_path)
+        data = b'block data'
+        block_hash = hashlib.sha1(data).hexdigest()
+
+        self.assertEqual([block_hash], handler.missing_blocks([block_hash]))
+        handler.upload_blocks({block_hash: data})
+        self.assertEqual([], handler.missing_blocks([block_hash]))
+        self.assertRaises(UploadException, handler.upload_blocks, {'b' * 40: data})
+
+    def test_chunked_upload(self):
+        """Chunks are spooled to disk, retried chunks are ignored"""
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        handler = DamnServiceHandler(store_path=tmp + '/store', spool_path=tmp + '/spool')
+        data = b'0123456789'
+        file_hash = hashlib.sha1(data).hexdigest()
+        file_descr = FileDescription(file=FileId(filename='cube.blend', hash=file_hash), mimetype='application/x-blender',
+                                     metadata={'st_size': MetaDataValue(type=MetaDataType.INT, int_value=len(data))})
+        handler.metadatastore.write_metadata('', file_hash, file_descr)
+
+        upload_id = handler.open_upload('cube.blend')
+        self.assertEqual(4, handler.append_upload(upload_id, 0, data[:4]))
+        self.assertEqual(4, handler.append_upload(upload_id, 0, data[:4]))
+        self.assertRaises(UploadException, handler.append_upload, upload_id, 6, data[6:])
+        self.assertEqual(10, handler.append_upload(upload_id, 4, data[4:]))
+        self.assertRaises(UploadException, handler.commit_upload, upload_id, 'b' * 40)
+        self.assertRaises(UploadException, handler.append_upload, upload_id, 10, data)
+
+        upload_id = handler.open_upload('cube.blend')
+        handler.append_upload(upload_id, 0, data)
+        self.assertEqual(file_descr, handler.commit_upload(upload_id, file_hash))
+        self.assertEqual([], os.listdir(tmp + '/spool'))
+
+    def start_server(self, threads=2):
+        """Start a server on a free port, return the server, its thread and port"""
+        server = create_server(DamnServiceHandler(), 'localhost', 0, threads=threads)
+        server.poll_interval = 0.05
+        server.listen()
+        port = server.serverTransport.handle.getsockname()[1]
+        thread = threading.Thread(target=server.serve, kwargs={'listen': False})
+        thread.start()
+        return server, thread, port
+
+    def stop_server(self, server, thread):
+        server.stop()
+        thread.join(5)
+
+    def test_serve_and_stop(self):
+        """Concurrent clients are served and stop() returns once they're done"""
+        server, thread, port = self.start_server()
+
+        transports = []
+        try:
+            for _ in range(2):
+                transport = TTransport.TBufferedTransport(TSocket.TSocket('localhost', port))
+                transport.open()
+                transports.append(transport)
+            for transport in transports:
+                client = DamnService.Client(TBinaryProtocol.TBinaryProtocol(transport))
+                client.ping()
+                self.assertEqual(['application/x-blender', 'image/png'], client.get_supported_mimetypes())
+        finally:
+            server.stop()
+            thread.join(5)
+            for transport in transports:
+                transport.close()
+        self.assertFalse(thread.is_alive())
+
+    def test_client_pool(self):
+        """Connections are reused and broken ones replaced"""
+        server, thread, port = self.start_server()
+        self.addCleanup(self.stop_server, server, thread)
+        client = DamnServiceClient(['localhost:%d' % port], size=2)
+        self.addCleanup(client.close)
+        for _ in range(3):
+            client.ping()
+        self.assertEqual(1, len(client._idle))
+        connection = client._idle[0]
+        connection.transport.close()
+        self.assertEqual(['application/x-blender', 'image/png'], client.get_supported_mimetypes())
+        self.assertEqual(1, len(client._idle))
+        self.assertFalse(connection is client._idle[0])
+
+    def test_client_retries(self):
+        """Only read-only calls are retried once the request went out"""
+        server, thread, port = self.start_server()
+        self.addCleanup(self.stop_server, server, thread)
+        client = DamnServiceClient(['localhost:%d' % port])
+        self.addCleanup(client.close)
+        sent = []
+
+        def recv_failing(self):  # pylint: disable=W0613
+            sent.append(True)
+            raise TTransport.TTransportException(message='Connection reset')
+        with mock.patch.object(DamnService.Client, 'recv_ping', recv_failing):
+            self.assertRaises(TTransport.TTransportException, client.ping)
+        self.assertEqual(3, len(sent))
+        del sent[:]
+        with mock.patch.object(DamnService.Client, 'recv_cancel_job', recv_failing):
+            self.assertRaises(TTransport.TTransportException, client.cancel_job, 'job')
+        self.assertEqual(1, len(sent))
+
+    def test_client_spreads_calls(self):
+        """Warm connections don't pin the calls to one endpoint"""
+        servers = [self.start_server() for _ in range(2)]
+        for server, thread, _ in servers:
+            self.addCleanup(self.stop_server, server, thread)
+        client = DamnServiceClient([('localhost', port) for _, _, port in servers])
+        self.addCleanup(client.close)
+        for _ in range(6):
+            client.ping()
+        self.assertEqual(sorted(('localhost', port) for _, _, port in servers),
+                         sorted(connection.endpoint for connection in client._idle))
+
+    def test_chunked_upload_abort_fails(self):
+        """A failing abort doesn't hide why the upload failed"""
+        def call(name, *args):  # pylint: disable=W0613
+            if name == 'open_upload':
+                return 'upload'
+            if name == 'append_upload':
+                raise UploadException(msg='Disk full')
+            raise TTransport.TTransportException(message='Connection reset')
+        client = DamnServiceClient()
+        with mock.patch.object(client, 'call', side_effect=call) as mocked:
+            self.assertRaises(UploadException, client.analyze_file_chunked, __file__, chunk_size=1024)
+        self.assertEqual('abort_upload', mocked.call_args[0][0])
+
+    def test_get_stats(self):
+        """Calls are counted per method"""
+        server, thread, port = self.start_server()
+        self.addCleanup(self.stop_server, server, thread)
+        client = DamnServiceClient(['localhost:%d' % port])
+        self.addCleanup(client.close)
+        before = json.loads(client.get_stats())['histograms'].get('rpc.ping', {}).get('count', 0)
+        for _ in range(3):
+            client.ping()
+        stats = json.loads(client.get_stats())
+        self.assertEqual(before + 3, stats['histograms']['rpc.ping']['count'])
+        self.assertEqual(1, stats['gauges']['rpc.inflight']['get_stats'])
+
+    def test_client_endpoints(self):
+        """Endpoints that refuse connections are skipped"""
+        server, thread, port = self.start_server()
+        self.addCleanup(self.stop_server, server, thread)
+        client = DamnServiceClient(['localhost:1', ('localhost', port)])
+        self.addCleanup(client.close)
+        for _ in range(4):
+            client.ping()
+
+
+class WorkerPoolTest(unittest.TestCase):
+    """Test the bounded WorkerPool"""
+    def setUp(self):
+        self.pool = WorkerPool(1, 1)
+        self.pool.start()
+        self.addCleanup(self.pool.close)
+
+    def test_run(self):
+        self.assertEqual(3, self.pool.run(len, ('abc',)))
+        self.assertRaises(PoolJobException, self.pool.run, int, ('abc',))
+        self.assertEqual(0, self.pool.pending)
+
+    def test_busy(self):
+        thread = threading.Thread(target=self.pool.run, args=(time.sleep, (0.5,)))
+        thread.start()
+        time.sleep(0.1)
+        try:
+            self.assertRaises(PoolBusyException, self.pool.run, len, ('abc',))
+        finally:
+            thread.join()
+        self.assertEqual(3, self.pool.run(len, ('abc',)))
+
+    def test_run_many(self):
+        """Batches larger than the pool are run to completion"""
+        results = self.pool.run_many(len, [('a',), ('bb',), ('ccc',)])
+        self.assertEqual([(1, None), (2, None), (3, None)], results)
+        results = self.pool.run_many(int, [('1',), ('x',)])
+        self.assertEqual((1, None), results[0])
+        self.assertTrue(isinstance(results[1][1], PoolJobException))
+        self.assertEqual(0, self.pool.pending)
+
+    def test_deadline(self):
+        self.assertRaises(PoolDeadlineException, self.pool.run, len, ('abc',), time.time() - 1)
+        self.assertRaises(PoolDeadlineException, self.pool.run, time.sleep, (5,), time.time() + 0.1)
+        # The job is interrupted at its deadline and gives up its slot.
+        time.sleep(0.5)
+        self.assertEqual(0, self.pool.pending)
+        self.assertEqual(3, self.pool.run(len, ('abc',)))
+
+    def test_hung_job(self):
+        """A job that ignores its deadline loses its worker and slot"""
+        pool = WorkerPool(1, 1, grace=0.2)
+        pool.start()
+        self.addCleanup(pool.close)
+        self.assertRaises(PoolDeadlineException, pool.run, _sleep_stubbornly, (5,), time.time() + 0.1)
+        self.assertEqual(1, pool.pending)
+        time.sleep(0.5)
+        self.assertEqual(0, pool.pending)
+        self.assertEqual(3, pool.run(len, ('abc',), time.time() + 5))
+
+
+def _sleep_stubbornly(seconds):
+    """Sleep, ignoring any interruptions"""
+    end = time.time() + seconds
+    while time.time() < end:
+        try:
+            time.sleep(end - time.time())
+        except BaseException:  # pylint: disable=W0702
+            pass
+
+
 def test_suite():
     """Suits"""
     return unittest.TestLoader().loadTestsFromTestCase(DAMNServiceTest)
@@ -0,0 +1,102 @@
+"""Test the persistent job queue"""
+import os
+import shutil
+import time
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+import mock
+
+from damn_at.serialization import jobqueue
+
+
+class JobQueueTest(unittest.TestCase):
+    """Test JobQueue"""
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.queue = jobqueue.JobQueue(os.path.join(self.tmp, 'jobs.sqlite'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_priority(self):
+        low = self.queue.submit('transcode', b'low', 0)
+        high = self.queue.submit('transcode', b'high', 10)
+        self.assertEqual((high, b'high'), self.queue.lease('transcode', 'worker', 60))
+        self.assertEqual((low, b'low'), self.queue.lease('transcode', 'worker', 60))
+        self.assertEqual(None, self.queue.lease('transcode', 'worker', 60))
+        self.assertEqual(None, self.queue.lease('analyze', 'worker', 60))
+
+    def test_complete(self):
+        job_id = self.queue.submit('transcode', b'request')
+        self.queue.lease('transcode', 'worker', 60)
+        self.assertEqual(jobqueue.RUNNING, self.queue.status(job_id)['state'])
+        self.assertFalse(self.queue.complete(job_id, 'other worker', b'result'))
+        self.assertTrue(self.queue.complete(job_id, 'worker', b'result'))
+        self.assertEqual((jobqueue.DONE, b'result', None), self.queue.result(job_id))
+        self.assertFalse(self.queue.cancel(job_id))
+
+    def test_expired_lease(self):
+        job_id = self.queue.submit('transcode', b'request')
+        for _ in range(jobqueue.MAX_ATTEMPTS):
+            self.assertEqual(job_id, self.queue.lease('transcode', 'worker', -1)[0])
+        self.assertEqual(None, self.queue.lease('transcode', 'worker', -1))
+        self.assertEqual(jobqueue.FAILED, self.queue.status(job_id)['state'])
+
+    def test_cancel(self):
+        job_id = self.queue.submit('transcode', b'request')
+        self.assertTrue(self.queue.cancel(job_id))
+        self.assertEqual(None, self.queue.lease('transcode', 'worker', 60))
+        self.assertEqual([job_id], [job['id'] for job in self.queue.list(jobqueue.CANCELLED)])
+        self.assertRaises(jobqueue.UnknownJobException, self.queue.cancel, 'unknown')
+
+    def test_runner(self):
+        done = threading.Event()
+
+        def handle(request, deadline):  # pylint: disable=W0613
+            if request == b'fail':
+                raise jobqueue.JobQueueException('failed')
+            done.set()
+            return request.upper()
+
+        failing = self.queue.submit('transcode', b'fail', 1)
+        job_id = self.queue.submit('transcode', b'request')
+        runner = jobqueue.JobRunner(self.queue, 'transcode', handle, threads=1, poll_interval=0.01)
+        runner.start()
+        try:
+            self.assertTrue(done.wait(5))
+        finally:
+            runner.stop()
+        self.assertEqual((jobqueue.DONE, b'REQUEST', None), self.queue.result(job_id))
+        self.assertEqual((jobqueue.FAILED, None, 'failed'), self.queue.result(failing))
+
+    def test_runner_database_errors(self):
+        """The runner outlives a locked database and gets a job deadline"""
+        deadlines = []
+        done = threading.Event()
+
+        def handle(request, deadline):
+            deadlines.append(deadline)
+            done.set()
+            return request
+
+        lease = self.queue.lease
+        errors = [sqlite3.OperationalError('database is locked')] * 2
+
+        def locked_lease(*args):
+            if errors:
+                raise errors.pop()
+            return lease(*args)
+
+        job_id = self.queue.submit('transcode', b'request')
+        runner = jobqueue.JobRunner(self.queue, 'transcode', handle, threads=1, poll_interval=0.01, timeout=600)
+        with mock.patch.object(self.queue, 'lease', side_effect=locked_lease):
+            runner.start()
+            try:
+                self.assertTrue(done.wait(5))
+            finally:
+                runner.stop()
+        self.assertEqual((jobqueue.DONE, b'request', None), self.queue.result(job_id))
+        self.assertTrue(time.time() + 590 < deadlines[0] <= time.time() + 600)
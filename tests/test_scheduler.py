@@ -0,0 +1,59 @@
+"""Test the concurrency limits of tools and plugins"""
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+
+from damn_at.scheduler import Scheduler, parse_limits
+
+
+class SchedulerTest(unittest.TestCase):
+    """Test Scheduler"""
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def max_concurrent(self, scheduler, slots, count=6):
+        """Run count threads that each hold one of the (name, cpus) slots,
+        return the most that held one at the same time"""
+        lock = threading.Lock()
+        running = [0, 0]
+
+        def work(name, cpus):
+            with scheduler.slot(name, cpus):
+                with lock:
+                    running[0] += 1
+                    running[1] = max(running)
+                time.sleep(0.05)
+                with lock:
+                    running[0] -= 1
+        threads = [threading.Thread(target=work, args=slots[i % len(slots)]) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return running[1]
+
+    def test_tool_limit(self):
+        scheduler = Scheduler(self.tmp, cpus=8, limits={'sox': 2})
+        self.assertEqual(2, self.max_concurrent(scheduler, [('sox', 1)]))
+
+    def test_cpu_budget(self):
+        scheduler = Scheduler(self.tmp, cpus=4, limits={'blender': 4})
+        self.assertEqual(1, self.max_concurrent(scheduler, [('blender', 4)], count=3))
+        self.assertEqual(4, self.max_concurrent(scheduler, [('exiftool', 1)]))
+        # Plugins take no CPUs, their tools do.
+        self.assertEqual(6, self.max_concurrent(scheduler, [('Image Transcoder', 0)]))
+
+    def test_unconfigured(self):
+        scheduler = Scheduler(cpus=1)
+        self.assertEqual(0, scheduler.blender_threads())
+        self.assertEqual(6, self.max_concurrent(scheduler, [('blender', 1)]))
+
+    def test_blender_threads(self):
+        self.assertEqual(4, Scheduler(self.tmp, cpus=8, limits={'blender': 2}).blender_threads())
+        self.assertEqual(1, Scheduler(self.tmp, cpus=2, limits={'blender': 4}).blender_threads())
+
+    def test_parse_limits(self):
+        self.assertEqual({'blender': 2, 'Image Transcoder': 4}, parse_limits(['blender=2', 'Image Transcoder=4']))
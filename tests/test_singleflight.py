@@ -0,0 +1,108 @@
+"""Test the coalescing of identical calls"""
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+
+from damn_at.singleflight import SingleFlight, SingleFlightDeadlineException
+
+
+class SingleFlightTest(unittest.TestCase):
+    """Test SingleFlight"""
+    def run_concurrently(self, flight, key, func, count=4):
+        """Call flight.do from count threads, return their outcomes"""
+        outcomes = []
+
+        def call():
+            try:
+                outcomes.append(flight.do(key, func))
+            except Exception as ex:  # pylint: disable=W0703
+                outcomes.append(ex)
+        threads = [threading.Thread(target=call) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return outcomes
+
+    def test_shared_result(self):
+        calls = []
+
+        def transcode():
+            calls.append(1)
+            time.sleep(0.2)
+            return ['thumbnail.png']
+        outcomes = self.run_concurrently(SingleFlight('test'), 'key', transcode)
+        self.assertEqual(1, len(calls))
+        self.assertEqual([['thumbnail.png']] * 4, outcomes)
+
+    def test_shared_error(self):
+        def transcode():
+            time.sleep(0.2)
+            raise ValueError('broken')
+        outcomes = self.run_concurrently(SingleFlight('test'), 'key', transcode)
+        self.assertTrue(all(isinstance(outcome, ValueError) for outcome in outcomes))
+
+    def test_sequential_calls_run(self):
+        flight = SingleFlight('test')
+        calls = []
+        flight.do('key', lambda: calls.append(1))
+        flight.do('key', lambda: calls.append(1))
+        self.assertEqual(2, len(calls))
+
+    def test_do_many(self):
+        """Batches only run the keys that aren't in flight"""
+        flight = SingleFlight('test')
+        started = threading.Event()
+        release = threading.Event()
+
+        def transcode():
+            started.set()
+            release.wait(5)
+            return 'a.png'
+        thread = threading.Thread(target=flight.do, args=('a', transcode))
+        thread.start()
+        self.assertTrue(started.wait(5))
+        threading.Timer(0.2, release.set).start()
+        batches = []
+
+        def transcode_many(keys):
+            batches.append(keys)
+            return [(key + '.png', None) if key != 'c' else (None, ValueError('broken')) for key in keys]
+        outcomes = flight.do_many(['a', 'b', 'c', 'b'], transcode_many)
+        thread.join()
+        self.assertEqual([['b', 'c']], batches)
+        self.assertEqual(('a.png', None), outcomes[0])
+        self.assertEqual(('b.png', None), outcomes[1])
+        self.assertTrue(isinstance(outcomes[2][1], ValueError))
+        self.assertEqual(('b.png', None), outcomes[3])
+
+    def test_deadline(self):
+        """Callers stop waiting for a call in flight at their deadline"""
+        flight = SingleFlight('test')
+        started = threading.Event()
+        release = threading.Event()
+
+        def transcode():
+            started.set()
+            release.wait(5)
+        thread = threading.Thread(target=flight.do, args=('key', transcode))
+        thread.start()
+        try:
+            self.assertTrue(started.wait(5))
+            self.assertRaises(SingleFlightDeadlineException, flight.do, 'key', transcode, time.time() + 0.1)
+            outcome = flight.do_many(['key'], lambda keys: [], time.time() + 0.1)[0]
+            self.assertTrue(isinstance(outcome[1], SingleFlightDeadlineException))
+        finally:
+            release.set()
+            thread.join()
+
+    def test_lock_path(self):
+        lock_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, lock_path)
+        self.assertEqual(42, SingleFlight('test', lock_path + '/locks').do('key', lambda: 42))
+        self.assertEqual(42, SingleFlight('test', lock_path + '/locks').do(b'caf\xc3\xa9.blend', lambda: 42))
+        self.assertEqual(42, SingleFlight('test', lock_path + '/locks').do(u'caf\xe9.blend', lambda: 42))
+        self.assertEqual([(42, None), (42, None)], SingleFlight('test', lock_path + '/locks').do_many(
+            ['b', 'a'], lambda keys: [(42, None)] * len(keys)))
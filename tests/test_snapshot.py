@@ -0,0 +1,76 @@
+"""Test the columnar store snapshot"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from damn_at import MetaDataType, MetaDataStore
+from damn_at.snapshot import Snapshot, SnapshotException, MISSING
+
+from tests.fixtures import create_file_description
+
+
+class SnapshotTest(unittest.TestCase):
+    """Test Snapshot.update and the column accessors"""
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.store = MetaDataStore(self.tmp + '/store')
+        self.snapshot_path = self.tmp + '/snapshot'
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def write(self, filename, file_hash, vertices):
+        self.store.write_metadata('', file_hash, create_file_description(filename, file_hash, vertices))
+
+    def test_update(self):
+        self.write('cube1.blend', 'a' * 40, 8)
+        snapshot = Snapshot(self.snapshot_path)
+        self.assertEqual(1, snapshot.update(self.store))
+        self.assertEqual(0, snapshot.update(self.store))
+
+        self.write('cube2.blend', 'b' * 40, 24)
+        snapshot = Snapshot(self.snapshot_path)
+        self.assertEqual(1, snapshot.update(self.store))
+        self.assertEqual(2, len(snapshot.manifest['segments']))
+        self.assertEqual(2, snapshot.rows('assets'))
+
+        vertices = snapshot.metadata('assets', 'nr_of_vertices', MetaDataType.INT)
+        self.assertEqual([8, 24], list(vertices))
+        self.assertEqual(['MESH', 'MESH'], snapshot.strings(snapshot.metadata('assets', 'type', MetaDataType.STRING)))
+        self.assertEqual(['cube1.blend', 'cube2.blend'], snapshot.strings(snapshot.column('files', 'filename')))
+        self.assertEqual([0, 1], list(snapshot.column('assets', 'file')))
+        self.assertEqual([MISSING[MetaDataType.INT]] * 2,
+                         list(snapshot.metadata('files', 'nr_of_vertices', MetaDataType.INT)))
+
+    def test_segment_without_assets(self):
+        self.write('cube1.blend', 'a' * 40, 8)
+        snapshot = Snapshot(self.snapshot_path)
+        snapshot.update(self.store)
+        self.store.write_metadata('', 'b' * 40, create_file_description('empty.blend', 'b' * 40, subnames=()))
+        snapshot = Snapshot(self.snapshot_path)
+        self.assertEqual(1, snapshot.update(self.store))
+        self.write('cube3.blend', 'c' * 40, 24)
+        snapshot = Snapshot(self.snapshot_path)
+        snapshot.update(self.store)
+
+        self.assertEqual(3, len(snapshot.manifest['segments']))
+        self.assertEqual([0, 2], list(snapshot.column('assets', 'file')))
+        self.assertEqual(['Cube', 'Cube'], snapshot.strings(snapshot.column('assets', 'subname')))
+        self.assertEqual([8, 24], list(snapshot.metadata('assets', 'nr_of_vertices', MetaDataType.INT)))
+        self.assertRaises(SnapshotException, snapshot.column, 'assets', 'filename')
+
+    def test_skips_temporary_files(self):
+        self.write('cube1.blend', 'a' * 40, 8)
+        open(os.path.join(self.store.store_path, 'aa', 'a' * 38 + '.tmp'), 'w').close()
+        open(os.path.join(self.store.store_path, 'aa', 'tmpk3j2x9'), 'w').close()
+        snapshot = Snapshot(self.snapshot_path)
+        self.assertEqual(1, snapshot.update(self.store))
+
+    def test_rebuild(self):
+        self.write('cube1.blend', 'a' * 40, 8)
+        Snapshot(self.snapshot_path).update(self.store)
+        self.write('cube2.blend', 'b' * 40, 24)
+        snapshot = Snapshot(self.snapshot_path)
+        self.assertEqual(2, snapshot.update(self.store, rebuild=True))
+        self.assertEqual(['00000'], snapshot.manifest['segments'])
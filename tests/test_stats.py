@@ -0,0 +1,74 @@
+"""Test the runtime statistics"""
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+from damn_at.stats import Histogram, Stats, StatsWriter, TimedProxy
+
+
+class HistogramTest(unittest.TestCase):
+    """Test Histogram"""
+    def test_percentiles(self):
+        histogram = Histogram()
+        for i in range(1, 1001):
+            histogram.record(i / 1000.0)
+        self.assertEqual(1000, histogram.count)
+        self.assertAlmostEqual(0.5, histogram.percentile(50), delta=0.5 * 0.04)
+        self.assertAlmostEqual(0.99, histogram.percentile(99), delta=0.99 * 0.04)
+        self.assertEqual(1.0, histogram.percentile(100))
+        self.assertAlmostEqual(0.5005, histogram.summary()['mean'], places=3)
+        self.assertEqual(0.0, Histogram().percentile(99))
+
+    def test_merge(self):
+        first, second = Histogram(), Histogram()
+        first.record(0.001)
+        second.record(2.0)
+        first.merge(Histogram.from_dict(json.loads(json.dumps(second.to_dict()))))
+        self.assertEqual(2, first.count)
+        self.assertEqual(2.0, first.summary()['max'])
+
+
+class StatsTest(unittest.TestCase):
+    """Test Stats"""
+    def test_drain_and_merge(self):
+        worker, server = Stats(), Stats()
+        worker.record('subprocess.sox', 0.25)
+        worker.incr('store.hit')
+        server.incr('store.miss', 3)
+        server.merge(worker.drain())
+        self.assertEqual({}, worker.snapshot()['histograms'])
+
+        snapshot = server.snapshot()
+        self.assertEqual(1, snapshot['histograms']['subprocess.sox']['count'])
+        self.assertEqual(0.25, snapshot['hit_rates']['store'])
+
+    def test_timed_proxy(self):
+        stats = Stats()
+
+        class Handler(object):
+            def ping(self):
+                return 'pong'
+
+            def fail(self):
+                raise ValueError('fail')
+
+        handler = TimedProxy(Handler(), 'rpc', stats)
+        self.assertEqual('pong', handler.ping())
+        self.assertRaises(ValueError, handler.fail)
+        snapshot = stats.snapshot()
+        self.assertEqual(1, snapshot['histograms']['rpc.ping']['count'])
+        self.assertEqual(1, snapshot['counters']['rpc.fail.errors'])
+        self.assertEqual({'ping': 0, 'fail': 0}, snapshot['gauges']['rpc.inflight'])
+
+    def test_writer(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        stats = Stats()
+        stats.incr('calls')
+        writer = StatsWriter(os.path.join(tmp, 'stats.json'), 60, stats)
+        writer.start()
+        writer.stop()
+        with open(os.path.join(tmp, 'stats.json')) as stats_file:
+            self.assertEqual(1, json.load(stats_file)['counters']['calls'])
@@ -0,0 +1,97 @@
+"""Test the transcode cache"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from damn_at import FileId, FileDescription, AssetDescription, AssetId
+from damn_at.transcodecache import TranscodeCache, cache_key, dependency_hashes
+
+
+def asset(file_hash, subname, mimetype='image/png'):
+    return AssetId(subname=subname, mimetype=mimetype, file=FileId(filename=file_hash + '.blend', hash=file_hash))
+
+
+class DependencyTest(unittest.TestCase):
+    """Test the cache keys"""
+    def setUp(self):
+        self.material = asset('a' * 40, 'Material', 'application/x-blender.material')
+        self.texture = asset('b' * 40, 'texture.png')
+        self.library = asset('c' * 40, 'Mesh', 'application/x-blender.mesh')
+        self.mesh = asset('a' * 40, 'Cube', 'application/x-blender.mesh')
+        self.file_descr = FileDescription(file=self.mesh.file, assets=[
+            AssetDescription(asset=self.mesh, dependencies=[self.material, self.library]),
+            AssetDescription(asset=self.material, dependencies=[self.texture]),
+        ])
+        self.library_descr = FileDescription(file=self.library.file, assets=[
+            AssetDescription(asset=self.library, dependencies=[asset('d' * 40, 'linked.png')]),
+        ])
+
+    def test_dependency_hashes(self):
+        self.assertEqual(['b' * 40, 'c' * 40], dependency_hashes(self.file_descr, self.mesh))
+        resolve = {'c' * 40: self.library_descr}.get
+        self.assertEqual(['b' * 40, 'c' * 40, 'd' * 40], dependency_hashes(self.file_descr, self.mesh, resolve))
+        self.texture.file.hash = None
+        self.assertEqual(None, dependency_hashes(self.file_descr, self.mesh))
+
+    def test_cache_key(self):
+        key = cache_key(self.file_descr, self.mesh, 'image/png', {'size': [128, 128]}, '1.0')
+        self.assertEqual(key, cache_key(self.file_descr, self.mesh, 'image/png', {'size': (128, 128)}, '1.0'))
+        self.assertNotEqual(key, cache_key(self.file_descr, self.mesh, 'image/png', {'size': [64, 64]}, '1.0'))
+        self.assertNotEqual(key, cache_key(self.file_descr, self.mesh, 'image/png', {'size': [128, 128]}, '1.1'))
+        self.texture.file.hash = 'e' * 40
+        self.assertNotEqual(key, cache_key(self.file_descr, self.mesh, 'image/png', {'size': [128, 128]}, '1.0'))
+
+
+class TranscodeCacheTest(unittest.TestCase):
+    """Test TranscodeCache"""
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.dest = os.path.join(self.tmp, 'transcoded')
+        self.cache = TranscodeCache(os.path.join(self.tmp, 'cache'), max_size=10)
+
+    def write(self, file_path, data):
+        path = os.path.join(self.dest, file_path)
+        if not os.path.exists(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, 'wb') as output:
+            output.write(data)
+
+    def test_get_put(self):
+        self.assertEqual(None, self.cache.get('key', self.dest))
+        self.write('a/thumb.png', b'12345')
+        self.cache.put('key', self.dest, ['a/thumb.png'])
+        os.remove(os.path.join(self.dest, 'a/thumb.png'))
+
+        self.assertEqual(['a/thumb.png'], self.cache.get('key', self.dest))
+        with open(os.path.join(self.dest, 'a/thumb.png'), 'rb') as output:
+            self.assertEqual(b'12345', output.read())
+
+    def test_rewritten_outputs(self):
+        """Outputs rewritten in place leave the cached copy alone"""
+        self.write('thumb.png', b'12345')
+        self.cache.put('key', self.dest, ['thumb.png'])
+        with open(os.path.join(self.dest, 'thumb.png'), 'r+b') as output:
+            output.write(b'abc')
+        self.cache.get('key', self.dest)
+        with open(os.path.join(self.dest, 'thumb.png'), 'r+b') as output:
+            self.assertEqual(b'12345', output.read())
+            output.seek(0)
+            output.write(b'abc')
+        os.remove(os.path.join(self.dest, 'thumb.png'))
+        self.cache.get('key', self.dest)
+        with open(os.path.join(self.dest, 'thumb.png'), 'rb') as output:
+            self.assertEqual(b'12345', output.read())
+
+    def test_lru_eviction(self):
+        for key in ('first', 'second'):
+            self.write(key + '.png', b'12345')
+            self.cache.put(key, self.dest, [key + '.png'])
+        self.cache.get('first', self.dest)
+        self.write('third.png', b'12345')
+        self.cache.put('third', self.dest, ['third.png'])
+
+        self.assertEqual(10, self.cache.size())
+        self.assertEqual(None, self.cache.get('second', self.dest))
+        self.assertEqual(['first.png'], self.cache.get('first', self.dest))
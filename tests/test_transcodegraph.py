@@ -0,0 +1,46 @@
+"""Test the route planning of the transcode graph"""
+import unittest
+
+from damn_at import TargetMimetype
+from damn_at.transcodegraph import TranscodeGraph
+
+
+class Plugin(object):
+    def __init__(self, name):
+        self.name = name
+
+
+class TranscodeGraphTest(unittest.TestCase):
+    """Test TranscodeGraph"""
+    def setUp(self):
+        self.video = Plugin('video')
+        self.image = Plugin('image')
+        self.png = TargetMimetype(mimetype='image/png')
+        self.jpeg = TargetMimetype(mimetype='image/jpeg')
+        self.video_jpeg = TargetMimetype(mimetype='image/jpeg')
+        self.graph = TranscodeGraph()
+        self.graph.add_edge('video/mp4', self.png, self.video)
+        self.graph.add_edge('image/png', self.png, self.image)
+        self.graph.add_edge('image/png', self.jpeg, self.image)
+
+    def test_plan(self):
+        self.assertEqual([('video/mp4', self.png, self.video)], self.graph.plan('video/mp4', 'image/png'))
+        self.assertEqual([('video/mp4', self.png, self.video), ('image/png', self.jpeg, self.image)],
+                         self.graph.plan('video/mp4', 'image/jpeg'))
+        self.assertEqual([('image/png', self.png, self.image)], self.graph.plan('image/png', 'image/png'))
+        self.assertEqual(None, self.graph.plan('image/png', 'video/mp4'))
+        self.assertEqual(None, self.graph.plan('video/mp4', 'image/jpeg', max_hops=1))
+        self.assertEqual(['image/jpeg', 'image/png'], sorted(self.graph.reachable('video/mp4')))
+
+    def test_learned_costs(self):
+        self.graph.add_edge('video/mp4', self.video_jpeg, self.video)
+        self.assertEqual([('video/mp4', self.video_jpeg, self.video)], self.graph.plan('video/mp4', 'image/jpeg'))
+
+        self.graph.record('video/mp4', self.video_jpeg, self.video, 10.0)
+        self.graph.record('video/mp4', self.png, self.video, 2.0)
+        self.graph.record('image/png', self.jpeg, self.image, 0.5)
+        self.assertEqual([('video/mp4', self.png, self.video), ('image/png', self.jpeg, self.image)],
+                         self.graph.plan('video/mp4', 'image/jpeg'))
+
+        self.graph.record('video/mp4', self.video_jpeg, self.video, 0.0)
+        self.assertAlmostEqual(8.0, self.graph.cost('video/mp4', self.video_jpeg, self.video))
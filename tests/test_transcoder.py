@@ -6,9 +6,9 @@ from damn_at import mimetypes
 from damn_at import utilities
 
 from damn_at.pluginmanager import DAMNPluginManagerSingleton
-from damn_at.transcoder import TranscoderException, Transcoder
+from damn_at.transcoder import TranscoderException, Transcoder, transcode_key
 
-from damn_at import FileDescription
+from damn_at import FileDescription, FileId, AssetId
 
 class MockPlugin:
     def __init__(self, mimetype):
@@ -16,6 +16,7 @@ class MockPlugin:
         self.plugin_object.is_activated = True
         self.plugin_object.convert_map = {mimetype: {mimetype: []}}
         self.plugin_object.transcode = self.transcode
+        self.name = mimetype
         self.description = 'description'
 
     def transcode(self, an_uri):
@@ -33,6 +34,15 @@ class TestCase(unittest.TestCase):
         assert ex.msg == 'message'
         assert str(ex) == repr('message')
 
+    def test_transcode_key(self):
+        """Transcodes of assets whose dependencies changed differ"""
+        asset_id = AssetId(subname='Cube', mimetype='application/x-blender.mesh',
+                           file=FileId(filename='cube.blend', hash='a' * 40))
+        key = transcode_key(asset_id, 'image/png', ['b' * 40], size=(64, 64))
+        self.assertEqual(key, transcode_key(asset_id, 'image/png', ['b' * 40], size=(64, 64)))
+        self.assertNotEqual(key, transcode_key(asset_id, 'image/png', ['c' * 40], size=(64, 64)))
+        self.assertNotEqual(key, transcode_key(asset_id, 'image/png', ['b' * 40], size=(32, 32)))
+
     """Test Analyzer"""
     @patch('damn_at.analyzer.mimetypes.guess_type')
     @patch('damn_at.analyzer.is_existing_file')
@@ -51,3 +61,68 @@ class TestCase(unittest.TestCase):
         assert 'some/other' in target_mimes
 
         target_mime = transcoder.get_target_mimetype('some/mime', 'some/mime')
+
+    def test_transcode_many(self):
+        """Targets of the same plugin are transcoded in one call"""
+        mock = MockDAMNPluginManager()
+        DAMNPluginManagerSingleton.get = classmethod(lambda x: mock)
+        transcoder = Transcoder('')
+        plugin = transcoder._get_transcoder('some/mime', transcoder.get_target_mimetype('some/mime', 'some/mime'))
+        plugin.plugin_object.transcode_assets = Mock(return_value=[['small.png'], ['large.png']])
+
+        asset_id = Mock()
+        asset_id.mimetype = 'some/mime'
+        asset_id.file.hash = 'a' * 40
+        results = transcoder.transcode_many(FileDescription(), asset_id,
+                                            [('some/mime', {'size': (64, 64)}), ('some/mime', {'size': (512, 512)})])
+
+        self.assertEqual([['small.png'], ['large.png']], results)
+        self.assertEqual(1, plugin.plugin_object.transcode_assets.call_count)
+
+    def test_transcode_assets(self):
+        """Assets of the same file are transcoded in one call"""
+        mock = MockDAMNPluginManager()
+        DAMNPluginManagerSingleton.get = classmethod(lambda x: mock)
+        transcoder = Transcoder('')
+        plugin = transcoder._get_transcoder('some/mime', transcoder.get_target_mimetype('some/mime', 'some/mime'))
+        plugin.plugin_object.transcode_assets = Mock(return_value=[['cube.png'], ['sphere.png']])
+
+        cube, sphere = Mock(), Mock()
+        for asset_id, subname in ((cube, 'Cube'), (sphere, 'Sphere')):
+            asset_id.subname = subname
+            asset_id.mimetype = 'some/mime'
+            asset_id.file.hash = 'a' * 40
+        results = transcoder.transcode_assets(FileDescription(), [(cube, 'some/mime', {}), (sphere, 'some/mime', {})])
+
+        self.assertEqual([['cube.png'], ['sphere.png']], results)
+        self.assertEqual(1, plugin.plugin_object.transcode_assets.call_count)
+        jobs = plugin.plugin_object.transcode_assets.call_args[0][2]
+        self.assertEqual([cube, sphere], [asset_id for asset_id, _, _ in jobs])
+
+    def test_planned_route(self):
+        """A request takes the route its options were parsed for"""
+        fast, slow = MockPlugin('some/mime'), MockPlugin('some/mime')
+        fast.name, slow.name = 'fast', 'slow'
+        for plugin in (fast, slow):
+            plugin.plugin_object.convert_map = {'some/mime': {'image/png': []}}
+            plugin.plugin_object.transcode_assets = Mock(return_value=[['cube.png']])
+        mock = Mock()
+        mock.getPluginsOfCategory.return_value = [fast, slow]
+        DAMNPluginManagerSingleton.get = classmethod(lambda x: mock)
+        transcoder = Transcoder('')
+
+        route = transcoder.plan('some/mime', 'image/png')
+        planned = route[-1][2]
+        other = slow if planned is fast else fast
+        # Learned meanwhile, the other plugin is cheaper now.
+        transcoder.graph.record('some/mime', route[-1][1], planned, 100.0)
+        self.assertTrue(transcoder.plan('some/mime', 'image/png')[-1][2] is other)
+
+        asset_id = Mock()
+        asset_id.mimetype = 'some/mime'
+        asset_id.file.hash = 'a' * 40
+        results = transcoder.transcode_assets(FileDescription(), [
+            (asset_id, 'image/png', transcoder.parse_route_options(route), route)])
+        self.assertEqual([['cube.png']], results)
+        self.assertEqual(1, planned.plugin_object.transcode_assets.call_count)
+        self.assertEqual(0, other.plugin_object.transcode_assets.call_count)
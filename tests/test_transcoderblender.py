@@ -0,0 +1,76 @@
+"""Test the Blender transcoders' handling of failed jobs"""
+import json
+import unittest
+
+import mock
+
+from damn_at import utilities, FileId, FileDescription, AssetId, TargetMimetype
+from damn_at.utilities import run_blender_batch
+from damn_at.transcoders.mesh.blender.render import transcoderblenderrender
+from damn_at.transcoders.mesh.blender.text import transcoderblendertext
+
+
+def run_blender(results, returncode):
+    """A run_blender that writes the results of the jobs it got done"""
+    def run(an_uri, script_uri, arguments):  # pylint: disable=W0613
+        with open(arguments[arguments.index('--result') + 1], 'w') as result:
+            json.dump(results, result)
+        return 'out', 'err', returncode
+    return run
+
+
+class RunBlenderBatchTest(unittest.TestCase):
+    """Test run_blender_batch"""
+    @mock.patch.object(utilities, 'run_blender')
+    def test_errors(self, run_blender_mock):
+        run_blender_mock.side_effect = run_blender([None, 'Failed to render Cube: No object'], 0)
+        self.assertEqual(([None, 'Failed to render Cube: No object'], 'out', 'err', 0),
+                         run_blender_batch('cube.blend', 'script.py', [{}, {}]))
+
+    @mock.patch.object(utilities, 'run_blender')
+    def test_crash(self, run_blender_mock):
+        """The jobs Blender didn't get to fail"""
+        run_blender_mock.side_effect = run_blender([None], -11)
+        errors, _, _, returncode = run_blender_batch('cube.blend', 'script.py', [{}, {}, {}])
+        self.assertEqual([None] + ['Blender exited with -11 before the job was done'] * 2, errors)
+        self.assertEqual(-11, returncode)
+
+        run_blender_mock.side_effect = lambda an_uri, script_uri, arguments: ('', '', 1)
+        errors, _, _, _ = run_blender_batch('cube.blend', 'script.py', [{}])
+        self.assertEqual(['Blender exited with 1 before the job was done'], errors)
+
+
+class BlenderTranscoderTest(unittest.TestCase):
+    """Test that the transcoders return False for the failed jobs only"""
+    def setUp(self):
+        fileid = FileId(filename='cube.blend')
+        self.file_descr = FileDescription(file=fileid)
+        self.asset_ids = [AssetId(subname=subname, mimetype='application/x-blender.object', file=fileid)
+                          for subname in ('Cube', 'Sphere')]
+
+    @mock.patch.object(transcoderblenderrender, 'run_blender_batch')
+    def test_render(self, run_blender_batch_mock):
+        run_blender_batch_mock.return_value = ([None, 'Failed to render Sphere: No object'], '', '', 0)
+        target = TargetMimetype(mimetype='image/png', template='${uuid}/${size[0]}_${size[1]}.png')
+        options = {'size': (64, 64), 'angles': (0.0,), 'camera_type': 'PERSPECTIVE'}
+        results = transcoderblenderrender.BlenderTranscoder().transcode_assets(
+            '/tmp', self.file_descr, [(asset_id, target, options) for asset_id in self.asset_ids])
+        self.assertEqual(2, len(results))
+        self.assertEqual(1, len(results[0]))
+        self.assertEqual(False, results[1])
+
+    @mock.patch.object(transcoderblendertext, 'run_process')
+    @mock.patch.object(transcoderblendertext, 'run_blender_batch')
+    def test_text(self, run_blender_batch_mock, run_process_mock):
+        run_blender_batch_mock.return_value = (['Failed to extract Cube: No text', None, None], '', '', 0)
+        run_process_mock.side_effect = [('', '', 0), ('', 'convert: no images', 1)]
+        target = TargetMimetype(mimetype='image/png', template='${uuid}.png')
+        asset_ids = self.asset_ids + [AssetId(subname='Torus', mimetype='application/x-blender.text',
+                                              file=self.file_descr.file)]
+        results = transcoderblendertext.BlenderTranscoder().transcode_assets(
+            '/tmp', self.file_descr, [(asset_id, target, {'size': (128, 128)}) for asset_id in asset_ids])
+        self.assertEqual(False, results[0])
+        self.assertEqual(1, len(results[1]))
+        self.assertEqual(False, results[2])
+        # The failed extraction isn't converted.
+        self.assertEqual(2, run_process_mock.call_count)
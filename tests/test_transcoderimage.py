@@ -0,0 +1,98 @@
+"""Test the PIL image transcoder"""
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+from PIL import Image
+
+from damn_at import FileId, FileDescription, AssetId, TargetMimetype
+from damn_at.transcoders.image.pil.transcoderimage import ImageTranscoder, open_image, _fit
+
+
+class ImageTranscoderTest(unittest.TestCase):
+    """Test open_image, _fit and ImageTranscoder.transcode_many"""
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def create_image(self, name, size, mode='RGB'):
+        path = os.path.join(self.tmp, name)
+        Image.linear_gradient('L').resize(size).convert(mode).save(path)
+        return path
+
+    def test_fit(self):
+        self.assertEqual((256, 192), _fit((4000, 3000), (256, 256)))
+        self.assertEqual((192, 256), _fit((3000, 4000), (256, 256)))
+        self.assertEqual((100, 50), _fit((100, 50), (256, 256)))
+        self.assertEqual((4000, 3000), _fit((4000, 3000), (-1, -1)))
+        self.assertEqual((1, 256), _fit((10, 4000), (256, 256)))
+
+    def test_open_jpeg_draft(self):
+        """JPEGs are scaled down while decoding, no smaller than needed"""
+        path = self.create_image('large.jpg', (2048, 1536))
+        image = open_image(path, [(128, 128), (200, 100)])
+        self.assertEqual((256, 192), image.size)
+        self.assertEqual((2048, 1536), open_image(path, [(128, 128), (-1, -1)]).size)
+
+    def test_open_reduce(self):
+        """Other images are reduced to no less than twice the target"""
+        path = self.create_image('large.png', (1024, 768))
+        image = open_image(path, [(64, 64)])
+        self.assertEqual((128, 96) if hasattr(image, 'reduce') else (1024, 768), image.size)
+        self.assertEqual((1024, 768), open_image(path, [(600, 600)]).size)
+
+    def test_open_palette(self):
+        path = self.create_image('palette.png', (64, 64), 'P')
+        self.assertEqual('RGB', open_image(path, [(16, 16)]).mode)
+
+    def test_open_bilevel(self):
+        """Modes reduce() doesn't support are converted first"""
+        path = self.create_image('bilevel.png', (2000, 2000), '1')
+        image = open_image(path, [(64, 64)])
+        self.assertEqual('L', image.mode)
+        self.assertEqual((134, 134) if hasattr(image, 'reduce') else (2000, 2000), image.size)
+
+        file_descr = FileDescription(file=FileId(filename=path, hash='a' * 40))
+        asset_id = AssetId(subname='bilevel.png', mimetype='image/png', file=file_descr.file)
+        target = TargetMimetype(mimetype='image/png', template='${name}${extension}')
+        results = ImageTranscoder().transcode_many(self.tmp, file_descr, asset_id, [
+            (target, {'size': (64, 64), 'quality': 1.0, 'name': 'small'}),
+            (target, {'size': (-1, -1), 'quality': 1.0, 'name': 'full'})])
+        self.assertEqual([['small.png'], ['full.png']], results)
+        self.assertEqual((64, 64), Image.open(os.path.join(self.tmp, 'small.png')).size)
+
+    def test_transcode_many_cascade(self):
+        """Every size is scaled down from the next larger one"""
+        path = self.create_image('large.png', (1024, 768))
+        file_descr = FileDescription(file=FileId(filename=path, hash='a' * 40))
+        asset_id = AssetId(subname='large.png', mimetype='image/png', file=file_descr.file)
+        target = TargetMimetype(mimetype='image/png', template='${name}${extension}')
+        targets = [(target, {'size': (32, 32), 'quality': 1.0, 'name': 'small'}),
+                   (target, {'size': (-1, -1), 'quality': 1.0, 'name': 'full'}),
+                   (target, {'size': (256, 256), 'quality': 1.0, 'name': 'large'})]
+
+        sources = []
+        thumbnail = Image.Image.thumbnail
+
+        def record(image, size, *args, **kwargs):
+            sources.append((image.size, tuple(size)))
+            return thumbnail(image, size, *args, **kwargs)
+        with mock.patch.object(Image.Image, 'thumbnail', autospec=True, side_effect=record):
+            results = ImageTranscoder().transcode_many(self.tmp, file_descr, asset_id, targets)
+
+        self.assertEqual([['small.png'], ['full.png'], ['large.png']], results)
+        self.assertEqual([((1024, 768), (256, 256)), ((256, 192), (32, 32))], sources)
+        sizes = [Image.open(os.path.join(self.tmp, name)).size for name in ('small.png', 'full.png', 'large.png')]
+        self.assertEqual([(32, 24), (1024, 768), (256, 192)], sizes)
+
+    def test_transcode_many_unreadable(self):
+        path = os.path.join(self.tmp, 'broken.png')
+        with open(path, 'wb') as broken:
+            broken.write(b'not an image')
+        file_descr = FileDescription(file=FileId(filename=path))
+        target = TargetMimetype(mimetype='image/png', template='${name}${extension}')
+        results = ImageTranscoder().transcode_many(self.tmp, file_descr, None,
+                                                   [(target, {'size': (32, 32), 'name': 'small'})])
+        self.assertEqual([False], results)
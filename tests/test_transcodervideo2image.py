@@ -0,0 +1,106 @@
+"""Test the video to image transcoder"""
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from damn_at import MetaDataType, MetaDataValue, FileId, FileDescription, AssetId, AssetDescription, TargetMimetype
+from damn_at.transcoders.video import transcodervideo2image
+from damn_at.transcoders.video.transcodervideo2image import (
+    Video2ImageTranscoder,
+    parse_duration,
+    video_size,
+    probe_video,
+    frame_size,
+    read_frames
+)
+
+
+def create_file_description(filename, metadata):
+    fileid = FileId(filename=filename)
+    asset_id = AssetId(subname=filename, mimetype='video/mp4', file=fileid)
+    return FileDescription(file=fileid, assets=[AssetDescription(asset=asset_id, metadata=metadata)])
+
+
+class Video2ImageTest(unittest.TestCase):
+    """Test the helpers and the transcoder's fallbacks"""
+    def test_parse_duration(self):
+        self.assertEqual(83.0, parse_duration('0:01:23'))
+        self.assertEqual(12.34, parse_duration('12.34 s'))
+        self.assertEqual(5.0, parse_duration('0:00:05 (approx)'))
+        self.assertEqual(3.5, parse_duration('3.500000'))
+        self.assertEqual(None, parse_duration('N/A'))
+        self.assertEqual(None, parse_duration(''))
+
+    def test_frame_size(self):
+        self.assertEqual((1920, 1080), frame_size((1920, 1080), (-1, -1)))
+        self.assertEqual((160, 90), frame_size((1920, 1080), (160, 160)))
+        self.assertEqual((90, 160), frame_size((1080, 1920), (160, 160)))
+        self.assertEqual((320, 240), frame_size((320, 240), (640, 640)))
+
+    def test_video_size(self):
+        metadata = {'width': MetaDataValue(type=MetaDataType.INT, int_value=1920),
+                    'height': MetaDataValue(type=MetaDataType.INT, int_value=1080)}
+        self.assertEqual((1920, 1080), video_size(create_file_description('a.mp4', metadata).assets[0]))
+        self.assertEqual(None, video_size(create_file_description('a.mp4', None).assets[0]))
+        metadata['width'].int_value = 0
+        self.assertEqual(None, video_size(create_file_description('a.mp4', metadata).assets[0]))
+
+    @mock.patch.object(transcodervideo2image, 'run_process')
+    def test_probe_video(self, run_process):
+        run_process.return_value = (b'width=640\nheight=360\nduration=12.500000\n', b'', 0)
+        self.assertEqual({'size': (640, 360), 'duration': 12.5}, probe_video('a.mp4'))
+        run_process.return_value = (b'width=640\nheight=360\nduration=N/A\n', b'', 0)
+        self.assertEqual({'size': (640, 360)}, probe_video('a.mp4'))
+        run_process.return_value = (b'', b'No such file', 1)
+        self.assertEqual({}, probe_video('a.mp4'))
+
+    @mock.patch.object(transcodervideo2image, 'run_process')
+    def test_read_frames(self, run_process):
+        run_process.return_value = (b'\x00' * (4 * 3 * 3) * 2 + b'\x00' * 5, b'', 0)
+        frames = read_frames('a.mp4', (4, 3), 2, start=1.0, fps=0.5)
+        self.assertEqual(2, len(frames))
+        self.assertEqual((4, 3), frames[0].size)
+        args = run_process.call_args[0][0]
+        self.assertEqual('fps=0.5,scale=4:3', args[args.index('-vf') + 1])
+        run_process.return_value = (b'', b'broken', 1)
+        self.assertEqual([], read_frames('a.mp4', (4, 3), 1))
+
+    @mock.patch.object(transcodervideo2image, 'read_frames')
+    @mock.patch.object(transcodervideo2image, 'probe_video')
+    def test_transcode_without_metadata(self, probe, read_frames_mock):
+        """The size and duration are probed when the analyzer found none"""
+        from PIL import Image
+        dest_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, dest_path)
+        probe.return_value = {'size': (640, 360), 'duration': 10.0}
+        read_frames_mock.return_value = [Image.new('RGB', (640, 360))]
+        file_descr = create_file_description('a.mp4', None)
+        target = TargetMimetype(mimetype='image/png', template='frame${extension}')
+
+        file_paths = Video2ImageTranscoder().transcode(dest_path, file_descr, file_descr.assets[0].asset, target,
+                                                       second=-1, size=(-1, -1))
+        self.assertEqual(['frame.png'], file_paths)
+        self.assertTrue(os.path.exists(os.path.join(dest_path, 'frame.png')))
+        read_frames_mock.assert_called_once_with('a.mp4', (640, 360), 1, start=5.0)
+
+        probe.return_value = {}
+        self.assertEqual(False, Video2ImageTranscoder().transcode(dest_path, file_descr, file_descr.assets[0].asset,
+                                                                  target, second=-1, size=(-1, -1)))
+
+    @mock.patch.object(transcodervideo2image, 'read_frames')
+    def test_storyboard(self, read_frames_mock):
+        """Frames are spread over the video and laid out in rows of footage"""
+        from PIL import Image
+        read_frames_mock.return_value = [Image.new('RGB', (4, 3), (i * 50, 0, 0)) for i in range(5)]
+        sprite = Video2ImageTranscoder().storyboard('a.mp4', 10.0, (4, 3),
+                                                    {'frames': 5, 'footage': 2, 'spacing': 'keyframes'})
+        self.assertEqual((8, 9), sprite.size)
+        self.assertEqual((200, 0, 0), sprite.getpixel((0, 6)))
+        self.assertEqual((150, 0, 0), sprite.getpixel((4, 3)))
+        read_frames_mock.assert_called_once_with('a.mp4', (4, 3), 5, start=1.0, fps=0.5, keyframes=True)
+        read_frames_mock.return_value = []
+        self.assertEqual(None, Video2ImageTranscoder().storyboard('a.mp4', 10.0, (4, 3),
+                                                                  {'frames': 5, 'footage': 2, 'spacing': 'even'}))
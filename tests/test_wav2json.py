@@ -0,0 +1,54 @@
+"""Test the audio to JSON transcoder"""
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+import mock
+import numpy
+
+from damn_at import FileId, AssetId, FileDescription, TargetMimetype
+from damn_at.transcoders.audio.wav2json import transcoderwav2json
+from damn_at.transcoders.audio.wav2json.transcoderwav2json import Audio2JsonTranscoder
+
+
+class Audio2JsonTest(unittest.TestCase):
+    """Test Audio2JsonTranscoder"""
+    def setUp(self):
+        self.dest_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dest_path)
+        self.file_descr = FileDescription(file=FileId(filename='tone.wav'))
+        self.asset_id = AssetId(subname='tone.wav', mimetype='audio/x-wav', file=self.file_descr.file)
+        self.target = TargetMimetype(mimetype='application/json', template='tone-${channels}${extension}')
+
+    def transcode(self, chunks, channels):
+        with mock.patch.object(transcoderwav2json, 'read_audio', return_value=iter(chunks)) as read_audio:
+            file_paths = Audio2JsonTranscoder().transcode(self.dest_path, self.file_descr, self.asset_id, self.target,
+                                                          channels=channels, samplerate=800, precision=2)
+        read_audio.assert_called_once_with('tone.wav', 800, channels)
+        with open(os.path.join(self.dest_path, file_paths[0])) as output:
+            return json.load(output)
+
+    def test_stereo(self):
+        chunks = [numpy.array([[0.1, -0.1], [0.254, -0.5]], numpy.float32),
+                  numpy.array([[1.0, 0.333]], numpy.float32)]
+        self.assertEqual({'left': [0.1, 0.25, 1.0], 'right': [-0.1, -0.5, 0.33]}, self.transcode(chunks, 2))
+
+    def test_mono(self):
+        chunks = [numpy.array([[0.5], [0.25]], numpy.float32)]
+        self.assertEqual({'mono': [0.5, 0.25]}, self.transcode(chunks, 1))
+
+    def test_empty(self):
+        self.assertEqual({'left': [], 'right': []}, self.transcode([], 2))
+
+    def test_sox_fails(self):
+        """A failed transcode leaves neither the output nor its temporary file"""
+        def read_audio(path, samplerate, nchannels):  # pylint: disable=W0613
+            yield numpy.array([[0.5, 0.5]], numpy.float32)
+            raise IOError('sox exited with 2')
+        with mock.patch.object(transcoderwav2json, 'read_audio', side_effect=read_audio):
+            self.assertEqual(False, Audio2JsonTranscoder().transcode(self.dest_path, self.file_descr, self.asset_id,
+                                                                     self.target, channels=2, samplerate=800,
+                                                                     precision=2))
+        self.assertEqual([], os.listdir(self.dest_path))
@@ -0,0 +1,45 @@
+"""Test decoding wave files"""
+import os
+import wave
+import shutil
+import struct
+import tempfile
+import unittest
+
+from damn_at.utilities import WaveData, decode_samples
+
+
+class WaveDataTest(unittest.TestCase):
+    """Test WaveData"""
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def write(self, sample_width, frames, nchannels=2):
+        path = os.path.join(self.tmp, '%d.wav' % sample_width)
+        stream = wave.open(path, 'wb')
+        stream.setnchannels(nchannels)
+        stream.setsampwidth(sample_width)
+        stream.setframerate(800)
+        stream.writeframes(frames)
+        stream.close()
+        return path
+
+    def test_decode_samples(self):
+        self.assertEqual([[-1.0, 0.5]], decode_samples(struct.pack('<hh', -32768, 16384), 2, 2).tolist())
+        self.assertEqual([[0.0], [-0.5]], decode_samples(struct.pack('<BB', 128, 64), 1, 1).tolist())
+        self.assertEqual([[-1.0, 0.5]], decode_samples(struct.pack('<ii', -2 ** 31, 2 ** 30), 4, 2).tolist())
+        self.assertRaises(ValueError, decode_samples, b'', 5, 1)
+
+    def test_24_bit(self):
+        # Little endian 24 bit: -1.0, 0.5 and -0.25.
+        frames = b'\x00\x00\x80' + b'\x00\x00\x40' + b'\x00\x00\xe0' + b'\x00\x00\x00'
+        self.assertEqual([[-1.0, 0.5], [-0.25, 0.0]], decode_samples(frames, 3, 2).tolist())
+
+    def test_extract_data(self):
+        path = self.write(2, struct.pack('<4h', 0, 32767, -16384, 8192))
+        wavedata = WaveData()
+        wavedata.extractData(path, 2)
+
+        self.assertEqual(2, wavedata.nchannels)
+        self.assertEqual([[0.0, -0.5], [1.0, 0.25]], wavedata.getData().tolist())
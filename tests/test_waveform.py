@@ -0,0 +1,70 @@
+"""Test the waveform peak levels and files"""
+import io
+import unittest
+
+import numpy
+
+from damn_at.waveform import PeakLevels, write_peaks, read_index, read_peaks, column_peaks, render_waveform
+
+
+class PeakLevelsTest(unittest.TestCase):
+    """Test PeakLevels"""
+    def setUp(self):
+        self.samples = numpy.sin(numpy.arange(1000, dtype=numpy.float32) / 10.0)[:, None] * [1.0, 0.5]
+
+    def expected(self, size):
+        return [[[self.samples[i:i + size, channel].min(), self.samples[i:i + size, channel].max()]
+                 for channel in range(2)] for i in range(0, len(self.samples), size)]
+
+    def test_levels(self):
+        peaks = PeakLevels([4, 16, 64], 2)
+        # Chunks that don't line up with the buckets.
+        for start in range(0, len(self.samples), 37):
+            peaks.add(self.samples[start:start + 37])
+        levels = peaks.finish()
+
+        self.assertEqual([250, 63, 16], [len(level) for level in levels])
+        for size, level in zip([4, 16, 64], levels):
+            numpy.testing.assert_allclose(self.expected(size), level, rtol=1e-6)
+
+    def test_invalid_levels(self):
+        self.assertRaises(ValueError, PeakLevels, [4, 10], 1)
+
+    def test_file(self):
+        peaks = PeakLevels([4, 16], 2)
+        peaks.add(self.samples)
+        levels = peaks.finish()
+        output = io.BytesIO()
+        write_peaks(output, levels, [4, 16], 22050, bits=16)
+
+        index = read_index(io.BytesIO(output.getvalue()))
+        self.assertEqual(22050, index['samplerate'])
+        self.assertEqual(2, index['channels'])
+        self.assertEqual([(4, 250), (16, 63)], [level[:2] for level in index['levels']])
+
+        peaks = read_peaks(io.BytesIO(output.getvalue()), 16, 10, 20)
+        numpy.testing.assert_allclose(levels[1][10:20], peaks, atol=1.0 / 32767)
+        self.assertEqual((0, 2, 2), read_peaks(io.BytesIO(output.getvalue()), 16, 100).shape)
+        self.assertRaises(ValueError, read_peaks, io.BytesIO(output.getvalue()), 8)
+
+
+class RenderWaveformTest(unittest.TestCase):
+    """Test column_peaks and render_waveform"""
+    def test_column_peaks(self):
+        peaks = numpy.array([[[-0.1, 0.2]], [[-0.5, 0.1]], [[-0.2, 0.9]], [[0.0, 0.3]]])
+        numpy.testing.assert_allclose([[[-0.5, 0.2]], [[-0.2, 0.9]]], column_peaks(peaks, 2))
+        self.assertEqual((8, 1, 2), column_peaks(peaks, 8).shape)
+        self.assertEqual((3, 1, 2), column_peaks(peaks[:0], 3).shape)
+
+    def test_render(self):
+        peaks = numpy.array([[[0.0, 1.0], [-1.0, 0.0]], [[0.0, 0.0], [0.0, 0.0]]])
+        image = render_waveform(peaks, (2, 10), (255, 0, 0))
+        self.assertEqual((2, 10), image.size)
+        pixels = numpy.asarray(image)
+        # The first channel's column reaches the top of its band, the
+        # second's the bottom of its band.
+        self.assertEqual((255, 0, 0), tuple(pixels[0, 0]))
+        self.assertEqual((255, 255, 255), tuple(pixels[4, 0]))
+        self.assertEqual((255, 255, 255), tuple(pixels[5, 0]))
+        self.assertEqual((255, 0, 0), tuple(pixels[9, 0]))
+        self.assertEqual((255, 255, 255), tuple(pixels[0, 1]))